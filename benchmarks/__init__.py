@@ -0,0 +1 @@
+"""ベンチマークモジュール（ローカルスタブサーバーを使用したオフライン計測）"""
@@ -0,0 +1,218 @@
+"""
+arXiv APIレスポンス（Atom）のパースのベンチマーク
+
+1ページ2,000件のレスポンスを、arxivパッケージの経路（レスポンス全体を木構造にパース →
+arxiv.Result → PaperResult）とストリーミングの経路（src.collectors.arxiv_atom.parse_feed →
+PaperResult）でパースし、スループットとピークメモリを比較する。ピークRSSは下がらないため、
+経路ごとに子プロセスで計測する
+
+レスポンスはスタブと同じ合成データで生成するほか、``--feed`` で記録済みのレスポンス
+（HTTP_CACHE_DIRを設定して収集した ``*.body`` など）を指定できる
+
+使用例:
+    python -m benchmarks.atom_parse --entries 2000 --pages 3 --output -
+    python -m benchmarks.atom_parse --feed .cache/arxiv/<key>.body
+"""
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from benchmarks.run_benchmark import peak_rss_kb
+from benchmarks.stubs import generate_papers, render_atom_feed
+
+
+PARSERS = ("arxiv", "streaming")
+
+
+def write_pages(directory: str, entries: int, pages: int) -> List[str]:
+    """
+    合成データのレスポンスをファイルに書き出す
+    
+    Args:
+        directory: 出力先ディレクトリ
+        entries: 1ページあたりの件数
+        pages: ページ数
+    
+    Returns:
+        書き出したファイルのパス
+    """
+    paths = []
+    for index in range(pages):
+        papers = generate_papers(entries, seed=index)
+        path = Path(directory) / f"page-{index}.xml"
+        path.write_bytes(render_atom_feed(papers, total_results=entries * pages, start=index * entries))
+        paths.append(str(path))
+    return paths
+
+
+def _chunks(page: bytes, size: int) -> Iterator[memoryview]:
+    """受信時と同じ単位でレスポンスを分割（コピーしない）"""
+    view = memoryview(page)
+    for offset in range(0, len(view), size):
+        yield view[offset:offset + size]
+
+
+def parse_with_arxiv(page: bytes) -> list:
+    """arxivパッケージの経路でパース（ArxivCollectorの既定の処理と同じ）"""
+    from src.collectors.arxiv_collector import to_paper_result
+    
+    try:
+        from arxiv import _feed
+        results = _feed.parse(page).results
+    except ImportError:
+        # arxiv 3.x以前はfeedparserでパースする
+        import arxiv
+        import feedparser
+        results = [arxiv.Result._from_feed_entry(entry) for entry in feedparser.parse(page).entries]
+    return [to_paper_result(result) for result in results]
+
+
+def parse_streaming(page: bytes) -> list:
+    """ストリーミングの経路でパース（StreamingArxivClientと同じ処理）"""
+    from src.collectors.arxiv_atom import CHUNK_SIZE, parse_feed
+    
+    return list(parse_feed(_chunks(page, CHUNK_SIZE)))
+
+
+_PARSE: Dict[str, Callable[[bytes], list]] = {
+    "arxiv": parse_with_arxiv,
+    "streaming": parse_streaming,
+}
+
+
+def measure(parser: str, paths: List[str], runs: int = 5) -> dict:
+    """
+    1つの経路でレスポンスをパースして計測
+    
+    Args:
+        parser: "arxiv" または "streaming"
+        paths: レスポンスのファイル
+        runs: スループットの計測回数（最速の結果を採用）
+    
+    Returns:
+        計測結果の辞書
+    """
+    parse = _PARSE[parser]
+    pages = [Path(path).read_bytes() for path in paths]
+    # パーサーのインポートは計測に含めない
+    parse(render_atom_feed([], total_results=0))
+    gc.collect()
+    
+    # 1ページずつパースし、結果はページ分まとめて保持する（収集時と同じ）
+    baseline_kb = peak_rss_kb()
+    entries = sum(len(parse(page)) for page in pages)
+    rss_kb = peak_rss_kb() - baseline_kb
+    
+    tracemalloc.start()
+    for page in pages:
+        parse(page)
+    traced_kb = tracemalloc.get_traced_memory()[1] // 1024
+    tracemalloc.stop()
+    
+    best = None
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        for page in pages:
+            parse(page)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    
+    return {
+        "parser": parser,
+        "pages": len(pages),
+        "entries": entries,
+        "bytes": sum(len(page) for page in pages),
+        "best_seconds": round(best, 4),
+        "entries_per_second": round(entries / best, 1) if best else 0.0,
+        "peak_rss_delta_kb": rss_kb,
+        "peak_traced_kb": traced_kb,
+    }
+
+
+def run_isolated(parser: str, paths: List[str], runs: int) -> dict:
+    """1つの経路を子プロセスで計測（経路ごとに独立したピークRSSを得るため）"""
+    command = [
+        sys.executable, "-m", "benchmarks.atom_parse", "--child", parser,
+        "--runs", str(runs), "--output", "-",
+    ]
+    for path in paths:
+        command += ["--feed", path]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def compare(paths: List[str], runs: int = 5, in_process: bool = False) -> dict:
+    """
+    2つの経路を計測して比較
+    
+    Args:
+        paths: レスポンスのファイル
+        runs: スループットの計測回数
+        in_process: Trueの場合は同一プロセスで計測（ピークRSSの差分は参考値）
+    
+    Returns:
+        経路ごとの計測結果と比
+    """
+    results = {
+        parser: measure(parser, paths, runs) if in_process else run_isolated(parser, paths, runs)
+        for parser in PARSERS
+    }
+    baseline, streaming = results["arxiv"], results["streaming"]
+    return {
+        "results": results,
+        "speedup": round(baseline["best_seconds"] / streaming["best_seconds"], 2)
+        if streaming["best_seconds"] else None,
+        "traced_memory_ratio": round(baseline["peak_traced_kb"] / streaming["peak_traced_kb"], 2)
+        if streaming["peak_traced_kb"] else None,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数のパーサーを作成"""
+    parser = argparse.ArgumentParser(description="arXiv Atom parsing benchmark")
+    parser.add_argument("--entries", type=int, default=2000, help="合成データの1ページあたりの件数")
+    parser.add_argument("--pages", type=int, default=3, help="合成データのページ数")
+    parser.add_argument("--feed", action="append", default=[],
+                        help="記録済みのレスポンスファイル（複数指定可。指定した場合は合成データを使わない）")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default="atom_parse_output.json",
+                        help="結果JSONの出力先（'-'で標準出力）")
+    parser.add_argument("--in-process", action="store_true",
+                        help="両方の経路を同一プロセスで計測")
+    parser.add_argument("--child", choices=PARSERS, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """エントリーポイント"""
+    import logging
+    
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    if args.child:
+        output = measure(args.child, args.feed, args.runs)
+    elif args.feed:
+        output = compare(args.feed, args.runs, args.in_process)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            output = compare(write_pages(directory, args.entries, args.pages), args.runs, args.in_process)
+    
+    text = json.dumps(output, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+パイプライン全体のオフラインベンチマーク
+
+ローカルスタブサーバー（arXiv / Chat Completions / Discord Webhook）に対して
+ResearchPaperBotを端から端まで実行し、スループット・テイルレイテンシ・
+ピークRSSをJSONで出力する
+
+使用例:
+    python -m benchmarks.run_benchmark --scales 10,100,1000 --output bench_output.json
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.stubs import (
+    ArxivApiStub,
+    ChatCompletionStub,
+    CompletionProfile,
+    DiscordWebhookStub,
+)
+
+
+DEFAULT_SCALES = [10, 100, 1000]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """
+    線形補間によるパーセンタイル
+
+    Args:
+        samples: 計測値のリスト
+        q: パーセンタイル（0-100）
+
+    Returns:
+        パーセンタイル値（サンプルが空の場合は0.0）
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """レイテンシ（秒）のリストをミリ秒単位の統計値に変換"""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def peak_rss_kb() -> int:
+    """プロセスのピークRSS（KB）"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト単位、Linuxはキロバイト単位
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def _timed(func: Callable, samples: List[float]) -> Callable:
+    """呼び出し時間をsamplesに記録するラッパー"""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def run_scale(
+    scale: int,
+    profile: Optional[CompletionProfile] = None,
+    discord_rate_limit: int = 5,
+    discord_window_seconds: float = 2.0,
+    page_size: int = 500,
+    dry_run: bool = False
+) -> dict:
+    """
+    指定した論文数でパイプラインを1回実行して計測
+
+    Args:
+        scale: 収集・要約・通知する論文数
+        profile: Chat Completionsスタブの応答プロファイル
+        discord_rate_limit: Discordスタブのウィンドウあたり許可リクエスト数
+        discord_window_seconds: Discordスタブのレート制限ウィンドウ（秒）
+        page_size: arXiv APIの1ページあたりの取得件数
+        dry_run: Trueの場合、Discord通知を行わない
+
+    Returns:
+        計測結果の辞書
+    """
+    import arxiv
+
+    from src.collectors.arxiv_collector import ArxivCollector
+    from src.main import ResearchPaperBot
+    from src.notifiers.paper_notifier import PaperNotifier
+    from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+
+    profile = profile or CompletionProfile()
+
+    with ArxivApiStub(scale) as arxiv_stub, \
+            ChatCompletionStub(profile) as llm_stub, \
+            DiscordWebhookStub(discord_rate_limit, discord_window_seconds) as discord_stub:
+        client = arxiv.Client(page_size=page_size, delay_seconds=0, num_retries=0)
+        client.query_url_format = arxiv_stub.query_url_format
+
+        notifier = None
+        if not dry_run:
+            notifier = PaperNotifier(webhook_url=discord_stub.webhook_url())
+
+        bot = ResearchPaperBot(
+            dry_run=dry_run,
+            collector=ArxivCollector("cat:cs.AI", max_results=scale, client=client),
+            summarizer=OpenRouterSummarizer(
+                api_key="benchmark", model="stub-model", retry_delay=0, base_url=llm_stub.base_url
+            ),
+            notifier=notifier
+        )
+
+        stage_samples: Dict[str, List[float]] = {
+            "collect_papers": [], "summarize_papers": [], "notify_papers": []
+        }
+        for stage, samples in stage_samples.items():
+            setattr(bot, stage, _timed(getattr(bot, stage), samples))
+
+        summarize_samples: List[float] = []
+        bot.summarizer.summarize = _timed(bot.summarizer.summarize, summarize_samples)
+        notify_samples: List[float] = []
+        notify_results: List[bool] = []
+        if bot.notifier is not None:
+            send = bot.notifier.send_paper_summary
+
+            def recording_send(paper):
+                ok = send(paper)
+                notify_results.append(ok)
+                return ok
+
+            bot.notifier.send_paper_summary = _timed(recording_send, notify_samples)
+
+        started = time.perf_counter()
+        success = bot.run(days=7)
+        wall_seconds = time.perf_counter() - started
+
+        return {
+            "scale": scale,
+            "success": success,
+            "wall_seconds": round(wall_seconds, 4),
+            "throughput_papers_per_second": round(scale / wall_seconds, 3) if wall_seconds else 0.0,
+            "stages_seconds": {
+                stage: round(sum(samples), 4) for stage, samples in stage_samples.items()
+            },
+            "latency": {
+                "summarize": latency_summary(summarize_samples),
+                "notify": latency_summary(notify_samples),
+            },
+            "notifications": {
+                "succeeded": sum(notify_results),
+                "failed": len(notify_results) - sum(notify_results),
+            },
+            "peak_rss_kb": peak_rss_kb(),
+            "stubs": {
+                "arxiv_requests": arxiv_stub.request_count,
+                "completions": dict(llm_stub.stats),
+                "discord": dict(discord_stub.stats),
+            },
+        }
+
+
+def run_isolated(scale: int, argv: List[str]) -> dict:
+    """
+    1スケール分を子プロセスで実行（スケール毎に独立したピークRSSを得るため）
+
+    Args:
+        scale: 論文数
+        argv: 子プロセスに引き継ぐ共通オプション
+
+    Returns:
+        計測結果の辞書
+    """
+    command = [
+        sys.executable, "-m", "benchmarks.run_benchmark",
+        "--scales", str(scale), "--in-process", "--output", "-", *argv
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)["results"][0]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数のパーサーを作成"""
+    parser = argparse.ArgumentParser(description="Research Paper Bot offline benchmark")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="カンマ区切りの論文数（例: 10,100,10000）")
+    parser.add_argument("--output", default="bench_output.json",
+                        help="結果JSONの出力先（'-'で標準出力）")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--llm-retry-after", type=float, default=0.0)
+    parser.add_argument("--discord-rate-limit", type=int, default=5)
+    parser.add_argument("--discord-window", type=float, default=2.0)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Discord通知を行わない")
+    parser.add_argument("--in-process", action="store_true",
+                        help="全スケールを同一プロセスで実行（ピークRSSは累積値になる）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """エントリーポイント"""
+    import logging
+
+    args = build_parser().parse_args(argv)
+    # 計測中のログ出力を抑制（ログI/O自体が結果を歪めるため）
+    logging.basicConfig(level=logging.WARNING)
+
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    profile = CompletionProfile(
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        error_rate=args.llm_error_rate,
+        rate_limit_rate=args.llm_rate_limit_rate,
+        retry_after_seconds=args.llm_retry_after,
+    )
+    shared = [
+        "--llm-latency-ms", str(args.llm_latency_ms),
+        "--llm-jitter-ms", str(args.llm_jitter_ms),
+        "--llm-error-rate", str(args.llm_error_rate),
+        "--llm-rate-limit-rate", str(args.llm_rate_limit_rate),
+        "--llm-retry-after", str(args.llm_retry_after),
+        "--discord-rate-limit", str(args.discord_rate_limit),
+        "--discord-window", str(args.discord_window),
+        "--page-size", str(args.page_size),
+    ] + (["--dry-run"] if args.dry_run else [])
+
+    results = []
+    for scale in scales:
+        if args.in_process:
+            results.append(run_scale(
+                scale,
+                profile=profile,
+                discord_rate_limit=args.discord_rate_limit,
+                discord_window_seconds=args.discord_window,
+                page_size=args.page_size,
+                dry_run=args.dry_run
+            ))
+        else:
+            results.append(run_isolated(scale, shared))
+
+    from src import __version__
+
+    report = {
+        "benchmark": "pipeline",
+        "version": __version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": asdict(profile),
+        "discord": {"rate_limit": args.discord_rate_limit, "window_seconds": args.discord_window},
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+CLI起動時間のベンチマーク
+
+``python -X importtime`` の出力を解析し、モジュール読み込みにかかる
+累積時間と読み込まれたモジュールの一覧を取得する
+
+使用例:
+    python -m benchmarks.startup src.main
+"""
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# 起動時に読み込まれてはならない重い依存パッケージ
+HEAVY_MODULES = ("openai", "arxiv", "discord_webhook", "pydantic", "httpx", "requests", "lxml")
+
+
+@dataclass
+class ImportProfile:
+    """インポート時間の計測結果"""
+
+    module: str
+    cumulative_us: int
+    modules: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000
+
+    def loaded(self, prefix: str) -> bool:
+        """指定したパッケージ（またはそのサブモジュール）が読み込まれたか"""
+        return any(name == prefix or name.startswith(prefix + ".") for name in self.modules)
+
+    def heavy_modules(self, candidates: tuple = HEAVY_MODULES) -> List[str]:
+        """読み込まれた重い依存パッケージの一覧"""
+        return [name for name in candidates if self.loaded(name)]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    ``-X importtime`` の出力をモジュール名 → 累積時間（マイクロ秒）に変換
+
+    Args:
+        stderr: ``python -X importtime`` の標準エラー出力
+
+    Returns:
+        モジュール名と累積インポート時間の辞書
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            # ヘッダー行（self [us] | cumulative | imported package）
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def measure_import(module: str, python: Optional[str] = None, runs: int = 3) -> ImportProfile:
+    """
+    新しいインタプリタでモジュールをインポートし、最速の計測結果を返す
+
+    Args:
+        module: 計測するモジュール名
+        python: Python実行ファイル（Noneの場合は現在のインタプリタ）
+        runs: 計測回数（ディスクキャッシュ等の揺らぎを抑えるため最小値を採用）
+
+    Returns:
+        インポート時間の計測結果
+    """
+    best: Optional[ImportProfile] = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        modules = parse_importtime(completed.stderr)
+        profile = ImportProfile(module=module, cumulative_us=modules.get(module, 0), modules=modules)
+        if best is None or profile.cumulative_us < best.cumulative_us:
+            best = profile
+    return best
+
+
+def main() -> None:
+    """エントリーポイント"""
+    module = sys.argv[1] if len(sys.argv) > 1 else "src.main"
+    profile = measure_import(module)
+    print(json.dumps({
+        "module": profile.module,
+        "cumulative_ms": profile.cumulative_ms,
+        "heavy_modules": profile.heavy_modules(),
+        "module_count": len(profile.modules),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,928 @@
+"""
+ベンチマーク用ローカルスタブサーバー
+
+arXiv API（Atomフィード）・PDF、arXiv OAI-PMH・新着フィード（RSS）、Semantic Scholar Graph API、OpenAI互換の
+Chat Completions API、Discord Webhookをローカルで再現し、外部サービスに接続せずに
+パイプライン全体を計測できるようにする
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+
+StubResponse = Tuple[int, Dict[str, str], bytes]
+
+
+class StubServer:
+    """バックグラウンドスレッドで動作するHTTPスタブサーバーの基底クラス"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            host: バインドするホスト
+            port: バインドするポート（0の場合は空きポートを自動選択）
+        """
+        self.host = host
+        self.port = port
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """サーバーのベースURL"""
+        if self._server is None:
+            raise RuntimeError("Stub server is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        """サーバーを起動"""
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # ヘッダーとボディを別々に書き込むため、Nagle + 遅延ACKによる40ms待ちを避ける
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                with stub._lock:
+                    stub.request_count += 1
+                status, headers, payload = stub.handle(
+                    method, parsed.path, parse_qs(parsed.query), dict(self.headers), body
+                )
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def log_message(self, format: str, *args) -> None:
+                # 計測結果に影響しないようアクセスログは出力しない
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """サーバーを停止"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, List[str]],
+        headers: Dict[str, str],
+        body: bytes
+    ) -> StubResponse:
+        """
+        リクエストを処理してレスポンスを返す（サブクラスで実装）
+
+        Returns:
+            (ステータスコード, ヘッダー, ボディ) のタプル
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _json(status: int, data: dict, headers: Optional[Dict[str, str]] = None) -> StubResponse:
+        merged = {"Content-Type": "application/json"}
+        merged.update(headers or {})
+        return status, merged, json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# arXiv API
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "learning model neural network transformer attention graph language "
+    "reinforcement policy diffusion generative benchmark dataset training "
+    "inference optimization gradient sparse robust adversarial federated "
+    "retrieval reasoning agent planning vision multimodal representation "
+    "contrastive embedding scaling efficient latency memory quantization"
+).split()
+
+_CATEGORIES = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.IR", "stat.ML"]
+
+
+@dataclass
+class SyntheticPaper:
+    """スタブが生成する論文データ"""
+
+    arxiv_id: str
+    title: str
+    abstract: str
+    authors: List[str]
+    categories: List[str]
+    published: datetime
+
+
+def generate_papers(count: int, seed: int = 0, now: Optional[datetime] = None) -> List[SyntheticPaper]:
+    """
+    決定的な合成論文データを生成
+
+    Args:
+        count: 生成する論文数
+        seed: 乱数シード
+        now: 最新論文の公開日時（Noneの場合は現在時刻）
+
+    Returns:
+        公開日時の降順に並んだ論文のリスト
+    """
+    now = now or datetime.now(timezone.utc).replace(microsecond=0)
+    papers = []
+    for index in range(count):
+        rng = random.Random(seed * 1_000_003 + index)
+        title_words = rng.sample(_WORDS, 6)
+        sentences = []
+        for _ in range(rng.randint(5, 9)):
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(12, 24))]
+            sentences.append(" ".join(words).capitalize() + ".")
+        papers.append(SyntheticPaper(
+            arxiv_id=f"2601.{index:05d}v1",
+            title=" ".join(title_words).title(),
+            abstract=" ".join(sentences),
+            authors=[f"Author{rng.randint(1, 5000)} Bench" for _ in range(rng.randint(2, 8))],
+            categories=rng.sample(_CATEGORIES, rng.randint(1, 3)),
+            published=now - timedelta(seconds=30 * index)
+        ))
+    return papers
+
+
+def render_atom_entry(paper: SyntheticPaper) -> str:
+    """論文1件をarXiv API形式のAtom entryに変換"""
+    timestamp = paper.published.strftime("%Y-%m-%dT%H:%M:%SZ")
+    authors = "".join(
+        f"<author><name>{escape(name)}</name></author>" for name in paper.authors
+    )
+    categories = "".join(
+        f'<category term="{category}" scheme="http://arxiv.org/schemas/atom"/>'
+        for category in paper.categories
+    )
+    return (
+        "<entry>"
+        f"<id>http://arxiv.org/abs/{paper.arxiv_id}</id>"
+        f"<updated>{timestamp}</updated>"
+        f"<published>{timestamp}</published>"
+        f"<title>{escape(paper.title)}</title>"
+        f"<summary>{escape(paper.abstract)}</summary>"
+        f"{authors}"
+        f'<link href="http://arxiv.org/abs/{paper.arxiv_id}" rel="alternate" type="text/html"/>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/{paper.arxiv_id}" rel="related" type="application/pdf"/>'
+        f'<arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="{paper.categories[0]}" scheme="http://arxiv.org/schemas/atom"/>'
+        f"{categories}"
+        "</entry>"
+    )
+
+
+def render_atom_feed(entries: Iterable[SyntheticPaper], total_results: int, start: int = 0) -> bytes:
+    """arXiv APIレスポンスと同形式のAtomフィードを生成"""
+    entries = list(entries)
+    body = "".join(render_atom_entry(paper) for paper in entries)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        '<id>http://arxiv.org/api/stub</id>'
+        '<title type="html">ArXiv Query: stub</title>'
+        f"<updated>{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}</updated>"
+        f"<opensearch:totalResults>{total_results}</opensearch:totalResults>"
+        f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+        f"<opensearch:itemsPerPage>{len(entries)}</opensearch:itemsPerPage>"
+        f"{body}"
+        "</feed>"
+    ).encode("utf-8")
+
+
+class ArxivApiStub(StubServer):
+    """arXiv API（/api/query）のスタブ"""
+
+    def __init__(self, paper_count: int, seed: int = 0, latency_ms: float = 0.0, **kwargs):
+        """
+        Args:
+            paper_count: 検索結果として返す論文の総数
+            seed: 合成データの乱数シード
+            latency_ms: 1リクエストあたりの応答遅延（ミリ秒）
+        """
+        super().__init__(**kwargs)
+        self.papers = generate_papers(paper_count, seed=seed)
+        self.latency_ms = latency_ms
+        self.stats = {"feeds": 0, "not_modified": 0}
+        self._updated = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    @property
+    def query_url_format(self) -> str:
+        """arxiv.Client.query_url_formatに設定するURLフォーマット"""
+        return f"{self.url}/api/query?{{}}"
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if path != "/api/query":
+            return 404, {}, b""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        start = int(query.get("start", ["0"])[0])
+        max_results = int(query.get("max_results", ["10"])[0])
+        # 論文データは起動後に変化しないため、ページ位置からETagを決める（条件付きリクエスト確認用）
+        etag = f'"{start}-{max_results}-{len(self.papers)}"'
+        validators = {"ETag": etag, "Last-Modified": self._updated}
+        if headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return 304, validators, b""
+        page = self.papers[start:start + max_results]
+        feed = render_atom_feed(page, total_results=len(self.papers), start=start)
+        with self._lock:
+            self.stats["feeds"] += 1
+        return 200, {"Content-Type": "application/atom+xml; charset=utf-8", **validators}, feed
+
+
+# ---------------------------------------------------------------------------
+# arXiv PDF
+# ---------------------------------------------------------------------------
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(pages: List[List[str]]) -> bytes:
+    """
+    テキスト行のリストからPDFを生成（Helvetica、1ページあたり最大60行程度）
+
+    Args:
+        pages: ページごとのテキスト行（ASCIIのみ）
+
+    Returns:
+        PDFのバイト列
+    """
+    objects: List[bytes] = []
+    page_count = len(pages)
+    # 1: Catalog, 2: Pages, 3: Font, 4以降: Page / Contentの組
+    kids = " ".join(f"{4 + 2 * index} 0 R" for index in range(page_count))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode("ascii"))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for index, lines in enumerate(pages):
+        content_id = 5 + 2 * index
+        objects.append((
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 760 Td {text} ET".encode("latin-1")
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("ascii")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode("ascii")
+    return bytes(output)
+
+
+_PAPER_SECTIONS = ("Introduction", "Related Work", "Method", "Experiments", "Results", "Conclusion")
+
+
+def synthetic_paper_pages(paper: SyntheticPaper, page_count: int = 8, lines_per_page: int = 55) -> List[List[str]]:
+    """
+    合成論文の本文（セクション見出し・本文・参考文献）をページごとの行に展開
+
+    Args:
+        paper: 合成論文
+        page_count: 本文のページ数（参考文献のページを除く）
+        lines_per_page: 1ページあたりの行数
+
+    Returns:
+        ページごとのテキスト行
+    """
+    rng = random.Random(paper.arxiv_id)
+    lines = [paper.title, ", ".join(paper.authors), "", "Abstract", paper.abstract[:90], ""]
+    body_lines = page_count * lines_per_page - len(lines)
+    per_section = max(4, body_lines // len(_PAPER_SECTIONS))
+    for number, section in enumerate(_PAPER_SECTIONS, 1):
+        lines += [f"{number} {section}", ""]
+        for line_index in range(per_section - 3):
+            words = [rng.choice(_WORDS) for _ in range(14)]
+            if section == "Results" and line_index % 6 == 0:
+                words += [f"accuracy {rng.uniform(60, 99):.1f}%."]
+            else:
+                words[-1] += "."
+            lines.append(" ".join(words).capitalize())
+            if line_index % 8 == 7:
+                lines.append("")
+        lines.append("")
+    lines += ["References", "[1] A. Author. A referenced paper. 2020."]
+    return [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+
+
+class PdfStub(StubServer):
+    """arXiv PDF（/pdf/<id>）のスタブ"""
+
+    def __init__(self, page_count: int = 8, latency_ms: float = 0.0, missing: Iterable[str] = (), **kwargs):
+        """
+        Args:
+            page_count: 生成するPDFの本文ページ数
+            latency_ms: 1リクエストあたりの応答遅延（ミリ秒）
+            missing: 404を返すarXiv ID
+        """
+        super().__init__(**kwargs)
+        self.page_count = page_count
+        self.latency_ms = latency_ms
+        self.missing = set(missing)
+        self.stats = {"downloads": 0}
+        self._pdfs: Dict[str, bytes] = {}
+
+    @property
+    def pdf_url_format(self) -> str:
+        """FullTextSummarizerのpdf_url_formatに設定するURLフォーマット"""
+        return f"{self.url}/pdf/{{id}}"
+
+    def pdf_for(self, arxiv_id: str) -> bytes:
+        """IDに対応するPDFを生成（同じIDには同じ内容を返す）"""
+        with self._lock:
+            if arxiv_id not in self._pdfs:
+                paper = generate_papers(1, seed=sum(map(ord, arxiv_id)))[0]
+                paper = replace(paper, arxiv_id=arxiv_id)
+                self._pdfs[arxiv_id] = render_pdf(synthetic_paper_pages(paper, self.page_count))
+            return self._pdfs[arxiv_id]
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if method != "GET" or not path.startswith("/pdf/"):
+            return 404, {}, b""
+        arxiv_id = path[len("/pdf/"):]
+        if arxiv_id in self.missing:
+            return 404, {}, b""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        pdf = self.pdf_for(arxiv_id)
+        with self._lock:
+            self.stats["downloads"] += 1
+        return 200, {"Content-Type": "application/pdf"}, pdf
+
+
+# ---------------------------------------------------------------------------
+# arXiv OAI-PMH
+# ---------------------------------------------------------------------------
+
+def render_oai_record(paper: SyntheticPaper, metadata_prefix: str = "arXiv") -> str:
+    """論文1件をarXiv OAI-PMHのrecord要素（arXiv / arXivRaw形式）に変換"""
+    arxiv_id = paper.arxiv_id.split("v")[0]
+    header = (
+        "<header>"
+        f"<identifier>oai:arXiv.org:{arxiv_id}</identifier>"
+        f"<datestamp>{paper.published:%Y-%m-%d}</datestamp>"
+        f"<setSpec>{paper.categories[0].split('.')[0]}</setSpec>"
+        "</header>"
+    )
+    categories = " ".join(paper.categories)
+    if metadata_prefix == "arXivRaw":
+        metadata = (
+            '<arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">'
+            f"<id>{arxiv_id}</id>"
+            '<version version="v1">'
+            f"<date>{paper.published:%a, %d %b %Y %H:%M:%S} GMT</date>"
+            "</version>"
+            f"<title>{escape(paper.title)}</title>"
+            f"<authors>{escape(', '.join(paper.authors))}</authors>"
+            f"<categories>{categories}</categories>"
+            f"<abstract>{escape(paper.abstract)}</abstract>"
+            "</arXivRaw>"
+        )
+    else:
+        authors = "".join(
+            f"<author><keyname>{escape(name.split()[-1])}</keyname>"
+            f"<forenames>{escape(' '.join(name.split()[:-1]))}</forenames></author>"
+            for name in paper.authors
+        )
+        metadata = (
+            '<arXiv xmlns="http://arxiv.org/OAI/arXiv/">'
+            f"<id>{arxiv_id}</id>"
+            f"<created>{paper.published:%Y-%m-%d}</created>"
+            f"<authors>{authors}</authors>"
+            f"<title>{escape(paper.title)}</title>"
+            f"<categories>{categories}</categories>"
+            f"<abstract>{escape(paper.abstract)}</abstract>"
+            "</arXiv>"
+        )
+    return f"<record>{header}<metadata>{metadata}</metadata></record>"
+
+
+class OaiPmhStub(StubServer):
+    """arXiv OAI-PMH（ListRecords）のスタブ
+
+    レスポンスはページ単位で生成し、resumptionTokenで続きを返す
+    """
+
+    def __init__(
+        self,
+        paper_count: int,
+        seed: int = 0,
+        page_size: int = 1000,
+        retry_after_first: int = 0,
+        **kwargs
+    ):
+        """
+        Args:
+            paper_count: ハーベスト対象の論文の総数
+            seed: 合成データの乱数シード
+            page_size: 1レスポンスあたりのレコード数
+            retry_after_first: 最初のN回のリクエストに503 + Retry-Afterを返す（フロー制御の確認用）
+        """
+        super().__init__(**kwargs)
+        self.paper_count = paper_count
+        self.seed = seed
+        self.page_size = page_size
+        self.retry_after_first = retry_after_first
+        self.stats = {"pages": 0, "records": 0, "retry_after": 0}
+        self.requests: List[Dict[str, str]] = []
+        # 大量レコードでもメモリを使いすぎないよう、論文データはページごとに生成する
+        self._now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    @property
+    def base_url(self) -> str:
+        """OaiPmhCollectorのbase_urlに設定するURL"""
+        return f"{self.url}/oai"
+
+    def _page(self, offset: int) -> List[SyntheticPaper]:
+        count = min(self.page_size, self.paper_count - offset)
+        return [
+            replace(paper, arxiv_id=f"2601.{offset + index:05d}v1",
+                    published=self._now - timedelta(seconds=30 * (offset + index)))
+            for index, paper in enumerate(generate_papers(count, seed=self.seed * 7919 + offset, now=self._now))
+        ]
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if path != "/oai":
+            return 404, {}, b""
+        params = {key: values[0] for key, values in query.items()}
+        with self._lock:
+            self.requests.append(params)
+            if self.retry_after_first > 0:
+                self.retry_after_first -= 1
+                self.stats["retry_after"] += 1
+                return 503, {"Retry-After": "0"}, b""
+
+        if "resumptionToken" in params:
+            prefix, set_spec, offset = params["resumptionToken"].split("|")
+            offset = int(offset)
+        else:
+            prefix, set_spec, offset = params.get("metadataPrefix", "arXiv"), params.get("set", ""), 0
+
+        response_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        head = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+            f"<responseDate>{response_date}</responseDate>"
+            '<request verb="ListRecords">stub</request>'
+        )
+        if offset >= self.paper_count:
+            return 200, {"Content-Type": "text/xml"}, (
+                head + '<error code="noRecordsMatch">No records</error></OAI-PMH>'
+            ).encode("utf-8")
+
+        page = self._page(offset)
+        next_offset = offset + len(page)
+        token = f"{prefix}|{set_spec}|{next_offset}" if next_offset < self.paper_count else ""
+        records = "".join(render_oai_record(paper, prefix) for paper in page)
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["records"] += len(page)
+        return 200, {"Content-Type": "text/xml"}, (
+            head
+            + f"<ListRecords>{records}"
+            + f'<resumptionToken cursor="{offset}" completeListSize="{self.paper_count}">{token}</resumptionToken>'
+            + "</ListRecords></OAI-PMH>"
+        ).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# arXiv新着フィード（rss.arxiv.org）
+# ---------------------------------------------------------------------------
+
+def render_rss_item(paper: SyntheticPaper, announce_type: str, announced: datetime) -> str:
+    """論文1件をarXiv新着フィード（RSS 2.0）のitem要素に変換"""
+    arxiv_id = paper.arxiv_id.split("v")[0]
+    categories = "".join(f"<category>{category}</category>" for category in paper.categories)
+    description = f"arXiv:{paper.arxiv_id} Announce Type: {announce_type} \nAbstract: {paper.abstract}"
+    return (
+        "<item>"
+        f"<title>{escape(paper.title)}</title>"
+        f"<link>https://arxiv.org/abs/{arxiv_id}</link>"
+        f"<description>{escape(description)}</description>"
+        f'<guid isPermaLink="false">oai:arXiv.org:{paper.arxiv_id}</guid>'
+        f"{categories}"
+        f"<pubDate>{announced:%a, %d %b %Y %H:%M:%S} +0000</pubDate>"
+        f"<arxiv:announce_type>{announce_type}</arxiv:announce_type>"
+        "<dc:rights>http://creativecommons.org/licenses/by/4.0/</dc:rights>"
+        f"<dc:creator>{escape(', '.join(paper.authors))}</dc:creator>"
+        "</item>"
+    )
+
+
+class ArxivRssStub(StubServer):
+    """arXivのカテゴリごとの新着フィード（/rss/{category}）のスタブ
+
+    各論文は先頭のカテゴリのフィードに"new"として、他のカテゴリのフィードに"cross"として現れる
+    """
+
+    def __init__(
+        self,
+        paper_count: int,
+        seed: int = 0,
+        latency_ms: float = 0.0,
+        replacements: int = 0,
+        **kwargs
+    ):
+        """
+        Args:
+            paper_count: 当日アナウンスされた論文の総数
+            seed: 合成データの乱数シード
+            latency_ms: 1リクエストあたりの応答遅延（ミリ秒）
+            replacements: 末尾のN件を改訂（"replace" / "replace-cross"）としてアナウンスする
+        """
+        super().__init__(**kwargs)
+        self.papers = generate_papers(paper_count, seed=seed)
+        self.latency_ms = latency_ms
+        self.replacements = replacements
+        self.stats = {"feeds": 0, "items": 0}
+        self.requests: List[str] = []
+        self._announced = datetime.now(timezone.utc).replace(microsecond=0)
+
+    @property
+    def feed_url_format(self) -> str:
+        """ArxivRssCollectorのfeed_url_formatに設定するURLフォーマット"""
+        return f"{self.url}/rss/{{category}}"
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if not path.startswith("/rss/"):
+            return 404, {}, b""
+        category = path[len("/rss/"):]
+        if category not in _CATEGORIES:
+            return 404, {}, b""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        replaced_from = len(self.papers) - self.replacements
+        items = []
+        for index, paper in enumerate(self.papers):
+            if category not in paper.categories:
+                continue
+            announce_type = "new" if paper.categories[0] == category else "cross"
+            if index >= replaced_from:
+                announce_type = "replace" if announce_type == "new" else "replace-cross"
+            items.append(render_rss_item(paper, announce_type, self._announced))
+        with self._lock:
+            self.requests.append(category)
+            self.stats["feeds"] += 1
+            self.stats["items"] += len(items)
+        feed = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss xmlns:arxiv="http://arxiv.org/schemas/atom" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+            'xmlns:atom="http://www.w3.org/2005/Atom" version="2.0">'
+            "<channel>"
+            f"<title>{category} updates on arXiv.org</title>"
+            f"<link>http://rss.arxiv.org/rss/{category}</link>"
+            f"<description>{category} updates on the arXiv.org e-print archive.</description>"
+            f"<pubDate>{self._announced:%a, %d %b %Y %H:%M:%S} +0000</pubDate>"
+            f"{''.join(items)}"
+            "</channel></rss>"
+        ).encode("utf-8")
+        return 200, {"Content-Type": "application/rss+xml; charset=utf-8"}, feed
+
+
+# ---------------------------------------------------------------------------
+# Semantic Scholar Graph API
+# ---------------------------------------------------------------------------
+
+def render_scholar_paper(paper: SyntheticPaper) -> dict:
+    """論文1件をSemantic Scholar Graph APIのpaperオブジェクト形式に変換"""
+    arxiv_id = paper.arxiv_id.split("v")[0]
+    paper_id = hashlib.sha1(arxiv_id.encode("ascii")).hexdigest()
+    return {
+        "paperId": paper_id,
+        "externalIds": {"ArXiv": arxiv_id},
+        "url": f"https://www.semanticscholar.org/paper/{paper_id}",
+        "title": paper.title,
+        "abstract": paper.abstract,
+        "authors": [{"authorId": str(i), "name": name} for i, name in enumerate(paper.authors)],
+        "publicationDate": paper.published.strftime("%Y-%m-%d"),
+        "year": paper.published.year,
+        "venue": "arXiv.org",
+        "fieldsOfStudy": ["Computer Science"],
+        "s2FieldsOfStudy": [{"category": "Computer Science", "source": "external"}],
+    }
+
+
+class SemanticScholarStub(StubServer):
+    """Semantic Scholar Graph API（/paper/search/bulk, /paper/batch）のスタブ"""
+
+    BATCH_LIMIT = 500
+
+    def __init__(
+        self,
+        paper_count: int,
+        seed: int = 0,
+        page_size: int = 1000,
+        rate_limit_first: int = 0,
+        **kwargs
+    ):
+        """
+        Args:
+            paper_count: 検索結果として返す論文の総数
+            seed: 合成データの乱数シード
+            page_size: bulk searchの1ページあたりの件数（実APIは最大1000件）
+            rate_limit_first: 最初のN回のリクエストに429を返す（リトライ確認用）
+        """
+        super().__init__(**kwargs)
+        self.papers = [render_scholar_paper(paper) for paper in generate_papers(paper_count, seed=seed)]
+        self.page_size = page_size
+        self.rate_limit_first = rate_limit_first
+        self.api_keys: List[Optional[str]] = []
+        self.stats = {"search": 0, "batch": 0, "rate_limited": 0}
+        self._index: Dict[str, dict] = {}
+        for paper in self.papers:
+            self._index[paper["paperId"]] = paper
+            self._index[f"ARXIV:{paper['externalIds']['ArXiv']}"] = paper
+
+    @property
+    def api_url(self) -> str:
+        """SemanticScholarCollectorのapi_urlに設定するベースURL"""
+        return f"{self.url}/graph/v1"
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        with self._lock:
+            self.api_keys.append(headers.get("x-api-key") or headers.get("X-Api-Key"))
+            if self.rate_limit_first > 0:
+                self.rate_limit_first -= 1
+                self.stats["rate_limited"] += 1
+                return self._json(429, {"message": "Too Many Requests"}, {"Retry-After": "0"})
+
+        if method == "GET" and path == "/graph/v1/paper/search/bulk":
+            with self._lock:
+                self.stats["search"] += 1
+            start = int(query.get("token", ["0"])[0])
+            page = self.papers[start:start + self.page_size]
+            next_start = start + len(page)
+            data = {"total": len(self.papers), "data": page}
+            if next_start < len(self.papers):
+                data["token"] = str(next_start)
+            return self._json(200, data)
+
+        if method == "POST" and path == "/graph/v1/paper/batch":
+            ids = json.loads(body or b"{}").get("ids", [])
+            if len(ids) > self.BATCH_LIMIT:
+                return self._json(400, {"error": f"Cannot process more than {self.BATCH_LIMIT} ids"})
+            with self._lock:
+                self.stats["batch"] += 1
+            return self._json(200, [self._index.get(paper_id) for paper_id in ids])
+
+        return 404, {}, b""
+
+
+# ---------------------------------------------------------------------------
+# OpenAI互換 Chat Completions API
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CompletionProfile:
+    """Chat Completionsスタブの応答プロファイル"""
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 0.0
+    completion_chars: int = 200
+    seed: int = 0
+
+
+def _messages_text(messages: List[dict]) -> str:
+    """chat completionのメッセージ（パート形式を含む）の本文を連結"""
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for message in messages
+        for part in (
+            message.get("content")
+            if isinstance(message.get("content"), list)
+            else [message.get("content") or ""]
+        )
+    )
+
+
+class ChatCompletionStub(StubServer):
+    """OpenAI互換 /chat/completions・/models エンドポイントのスタブ"""
+
+    # GET /models が返すモデルのID
+    served_models = ("stub-model",)
+
+    def __init__(
+        self,
+        profile: Optional[CompletionProfile] = None,
+        keep_prompts: bool = False,
+        responder: Optional[Callable[[str, str], str]] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            profile: 遅延・エラー率・429発生率などの応答プロファイル
+            keep_prompts: 受信したプロンプトを保持するか（テスト用）
+            responder: (モデル名, プロンプト) から応答本文を返す関数（Noneの場合は固定の要約文）
+        """
+        super().__init__(**kwargs)
+        self.profile = profile or CompletionProfile()
+        self.keep_prompts = keep_prompts
+        self.responder = responder
+        self.prompts: List[str] = []
+        self.models: Dict[str, int] = {}
+        self._rng = random.Random(self.profile.seed)
+        self._prefixes: Set[str] = set()
+        self.stats = {"completions": 0, "errors": 0, "rate_limited": 0, "prompt_tokens": 0, "cached_tokens": 0}
+
+    @property
+    def base_url(self) -> str:
+        """OpenAIクライアントに渡すbase_url"""
+        return f"{self.url}/v1"
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if method == "GET" and path.endswith("/models"):
+            return self._json(200, {"object": "list", "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "stub"}
+                for model in self.served_models
+            ]})
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return 404, {}, b""
+        request = json.loads(body or b"{}")
+        with self._lock:
+            roll = self._rng.random()
+            jitter = self._rng.uniform(-self.profile.jitter_ms, self.profile.jitter_ms)
+        delay = max(0.0, self.profile.latency_ms + jitter) / 1000
+        if roll < self.profile.rate_limit_rate:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            return self._json(
+                429,
+                {"error": {"message": "Rate limit exceeded (stub)", "code": 429}},
+                {"Retry-After": str(self.profile.retry_after_seconds)}
+            )
+        time.sleep(delay)
+        if roll < self.profile.rate_limit_rate + self.profile.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            return self._json(500, {"error": {"message": "Internal error (stub)", "code": 500}})
+
+        messages = request.get("messages", [])
+        prompt_text = _messages_text(messages)
+        prompt_tokens = max(1, len(prompt_text) // 4)
+        # プロバイダーのプレフィックスキャッシュを模擬（最後のメッセージより前が以前と同じならキャッシュ済み）
+        prefix = json.dumps(messages[:-1], ensure_ascii=False, sort_keys=True)
+        prefix_text = _messages_text(messages[:-1])
+        model = request.get("model", "stub-model")
+        if self.responder is not None:
+            content = self.responder(model, prompt_text)
+        else:
+            content = ("この論文はベンチマーク用のスタブ要約です。" * 20)[:self.profile.completion_chars]
+        completion_tokens = max(1, len(content) // 2)
+        with self._lock:
+            cached_tokens = len(prefix_text) // 4 if messages[:-1] and prefix in self._prefixes else 0
+            self._prefixes.add(prefix)
+            self.stats["completions"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["cached_tokens"] += cached_tokens
+            self.models[model] = self.models.get(model, 0) + 1
+            if self.keep_prompts:
+                self.prompts.append(prompt_text)
+        return self._json(200, {
+            "id": f"chatcmpl-stub-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        })
+
+
+# ---------------------------------------------------------------------------
+# Discord Webhook
+# ---------------------------------------------------------------------------
+
+class DiscordWebhookStub(StubServer):
+    """レート制限を再現するDiscord Webhookのスタブ"""
+
+    def __init__(
+        self,
+        rate_limit: int = 5,
+        window_seconds: float = 2.0,
+        keep_payloads: bool = False,
+        **kwargs
+    ):
+        """
+        Args:
+            rate_limit: ウィンドウ内に許可するWebhookあたりのリクエスト数
+            window_seconds: レート制限のウィンドウ幅（秒）
+            keep_payloads: 受信したペイロードを保持するか（テスト用）
+        """
+        super().__init__(**kwargs)
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self.keep_payloads = keep_payloads
+        self.payloads: List[bytes] = []
+        self.stats = {"messages": 0, "rate_limited": 0}
+        self._buckets: Dict[str, deque] = {}
+
+    def webhook_url(self, name: str = "bench") -> str:
+        """スタブ上のWebhook URLを返す"""
+        return f"{self.url}/api/webhooks/0/{name}"
+
+    def handle(self, method, path, query, headers, body) -> StubResponse:
+        if method != "POST" or not path.startswith("/api/webhooks/"):
+            return 404, {}, b""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(path, deque())
+            while bucket and now - bucket[0] >= self.window_seconds:
+                bucket.popleft()
+            if len(bucket) >= self.rate_limit:
+                retry_after = self.window_seconds - (now - bucket[0])
+                self.stats["rate_limited"] += 1
+                return self._json(
+                    429,
+                    {"message": "You are being rate limited.", "retry_after": retry_after, "global": False},
+                    {
+                        "Via": "1.1 stub",
+                        "Retry-After": f"{retry_after:.3f}",
+                        "X-RateLimit-Limit": str(self.rate_limit),
+                        "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset-After": f"{retry_after:.3f}",
+                    }
+                )
+            bucket.append(now)
+            remaining = self.rate_limit - len(bucket)
+            reset_after = self.window_seconds - (now - bucket[0])
+            self.stats["messages"] += 1
+            message_id = str(self.stats["messages"])
+            if self.keep_payloads:
+                self.payloads.append(body)
+        return self._json(
+            200,
+            {"id": message_id, "attachments": []},
+            {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            }
+        )
@@ -0,0 +1,9 @@
+"""論文分析モジュール
+
+トピッククラスタリング（clustering）はnumpy / scipyに依存するため、
+``src.analyzers.clustering`` から直接インポートする
+"""
+
+from .watchlist import AuthorWatchlist, normalize_name, split_authors
+
+__all__ = ["AuthorWatchlist", "normalize_name", "split_authors"]
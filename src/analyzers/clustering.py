@@ -0,0 +1,254 @@
+"""論文のトピッククラスタリング（CPUのみ）
+
+タイトルとアブストラクトをTF-IDFの疎行列（SciPy CSR）に変換し、
+球面ミニバッチk-means（NumPy）でクラスタリングする。各クラスタのラベルは
+重心の上位語から作成し、重心に最も近い論文を代表論文とする
+
+このモジュールはnumpy / scipyに依存するため、クラスタリングが有効な場合にのみインポートする
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ..models import PaperResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPIC = "その他"
+
+_TOKEN = re.compile(r"[a-z][a-z0-9-]*[a-z0-9]")
+
+# 英語の一般的な機能語と、論文のアブストラクトに頻出するが話題を表さない語
+STOPWORDS = frozenset("""
+a about above across after again against all almost also although among an and any are as at be
+because been before being below between both but by can could did do does doing done during each
+either et etc few for from further had has have having here how however if in into is it its itself
+just may might more most much must no nor not now of off on once only or other our ours out over own
+per rather same several should since so some such than that the their them then there these they this
+those through thus to too under until up upon us very via was we were what when where whether which
+while who whom why will with within without would yet you your
+abstract approach approaches based demonstrate demonstrates existing experiments experimental
+furthermore method methods novel paper propose proposed proposes provide results show shows shown
+significant significantly state-of-the-art study task tasks two use used using well work
+""".split())
+
+
+@dataclass
+class TopicCluster:
+    """トピッククラスタ"""
+    
+    label: str
+    terms: List[str]
+    papers: List[PaperResult] = field(default_factory=list)
+    representative: Optional[PaperResult] = None
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    テキストを小文字の語に分割（ストップワード・2文字以下の語を除く）
+    
+    Args:
+        text: テキスト
+    
+    Returns:
+        語のリスト
+    """
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 2 and token not in STOPWORDS]
+
+
+def build_tfidf(
+    documents: Sequence[str],
+    min_df: int = 2,
+    max_df: float = 0.5,
+    max_features: int = 20000
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    文書集合をTF-IDF行列に変換（対数TF、平滑化IDF、行ごとにL2正規化）
+    
+    Args:
+        documents: 文書のリスト
+        min_df: 語を残す最小文書頻度
+        max_df: 語を残す最大文書頻度（文書数に対する割合）
+        max_features: 語彙数の上限（文書頻度の高い順）
+    
+    Returns:
+        (文書数 × 語彙数のCSR行列, 語彙の配列)
+    """
+    vocabulary = {}
+    indices: List[int] = []
+    indptr = [0]
+    for document in documents:
+        indices.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(document))
+        indptr.append(len(indices))
+    
+    n_documents = len(documents)
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(n_documents, len(vocabulary))
+    )
+    counts.sum_duplicates()
+    terms = np.empty(len(vocabulary), dtype=object)
+    for term, index in vocabulary.items():
+        terms[index] = term
+    
+    df = np.bincount(counts.indices, minlength=len(vocabulary))
+    keep = np.flatnonzero((df >= min_df) & (df <= max(1.0, max_df * n_documents)))
+    if len(keep) > max_features:
+        keep = keep[np.argsort(-df[keep], kind="stable")[:max_features]]
+        keep.sort()
+    matrix = counts[:, keep].tocsr()
+    terms = terms[keep]
+    
+    matrix.data = 1.0 + np.log(matrix.data)
+    idf = np.log((1.0 + n_documents) / (1.0 + df[keep])) + 1.0
+    matrix = matrix @ sparse.diags(idf.astype(np.float32))
+    return _normalize_rows(matrix.tocsr()), terms
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _init_centers(matrix: sparse.csr_matrix, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++で初期重心を選択（コサイン距離）"""
+    n_documents = matrix.shape[0]
+    chosen = [int(rng.integers(n_documents))]
+    distance = 1.0 - matrix @ matrix[chosen[0]].toarray().ravel()
+    for _ in range(1, k):
+        weights = np.clip(distance, 0.0, None)
+        total = weights.sum()
+        index = int(rng.choice(n_documents, p=weights / total)) if total > 0 else int(rng.integers(n_documents))
+        chosen.append(index)
+        distance = np.minimum(distance, 1.0 - matrix @ matrix[index].toarray().ravel())
+    return matrix[chosen].toarray()
+
+
+def minibatch_kmeans(
+    matrix: sparse.csr_matrix,
+    k: int,
+    batch_size: int = 256,
+    epochs: int = 3,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    球面ミニバッチk-means（行がL2正規化済みの行列をコサイン類似度でクラスタリング）
+    
+    Args:
+        matrix: 文書 × 語彙の行列（行ごとにL2正規化済み）
+        k: クラスタ数
+        batch_size: ミニバッチの文書数
+        epochs: 全文書を何周分ミニバッチで更新するか
+        seed: 乱数シード
+    
+    Returns:
+        (各文書のクラスタ番号, k × 語彙数の重心)
+    """
+    rng = np.random.default_rng(seed)
+    n_documents = matrix.shape[0]
+    centers = _init_centers(matrix, k, rng)
+    seen = np.zeros(k)
+    batch_size = min(batch_size, n_documents)
+    for _ in range(max(1, math.ceil(epochs * n_documents / batch_size))):
+        batch = matrix[rng.choice(n_documents, batch_size, replace=False)]
+        labels = np.asarray((batch @ centers.T).argmax(axis=1)).ravel()
+        membership = sparse.csr_matrix(
+            (np.ones(batch_size), (labels, np.arange(batch_size))), shape=(k, batch_size)
+        )
+        sums = np.asarray((membership @ batch).todense())
+        batch_counts = np.bincount(labels, minlength=k)
+        seen += batch_counts
+        updated = batch_counts > 0
+        # 各重心を割り当てられた文書の累積平均に近づける（学習率 = 1 / 累積割り当て数）
+        centers[updated] += (sums[updated] - batch_counts[updated, None] * centers[updated]) / seen[updated, None]
+        norms = np.linalg.norm(centers, axis=1)
+        norms[norms == 0] = 1.0
+        centers /= norms[:, None]
+    labels = np.asarray((matrix @ centers.T).argmax(axis=1)).ravel()
+    return labels, centers
+
+
+def default_cluster_count(n_papers: int, max_clusters: int = 20) -> int:
+    """論文数に応じたクラスタ数（√(n/2)、1以上max_clusters以下）"""
+    return max(1, min(max_clusters, round(math.sqrt(n_papers / 2))))
+
+
+def cluster_papers(
+    papers: List[PaperResult],
+    n_clusters: int = 0,
+    max_clusters: int = 20,
+    label_terms: int = 3,
+    seed: int = 0
+) -> List[TopicCluster]:
+    """
+    論文をトピックごとにクラスタリングし、各論文のtopicにラベルを格納
+    
+    Args:
+        papers: 論文のリスト
+        n_clusters: クラスタ数（0の場合は論文数から自動決定）
+        max_clusters: 自動決定する場合のクラスタ数の上限
+        label_terms: ラベルに使用する上位語の数
+        seed: 乱数シード
+    
+    Returns:
+        クラスタのリスト（論文数の多い順、各クラスタ内は代表論文が先頭）
+    """
+    if not papers:
+        return []
+    # タイトルは2回含めて重みを上げる
+    documents = [f"{paper.title} {paper.title} {paper.abstract}" for paper in papers]
+    matrix, terms = build_tfidf(documents, min_df=2 if len(papers) >= 20 else 1)
+    k = min(n_clusters or default_cluster_count(len(papers), max_clusters), len(papers))
+    if matrix.shape[1] == 0 or k <= 1:
+        return [_single_cluster(papers, matrix, terms, label_terms)]
+    
+    labels, centers = minibatch_kmeans(matrix, k, seed=seed)
+    similarity = np.asarray(matrix.multiply(centers[labels]).sum(axis=1)).ravel()
+    
+    clusters = []
+    for index in np.unique(labels):
+        members = np.flatnonzero(labels == index)
+        members = members[np.argsort(-similarity[members], kind="stable")]
+        top_terms = [str(term) for term in terms[np.argsort(-centers[index])[:label_terms]]]
+        cluster_members = [papers[member] for member in members]
+        clusters.append(TopicCluster(
+            label=" / ".join(top_terms) or DEFAULT_TOPIC,
+            terms=top_terms,
+            papers=cluster_members,
+            representative=cluster_members[0]
+        ))
+    clusters.sort(key=lambda cluster: -len(cluster.papers))
+    _assign_topics(clusters)
+    return clusters
+
+
+def _single_cluster(papers: List[PaperResult], matrix: sparse.csr_matrix, terms: np.ndarray, label_terms: int) -> TopicCluster:
+    """全論文を1クラスタにまとめる（論文数・語彙が少ない場合）"""
+    if matrix.shape[1]:
+        centroid = np.asarray(matrix.mean(axis=0)).ravel()
+        top_terms = [str(term) for term in terms[np.argsort(-centroid)[:label_terms]]]
+        order = np.argsort(-(matrix @ centroid), kind="stable")
+        members = [papers[index] for index in order]
+    else:
+        top_terms, members = [], list(papers)
+    cluster = TopicCluster(
+        label=" / ".join(top_terms) or DEFAULT_TOPIC,
+        terms=top_terms,
+        papers=members,
+        representative=members[0]
+    )
+    _assign_topics([cluster])
+    return cluster
+
+
+def _assign_topics(clusters: List[TopicCluster]) -> None:
+    for cluster in clusters:
+        for paper in cluster.papers:
+            paper.topic = cluster.label
@@ -0,0 +1,286 @@
+"""著者ウォッチリスト
+
+ウォッチ中の著者名を正規化（大文字小文字・ダイアクリティカルマーク・イニシャル）した
+キーでハッシュマップに索引し、論文の著者ごとに定数時間で照合する。
+照合コストは論文の著者数にのみ比例し、ウォッチ中の著者数には依存しない。
+ウォッチリストと索引・照合履歴はJSONファイルに保存し、実行をまたいで再利用する
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .. import clock
+from ..models import PaperResult
+
+logger = logging.getLogger(__name__)
+
+# 保存形式のバージョン（索引のキーの作り方を変えた場合に更新）
+INDEX_VERSION = 1
+
+_AUTHOR_SEPARATOR = re.compile(r"\s*(?:,|;|\band\b|&)\s*")
+_NON_NAME = re.compile(r"[^\w\s]|_|\d")
+_ET_AL = re.compile(r"^et\.?\s*al\.?$", re.IGNORECASE)
+
+
+def normalize_name(name: str) -> List[str]:
+    """
+    著者名を正規化した語のリストに変換
+    
+    ダイアクリティカルマークを除去し（"Müller" → "muller"）、大文字小文字を区別せず、
+    ピリオド・ハイフンなどの記号を区切りとして扱う（"J.-P. Dupont" → ["j", "p", "dupont"]）
+    
+    Args:
+        name: 著者名
+    
+    Returns:
+        正規化した語のリスト
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_NAME.sub(" ", stripped.casefold()).split()
+
+
+@dataclass(frozen=True)
+class NameKeys:
+    """照合用のキー"""
+    
+    full: str
+    first_last: str
+    initial: str
+    abbreviated: bool
+
+
+def name_keys(name: str) -> Optional[NameKeys]:
+    """
+    著者名から照合用のキーを作成
+    
+    Args:
+        name: 著者名
+    
+    Returns:
+        キー（姓と名の両方がない場合はNone）
+        - full: 全ての語（"john ronald smith"）
+        - first_last: 名の先頭と姓（"john smith"）
+        - initial: 名のイニシャルと姓（"j smith"）
+        - abbreviated: 名がイニシャルのみで書かれているか
+    """
+    tokens = normalize_name(name)
+    if len(tokens) < 2:
+        return None
+    given, last = tokens[:-1], tokens[-1]
+    return NameKeys(
+        full=" ".join(tokens),
+        first_last=f"{given[0]} {last}",
+        initial=f"{given[0][0]} {last}",
+        abbreviated=all(len(token) == 1 for token in given)
+    )
+
+
+def split_authors(authors: str) -> List[str]:
+    """
+    カンマ区切りの著者文字列を著者名のリストに分割
+    
+    Args:
+        authors: PaperResult.authors
+    
+    Returns:
+        著者名のリスト（"et al." などは除く）
+    """
+    names = (name.strip() for name in _AUTHOR_SEPARATOR.split(authors or ""))
+    return [name for name in names if name and not _ET_AL.match(name)]
+
+
+class AuthorWatchlist:
+    """ウォッチ中の著者の索引"""
+    
+    def __init__(self, authors: Iterable[str] = (), path: Optional[str] = None):
+        """
+        Args:
+            authors: ウォッチする著者名
+            path: 保存先のJSONファイル（Noneの場合は保存しない）
+        """
+        self.path = Path(path) if path else None
+        self.authors: List[str] = []
+        self.matches: Dict[str, dict] = {}
+        # 正規化キー → ウォッチ中の著者名
+        self._exact: Dict[str, List[str]] = {}
+        # イニシャルキー → 全てのウォッチ中の著者名 / イニシャルで登録された著者名
+        self._initials: Dict[str, List[str]] = {}
+        self._abbreviated: Dict[str, List[str]] = {}
+        for author in authors:
+            self.add(author)
+    
+    def __len__(self) -> int:
+        return len(self.authors)
+    
+    @classmethod
+    def load(cls, path: str, authors: Optional[Iterable[str]] = None) -> "AuthorWatchlist":
+        """
+        保存したウォッチリストを読み込む
+        
+        Args:
+            path: JSONファイルのパス（存在しない場合は空のウォッチリスト）
+            authors: ウォッチする著者名（指定した場合は保存済みの著者リストより優先し、
+                照合履歴のみ引き継ぐ。Noneの場合は保存済みの著者リストを使用）
+        
+        Returns:
+            ウォッチリスト
+        """
+        watchlist = cls(path=path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load author watchlist {path}: {e}")
+            data = {}
+        
+        stored = list(data.get("authors", []))
+        wanted = stored if authors is None else [" ".join(author.split()) for author in authors]
+        index = data.get("index") or {}
+        if data.get("version") == INDEX_VERSION and index and wanted == stored:
+            # 著者リストが変わっていなければ保存済みの索引をそのまま使用（正規化のやり直しを省く）
+            watchlist.authors = stored
+            watchlist._exact = index.get("exact", {})
+            watchlist._initials = index.get("initials", {})
+            watchlist._abbreviated = index.get("abbreviated", {})
+        else:
+            for author in wanted:
+                watchlist.add(author)
+        watchlist.matches = data.get("matches", {})
+        return watchlist
+    
+    def add(self, author: str) -> bool:
+        """
+        著者をウォッチリストに追加
+        
+        Args:
+            author: 著者名
+        
+        Returns:
+            追加した場合True（登録済み・姓名として解釈できない場合はFalse）
+        """
+        author = " ".join(author.split())
+        keys = name_keys(author)
+        if keys is None:
+            logger.warning(f"Ignoring watchlist entry without given and family name: {author!r}")
+            return False
+        if author in self._exact.get(keys.full, []):
+            return False
+        self.authors.append(author)
+        if keys.abbreviated:
+            self._abbreviated.setdefault(keys.initial, []).append(author)
+            exact_keys = {keys.full}
+        else:
+            exact_keys = {keys.full, keys.first_last}
+        for key in exact_keys:
+            self._exact.setdefault(key, []).append(author)
+        self._initials.setdefault(keys.initial, []).append(author)
+        return True
+    
+    def remove(self, author: str) -> bool:
+        """
+        著者をウォッチリストから削除
+        
+        Args:
+            author: 追加時と同じ著者名
+        
+        Returns:
+            削除した場合True
+        """
+        author = " ".join(author.split())
+        if author not in self.authors:
+            return False
+        self.authors.remove(author)
+        for index in (self._exact, self._initials, self._abbreviated):
+            for key in [key for key, names in index.items() if author in names]:
+                index[key].remove(author)
+                if not index[key]:
+                    del index[key]
+        return True
+    
+    def match_author(self, name: str) -> List[str]:
+        """
+        1人の著者名に一致するウォッチ中の著者を検索
+        
+        完全な名前同士は名と姓（ミドルネームは任意）で照合し、どちらかがイニシャル表記の場合は
+        イニシャルと姓で照合する（"J. Smith" は "John Smith" に一致し、"Jane Smith" にも一致する）
+        
+        Args:
+            name: 論文の著者名
+        
+        Returns:
+            一致したウォッチ中の著者名
+        """
+        keys = name_keys(name)
+        if keys is None:
+            return []
+        if keys.abbreviated:
+            return list(self._initials.get(keys.initial, []))
+        found = self._exact.get(keys.full) or self._exact.get(keys.first_last) or []
+        return list(dict.fromkeys(found + self._abbreviated.get(keys.initial, [])))
+    
+    def match(self, paper: PaperResult) -> List[str]:
+        """
+        論文の著者に一致するウォッチ中の著者を検索
+        
+        Args:
+            paper: 論文
+        
+        Returns:
+            一致したウォッチ中の著者名（重複なし）
+        """
+        matched: Dict[str, None] = {}
+        for name in split_authors(paper.authors):
+            matched.update(dict.fromkeys(self.match_author(name)))
+        return list(matched)
+    
+    def annotate(self, papers: Iterable[PaperResult]) -> List[PaperResult]:
+        """
+        論文のwatched_authorsに一致したウォッチ中の著者を格納し、照合履歴を更新
+        
+        Args:
+            papers: 論文
+        
+        Returns:
+            ウォッチ中の著者を含む論文
+        """
+        flagged = []
+        now = clock.now().isoformat(timespec="seconds")
+        for paper in papers:
+            matched = self.match(paper) if self.authors else []
+            paper.watched_authors = matched or None
+            if not matched:
+                continue
+            flagged.append(paper)
+            for author in matched:
+                history = self.matches.setdefault(author, {"count": 0})
+                history.update(count=history["count"] + 1, last_paper=paper.id, last_seen=now)
+        return flagged
+    
+    def save(self) -> None:
+        """ウォッチリスト・索引・照合履歴を保存（pathがNoneの場合は何もしない）"""
+        if self.path is None:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "authors": self.authors,
+            "index": {"exact": self._exact, "initials": self._initials, "abbreviated": self._abbreviated},
+            "matches": self.matches,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(data, tmp_file, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,447 @@
+"""パイプライン実行の記録・再生（カセット）
+
+ResearchPaperBot.runの外部とのやり取り（arXiv / Semantic Scholar / OAI-PMHへのHTTPリクエスト、
+PDFの取得、要約・トリアージのcompletion、Discord Webhookへの送信）を1つのカセットファイル
+（gzip圧縮したJSON）に記録し、同じ実行をネットワークに接続せずに再生する。
+
+HTTPはrequests.Session.send（複数Webhookへの非同期送信はhttpx.AsyncClient.send）で、
+completionはOpenRouterSummarizer._call_apiで横取りする。
+再生時はリクエストの内容が一致する記録を返し、プロンプトや通知のレイアウトを変更して
+内容が一致しない場合は同じ宛先（HTTPはメソッドとURL、completionはティア）の記録を順に返す。
+記録中・再生中の現在時刻（src.clock）は記録開始時刻に固定するため、再生結果は決定的になる
+
+このモジュールはrequestsに依存するため、--record / --replay を指定した場合にのみインポートする
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src import clock
+from src.collectors.http_cache import normalize_url
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+
+logger = logging.getLogger(__name__)
+
+# カセットの保存形式のバージョン
+CASSETTE_VERSION = 1
+
+# 記録しないレスポンスヘッダー（ボディは復号済みの内容を保存するため）
+_DROPPED_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding", "set-cookie"))
+
+# 再生時にAPIキーの代わりに使う値（completionは記録から返すため送信されない）
+REPLAY_API_KEY = "replay"
+# Webhookへの送信を記録していないカセットの再生時に使うURL（送信しないdry-runの記録など）
+REPLAY_WEBHOOK_URL = "https://discord.com/api/webhooks/0/replay"
+
+
+class CassetteMiss(LookupError):
+    """再生中のリクエストに対応する記録がない"""
+
+
+@dataclass
+class Interaction:
+    """記録した1回のやり取り"""
+    
+    kind: str
+    key: str
+    endpoint: str
+    request: Dict[str, Any]
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def _encode_body(data: bytes) -> Dict[str, str]:
+    """ボディを保存形式に変換（UTF-8として読めない場合はBase64）"""
+    try:
+        return {"body": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(data).decode("ascii"), "body_encoding": "base64"}
+
+
+def _decode_body(data: Dict[str, Any]) -> bytes:
+    if data.get("body_encoding") == "base64":
+        return base64.b64decode(data["body"])
+    return data.get("body", "").encode("utf-8")
+
+
+def _to_namespace(value: Any) -> Any:
+    """JSONの辞書を属性でアクセスできるオブジェクトに変換（completionの応答の再生用）"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{name: _to_namespace(item) for name, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+class Cassette:
+    """パイプライン実行の外部とのやり取りを記録・再生するクラス"""
+    
+    def __init__(
+        self,
+        path: str,
+        recorded_at: Optional[datetime] = None,
+        interactions: Optional[List[Interaction]] = None
+    ):
+        """
+        Args:
+            path: カセットファイルのパス
+            recorded_at: 記録時刻（再生時の現在時刻。Noneの場合は記録開始時に設定）
+            interactions: 記録済みのやり取り
+        """
+        self.path = Path(path)
+        self.recorded_at = recorded_at
+        self.interactions: List[Interaction] = list(interactions or [])
+        self.stats = {"recorded": 0, "replayed": 0, "fallbacks": 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._used = [False] * len(self.interactions)
+        self._by_key: Dict[str, List[int]] = {}
+        self._by_endpoint: Dict[str, List[int]] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        for index, interaction in enumerate(self.interactions):
+            self._by_key.setdefault(interaction.key, []).append(index)
+            self._by_endpoint.setdefault(interaction.endpoint, []).append(index)
+    
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """
+        カセットファイルを読み込む
+        
+        Args:
+            path: カセットファイルのパス
+        
+        Returns:
+            カセット
+        
+        Raises:
+            ValueError: 形式・バージョンが異なる場合
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+            data = json.load(cassette_file)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        return cls(
+            path,
+            recorded_at=datetime.fromisoformat(data["recorded_at"]),
+            interactions=[Interaction(**item) for item in data["interactions"]]
+        )
+    
+    def save(self) -> None:
+        """カセットファイルに保存（一時ファイルに書き込んでから置き換え）"""
+        data = {
+            "version": CASSETTE_VERSION,
+            "recorded_at": (self.recorded_at or clock.now()).isoformat(),
+            "interactions": [asdict(interaction) for interaction in self.interactions],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as raw_file, gzip.open(raw_file, "wt", encoding="utf-8") as cassette_file:
+                json.dump(data, cassette_file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info(f"Saved cassette with {len(self.interactions)} interactions: {self.path}")
+    
+    def webhook_urls(self) -> List[str]:
+        """記録したDiscord Webhookの送信先（クエリを除いたURL、記録順で重複なし）"""
+        urls = (
+            urlunsplit(urlsplit(interaction.request["url"])._replace(query="", fragment=""))
+            for interaction in self.interactions
+            if interaction.kind == "http" and interaction.request.get("method") == "POST"
+            and "/api/webhooks/" in interaction.request.get("url", "")
+        )
+        return list(dict.fromkeys(urls))
+    
+    def replay_settings(self) -> Dict[str, str]:
+        """
+        再生に必要な秘密情報の代わりに使う設定
+        
+        再生中はAPIキーを送信せず、Webhookへの送信も記録から返すため、実際の値は不要
+        
+        Returns:
+            設定名から値への辞書（OPENROUTER_API_KEY / DISCORD_WEBHOOK_URL）
+        """
+        return {
+            "OPENROUTER_API_KEY": REPLAY_API_KEY,
+            "DISCORD_WEBHOOK_URL": ",".join(self.webhook_urls()) or REPLAY_WEBHOOK_URL,
+        }
+    
+    @property
+    def unused(self) -> int:
+        """再生されていない記録の数"""
+        return self._used.count(False)
+    
+    @contextmanager
+    def record(self) -> Iterator["Cassette"]:
+        """
+        ブロック内の外部とのやり取りを実際に行い、その内容を記録
+        
+        再生時と同じ結果になるよう、ブロック内の現在時刻は記録開始時刻に固定する
+        """
+        if self.recorded_at is None:
+            self.recorded_at = clock.now().replace(microsecond=0)
+        with clock.frozen(self.recorded_at), self._installed(replay=False):
+            yield self
+        logger.info(f"Recorded {self.stats['recorded']} interactions")
+    
+    @contextmanager
+    def replay(self) -> Iterator["Cassette"]:
+        """ブロック内の外部とのやり取りを記録から返す（現在時刻は記録時刻に固定）"""
+        with clock.frozen(self.recorded_at or clock.now()), self._installed(replay=True):
+            yield self
+        logger.info(
+            f"Replayed {self.stats['replayed']} interactions "
+            f"({self.stats['fallbacks']} by endpoint, {self.unused} unused)"
+        )
+    
+    @contextmanager
+    def _installed(self, replay: bool) -> Iterator[None]:
+        """requests.Session.send / httpx.AsyncClient.send / OpenRouterSummarizer._call_apiを差し替える"""
+        original_send = requests.Session.send
+        original_call_api = OpenRouterSummarizer._call_api
+        cassette = self
+        try:
+            import httpx
+        except ImportError:
+            httpx = None
+        
+        def send(session, request, **kwargs):
+            if getattr(cassette._local, "active", False):
+                # リダイレクトの追跡など、記録・再生中のリクエストから呼ばれた場合はそのまま送信
+                return original_send(session, request, **kwargs)
+            cassette._local.active = True
+            try:
+                if replay:
+                    return cassette._replay_http(request)
+                return cassette._record_http(original_send, session, request, **kwargs)
+            finally:
+                cassette._local.active = False
+        
+        def call_api(summarizer, prompt):
+            if replay:
+                return cassette._replay_completion(summarizer, prompt)
+            return cassette._record_completion(original_call_api, summarizer, prompt)
+        
+        requests.Session.send = send
+        OpenRouterSummarizer._call_api = call_api
+        if httpx is not None:
+            original_async_send = httpx.AsyncClient.send
+            
+            async def async_send(client, request, **kwargs):
+                if replay:
+                    return cassette._replay_httpx(request)
+                return await cassette._record_httpx(original_async_send, client, request, **kwargs)
+            
+            httpx.AsyncClient.send = async_send
+        try:
+            yield
+        finally:
+            requests.Session.send = original_send
+            OpenRouterSummarizer._call_api = original_call_api
+            if httpx is not None:
+                httpx.AsyncClient.send = original_async_send
+    
+    @staticmethod
+    def _http_request(request: requests.PreparedRequest) -> Dict[str, Any]:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return {"method": request.method, "url": normalize_url(request.url), **_encode_body(body)}
+    
+    @staticmethod
+    def _httpx_request(request) -> Dict[str, Any]:
+        # JSON・multipartのボディはメモリ上にあるため、読み込んでも送信に影響しない
+        body = request.read()
+        return {"method": request.method, "url": normalize_url(str(request.url)), **_encode_body(body)}
+    
+    @staticmethod
+    def _recorded_response(status: int, reason: str, headers, body: bytes) -> Dict[str, Any]:
+        return {
+            "status": status,
+            "reason": reason,
+            "headers": {
+                name: value for name, value in headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            **_encode_body(body),
+        }
+    
+    @staticmethod
+    def _completion_request(summarizer: OpenRouterSummarizer, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": summarizer.model,
+            "prompt": prompt,
+            "temperature": summarizer.temperature,
+            "max_tokens": summarizer.max_tokens,
+        }
+    
+    @staticmethod
+    def _key(kind: str, request: Dict[str, Any]) -> str:
+        payload = json.dumps([kind, request], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _add(self, interaction: Interaction) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["recorded"] += 1
+    
+    def _record_http(self, original_send, session, request, **kwargs) -> requests.Response:
+        recorded = self._http_request(request)
+        interaction = Interaction(
+            kind="http",
+            key=self._key("http", recorded),
+            endpoint=f"{recorded['method']} {recorded['url']}",
+            request=recorded
+        )
+        try:
+            response = original_send(session, request, **kwargs)
+            body = response.content
+        except requests.RequestException as e:
+            interaction.error = f"{type(e).__name__}: {e}"
+            self._add(interaction)
+            raise
+        interaction.response = self._recorded_response(response.status_code, response.reason, response.headers, body)
+        self._add(interaction)
+        # ストリーミングで読むコレクター向けに、読み込み済みのボディから作り直したレスポンスを返す
+        return self._build_response(request, interaction.response)
+    
+    async def _record_httpx(self, original_send, client, request, **kwargs):
+        import httpx
+        
+        recorded = self._httpx_request(request)
+        interaction = Interaction(
+            kind="http",
+            key=self._key("http", recorded),
+            endpoint=f"{recorded['method']} {recorded['url']}",
+            request=recorded
+        )
+        try:
+            response = await original_send(client, request, **kwargs)
+            body = await response.aread()
+        except httpx.HTTPError as e:
+            interaction.error = f"{type(e).__name__}: {e}"
+            self._add(interaction)
+            raise
+        interaction.response = self._recorded_response(
+            response.status_code, response.reason_phrase, response.headers, body
+        )
+        self._add(interaction)
+        return self._build_httpx_response(request, interaction.response)
+    
+    def _replay_httpx(self, request):
+        import httpx
+        
+        recorded = self._httpx_request(request)
+        interaction = self._take(self._key("http", recorded), f"{recorded['method']} {recorded['url']}")
+        if interaction.error is not None:
+            raise httpx.ConnectError(f"Recorded error: {interaction.error}", request=request)
+        return self._build_httpx_response(request, interaction.response)
+    
+    @staticmethod
+    def _build_httpx_response(request, recorded: Dict[str, Any]):
+        import httpx
+        
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded["headers"],
+            content=_decode_body(recorded),
+            request=request
+        )
+    
+    def _replay_http(self, request: requests.PreparedRequest) -> requests.Response:
+        recorded = self._http_request(request)
+        interaction = self._take(self._key("http", recorded), f"{recorded['method']} {recorded['url']}")
+        if interaction.error is not None:
+            raise requests.ConnectionError(f"Recorded error: {interaction.error}", request=request)
+        return self._build_response(request, interaction.response)
+    
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, recorded: Dict[str, Any]) -> requests.Response:
+        body = _decode_body(recorded)
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = body
+        response.raw = BytesIO(body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def _record_completion(self, original_call_api, summarizer: OpenRouterSummarizer, prompt: str):
+        recorded = self._completion_request(summarizer, prompt)
+        interaction = Interaction(
+            kind="completion",
+            key=self._key("completion", recorded),
+            endpoint=f"completion {summarizer.tier}",
+            request=recorded
+        )
+        try:
+            completion = original_call_api(summarizer, prompt)
+        except Exception as e:
+            interaction.error = f"{type(e).__name__}: {e}"
+            self._add(interaction)
+            raise
+        interaction.response = completion.model_dump(mode="json")
+        self._add(interaction)
+        return completion
+    
+    def _replay_completion(self, summarizer: OpenRouterSummarizer, prompt: str):
+        recorded = self._completion_request(summarizer, prompt)
+        interaction = self._take(self._key("completion", recorded), f"completion {summarizer.tier}")
+        if interaction.error is not None:
+            raise RuntimeError(f"Recorded error: {interaction.error}")
+        return _to_namespace(interaction.response)
+    
+    def _take(self, key: str, endpoint: str) -> Interaction:
+        """
+        再生する記録を選択
+        
+        内容が一致する未使用の記録 → 同じ宛先の未使用の記録（記録順） → 同じ宛先の最後の記録の順に探す
+        
+        Raises:
+            CassetteMiss: 同じ宛先の記録が1つもない場合
+        """
+        with self._lock:
+            index = self._next_unused(self._by_key, "key", key)
+            if index is None:
+                index = self._next_unused(self._by_endpoint, "endpoint", endpoint)
+                if index is None and endpoint in self._by_endpoint:
+                    index = self._by_endpoint[endpoint][-1]
+                if index is None:
+                    raise CassetteMiss(f"No recorded interaction for {endpoint}")
+                self.stats["fallbacks"] += 1
+                logger.debug(f"Cassette replaying by endpoint: {endpoint}")
+            self._used[index] = True
+            self.stats["replayed"] += 1
+            return self.interactions[index]
+    
+    def _next_unused(self, index_map: Dict[str, List[int]], kind: str, name: str) -> Optional[int]:
+        """index_map[name]のうち最初の未使用の記録（使用済みの記録は次回以降読み飛ばす）"""
+        indices = index_map.get(name, [])
+        cursor = self._cursors.get((kind, name), 0)
+        while cursor < len(indices) and self._used[indices[cursor]]:
+            cursor += 1
+        self._cursors[(kind, name)] = cursor
+        return indices[cursor] if cursor < len(indices) else None
@@ -0,0 +1,44 @@
+"""現在時刻の取得
+
+収集期間の基準などに使う現在時刻を1か所から取得する。
+記録したパイプライン実行の再生時は、記録時刻に固定して結果を決定的にする
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+_lock = threading.Lock()
+_frozen: Optional[datetime] = None
+
+
+def now() -> datetime:
+    """
+    現在時刻（ローカル時刻、タイムゾーンなし）
+    
+    Returns:
+        frozen()で固定中の場合はその時刻、それ以外はdatetime.now()
+    """
+    return _frozen if _frozen is not None else datetime.now()
+
+
+@contextmanager
+def frozen(at: datetime) -> Iterator[datetime]:
+    """
+    ブロック内のnow()を指定した時刻に固定
+    
+    Args:
+        at: 固定する時刻
+    
+    Yields:
+        固定した時刻
+    """
+    global _frozen
+    with _lock:
+        previous, _frozen = _frozen, at
+    try:
+        yield at
+    finally:
+        with _lock:
+            _frozen = previous
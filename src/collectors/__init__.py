@@ -1,5 +1,20 @@
 """論文収集モジュール"""
 
 from .arxiv_collector import ArxivCollector
+from .base import PaperCollector
+from .oai_collector import OaiPmhCollector
+from .rss_collector import ArxivRssCollector
+from .registry import MultiSourceCollector, build_collector, create_collector, register_collector
+from .scholar_collector import SemanticScholarCollector
 
-__all__ = ["ArxivCollector"]
+__all__ = [
+    "ArxivCollector",
+    "ArxivRssCollector",
+    "MultiSourceCollector",
+    "OaiPmhCollector",
+    "PaperCollector",
+    "SemanticScholarCollector",
+    "build_collector",
+    "create_collector",
+    "register_collector",
+]
@@ -0,0 +1,284 @@
+"""arXiv APIレスポンス（Atom）のストリーミングパース
+
+arxivパッケージはレスポンス全体を受信してから木構造にパースし、ページ単位でarxiv.Resultの
+リストを作るため、ArxivCollectorはさらにそれをPaperResultに変換することになり、大きなページや
+さかのぼり収集ではこの二重の生成がCPU時間とメモリの大半を占める。このモジュールはレスポンスを
+受信したチャンクごとにXMLPullParserへ渡し、entry要素が閉じた時点でPaperResultを直接作って
+要素を破棄するため、ページの大きさに関わらずメモリ使用量は1件分で済む
+
+ページング・リクエスト間隔・リトライ・URLの形式はarxiv.Clientに合わせているため、
+同じHTTPキャッシュ・カセットの記録をそのまま使える
+"""
+
+import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+from urllib.parse import urlencode
+
+from src import deadline
+from src.collectors.base import new_session
+from src.models import PaperResult
+
+if TYPE_CHECKING:
+    import requests
+    
+    from src.collectors.http_cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_URL_FORMAT = "https://export.arxiv.org/api/query?{}"
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+# レスポンスを読み込む単位（バイト）
+CHUNK_SIZE = 64 * 1024
+
+
+class EmptyPageError(Exception):
+    """2ページ目以降のレスポンスが空（arXiv APIで散発的に発生し、リトライで解消する）"""
+
+
+@dataclass
+class FeedHeader:
+    """フィードのページ情報（opensearch要素）"""
+    
+    total_results: int = 0
+    start_index: int = 0
+    items_per_page: int = 0
+
+
+def _parse_datetime(text: Optional[str]) -> Optional[datetime]:
+    """RFC 3339の日時をタイムゾーンなしのUTCに変換"""
+    if not text:
+        return None
+    value = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_entry(entry: ET.Element) -> Optional[PaperResult]:
+    """
+    Atomのentry要素をPaperResultに変換
+    
+    タイトルの空白の正規化など、arxiv.Resultを経由した場合と同じ値になる
+    
+    Args:
+        entry: entry要素
+    
+    Returns:
+        論文（id / publishedがない不正なentryの場合はNone）
+    """
+    entry_id = entry.findtext(f"{_ATOM}id")
+    published = _parse_datetime(entry.findtext(f"{_ATOM}published"))
+    if not entry_id or published is None:
+        logger.warning(f"Skipping invalid Atom entry: {entry_id or '(no id)'}")
+        return None
+    return PaperResult(
+        id=entry_id,
+        title=re.sub(r"\s+", " ", entry.findtext(f"{_ATOM}title") or ""),
+        authors=", ".join(
+            author.findtext(f"{_ATOM}name") or "" for author in entry.iterfind(f"{_ATOM}author")
+        ),
+        abstract=entry.findtext(f"{_ATOM}summary") or "",
+        url=entry_id,
+        published=published.isoformat(),
+        categories=", ".join(
+            category.get("term") for category in entry.iterfind(f"{_ATOM}category")
+            if category.get("term") is not None
+        ),
+        source="arXiv"
+    )
+
+
+def parse_feed(chunks: Iterable[bytes], header: Optional[FeedHeader] = None) -> Iterator[PaperResult]:
+    """
+    Atomフィードをチャンクごとにパースし、論文を1件ずつ返す
+    
+    Args:
+        chunks: レスポンスボディのチャンク（response.iter_content()など）
+        header: ページ情報の格納先（opensearch要素を読んだ時点で更新される）
+    
+    Yields:
+        論文
+    
+    Raises:
+        xml.etree.ElementTree.ParseError: XMLとして不正なレスポンスの場合
+    """
+    header = header if header is not None else FeedHeader()
+    fields = {
+        f"{_OPENSEARCH}totalResults": "total_results",
+        f"{_OPENSEARCH}startIndex": "start_index",
+        f"{_OPENSEARCH}itemsPerPage": "items_per_page",
+    }
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    
+    def events() -> Iterator[PaperResult]:
+        nonlocal root
+        for event, element in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+            if element.tag == f"{_ATOM}entry":
+                paper = parse_entry(element)
+                # 処理済みのentryを木から外し、ページ全体を保持しないようにする
+                root.clear()
+                if paper is not None:
+                    yield paper
+            elif element.tag in fields:
+                try:
+                    setattr(header, fields[element.tag], int((element.text or "0").strip()))
+                except ValueError:
+                    pass
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from events()
+    parser.close()
+    yield from events()
+
+
+class StreamingArxivClient:
+    """レスポンスをストリーミングでパースし、PaperResultを直接返すarXiv APIクライアント
+    
+    arxiv.Clientと同じくページ間のリクエスト間隔（delay_seconds）を守り、
+    HTTPキャッシュから返したレスポンスは間隔の計算に含めない
+    """
+    
+    def __init__(
+        self,
+        page_size: int = 100,
+        delay_seconds: float = 3.0,
+        num_retries: int = 3,
+        cache: Optional["HttpCache"] = None,
+        timeout: float = 60.0
+    ):
+        """
+        Args:
+            page_size: 1リクエストあたりの最大取得件数
+            delay_seconds: arXivへのリクエスト間隔（秒）
+            num_retries: 失敗したページのリトライ回数
+            cache: APIレスポンスのキャッシュ（Noneの場合はキャッシュしない）
+            timeout: 1リクエストのタイムアウト（秒）
+        """
+        self.page_size = page_size
+        self.delay_seconds = delay_seconds
+        self.num_retries = num_retries
+        self.cache = cache
+        self.timeout = timeout
+        self.query_url_format = DEFAULT_QUERY_URL_FORMAT
+        self._session: Optional["requests.Session"] = None
+        self._cache_adapter = None
+        self._last_request: Optional[float] = None
+    
+    def get_session(self) -> "requests.Session":
+        """HTTPセッションを取得（初回のみ生成し、以降は接続を再利用）"""
+        if self._session is None:
+            self._session = new_session()
+            if self.cache is not None:
+                # http_cacheはrequests / arxivに依存するため、キャッシュを使う場合のみインポートする
+                from src.collectors.http_cache import CachingAdapter
+                self._cache_adapter = CachingAdapter(self.cache)
+                self._session.mount("https://", self._cache_adapter)
+                self._session.mount("http://", self._cache_adapter)
+        return self._session
+    
+    def format_url(
+        self,
+        search_query: str,
+        start: int,
+        max_results: int,
+        sort_by: str = "submittedDate",
+        sort_order: str = "descending"
+    ) -> str:
+        """arxiv.Clientと同じ形式のクエリURLを組み立てる（キャッシュのキーを共有するため）"""
+        return self.query_url_format.format(urlencode({
+            "search_query": search_query,
+            "id_list": "",
+            "sortBy": sort_by,
+            "sortOrder": sort_order,
+            "start": str(start),
+            "max_results": str(max_results),
+        }))
+    
+    def results(
+        self,
+        search_query: str,
+        max_results: Optional[int] = None,
+        sort_by: str = "submittedDate",
+        sort_order: str = "descending"
+    ) -> Iterator[PaperResult]:
+        """
+        検索結果を1ページずつ取得し、パースした論文から順に返す
+        
+        Args:
+            search_query: arXiv検索クエリ
+            max_results: 取得する最大論文数（Noneの場合は検索結果すべて）
+            sort_by: 並び順の基準（"submittedDate" / "lastUpdatedDate" / "relevance"）
+            sort_order: "descending" または "ascending"
+        
+        Yields:
+            論文
+        """
+        offset = 0
+        total: Optional[int] = None
+        while max_results is None or offset < max_results:
+            size = self.page_size if max_results is None else min(self.page_size, max_results - offset)
+            url = self.format_url(search_query, offset, size, sort_by, sort_order)
+            header = FeedHeader()
+            count = 0
+            for paper in self._page(url, header, first_page=offset == 0):
+                count += 1
+                yield paper
+            if total is None:
+                total = header.total_results
+                logger.info(f"Got first page: {count} of {total} total results")
+            offset += count
+            if count == 0 or offset >= total:
+                return
+    
+    def _page(self, url: str, header: FeedHeader, first_page: bool) -> Iterator[PaperResult]:
+        """1ページを取得してパース（途中で失敗した場合は返し済みの論文を飛ばしてリトライ）"""
+        # セッションの生成時にインポート済み
+        from requests import RequestException
+        
+        yielded = 0
+        for attempt in range(self.num_retries + 1):
+            try:
+                count = 0
+                for paper in self._fetch(url, header):
+                    count += 1
+                    if count > yielded:
+                        yielded = count
+                        yield paper
+                if count == 0 and not first_page:
+                    raise EmptyPageError(f"Unexpected empty page: {url}")
+                return
+            except (RequestException, ET.ParseError, EmptyPageError) as e:
+                if attempt >= self.num_retries:
+                    raise
+                logger.debug(f"Got error (try {attempt}): {e}")
+    
+    def _fetch(self, url: str, header: FeedHeader) -> Iterator[PaperResult]:
+        if self._last_request is not None:
+            wait = self._last_request + self.delay_seconds - time.monotonic()
+            if wait > 0:
+                logger.info(f"Sleeping: {wait:f} seconds")
+                time.sleep(wait)
+        logger.info(f"Requesting page: {url}")
+        session = self.get_session()
+        response = session.get(url, stream=True, timeout=deadline.timeout(self.timeout))
+        if self._cache_adapter is None or not self._cache_adapter.last_from_cache:
+            self._last_request = time.monotonic()
+        try:
+            response.raise_for_status()
+            yield from parse_feed(response.iter_content(CHUNK_SIZE), header)
+        finally:
+            response.close()
@@ -1,28 +1,106 @@
 """arXiv論文収集モジュール"""
 
 import logging
-from datetime import datetime, timedelta
-from typing import List
-import arxiv
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
 
+from src import clock
+from src.config import config
+from src.lazy_import import LazyImporter
 from src.models import PaperResult
 
+if TYPE_CHECKING:
+    import arxiv
+    
+    from src.collectors.arxiv_atom import StreamingArxivClient
+
 logger = logging.getLogger(__name__)
 
+# arxivパッケージ（requests / lxml依存）は初回収集時にインポート
+_lazy = LazyImporter(__name__, {"arxiv": "arxiv"})
+__getattr__ = _lazy.module_getattr
+
+
+def to_paper_result(result: "arxiv.Result") -> PaperResult:
+    """
+    arxiv.ResultをPaperResultに変換
+    
+    Args:
+        result: arxivパッケージの検索結果
+    
+    Returns:
+        論文情報
+    """
+    return PaperResult(
+        id=result.entry_id,
+        title=result.title,
+        authors=", ".join([author.name for author in result.authors]),
+        abstract=result.summary,
+        url=result.entry_id,
+        published=result.published.replace(tzinfo=None).isoformat(),
+        categories=", ".join(result.categories),
+        source="arXiv"
+    )
+
 
 class ArxivCollector:
     """arXiv APIを使用して論文を収集するクラス"""
     
-    def __init__(self, search_query: str, max_results: int = 5):
+    def __init__(
+        self,
+        search_query: str,
+        max_results: int = 5,
+        client: Optional[Union["arxiv.Client", "StreamingArxivClient"]] = None,
+        cache_dir: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        streaming: Optional[bool] = None
+    ):
         """
         Args:
             search_query: arXiv検索クエリ（例: "cat:cs.AI OR cat:cs.LG"）
             max_results: 取得する最大論文数
+            client: 使用するarXivクライアント（Noneの場合は初回収集時にデフォルト設定で生成）
+            cache_dir: APIレスポンスのキャッシュディレクトリ
+                （Noneの場合はHTTP_CACHE_DIR、空文字の場合はキャッシュしない）
+            cache_ttl: キャッシュの有効期間（秒、Noneの場合はHTTP_CACHE_TTL）
+            streaming: Trueの場合、arxivパッケージを使わずレスポンスをストリーミングでパースする
+                （Noneの場合はARXIV_STREAMING_PARSER）
         """
         self.search_query = search_query
         self.max_results = max_results
+        self.client = client
+        self.cache_dir = config.HTTP_CACHE_DIR if cache_dir is None else cache_dir
+        self.cache_ttl = config.HTTP_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.streaming = config.ARXIV_STREAMING_PARSER if streaming is None else streaming
         logger.info(f"ArxivCollector initialized with query: {search_query}")
     
+    def get_client(self) -> Union["arxiv.Client", "StreamingArxivClient"]:
+        """
+        arXivクライアントを取得（初回のみ生成し、以降は再利用）
+        
+        同じクライアントを使い回すことで、接続の再利用とリクエスト間隔の制御が
+        呼び出しをまたいで維持される。キャッシュが有効な場合はレスポンスを
+        ディスクに保存し、TTL内の同一クエリはarXivに接続せずに返す
+        
+        Returns:
+            arXivクライアント（ストリーミングの場合はStreamingArxivClient）
+        """
+        if self.client is None and self.streaming:
+            from src.collectors.arxiv_atom import StreamingArxivClient
+            cache = None
+            if self.cache_dir:
+                from src.collectors.http_cache import HttpCache
+                cache = HttpCache(self.cache_dir, ttl=self.cache_ttl)
+            self.client = StreamingArxivClient(cache=cache)
+        elif self.client is None:
+            if self.cache_dir:
+                # http_cacheはrequests / arxivに依存するため、ここで初めてインポートする
+                from src.collectors.http_cache import CachedArxivClient, HttpCache
+                self.client = CachedArxivClient(HttpCache(self.cache_dir, ttl=self.cache_ttl))
+            else:
+                self.client = _lazy.arxiv.Client()
+        return self.client
+    
     def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
         """
         指定日数以内に公開された論文を収集
@@ -36,37 +114,16 @@ class ArxivCollector:
         try:
             logger.info(f"Collecting papers from last {days} days...")
             
-            # arXiv検索クライアント
-            client = arxiv.Client()
-            search = arxiv.Search(
-                query=self.search_query,
-                max_results=self.max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
             papers = []
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff = (clock.now() - timedelta(days=days)).isoformat()
             
-            for result in client.results(search):
+            for paper_info in self._search():
                 # 公開日チェック
-                published = result.published.replace(tzinfo=None)
-                if published < cutoff_date:
-                    logger.debug(f"Paper {result.entry_id} is too old, skipping")
+                if paper_info.published < cutoff:
+                    logger.debug(f"Paper {paper_info.id} is too old, skipping")
                     continue
-                
-                paper_info = PaperResult(
-                    id=result.entry_id,
-                    title=result.title,
-                    authors=", ".join([author.name for author in result.authors]),
-                    abstract=result.summary,
-                    url=result.entry_id,
-                    published=published.isoformat(),
-                    categories=", ".join(result.categories),
-                    source="arXiv"
-                )
                 papers.append(paper_info)
-                logger.info(f"Collected paper: {result.title}")
+                logger.info(f"Collected paper: {paper_info.title}")
             
             logger.info(f"Total papers collected: {len(papers)}")
             return papers
@@ -75,6 +132,27 @@ class ArxivCollector:
             logger.error(f"Error collecting papers from arXiv: {e}")
             raise
     
+    def _search(self) -> Iterator[PaperResult]:
+        """検索結果を新しい順にPaperResultとして返す"""
+        from src.collectors.arxiv_atom import StreamingArxivClient
+        
+        client = self.get_client()
+        if isinstance(client, StreamingArxivClient):
+            # レスポンスからPaperResultを直接作る（arxiv.Resultを経由しない）
+            yield from client.results(self.search_query, max_results=self.max_results)
+            return
+        
+        # arXiv検索クライアント
+        arxiv = _lazy.arxiv
+        search = arxiv.Search(
+            query=self.search_query,
+            max_results=self.max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        for result in client.results(search):
+            yield to_paper_result(result)
+    
     def collect_papers(self) -> List[PaperResult]:
         """
         最新論文を収集（デフォルト: 過去1日）
@@ -0,0 +1,89 @@
+"""論文コレクターの共通インターフェース"""
+
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, runtime_checkable
+
+from src.lazy_import import LazyImporter
+from src.models import PaperResult
+
+if TYPE_CHECKING:
+    import requests
+
+# requestsは初回のHTTPセッション生成時にインポート
+_lazy = LazyImporter(__name__, {"requests": "requests", "HTTPAdapter": "requests.adapters:HTTPAdapter"})
+__getattr__ = _lazy.module_getattr
+
+# コレクターがHTTPリクエストに付けるUser-Agent
+USER_AGENT = "research-paper-bot"
+
+# arXiv IDの抽出（新形式 2401.00001v2 / 旧形式 cs.AI/0101001）
+_ARXIV_ID = re.compile(r"(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?/?$")
+
+
+@runtime_checkable
+class PaperCollector(Protocol):
+    """論文コレクターのプロトコル
+    
+    ArxivCollector / SemanticScholarCollector など、ソースごとのコレクターが満たすインターフェース
+    """
+    
+    def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
+        """指定日数以内に公開された論文を収集"""
+        ...
+
+
+def new_session(pool_size: Optional[int] = None, headers: Optional[Dict[str, str]] = None) -> "requests.Session":
+    """
+    コレクター用のHTTPセッションを生成（User-Agentを設定済み）
+    
+    Args:
+        pool_size: ホストごとに保持する接続数（Noneの場合はrequestsの既定値）
+        headers: User-Agentに加えて付けるヘッダー
+    
+    Returns:
+        requestsのセッション
+    """
+    session = _lazy.requests.Session()
+    if pool_size is not None:
+        adapter = _lazy.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    session.headers.update(headers or {})
+    return session
+
+
+def extract_arxiv_id(text: str) -> Optional[str]:
+    """
+    URLや識別子からバージョンを除いたarXiv IDを抽出
+    
+    Args:
+        text: "http://arxiv.org/abs/2401.00001v1" などの文字列
+    
+    Returns:
+        "2401.00001" 形式のID（arXiv IDでない場合はNone）
+    """
+    match = _ARXIV_ID.search(text)
+    return match.group(1) if match else None
+
+
+def dedup_keys(paper: PaperResult) -> List[str]:
+    """
+    ソースをまたいだ重複判定に使うキーを取得
+    
+    arXiv ID（IDまたはURLから抽出できる場合）と、正規化したタイトルの両方を返す
+    
+    Args:
+        paper: 論文
+    
+    Returns:
+        重複判定キーのリスト
+    """
+    keys = []
+    arxiv_id = extract_arxiv_id(paper.id) or extract_arxiv_id(paper.url)
+    if arxiv_id:
+        keys.append(f"arxiv:{arxiv_id}")
+    title = re.sub(r"[^0-9a-z]+", " ", paper.title.casefold()).strip()
+    if title:
+        keys.append(f"title:{title}")
+    return keys
@@ -0,0 +1,296 @@
+"""arXiv APIレスポンスのディスクキャッシュ
+
+arxiv.Clientのセッションにマウントするrequestsのアダプターとして動作し、
+正規化したクエリURLをキーにAtomレスポンスをそのまま保存する。
+TTL内のエントリはネットワークに接続せずに返し、TTLを過ぎたエントリは
+ETag / Last-Modifiedによる条件付きリクエストで再検証する
+
+このモジュールはrequests / arxivに依存するため、初回収集時にのみインポートする
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import arxiv
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+logger = logging.getLogger(__name__)
+
+# キャッシュに保存するレスポンスヘッダー
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# 保存・再検証されないまま経過したエントリを削除するまでの秒数（デフォルト）
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+def normalize_url(url: str) -> str:
+    """
+    キャッシュキー用にURLを正規化（スキーム・ホストの小文字化、クエリパラメータの並べ替え）
+    
+    Args:
+        url: リクエストURL
+    
+    Returns:
+        正規化したURL
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュしたレスポンス"""
+    
+    url: str
+    stored_at: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    
+    def age(self, now: Optional[float] = None) -> float:
+        """保存（または最後の再検証）からの経過秒数"""
+        return (now if now is not None else time.time()) - self.stored_at
+
+
+class HttpCache:
+    """URLをキーにレスポンスを保存するディスクキャッシュ
+    
+    TTLを過ぎたエントリも再検証のために残すが、max_ageの間に保存・再検証されなかった
+    エントリは書き込みのたびに削除し、常駐モードでもディレクトリが増え続けないようにする
+    """
+    
+    def __init__(self, directory: str, ttl: float = 600.0, max_age: Optional[float] = None):
+        """
+        Args:
+            directory: キャッシュディレクトリ（初回書き込み時に作成）
+            ttl: ネットワークに接続せずに返す有効期間（秒）。0の場合は毎回再検証する
+            max_age: エントリを削除するまでの秒数（Noneの場合はttlとDEFAULT_MAX_AGEの大きい方）
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_age = max(ttl, DEFAULT_MAX_AGE) if max_age is None else max_age
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+    
+    def _paths(self, url: str):
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+    
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        キャッシュエントリを取得
+        
+        Args:
+            url: リクエストURL
+        
+        Returns:
+            キャッシュエントリ（存在しない・読み込めない場合はNone）
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(url=meta["url"], stored_at=meta["stored_at"], headers=meta["headers"], body=body)
+    
+    def put(self, url: str, headers: Dict[str, str], body: bytes) -> CacheEntry:
+        """
+        レスポンスを保存
+        
+        Args:
+            url: リクエストURL
+            headers: レスポンスヘッダー（_STORED_HEADERSのみ保存）
+            body: レスポンスボディ
+        
+        Returns:
+            保存したキャッシュエントリ
+        """
+        stored = {name: headers[name] for name in _STORED_HEADERS if headers.get(name)}
+        entry = CacheEntry(url=normalize_url(url), stored_at=time.time(), headers=stored, body=body)
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prune()
+        # ボディ → メタデータの順に置き換え、メタデータがあるエントリは常に完全な状態にする
+        self._write_atomic(body_path, body)
+        self._write_meta(meta_path, entry)
+        return entry
+    
+    def touch(self, entry: CacheEntry) -> None:
+        """再検証（304応答）に成功したエントリの保存時刻を更新"""
+        entry.stored_at = time.time()
+        self._write_meta(self._paths(entry.url)[0], entry)
+    
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        max_ageの間に保存・再検証されなかったエントリを削除
+        
+        メタデータの更新時刻で判定し、書き込み途中で残ったボディや一時ファイルも削除する
+        
+        Args:
+            now: 基準時刻（Noneの場合は現在時刻）
+        
+        Returns:
+            削除したエントリ数
+        """
+        if not self.directory.exists():
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                if path.suffix == ".json":
+                    # メタデータ → ボディの順に削除し、メタデータがあるエントリは常に完全な状態にする
+                    path.unlink(missing_ok=True)
+                    path.with_suffix(".body").unlink(missing_ok=True)
+                    removed += 1
+                elif path.suffix == ".body" and not path.with_suffix(".json").exists():
+                    path.unlink(missing_ok=True)
+                elif path.name.startswith(".tmp-"):
+                    path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Failed to prune cache file {path}: {e}")
+        if removed:
+            logger.debug(f"Pruned {removed} expired HTTP cache entries")
+        return removed
+    
+    def clear(self) -> None:
+        """全エントリを削除"""
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if path.suffix in (".json", ".body"):
+                path.unlink(missing_ok=True)
+    
+    def record(self, outcome: str) -> None:
+        """キャッシュの利用結果（hits / revalidated / misses）を記録"""
+        with self._lock:
+            self.stats[outcome] += 1
+    
+    def _write_meta(self, path: Path, entry: CacheEntry) -> None:
+        meta = {"url": entry.url, "stored_at": entry.stored_at, "headers": entry.headers}
+        self._write_atomic(path, json.dumps(meta).encode("utf-8"))
+    
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+class CachingAdapter(HTTPAdapter):
+    """GETレスポンスをHttpCacheに保存・再利用するrequestsのアダプター"""
+    
+    def __init__(self, cache: HttpCache, **kwargs):
+        """
+        Args:
+            cache: 使用するキャッシュ
+            **kwargs: HTTPAdapterに渡す引数
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+        self._local = threading.local()
+    
+    @property
+    def last_from_cache(self) -> bool:
+        """直前のレスポンスをネットワークに接続せずに返したか（スレッドごと）"""
+        return getattr(self._local, "from_cache", False)
+    
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self._local.from_cache = False
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+        
+        entry = self.cache.get(request.url)
+        if entry is not None and entry.age() < self.cache.ttl:
+            self.cache.record("hits")
+            self._local.from_cache = True
+            logger.debug(f"HTTP cache hit ({entry.age():.0f}s old): {request.url}")
+            return self._build_response(request, entry, "HIT")
+        
+        if entry is not None:
+            if "ETag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["ETag"]
+            if "Last-Modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.touch(entry)
+            self.cache.record("revalidated")
+            logger.debug(f"HTTP cache revalidated: {request.url}")
+            return self._build_response(request, entry, "REVALIDATED")
+        
+        self.cache.record("misses")
+        if response.status_code == 200:
+            self.cache.put(request.url, response.headers, response.content)
+        return response
+    
+    @staticmethod
+    def _build_response(request: PreparedRequest, entry: CacheEntry, status: str) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers["X-Cache"] = status
+        response._content = entry.body
+        # ボディは読み込み済み（iter_content() / close()がrawに触れないようにする）
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CachedArxivClient(arxiv.Client):
+    """HTTPキャッシュを使用するarXivクライアント
+    
+    arxiv.Clientはリクエストごとにリクエスト間隔（delay_seconds）の基準時刻を更新するが、
+    キャッシュから返したレスポンスはarXivに接続していないため基準時刻を更新しない。
+    これによりキャッシュヒットが続く間は待機が発生しない
+    """
+    
+    def __init__(self, cache: HttpCache, **kwargs):
+        """
+        Args:
+            cache: 使用するキャッシュ
+            **kwargs: arxiv.Clientに渡す引数（page_size / delay_seconds / num_retries）
+        """
+        self._network_request_dt = None
+        self.cache_adapter = CachingAdapter(cache)
+        super().__init__(**kwargs)
+        self._session.mount("https://", self.cache_adapter)
+        self._session.mount("http://", self.cache_adapter)
+    
+    @property
+    def cache(self) -> HttpCache:
+        return self.cache_adapter.cache
+    
+    @property
+    def _last_request_dt(self):
+        return self._network_request_dt
+    
+    @_last_request_dt.setter
+    def _last_request_dt(self, value) -> None:
+        if value is None or not self.cache_adapter.last_from_cache:
+            self._network_request_dt = value
@@ -0,0 +1,355 @@
+"""arXiv OAI-PMHメタデータハーベスト
+
+検索API（ArxivCollector）は1クエリあたりの件数上限とリクエスト間隔の制約があるため、
+cs全体などの大きなカテゴリ集合ではOAI-PMHのListRecordsでセット・日付範囲単位に
+メタデータを一括取得する。レスポンスはストリーミングでパースし、レコードを
+1件ずつPaperResultとして返すため、1日数万件でもメモリ使用量は一定になる
+"""
+
+import heapq
+import json
+import logging
+import os
+import time
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set
+
+from src import clock, deadline
+from src.collectors.base import new_session
+from src.models import PaperResult
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://oaipmh.arxiv.org/oai"
+
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXiv/}"
+_ARXIV_RAW = "{http://arxiv.org/OAI/arXivRaw/}"
+
+METADATA_PREFIXES = ("arXiv", "arXivRaw")
+
+
+class OaiPmhError(Exception):
+    """OAI-PMHのエラー応答"""
+    
+    def __init__(self, code: str, message: str):
+        super().__init__(f"OAI-PMH error {code}: {message}")
+        self.code = code
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return " ".join((element.text or "").split()) if element is not None else ""
+
+
+def parse_record(record: ET.Element) -> Optional[PaperResult]:
+    """
+    OAI-PMHのrecord要素（arXiv / arXivRaw形式）をPaperResultに変換
+    
+    Args:
+        record: record要素
+    
+    Returns:
+        論文（削除済みレコードの場合はNone）
+    """
+    header = record.find(f"{_OAI}header")
+    if header is not None and header.get("status") == "deleted":
+        return None
+    metadata = record.find(f"{_OAI}metadata")
+    if metadata is None or len(metadata) == 0:
+        return None
+    body = metadata[0]
+    
+    if body.tag == f"{_ARXIV_RAW}arXivRaw":
+        ns = _ARXIV_RAW
+        authors = _text(body.find(f"{ns}authors"))
+        # 最初のversion要素の日付が初版の投稿日
+        first_version = body.find(f"{ns}version/{ns}date")
+        published = None
+        if first_version is not None:
+            published = parsedate_to_datetime(_text(first_version)).replace(tzinfo=None)
+    else:
+        ns = _ARXIV
+        authors = ", ".join(
+            " ".join(filter(None, [_text(author.find(f"{ns}forenames")), _text(author.find(f"{ns}keyname"))]))
+            for author in body.iterfind(f"{ns}authors/{ns}author")
+        )
+        created = _text(body.find(f"{ns}created"))
+        published = datetime.strptime(created, "%Y-%m-%d") if created else None
+    
+    arxiv_id = _text(body.find(f"{ns}id"))
+    url = f"http://arxiv.org/abs/{arxiv_id}"
+    return PaperResult(
+        id=url,
+        title=_text(body.find(f"{ns}title")),
+        authors=authors,
+        abstract=_text(body.find(f"{ns}abstract")),
+        url=url,
+        published=published.isoformat() if published else "",
+        categories=", ".join(_text(body.find(f"{ns}categories")).split()),
+        source="arXiv"
+    )
+
+
+class HarvestCheckpoint:
+    """ハーベストの進捗（resumptionToken）をJSONファイルに保存するチェックポイント"""
+    
+    def __init__(self, path: Optional[str]):
+        """
+        Args:
+            path: チェックポイントファイルのパス（Noneまたは空の場合は保存しない）
+        """
+        self.path = Path(path) if path else None
+    
+    def load(self, key: dict) -> Optional[dict]:
+        """
+        同じ条件（セット・形式・日付範囲）の未完了のハーベストの進捗を読み込む
+        
+        Args:
+            key: ハーベスト条件
+        
+        Returns:
+            進捗（{"resumption_token", "records"}）。該当しない場合はNone
+        """
+        if self.path is None:
+            return None
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return state if state.get("key") == key else None
+    
+    def save(self, key: dict, resumption_token: str, records: int) -> None:
+        """進捗を保存（一時ファイルからの置き換えで書き込み途中の状態を残さない）"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"key": key, "resumption_token": resumption_token, "records": records}),
+            encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
+    
+    def clear(self) -> None:
+        """ハーベスト完了時に進捗を削除"""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class OaiPmhCollector:
+    """arXiv OAI-PMHのListRecordsで論文メタデータをハーベストするクラス"""
+    
+    def __init__(
+        self,
+        sets: List[str],
+        max_results: int = 5,
+        metadata_prefix: str = "arXiv",
+        base_url: str = DEFAULT_BASE_URL,
+        checkpoint_path: Optional[str] = None,
+        max_retries: int = 5,
+        timeout: float = 120.0
+    ):
+        """
+        Args:
+            sets: ハーベストするOAIセット（例: ["cs", "stat"]）
+            max_results: collect_recent_papersで返す最大論文数
+            metadata_prefix: "arXiv" または "arXivRaw"
+            base_url: OAI-PMHエンドポイント（テスト用のスタブサーバー等に差し替え可能）
+            checkpoint_path: 進捗を保存するファイル（Noneまたは空の場合は保存しない）
+            max_retries: 503（フロー制御）応答時の最大リトライ回数
+            timeout: 1リクエストのタイムアウト（秒）
+        """
+        if not sets:
+            raise ValueError("At least one OAI set is required")
+        if metadata_prefix not in METADATA_PREFIXES:
+            raise ValueError(f"Unsupported metadata prefix: {metadata_prefix}")
+        self.sets = sets
+        self.max_results = max_results
+        self.metadata_prefix = metadata_prefix
+        self.base_url = base_url
+        self.checkpoint = HarvestCheckpoint(checkpoint_path)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stats = {"pages": 0, "records": 0}
+        self._session: Optional["requests.Session"] = None
+        logger.info(f"OaiPmhCollector initialized with sets: {', '.join(sets)}")
+    
+    def get_session(self) -> "requests.Session":
+        """HTTPセッションを取得（初回のみ生成し、以降は接続を再利用）"""
+        if self._session is None:
+            self._session = new_session()
+        return self._session
+    
+    def _open(self, params: dict):
+        """
+        ListRecordsをストリーミングで要求（503 + Retry-Afterのフロー制御に従ってリトライ）
+        
+        Returns:
+            ボディを読み込んでいないレスポンス
+        """
+        session = self.get_session()
+        for attempt in range(self.max_retries + 1):
+            response = session.get(self.base_url, params=params, stream=True, timeout=deadline.timeout(self.timeout))
+            if response.status_code != 503 or attempt == self.max_retries:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return response
+            delay = float(response.headers.get("Retry-After") or 10)
+            response.close()
+            logger.info(f"OAI-PMH flow control: retrying in {delay:g}s")
+            time.sleep(delay)
+    
+    def _parse_page(self, response, state: dict) -> Iterator[PaperResult]:
+        """
+        1ページ分のレスポンスをストリーミングでパースし、論文を1件ずつ返す
+        
+        処理済みのrecord要素は親要素から外して破棄するため、ページ全体を保持しない。
+        ページ末尾のresumptionTokenはstate["token"]に格納する
+        """
+        container = None
+        state["token"] = ""
+        for event, element in ET.iterparse(response.raw, events=("start", "end")):
+            if event == "start":
+                if element.tag == f"{_OAI}ListRecords":
+                    container = element
+                continue
+            if element.tag == f"{_OAI}record":
+                paper = parse_record(element)
+                if container is not None:
+                    container.remove(element)
+                if paper is not None:
+                    yield paper
+            elif element.tag == f"{_OAI}resumptionToken":
+                state["token"] = (element.text or "").strip()
+            elif element.tag == f"{_OAI}error":
+                code = element.get("code", "")
+                if code == "noRecordsMatch":
+                    return
+                raise OaiPmhError(code, _text(element))
+    
+    def harvest_set(self, set_spec: str, from_date: date, until_date: Optional[date] = None) -> Iterator[PaperResult]:
+        """
+        1つのセットを日付範囲でハーベストし、論文を1件ずつ返す
+        
+        ページごとにresumptionTokenをチェックポイントに保存し、中断した場合は
+        次回同じ条件で呼び出したときに保存したページから再開する
+        
+        Args:
+            set_spec: OAIセット（例: "cs"）
+            from_date: 開始日（datestamp、この日を含む）
+            until_date: 終了日（datestamp、この日を含む。Noneの場合は指定なし）
+        
+        Yields:
+            論文
+        """
+        key = {
+            "set": set_spec,
+            "metadataPrefix": self.metadata_prefix,
+            "from": from_date.isoformat(),
+            "until": until_date.isoformat() if until_date else None,
+        }
+        resumed = self.checkpoint.load(key)
+        records = 0
+        if resumed:
+            params = {"verb": "ListRecords", "resumptionToken": resumed["resumption_token"]}
+            records = resumed["records"]
+            logger.info(f"Resuming OAI-PMH harvest of {set_spec} after {records} records")
+        else:
+            params = {"verb": "ListRecords", **{k: v for k, v in key.items() if v}}
+        
+        while True:
+            state: dict = {}
+            response = self._open(params)
+            try:
+                for paper in self._parse_page(response, state):
+                    records += 1
+                    self.stats["records"] += 1
+                    yield paper
+            except OaiPmhError as e:
+                if e.code == "badResumptionToken" and resumed:
+                    # 期限切れのトークンからは再開できないため、最初からやり直す
+                    logger.warning("Checkpointed resumption token expired; restarting harvest")
+                    self.checkpoint.clear()
+                    yield from self.harvest_set(set_spec, from_date, until_date)
+                    return
+                raise
+            finally:
+                response.close()
+            self.stats["pages"] += 1
+            
+            token = state["token"]
+            if not token:
+                break
+            self.checkpoint.save(key, token, records)
+            params = {"verb": "ListRecords", "resumptionToken": token}
+            resumed = None
+        
+        self.checkpoint.clear()
+        logger.info(f"Harvested {records} records from OAI set {set_spec}")
+    
+    def iter_papers(self, from_date: date, until_date: Optional[date] = None) -> Iterator[PaperResult]:
+        """
+        全セットをハーベストし、論文を1件ずつ返す（クロスリストによるセット間の重複は除く）
+        
+        Args:
+            from_date: 開始日
+            until_date: 終了日（Noneの場合は指定なし）
+        
+        Yields:
+            論文
+        """
+        seen: Set[str] = set()
+        for set_spec in self.sets:
+            for paper in self.harvest_set(set_spec, from_date, until_date):
+                if paper.id in seen:
+                    continue
+                seen.add(paper.id)
+                yield paper
+    
+    def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
+        """
+        指定日数以内に投稿された論文のうち新しいものからmax_results件を収集
+        
+        OAI-PMHのdatestampは更新日のため、初版の投稿日で改めて絞り込む。
+        arXiv形式の投稿日は日付のみのため、基準日時は日の始まりに切り下げて比較する。
+        上位max_results件のみをヒープで保持するため、ハーベスト件数によらずメモリは一定
+        
+        Args:
+            days: 何日前までの論文を取得するか
+        
+        Returns:
+            投稿日の降順に並んだ論文のリスト
+        """
+        try:
+            cutoff = (clock.now() - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+            logger.info(f"Harvesting OAI-PMH records since {cutoff:%Y-%m-%d}...")
+            newest: List[tuple] = []
+            for index, paper in enumerate(self.iter_papers(cutoff.date())):
+                if not paper.published or paper.published < cutoff.isoformat():
+                    continue
+                item = (paper.published, -index, paper)
+                if len(newest) < self.max_results:
+                    heapq.heappush(newest, item)
+                else:
+                    heapq.heappushpop(newest, item)
+            papers = [item[2] for item in sorted(newest, reverse=True)]
+            logger.info(f"Total papers collected: {len(papers)}")
+            return papers
+        except Exception as e:
+            logger.error(f"Error harvesting papers from arXiv OAI-PMH: {e}")
+            raise
+    
+    def collect_papers(self) -> List[PaperResult]:
+        """
+        最新論文を収集（デフォルト: 過去1日）
+        
+        Returns:
+            論文情報のリスト
+        """
+        return self.collect_recent_papers(days=1)
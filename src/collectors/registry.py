@@ -0,0 +1,296 @@
+"""コレクターのレジストリと複数ソースの並行収集
+
+ENABLED_COLLECTORS（カンマ区切り）に指定したソースのコレクターを生成し、
+複数ある場合はMultiSourceCollectorで並行に収集して1つの論文リストにまとめる
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+from src import deadline
+from src.collectors.base import PaperCollector, dedup_keys
+from src.config import config
+from src.models import PaperResult
+
+logger = logging.getLogger(__name__)
+
+CollectorFactory = Callable[[], PaperCollector]
+
+# ソース名 → コレクターの生成関数
+_REGISTRY: Dict[str, CollectorFactory] = {}
+
+
+def register_collector(name: str, factory: CollectorFactory) -> None:
+    """
+    コレクターを登録
+    
+    Args:
+        name: ソース名（ENABLED_COLLECTORSで指定する名前）
+        factory: 設定からコレクターを生成する関数
+    """
+    _REGISTRY[name] = factory
+
+
+def available_collectors() -> List[str]:
+    """登録済みのソース名の一覧"""
+    return list(_REGISTRY)
+
+
+def create_collector(name: str) -> PaperCollector:
+    """
+    登録済みのコレクターを生成
+    
+    Args:
+        name: ソース名
+    
+    Returns:
+        コレクター
+    
+    Raises:
+        ValueError: 未登録のソース名の場合
+    """
+    if name not in _REGISTRY:
+        raise ValueError(
+            f"Unknown collector: {name} (available: {', '.join(available_collectors())})"
+        )
+    return _REGISTRY[name]()
+
+
+def _create_arxiv_collector() -> PaperCollector:
+    from src.collectors.arxiv_collector import ArxivCollector
+    return ArxivCollector(
+        search_query=config.ARXIV_SEARCH_QUERY,
+        max_results=config.MAX_PAPERS_PER_DAY
+    )
+
+
+def _create_semantic_scholar_collector() -> PaperCollector:
+    from src.collectors.scholar_collector import SemanticScholarCollector
+    return SemanticScholarCollector(
+        search_query=config.SEMANTIC_SCHOLAR_QUERY,
+        max_results=config.MAX_PAPERS_PER_DAY
+    )
+
+
+def _create_arxiv_oai_collector() -> PaperCollector:
+    from src.collectors.oai_collector import OaiPmhCollector
+    return OaiPmhCollector(
+        sets=[name.strip() for name in config.OAI_SETS.split(",") if name.strip()],
+        max_results=config.MAX_PAPERS_PER_DAY,
+        metadata_prefix=config.OAI_METADATA_PREFIX,
+        checkpoint_path=config.OAI_CHECKPOINT_FILE
+    )
+
+
+def _create_arxiv_rss_collector() -> PaperCollector:
+    from src.collectors.rss_collector import ArxivRssCollector, categories_from_query
+    categories = [name.strip() for name in config.RSS_CATEGORIES.split(",") if name.strip()]
+    return ArxivRssCollector(
+        categories=categories or categories_from_query(config.ARXIV_SEARCH_QUERY),
+        max_results=config.MAX_PAPERS_PER_DAY,
+        announce_types=[name.strip() for name in config.RSS_ANNOUNCE_TYPES.split(",") if name.strip()],
+        feed_url_format=config.RSS_FEED_URL
+    )
+
+
+register_collector("arxiv", _create_arxiv_collector)
+register_collector("arxiv_oai", _create_arxiv_oai_collector)
+register_collector("arxiv_rss", _create_arxiv_rss_collector)
+register_collector("semantic_scholar", _create_semantic_scholar_collector)
+
+
+def _published_at(published: str) -> datetime:
+    """
+    ソースごとに形式の異なる公開日を比較可能なタイムゾーンなしのUTCに変換
+    
+    ISO 8601の日時・日付、年のみ（Semantic Scholarのフォールバック）、
+    RFC 2822（RSS）を受け付け、解釈できない場合は最も古い日時として扱う
+    
+    Args:
+        published: 論文の公開日の文字列
+    
+    Returns:
+        公開日時
+    """
+    text = (published or "").strip()
+    value = None
+    if text:
+        try:
+            value = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            if text.isdigit() and len(text) == 4:
+                value = datetime(int(text), 1, 1)
+            else:
+                try:
+                    value = parsedate_to_datetime(text)
+                except (TypeError, ValueError):
+                    logger.debug(f"Unparseable published date: {published!r}")
+    if value is None:
+        return datetime.min
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def merge_papers(
+    results: List[List[PaperResult]],
+    max_results: Optional[int] = None
+) -> List[PaperResult]:
+    """
+    複数ソースの論文リストを重複排除して公開日の降順にまとめる
+    
+    重複（同じarXiv IDまたは同じタイトル）は先に指定したソースの論文を残す
+    
+    Args:
+        results: ソースごとの論文リスト（優先度順）
+        max_results: まとめた後の最大件数（Noneの場合は制限なし）
+    
+    Returns:
+        まとめた論文のリスト
+    """
+    seen = set()
+    merged = []
+    for papers in results:
+        for paper in papers:
+            keys = dedup_keys(paper)
+            if any(key in seen for key in keys):
+                logger.debug(f"Duplicate paper skipped: {paper.id} ({paper.source})")
+                continue
+            seen.update(keys)
+            merged.append(paper)
+    # 公開日の形式はソースごとに異なるため日時に変換して比較する（同時刻はソースの優先度順を維持）
+    merged.sort(key=lambda paper: _published_at(paper.published), reverse=True)
+    return merged[:max_results] if max_results is not None else merged
+
+
+class MultiSourceCollector:
+    """複数のコレクターを並行に実行し、結果をまとめるコレクター
+    
+    各ソースは同時に開始され、ソースごとのタイムアウトで打ち切られる。
+    遅い・失敗したソースは結果から除外されるだけで他のソースを待たせないため、
+    全体の所要時間はソースの合計ではなく最も遅いソース（またはタイムアウト）で決まる
+    """
+    
+    def __init__(
+        self,
+        collectors: Dict[str, PaperCollector],
+        timeout: float = 60.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_results: Optional[int] = None
+    ):
+        """
+        Args:
+            collectors: ソース名 → コレクター（優先度順）
+            timeout: ソースごとのタイムアウト（秒）
+            timeouts: ソース名 → タイムアウトの個別指定
+            max_results: まとめた後の最大件数（Noneの場合は制限なし）
+        """
+        if not collectors:
+            raise ValueError("At least one collector is required")
+        self.collectors = collectors
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.max_results = max_results
+        self.last_report: Dict[str, dict] = {}
+    
+    def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
+        """
+        全ソースから指定日数以内に公開された論文を並行に収集
+        
+        Args:
+            days: 何日前までの論文を取得するか
+        
+        Returns:
+            重複排除して公開日の降順にまとめた論文のリスト
+        """
+        # タイムアウトしたソースのスレッドを待たずに戻るため、withは使わずwait=Falseで終了する
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.collectors), thread_name_prefix="collector"
+        )
+        started = time.monotonic()
+        futures = {
+            name: executor.submit(self._run_source, collector, days)
+            for name, collector in self.collectors.items()
+        }
+        
+        results = []
+        report = {}
+        try:
+            for name, future in futures.items():
+                timeout = self.timeouts.get(name, self.timeout)
+                active = deadline.current()
+                if active is not None:
+                    # 実行の締め切りが近い場合はソースのタイムアウトを短くする
+                    timeout = active.timeout(timeout)
+                remaining = max(0.0, started + timeout - time.monotonic())
+                try:
+                    papers, seconds = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    logger.error(f"Collector '{name}' timed out after {timeout:.1f}s, skipping")
+                    report[name] = {"papers": 0, "seconds": timeout, "error": "timeout"}
+                    continue
+                except Exception as e:
+                    logger.error(f"Collector '{name}' failed: {e}")
+                    report[name] = {
+                        "papers": 0,
+                        "seconds": round(time.monotonic() - started, 3),
+                        "error": str(e)
+                    }
+                    continue
+                logger.info(f"Collector '{name}' returned {len(papers)} papers in {seconds:.2f}s")
+                report[name] = {"papers": len(papers), "seconds": round(seconds, 3), "error": None}
+                results.append(papers)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.last_report = report
+        if not results:
+            raise RuntimeError("All collectors failed")
+        
+        merged = merge_papers(results, self.max_results)
+        logger.info(
+            f"Merged {sum(len(papers) for papers in results)} papers from "
+            f"{len(results)}/{len(futures)} sources into {len(merged)} "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return merged
+    
+    @staticmethod
+    def _run_source(collector: PaperCollector, days: int):
+        started = time.monotonic()
+        papers = collector.collect_recent_papers(days=days)
+        return papers, time.monotonic() - started
+    
+    def collect_papers(self) -> List[PaperResult]:
+        """
+        最新論文を収集（デフォルト: 過去1日）
+        
+        Returns:
+            論文情報のリスト
+        """
+        return self.collect_recent_papers(days=1)
+
+
+def build_collector(names: Optional[List[str]] = None) -> PaperCollector:
+    """
+    設定に従ってコレクターを生成
+    
+    Args:
+        names: 有効にするソース名（Noneの場合はENABLED_COLLECTORSから取得）
+    
+    Returns:
+        ソースが1つの場合はそのコレクター、複数の場合はMultiSourceCollector
+    """
+    if names is None:
+        names = [name.strip() for name in config.ENABLED_COLLECTORS.split(",") if name.strip()]
+    names = list(dict.fromkeys(names))
+    if not names:
+        raise ValueError("ENABLED_COLLECTORS must contain at least one collector")
+    collectors = {name: create_collector(name) for name in names}
+    if len(collectors) == 1:
+        return collectors[names[0]]
+    return MultiSourceCollector(collectors, timeout=config.COLLECTOR_TIMEOUT)
@@ -0,0 +1,235 @@
+"""arXivの新着論文フィード（rss.arxiv.org）による収集
+
+arXivはカテゴリごとに、その日にアナウンスされた論文をすべて含むRSSフィードを公開している。
+検索API（ArxivCollector）のようにリクエスト間隔を空けてページングする必要がないため、
+設定したカテゴリのフィードを並行に1リクエストずつ取得し、当日分をまとめて収集する。
+フィードはストリーミングでパースし、クロスリストで複数のカテゴリに現れる論文は1件にまとめる
+"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Set
+
+from src import clock, deadline
+from src.collectors.base import extract_arxiv_id, new_session
+from src.models import PaperResult
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEED_URL_FORMAT = "https://rss.arxiv.org/rss/{category}"
+
+# アナウンスの種類（new: 新規投稿、cross: 他カテゴリからのクロスリスト、
+# replace / replace-cross: 既存論文の改訂）
+ANNOUNCE_TYPES = ("new", "cross", "replace", "replace-cross")
+
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+# 検索クエリのカテゴリ指定（"cat:cs.AI"）
+_QUERY_CATEGORY = re.compile(r"\bcat:([A-Za-z\-]+(?:\.[A-Za-z\-]+)?)")
+
+# descriptionの先頭の "arXiv:2601.00001v1 Announce Type: new Abstract: " 部分
+_DESCRIPTION_HEADER = re.compile(r"^arXiv:\S+\s+Announce Type:\s*\S+\s*(?:Abstract:\s*)?", re.IGNORECASE)
+
+
+def categories_from_query(query: str) -> List[str]:
+    """
+    検索クエリからカテゴリを抽出
+    
+    Args:
+        query: arXiv検索クエリ（例: "cat:cs.AI OR cat:cs.LG"）
+    
+    Returns:
+        カテゴリのリスト（出現順、重複なし）
+    """
+    return list(dict.fromkeys(_QUERY_CATEGORY.findall(query)))
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return " ".join((element.text or "").split()) if element is not None else ""
+
+
+def parse_item(item: ET.Element) -> Optional[PaperResult]:
+    """
+    RSSのitem要素をPaperResultに変換
+    
+    Args:
+        item: item要素
+    
+    Returns:
+        論文（arXiv IDを取得できない場合はNone）
+    """
+    arxiv_id = extract_arxiv_id(_text(item.find("link"))) or extract_arxiv_id(_text(item.find("guid")))
+    if arxiv_id is None:
+        return None
+    published = ""
+    pub_date = _text(item.find("pubDate"))
+    if pub_date:
+        published = parsedate_to_datetime(pub_date).astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+    url = f"http://arxiv.org/abs/{arxiv_id}"
+    return PaperResult(
+        id=url,
+        title=_text(item.find("title")),
+        authors=_text(item.find(f"{_DC}creator")),
+        abstract=_DESCRIPTION_HEADER.sub("", _text(item.find("description"))),
+        url=url,
+        published=published,
+        categories=", ".join(_text(category) for category in item.iterfind("category")),
+        source="arXiv"
+    )
+
+
+def parse_feed(stream, announce_types: Iterable[str] = ANNOUNCE_TYPES) -> Iterator[PaperResult]:
+    """
+    RSSフィードをストリーミングでパースし、論文を1件ずつ返す
+    
+    Args:
+        stream: フィードのバイトストリーム（レスポンスのrawなど）
+        announce_types: 収集するアナウンスの種類
+    
+    Yields:
+        論文
+    """
+    announce_types = set(announce_types)
+    for _, element in ET.iterparse(stream, events=("end",)):
+        if element.tag != "item":
+            continue
+        announce_type = _text(element.find(f"{_ARXIV}announce_type")) or "new"
+        if announce_type in announce_types:
+            paper = parse_item(element)
+            if paper is not None:
+                yield paper
+        # パース済みのitemは破棄してメモリ使用量を一定に保つ
+        element.clear()
+
+
+class ArxivRssCollector:
+    """arXivのカテゴリごとの新着論文フィードから論文を収集するクラス"""
+    
+    def __init__(
+        self,
+        categories: Sequence[str],
+        max_results: Optional[int] = None,
+        announce_types: Iterable[str] = ("new", "cross"),
+        feed_url_format: str = DEFAULT_FEED_URL_FORMAT,
+        max_workers: int = 8,
+        timeout: float = 60.0
+    ):
+        """
+        Args:
+            categories: 収集するカテゴリ（例: ["cs.AI", "cs.LG"]）
+            max_results: 返す最大論文数（Noneの場合は当日分すべて）
+            announce_types: 収集するアナウンスの種類（デフォルトは改訂を除く新規投稿とクロスリスト）
+            feed_url_format: カテゴリからフィードのURLを組み立てるフォーマット（スタブサーバー等に差し替え可能）
+            max_workers: 並行して取得するフィード数
+            timeout: 1リクエストのタイムアウト（秒）
+        """
+        if not categories:
+            raise ValueError("At least one arXiv category is required")
+        unknown = set(announce_types) - set(ANNOUNCE_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown announce types: {', '.join(sorted(unknown))}")
+        self.categories = list(categories)
+        self.max_results = max_results
+        self.announce_types = tuple(announce_types)
+        self.feed_url_format = feed_url_format
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.stats = {"feeds": 0, "items": 0, "duplicates": 0}
+        self._session: Optional["requests.Session"] = None
+        logger.info(f"ArxivRssCollector initialized with categories: {', '.join(self.categories)}")
+    
+    def get_session(self) -> "requests.Session":
+        """HTTPセッションを取得（初回のみ生成し、以降は接続を再利用）"""
+        if self._session is None:
+            self._session = new_session()
+        return self._session
+    
+    def fetch_category(self, category: str) -> List[PaperResult]:
+        """
+        1カテゴリのフィードを取得してパース
+        
+        Args:
+            category: カテゴリ
+        
+        Returns:
+            フィード内の論文のリスト（フィードの順序）
+        """
+        url = self.feed_url_format.format(category=category)
+        response = self.get_session().get(url, stream=True, timeout=deadline.timeout(self.timeout))
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            papers = list(parse_feed(response.raw, self.announce_types))
+        finally:
+            response.close()
+        logger.info(f"Fetched {len(papers)} papers from arXiv feed {category}")
+        return papers
+    
+    def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
+        """
+        全カテゴリのフィードを並行に取得し、指定日数以内にアナウンスされた論文を収集
+        
+        フィードには最新のアナウンス分しか含まれないため、days > 1 でもそれより前の論文は取得できない。
+        取得に失敗したカテゴリは除外し、すべて失敗した場合のみエラーとする
+        
+        Args:
+            days: 何日前までの論文を取得するか
+        
+        Returns:
+            論文情報のリスト（カテゴリの指定順、クロスリストの重複は最初のカテゴリを優先）
+        """
+        cutoff = (clock.now() - timedelta(days=days)).isoformat()
+        logger.info(f"Fetching arXiv feeds for {len(self.categories)} categories...")
+        workers = min(self.max_workers, len(self.categories))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arxiv-rss") as executor:
+            futures = [executor.submit(self.fetch_category, category) for category in self.categories]
+        
+        results = []
+        errors = []
+        for category, future in zip(self.categories, futures):
+            try:
+                results.append(future.result())
+                self.stats["feeds"] += 1
+            except Exception as e:
+                logger.warning(f"Failed to fetch arXiv feed {category}: {e}")
+                errors.append(e)
+        if errors and not results:
+            logger.error(f"Error collecting papers from arXiv feeds: {errors[0]}")
+            raise errors[0]
+        
+        papers = []
+        seen: Set[str] = set()
+        for feed in results:
+            for paper in feed:
+                self.stats["items"] += 1
+                if paper.id in seen:
+                    self.stats["duplicates"] += 1
+                    continue
+                seen.add(paper.id)
+                if paper.published and paper.published < cutoff:
+                    continue
+                papers.append(paper)
+        if self.max_results is not None:
+            papers = papers[:self.max_results]
+        logger.info(
+            f"Total papers collected: {len(papers)} "
+            f"({self.stats['duplicates']} cross-listed duplicates removed)"
+        )
+        return papers
+    
+    def collect_papers(self) -> List[PaperResult]:
+        """
+        最新論文を収集（デフォルト: 過去1日）
+        
+        Returns:
+            論文情報のリスト
+        """
+        return self.collect_recent_papers(days=1)
@@ -0,0 +1,317 @@
+"""Semantic Scholar論文収集モジュール"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src import clock, deadline
+from src.collectors.base import extract_arxiv_id, new_session
+from src.config import config
+from src.models import PaperResult
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.semanticscholar.org/graph/v1"
+
+# /paper/batch が1リクエストで受け付けるIDの上限
+BATCH_SIZE = 500
+
+# 取得するフィールド（bulk search / batch共通）
+PAPER_FIELDS = (
+    "title,abstract,authors,url,publicationDate,year,externalIds,"
+    "fieldsOfStudy,s2FieldsOfStudy,venue"
+)
+
+
+class RateLimiter:
+    """リクエスト間隔を一定以上に保つスレッドセーフなレートリミッター"""
+    
+    def __init__(
+        self,
+        min_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            min_interval: リクエスト間の最小間隔（秒）
+            clock: 現在時刻を返す関数（テスト用に差し替え可能）
+            sleep: 待機関数（テスト用に差し替え可能）
+        """
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+    
+    def wait(self) -> None:
+        """次のリクエストが許可されるまで待機"""
+        with self._lock:
+            now = self._clock()
+            delay = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.min_interval
+        if delay > 0:
+            self._sleep(delay)
+
+
+def to_scholar_id(paper: PaperResult) -> Optional[str]:
+    """
+    PaperResultからSemantic Scholarの検索用IDを取得
+    
+    Args:
+        paper: 論文
+    
+    Returns:
+        "ARXIV:2401.00001" 形式またはSemantic ScholarのpaperId（特定できない場合はNone）
+    """
+    if paper.source == "Semantic Scholar":
+        return paper.id
+    arxiv_id = extract_arxiv_id(paper.id)
+    return f"ARXIV:{arxiv_id}" if arxiv_id else None
+
+
+class SemanticScholarCollector:
+    """Semantic Scholar Graph APIを使用して論文を収集するクラス
+    
+    検索はbulk search（1ページ最大1000件、トークンによるページング）、
+    メタデータ取得は /paper/batch（1リクエスト最大500件）を使用し、
+    論文1件ごとのリクエストは行わない
+    """
+    
+    def __init__(
+        self,
+        search_query: str,
+        max_results: int = 5,
+        api_key: Optional[str] = None,
+        api_url: str = DEFAULT_API_URL,
+        min_interval: Optional[float] = None,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+        timeout: float = 30.0,
+        pool_size: int = 4
+    ):
+        """
+        Args:
+            search_query: 検索クエリ（bulk searchのクエリ構文）
+            max_results: 取得する最大論文数
+            api_key: Semantic Scholar APIキー（Noneの場合は設定から取得、空の場合はキーなし）
+            api_url: Graph APIのベースURL（テスト用のスタブサーバー等に差し替え可能）
+            min_interval: リクエスト間の最小間隔（秒）。Noneの場合はAPIキーありで1秒、なしで3秒
+            max_retries: 429 / 5xx応答時の最大リトライ回数
+            retry_delay: リトライ間隔の初期値（秒、指数的に増加）
+            timeout: 1リクエストのタイムアウト（秒）
+            pool_size: 接続プールのサイズ
+        """
+        self.search_query = search_query
+        self.max_results = max_results
+        self.api_key = config.SEMANTIC_SCHOLAR_API_KEY if api_key is None else api_key
+        self.api_url = api_url.rstrip("/")
+        if min_interval is None:
+            # キーなしは全利用者共有の枠のため、控えめな間隔にする
+            min_interval = 1.0 if self.api_key else 3.0
+        self.rate_limiter = RateLimiter(min_interval)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.request_count = 0
+        self._session: Optional["requests.Session"] = None
+        logger.info(f"SemanticScholarCollector initialized with query: {search_query}")
+    
+    def get_session(self) -> "requests.Session":
+        """
+        HTTPセッションを取得（初回のみ生成し、以降は接続を再利用）
+        
+        Returns:
+            requestsのセッション
+        """
+        if self._session is None:
+            self._session = new_session(
+                pool_size=self.pool_size,
+                headers={"x-api-key": self.api_key} if self.api_key else None
+            )
+        return self._session
+    
+    def close(self) -> None:
+        """HTTPセッションを閉じる"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _request(self, method: str, path: str, **kwargs):
+        """
+        レート制限とリトライ付きでAPIを呼び出す
+        
+        Args:
+            method: HTTPメソッド
+            path: APIのパス（例: "/paper/batch"）
+            **kwargs: requestsに渡す引数
+        
+        Returns:
+            デコードしたJSONレスポンス
+        
+        Raises:
+            requests.HTTPError: リトライ後も失敗した場合
+        """
+        session = self.get_session()
+        url = f"{self.api_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            self.request_count += 1
+            response = session.request(method, url, timeout=deadline.timeout(self.timeout), **kwargs)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or attempt == self.max_retries:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after else self.retry_delay * (2 ** attempt)
+            logger.warning(
+                f"Semantic Scholar returned {response.status_code}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+            )
+            time.sleep(delay)
+    
+    def _to_paper_result(self, data: dict) -> PaperResult:
+        """Graph APIのpaperオブジェクトをPaperResultに変換"""
+        published = data.get("publicationDate")
+        if published:
+            published = datetime.strptime(published, "%Y-%m-%d").isoformat()
+        elif data.get("year"):
+            published = datetime(data["year"], 1, 1).isoformat()
+        categories = [field["category"] for field in data.get("s2FieldsOfStudy") or []]
+        categories = list(dict.fromkeys(categories or data.get("fieldsOfStudy") or []))
+        return PaperResult(
+            id=data["paperId"],
+            title=data.get("title") or "",
+            authors=", ".join(author["name"] for author in data.get("authors") or []),
+            abstract=data.get("abstract") or "",
+            url=data.get("url") or f"https://www.semanticscholar.org/paper/{data['paperId']}",
+            published=published or "",
+            categories=", ".join(categories) or None,
+            source="Semantic Scholar"
+        )
+    
+    def search(self, published_since: Optional[datetime] = None) -> Iterator[dict]:
+        """
+        bulk searchで検索結果を公開日の降順に取得（トークンでページング）
+        
+        Args:
+            published_since: この日付以降に公開された論文に絞り込む
+        
+        Yields:
+            Graph APIのpaperオブジェクト
+        """
+        params = {
+            "query": self.search_query,
+            "fields": PAPER_FIELDS,
+            "sort": "publicationDate:desc",
+        }
+        if published_since is not None:
+            params["publicationDateOrYear"] = f"{published_since:%Y-%m-%d}:"
+        while True:
+            page = self._request("GET", "/paper/search/bulk", params=params)
+            yield from page.get("data") or []
+            token = page.get("token")
+            if not token:
+                return
+            params["token"] = token
+    
+    def fetch_papers(self, ids: Iterable[str]) -> Dict[str, PaperResult]:
+        """
+        /paper/batch で複数論文のメタデータを一括取得
+        
+        Args:
+            ids: Semantic ScholarのpaperIdまたは "ARXIV:2401.00001" 形式のID
+        
+        Returns:
+            指定したID → 論文の辞書（見つからなかったIDは含まない）
+        """
+        ids = list(dict.fromkeys(ids))
+        results: Dict[str, PaperResult] = {}
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start:start + BATCH_SIZE]
+            data = self._request(
+                "POST", "/paper/batch", params={"fields": PAPER_FIELDS}, json={"ids": chunk}
+            )
+            for paper_id, item in zip(chunk, data):
+                if item is not None:
+                    results[paper_id] = self._to_paper_result(item)
+        logger.info(f"Fetched {len(results)}/{len(ids)} papers from Semantic Scholar")
+        return results
+    
+    def enrich_papers(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        他のソースで収集した論文の欠けているメタデータをSemantic Scholarから補完
+        
+        アブストラクト・著者・分野・公開日のうち空のものだけを埋める。
+        リクエスト数は論文数 / 500 回（切り上げ）
+        
+        Args:
+            papers: 論文のリスト（インプレースで更新）
+        
+        Returns:
+            更新した論文のリスト
+        """
+        lookup = {paper_id: paper for paper in papers if (paper_id := to_scholar_id(paper))}
+        if not lookup:
+            return papers
+        fetched = self.fetch_papers(lookup)
+        for paper_id, found in fetched.items():
+            paper = lookup[paper_id]
+            paper.abstract = paper.abstract or found.abstract
+            paper.authors = paper.authors or found.authors
+            paper.categories = paper.categories or found.categories
+            paper.published = paper.published or found.published
+        return papers
+    
+    def collect_recent_papers(self, days: int = 1) -> List[PaperResult]:
+        """
+        指定日数以内に公開された論文を収集
+        
+        Args:
+            days: 何日前までの論文を取得するか
+        
+        Returns:
+            論文情報のリスト
+        """
+        try:
+            logger.info(f"Collecting papers from Semantic Scholar for last {days} days...")
+            cutoff_date = clock.now() - timedelta(days=days)
+            papers = []
+            
+            for item in self.search(published_since=cutoff_date):
+                paper = self._to_paper_result(item)
+                if not paper.abstract:
+                    # アブストラクトのない論文は要約できないためスキップ
+                    logger.debug(f"Paper {paper.id} has no abstract, skipping")
+                    continue
+                if paper.published and datetime.fromisoformat(paper.published) < cutoff_date.replace(
+                    hour=0, minute=0, second=0, microsecond=0
+                ):
+                    logger.debug(f"Paper {paper.id} is too old, skipping")
+                    continue
+                papers.append(paper)
+                logger.info(f"Collected paper: {paper.title}")
+                if len(papers) >= self.max_results:
+                    break
+            
+            logger.info(f"Total papers collected: {len(papers)} ({self.request_count} requests)")
+            return papers
+        
+        except Exception as e:
+            logger.error(f"Error collecting papers from Semantic Scholar: {e}")
+            raise
+    
+    def collect_papers(self) -> List[PaperResult]:
+        """
+        最新論文を収集（デフォルト: 過去1日）
+        
+        Returns:
+            論文情報のリスト
+        """
+        return self.collect_recent_papers(days=1)
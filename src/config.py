@@ -1,33 +1,208 @@
-"""環境変数と設定管理"""
+"""環境変数と設定管理
+
+設定値はインポート時ではなく参照時に環境変数から解決する。
+.envファイルも最初に設定値を参照した時点で一度だけ読み込む。
+"""
 
 import os
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Any, Callable, Optional
+
+
+_dotenv_loaded = False
+
+
+def _load_dotenv_once() -> None:
+    """.envファイルを初回のみ読み込む"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    from dotenv import load_dotenv
+    load_dotenv()
 
-load_dotenv()
+
+def parse_bool(value: str) -> bool:
+    """環境変数の文字列を真偽値に変換"""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class EnvSetting:
+    """参照時に環境変数から値を解決する設定ディスクリプタ"""
+    
+    def __init__(self, default: str, cast: Callable[[str], Any] = str, env: Optional[str] = None):
+        """
+        Args:
+            default: 環境変数が未設定の場合のデフォルト値
+            cast: 文字列から設定値への変換関数
+            env: 環境変数名（Noneの場合は属性名を使用）
+        """
+        self.default = default
+        self.cast = cast
+        self.env = env
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.env is None:
+            self.env = name
+    
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        _load_dotenv_once()
+        return self.cast(os.getenv(self.env, self.default))
 
 
 class Config:
     """アプリケーション設定クラス"""
     
     # OpenRouter API設定
-    OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
-    OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
+    OPENROUTER_API_KEY: str = EnvSetting("")
+    OPENROUTER_MODEL: str = EnvSetting("anthropic/claude-3.5-sonnet")
+    OPENROUTER_BASE_URL: str = EnvSetting("https://openrouter.ai/api/v1")
     
-    # Discord Webhook設定
-    DISCORD_WEBHOOK_URL: str = os.getenv("DISCORD_WEBHOOK_URL", "")
+    # 要約のバックエンド（"openrouter" / "openai_compatible" / "extractive" / "fake"）
+    # openai_compatibleはSUMMARIZER_BASE_URLのOpenAI互換API（同一ホストのllama.cpp / vLLMサーバーなど）で要約し、
+    # SUMMARIZER_MODELが空の場合はサーバーの GET /models が返す最初のモデルを使用。
+    # extractiveはAPIを呼ばずTextRankで要点を抽出し、fakeはAPIを呼ばずアブストラクトから決定的に要約
+    # SUMMARIZER_CONCURRENCY: 同時に要約する論文数（0の場合はバックエンドの既定値）
+    SUMMARIZER_BACKEND: str = EnvSetting("openrouter")
+    SUMMARIZER_BASE_URL: str = EnvSetting("http://localhost:8080/v1")
+    SUMMARIZER_API_KEY: str = EnvSetting("")
+    SUMMARIZER_MODEL: str = EnvSetting("")
+    SUMMARIZER_CONCURRENCY: int = EnvSetting("0", int)
+    
+    # Discord Webhook設定（カンマ区切りで複数指定した場合は非同期に並行配信）
+    DISCORD_WEBHOOK_URL: str = EnvSetting("")
     
     # 論文検索設定
-    ARXIV_SEARCH_QUERY: str = os.getenv("ARXIV_SEARCH_QUERY", "cat:cs.AI OR cat:cs.LG")
-    MAX_PAPERS_PER_DAY: int = int(os.getenv("MAX_PAPERS_PER_DAY", "5"))
+    ARXIV_SEARCH_QUERY: str = EnvSetting("cat:cs.AI OR cat:cs.LG")
+    MAX_PAPERS_PER_DAY: int = EnvSetting("5", int)
+    
+    # 収集ソース設定
+    # ENABLED_COLLECTORS: カンマ区切りで指定（"arxiv", "arxiv_oai", "arxiv_rss", "semantic_scholar"）。複数指定時は並行に収集
+    ENABLED_COLLECTORS: str = EnvSetting("arxiv")
+    COLLECTOR_TIMEOUT: float = EnvSetting("60", float)
+    
+    # arXiv APIレスポンスをarxivパッケージを使わずストリーミングでパースする（大きなページ・さかのぼり収集向け）
+    ARXIV_STREAMING_PARSER: bool = EnvSetting("false", parse_bool)
+    
+    # arXiv APIレスポンスのキャッシュ設定（HTTP_CACHE_DIRを指定した場合のみキャッシュする。例: ".cache/arxiv"）
+    # TTL内の同一クエリはネットワークに接続せず、TTL経過後はETag / Last-Modifiedで再検証する
+    HTTP_CACHE_DIR: str = EnvSetting("")
+    HTTP_CACHE_TTL: float = EnvSetting("600", float)
+    
+    # arXiv OAI-PMHハーベスト設定（ENABLED_COLLECTORSに"arxiv_oai"を指定した場合に使用）
+    # OAI_SETS: カンマ区切りのOAIセット（例: "cs,stat"）、OAI_METADATA_PREFIX: "arXiv" または "arXivRaw"
+    OAI_SETS: str = EnvSetting("cs")
+    OAI_METADATA_PREFIX: str = EnvSetting("arXiv")
+    OAI_CHECKPOINT_FILE: str = EnvSetting(".cache/oai_checkpoint.json")
+    
+    # arXiv新着フィード設定（ENABLED_COLLECTORSに"arxiv_rss"を指定した場合に使用）
+    # RSS_CATEGORIES: カンマ区切りのカテゴリ（空の場合はARXIV_SEARCH_QUERYの"cat:"から取得）
+    # RSS_ANNOUNCE_TYPES: 収集するアナウンスの種類（"new", "cross", "replace", "replace-cross"）
+    RSS_CATEGORIES: str = EnvSetting("")
+    RSS_ANNOUNCE_TYPES: str = EnvSetting("new,cross")
+    RSS_FEED_URL: str = EnvSetting("https://rss.arxiv.org/rss/{category}")
+    
+    # Semantic Scholar API設定（キーなしでも利用可能だが、共有枠のためレート制限が厳しい）
+    SEMANTIC_SCHOLAR_API_KEY: str = EnvSetting("")
+    SEMANTIC_SCHOLAR_QUERY: str = EnvSetting("machine learning")
+    
+    # 要約プロンプトの前処理設定（アブストラクトのLaTeX・URL・定型文除去とトークン上限）
+    PROMPT_COMPRESSION: bool = EnvSetting("true", parse_bool)
+    PROMPT_MAX_ABSTRACT_TOKENS: int = EnvSetting("512", int)
+    
+    # プロンプトキャッシュ（固定の指示をシステムプロンプトに分け、PROMPT_CACHE=autoではAnthropicのモデルに
+    # cache_controlを付ける。true / falseで全モデルに強制・無効化）と、要約のfew-shotの例のJSONファイル
+    PROMPT_CACHE: str = EnvSetting("auto")
+    SUMMARY_EXAMPLES_FILE: str = EnvSetting("")
+    
+    # トリアージ設定（TRIAGE_MODE=trueで安価なモデルが関連度を評価し、しきい値以上の論文のみ要約）
+    TRIAGE_MODE: bool = EnvSetting("false", parse_bool)
+    TRIAGE_MODEL: str = EnvSetting("openai/gpt-4o-mini")
+    TRIAGE_THRESHOLD: float = EnvSetting("0.5", float)
+    # TRIAGE_EXTRACTIVE_THRESHOLD以上・TRIAGE_THRESHOLD未満の論文は要約せず、抽出した要点で通知（1.0の場合は通知しない）
+    TRIAGE_EXTRACTIVE_THRESHOLD: float = EnvSetting("1.0", float)
+    TRIAGE_BATCH_SIZE: int = EnvSetting("10", int)
+    TRIAGE_INTERESTS: str = EnvSetting("")
+    
+    # 推定コストの算出に使うモデルの単価（"モデル=入力/出力[/キャッシュ済み入力]"、100万トークンあたりのUSD）
+    MODEL_PRICES: str = EnvSetting("openai/gpt-4o-mini=0.15/0.6/0.075,anthropic/claude-3.5-sonnet=3/15/0.3")
+    
+    # API使用量の予算（1回の実行・1日あたりのトークン数とMODEL_PRICESによる推定コスト（USD）、0の場合は無制限）
+    # 予算を超える論文は要約せずアブストラクトのみ通知する。1日の使用量はBUDGET_FILEに記録
+    BUDGET_RUN_TOKENS: int = EnvSetting("0", int)
+    BUDGET_RUN_COST: float = EnvSetting("0", float)
+    BUDGET_DAILY_TOKENS: int = EnvSetting("0", int)
+    BUDGET_DAILY_COST: float = EnvSetting("0", float)
+    BUDGET_FILE: str = EnvSetting(".cache/budget.json")
+    
+    # 抽出要約（要約がない論文はアブストラクトからTextRankで抽出したEXTRACTIVE_SENTENCES文の要点を通知）
+    EXTRACTIVE_FALLBACK: bool = EnvSetting("true", parse_bool)
+    EXTRACTIVE_SENTENCES: int = EnvSetting("3", int)
+    
+    # トピッククラスタリング設定（TOPIC_CLUSTERS=0の場合は論文数から自動決定）
+    # TOPIC_REPRESENTATIVES_ONLY=trueの場合は各クラスタの代表論文のみ要約
+    TOPIC_CLUSTERING: bool = EnvSetting("false", parse_bool)
+    TOPIC_CLUSTERS: int = EnvSetting("0", int)
+    TOPIC_REPRESENTATIVES_ONLY: bool = EnvSetting("false", parse_bool)
+    
+    # 著者ウォッチリスト（";"区切り。一致した論文はトリアージ・代表論文の選択に関わらず要約・通知）
+    # WATCHLIST_AUTHORSが空の場合はWATCHLIST_FILEに保存済みの著者リストを使用
+    WATCHLIST_AUTHORS: str = EnvSetting("")
+    WATCHLIST_FILE: str = EnvSetting(".cache/watchlist.json")
+    
+    # 全文要約の設定（FULLTEXT_MODE=trueでPDF全文をmap-reduceで要約）
+    FULLTEXT_MODE: bool = EnvSetting("false", parse_bool)
+    FULLTEXT_CACHE_DIR: str = EnvSetting(".cache/pdf")
+    FULLTEXT_MAX_PAGES: int = EnvSetting("50", int)
+    FULLTEXT_CHUNK_TOKENS: int = EnvSetting("1500", int)
+    FULLTEXT_MAX_CHUNKS: int = EnvSetting("12", int)
+    FULLTEXT_WORKERS: int = EnvSetting("4", int)
+    
+    # プロファイリング設定（--profile / --trace-memory の出力先と、ホットスポット表の行数）
+    PROFILE_DIR: str = EnvSetting(".cache/profile")
+    PROFILE_TOP: int = EnvSetting("25", int)
+    
+    # 実行の時間予算（"900" / "25m" / "1h30m" など、空の場合は制限なし。--deadline が優先）
+    # 要約はDEADLINE_NOTIFY_RESERVE秒を通知のために残して打ち切り、処理できなかった論文は
+    # DEFERRED_FILEに保存して次回の実行で先に処理する
+    RUN_DEADLINE: str = EnvSetting("")
+    DEADLINE_NOTIFY_RESERVE: float = EnvSetting("60", float)
+    DEFERRED_FILE: str = EnvSetting(".cache/deferred.json")
+    
+    # シャード実行の結果（--shard i/N の各シャードの shard-i-of-N.json）の出力先
+    SHARD_OUTPUT_DIR: str = EnvSetting(".cache/shards")
+    
+    # ジョブキュー設定（--enqueue / --worker で使用。"sqlite:///パス" または "redis://ホスト:ポート/DB"）
+    # リースの期限（JOB_VISIBILITY_TIMEOUT秒）までに完了しなかったジョブは他のワーカーが引き継ぐ
+    JOB_QUEUE_URL: str = EnvSetting("sqlite:///.cache/jobs.db")
+    JOB_VISIBILITY_TIMEOUT: float = EnvSetting("300", float)
+    JOB_MAX_ATTEMPTS: int = EnvSetting("5", int)
+    JOB_RETRY_DELAY: float = EnvSetting("30", float)
+    JOB_BATCH_SIZE: int = EnvSetting("1", int)
+    JOB_POLL_INTERVAL: float = EnvSetting("2", float)
+    
+    # 通知設定
+    # NOTIFY_MODE: "embed"（論文ごとに1メッセージ）または "digest"（まとめて送信）
+    NOTIFY_MODE: str = EnvSetting("embed")
+    DIGEST_GROUP_BY: str = EnvSetting("category")
+    DIGEST_MAX_MESSAGES: int = EnvSetting("5", int)
     
     # ログ設定
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = EnvSetting("INFO")
+    
+    # デーモンモード設定
+    # DAEMON_QUERIES: "クエリ@間隔秒" をセミコロン区切りで指定（例: "cat:cs.AI@900; cat:cs.LG@3600"）
+    DAEMON_QUERIES: str = EnvSetting("")
+    DAEMON_POLL_INTERVAL: int = EnvSetting("900", int)
+    DAEMON_HEALTH_PORT: int = EnvSetting("8080", int)
+    DAEMON_SEEN_CACHE_SIZE: int = EnvSetting("10000", int)
+    # 処理済み論文IDの保存先（再起動後も通知済みの論文を再送しない、空の場合は保存しない）
+    DAEMON_SEEN_FILE: str = EnvSetting(".cache/daemon_seen.json")
     
     @classmethod
     def validate(cls) -> bool:
         """必須設定の検証"""
-        if not cls.OPENROUTER_API_KEY:
+        # ローカルのサーバー・フェイクの要約器はOpenRouterのAPIキーを使用しない
+        if not cls.OPENROUTER_API_KEY and (cls.SUMMARIZER_BACKEND == "openrouter" or cls.TRIAGE_MODE):
             raise ValueError("OPENROUTER_API_KEY is required")
         if not cls.DISCORD_WEBHOOK_URL:
             raise ValueError("DISCORD_WEBHOOK_URL is required")
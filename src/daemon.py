@@ -0,0 +1,427 @@
+"""
+常駐（デーモン）モード
+
+コレクター・要約器・通知器を起動したまま保持し、設定されたクエリごとの
+間隔でarXivをポーリングして新着論文を随時処理する
+"""
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.collectors.arxiv_collector import ArxivCollector
+from src.collectors.registry import MultiSourceCollector
+from src.config import config
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QuerySchedule:
+    """クエリごとのポーリングスケジュールと実行状態"""
+
+    query: str
+    interval: float
+    next_run: float = 0.0
+    last_run: Optional[float] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    papers_processed: int = 0
+
+
+def parse_query_schedules(spec: str, default_query: str, default_interval: float) -> List[QuerySchedule]:
+    """
+    クエリスケジュール指定をパース
+
+    Args:
+        spec: "クエリ@間隔秒" のセミコロン区切り（例: "cat:cs.AI@900; cat:cs.LG"）
+        default_query: specが空の場合に使用するクエリ
+        default_interval: 間隔が省略された場合のポーリング間隔（秒）
+
+    Returns:
+        スケジュールのリスト
+
+    Raises:
+        ValueError: 間隔が正の数でない場合
+    """
+    entries = [entry.strip() for entry in spec.split(";") if entry.strip()] or [default_query]
+    schedules = []
+    for entry in entries:
+        query, separator, interval = entry.rpartition("@")
+        if not separator:
+            query, interval = entry, ""
+        interval_seconds = float(interval) if interval.strip() else float(default_interval)
+        if interval_seconds <= 0:
+            raise ValueError(f"Poll interval must be positive: {entry}")
+        schedules.append(QuerySchedule(query=query.strip(), interval=interval_seconds))
+    return schedules
+
+
+class SeenPapers:
+    """処理済み論文IDの上限付きLRU集合（長期稼働でもメモリが増え続けない）
+
+    pathを指定した場合は起動時にファイルから読み込み、save()でファイルに保存するため、
+    再起動しても通知済みの論文を再送しない
+    """
+
+    def __init__(self, max_size: int = 10000, path: Optional[str] = None):
+        """
+        Args:
+            max_size: 保持する論文IDの最大数
+            path: 保存先のJSONファイル（Noneの場合は保存しない）
+        """
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        for paper_id in self._load():
+            self.add(paper_id)
+
+    def _load(self) -> List[str]:
+        """保存済みの論文ID（ファイルがない・壊れている場合は空）"""
+        if self.path is None or not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return [str(paper_id) for paper_id in data]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable seen papers file {self.path}: {e}")
+            return []
+
+    def save(self) -> None:
+        """論文IDを古い順に保存（一時ファイルに書いてから置き換える）"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(list(self._ids), tmp_file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def add(self, paper_id: str) -> bool:
+        """
+        論文IDを追加
+
+        Returns:
+            新規の論文IDだった場合True
+        """
+        if paper_id in self._ids:
+            self._ids.move_to_end(paper_id)
+            return False
+        self._ids[paper_id] = None
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return True
+
+    def __contains__(self, paper_id: str) -> bool:
+        return paper_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class HealthServer:
+    """ヘルスチェック用HTTPエンドポイント（GET /health）"""
+
+    def __init__(self, status_provider: Callable[[], dict], host: str = "0.0.0.0", port: int = 8080):
+        """
+        Args:
+            status_provider: ステータス辞書を返す関数（"status"キーが"ok"以外なら503を返す）
+            host: バインドするホスト
+            port: バインドするポート（0の場合は空きポートを自動選択）
+        """
+        self.status_provider = status_provider
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple:
+        """実際にバインドされたアドレス"""
+        return self._server.server_address if self._server else (self.host, self.port)
+
+    def start(self) -> None:
+        """バックグラウンドスレッドでサーバーを起動"""
+        provider = self.status_provider
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/health", "/healthz"):
+                    self.send_error(404)
+                    return
+                status = provider()
+                body = json.dumps(status, ensure_ascii=False).encode("utf-8")
+                self.send_response(200 if status.get("status") == "ok" else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug("Health check: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Health endpoint listening on {self.address[0]}:{self.address[1]}")
+
+    def stop(self) -> None:
+        """サーバーを停止"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class PaperDaemon:
+    """クエリごとの間隔で論文を収集・要約・通知し続ける常駐プロセス"""
+
+    def __init__(
+        self,
+        bot,
+        schedules: List[QuerySchedule],
+        days: int = 1,
+        seen_cache_size: int = 10000,
+        seen_path: Optional[str] = None,
+        health_port: Optional[int] = None,
+        collector_factory: Optional[Callable[[str], object]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        profiler=None
+    ):
+        """
+        Args:
+            bot: 要約・通知に使用するResearchPaperBot（起動中は保持し続ける）
+            schedules: クエリごとのポーリングスケジュール
+            days: 各ポーリングで何日前までの論文を対象にするか
+            seen_cache_size: 処理済み論文IDを保持する最大数
+            seen_path: 処理済み論文IDの保存先のJSONファイル（Noneの場合は保存しない）
+            health_port: ヘルスチェックのポート（Noneの場合は起動しない）
+            collector_factory: クエリからコレクターを生成する関数
+                （Noneの場合はbotのarXivクライアントを共有するArxivCollectorを生成）
+            clock: 単調増加する時刻を返す関数
+            profiler: 収集ステージを計測するStageProfiler（Noneの場合は計測しない）
+        """
+        if not schedules:
+            raise ValueError("At least one query schedule is required")
+
+        self.bot = bot
+        self.schedules = schedules
+        self.days = days
+        self.seen = SeenPapers(seen_cache_size, seen_path)
+        self.clock = clock
+        self.profiler = profiler
+        self.started_at: Optional[float] = None
+        self.papers_processed = 0
+        self._stop_event = threading.Event()
+        self._health = HealthServer(self.health, port=health_port) if health_port is not None else None
+
+        self._arxiv_client = None
+        collector_factory = collector_factory or self._default_collector_factory
+        self.collectors: Dict[str, object] = {
+            schedule.query: collector_factory(schedule.query) for schedule in schedules
+        }
+        logger.info(
+            "PaperDaemon initialized: "
+            + ", ".join(f"{s.query!r} every {s.interval:g}s" for s in schedules)
+        )
+
+    @classmethod
+    def from_config(cls, bot, days: int = 1, health_port: Optional[int] = None, profiler=None) -> "PaperDaemon":
+        """
+        設定からデーモンを生成
+
+        Args:
+            bot: ResearchPaperBot
+            days: 各ポーリングで何日前までの論文を対象にするか
+            health_port: ヘルスチェックのポート（Noneの場合はDAEMON_HEALTH_PORT）
+            profiler: 収集ステージを計測するStageProfiler
+
+        Returns:
+            PaperDaemonインスタンス
+        """
+        schedules = parse_query_schedules(
+            config.DAEMON_QUERIES,
+            default_query=config.ARXIV_SEARCH_QUERY,
+            default_interval=config.DAEMON_POLL_INTERVAL
+        )
+        shortest = min(schedule.interval for schedule in schedules)
+        if config.HTTP_CACHE_DIR and config.HTTP_CACHE_TTL >= shortest:
+            logger.warning(
+                f"HTTP_CACHE_TTL ({config.HTTP_CACHE_TTL:g}s) is not shorter than the poll interval "
+                f"({shortest:g}s); polls may be served from cache and miss new papers"
+            )
+        return cls(
+            bot,
+            schedules,
+            days=days,
+            seen_cache_size=config.DAEMON_SEEN_CACHE_SIZE,
+            seen_path=config.DAEMON_SEEN_FILE or None,
+            health_port=health_port if health_port is not None else config.DAEMON_HEALTH_PORT,
+            profiler=profiler
+        )
+
+    def _default_collector_factory(self, query: str) -> ArxivCollector:
+        # arXivの利用規約上のリクエスト間隔はクエリ横断で守る必要があるため、クライアントを共有する
+        return ArxivCollector(
+            search_query=query,
+            max_results=config.MAX_PAPERS_PER_DAY,
+            client=self._shared_arxiv_client()
+        )
+
+    def _shared_arxiv_client(self):
+        """botのarXivクライアント（botがarXivを使わない場合は新規生成）を取得"""
+        if self._arxiv_client is None:
+            collector = self.bot.collector
+            if isinstance(collector, MultiSourceCollector):
+                collector = collector.collectors.get("arxiv")
+            if not isinstance(collector, ArxivCollector):
+                collector = ArxivCollector(search_query="")
+            self._arxiv_client = collector.get_client()
+        return self._arxiv_client
+
+    @property
+    def stopping(self) -> bool:
+        """停止要求を受けているか"""
+        return self._stop_event.is_set()
+
+    def stop(self, *_args) -> None:
+        """停止を要求（実行中のポーリングは完了してから停止する）"""
+        if not self._stop_event.is_set():
+            logger.info("Shutdown requested; finishing current cycle...")
+        self._stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """SIGTERM / SIGINTで停止するようシグナルハンドラを設定"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def run_query(self, schedule: QuerySchedule) -> int:
+        """
+        1クエリ分のポーリングを実行
+
+        Args:
+            schedule: 実行するスケジュール
+
+        Returns:
+            新たに処理した論文数
+        """
+        now = self.clock()
+        schedule.last_run = now
+        schedule.next_run = now + schedule.interval
+        schedule.runs += 1
+
+        try:
+            # 要約・通知はbotのステージとして計測されるため、収集のみここで計測する
+            with self.profiler.stage("collect_papers") if self.profiler is not None else nullcontext():
+                papers = self.collectors[schedule.query].collect_recent_papers(days=self.days)
+            # 同じ結果に重複する論文は1件にまとめる
+            new_papers = list({paper.id: paper for paper in papers if paper.id not in self.seen}.values())
+            logger.info(
+                f"Query {schedule.query!r}: {len(papers)} collected, {len(new_papers)} new"
+            )
+            error = None
+            handled = new_papers
+            if new_papers:
+                processed = self.bot.process_papers(new_papers)
+                results = self.bot.notify_papers(processed)
+                # 通知に失敗した論文と締め切りで次回に回した論文は処理済みにせず、次回のポーリングで再度処理する
+                retry = {paper.id for paper, delivered in zip(processed, results) if not delivered}
+                retry.update(paper.id for paper in getattr(self.bot, "deferred_papers", []))
+                handled = [paper for paper in new_papers if paper.id not in retry]
+                for paper in handled:
+                    self.seen.add(paper.id)
+                self.seen.save()
+                failed = len(processed) - sum(results)
+                if failed:
+                    error = f"Failed to notify {failed}/{len(processed)} papers"
+                    logger.warning(f"Query {schedule.query!r}: {error}; retrying on the next poll")
+            schedule.last_error = error
+            schedule.papers_processed += len(handled)
+            self.papers_processed += len(handled)
+            return len(handled)
+        except Exception as e:
+            schedule.last_error = str(e)
+            logger.error(f"Polling failed for query {schedule.query!r}: {e}", exc_info=True)
+            return 0
+
+    def run_pending(self) -> int:
+        """
+        実行時刻を過ぎたスケジュールを全て実行
+
+        Returns:
+            新たに処理した論文数
+        """
+        processed = 0
+        for schedule in sorted(self.schedules, key=lambda s: s.next_run):
+            if self.stopping or schedule.next_run > self.clock():
+                continue
+            processed += self.run_query(schedule)
+        return processed
+
+    def seconds_until_next_run(self) -> float:
+        """次のスケジュール実行までの秒数"""
+        next_run = min(schedule.next_run for schedule in self.schedules)
+        return max(0.0, next_run - self.clock())
+
+    def run_forever(self) -> None:
+        """停止要求を受けるまでポーリングを続ける"""
+        self.started_at = self.clock()
+        if self._health is not None:
+            self._health.start()
+        logger.info("PaperDaemon started")
+        try:
+            while not self.stopping:
+                self.run_pending()
+                self._stop_event.wait(timeout=self.seconds_until_next_run())
+        finally:
+            if self._health is not None:
+                self._health.stop()
+            self.bot.close()
+            logger.info(f"PaperDaemon stopped (processed {self.papers_processed} papers)")
+
+    def health(self) -> dict:
+        """
+        ヘルスチェック用のステータス
+
+        Returns:
+            ステータス辞書
+        """
+        now = self.clock()
+        return {
+            "status": "stopping" if self.stopping else "ok",
+            "uptime_seconds": round(now - self.started_at, 1) if self.started_at is not None else 0.0,
+            "papers_processed": self.papers_processed,
+            "seen_papers": len(self.seen),
+            "queries": [
+                {
+                    "query": schedule.query,
+                    "interval_seconds": schedule.interval,
+                    "runs": schedule.runs,
+                    "papers_processed": schedule.papers_processed,
+                    "seconds_since_last_run": (
+                        round(now - schedule.last_run, 1) if schedule.last_run is not None else None
+                    ),
+                    "seconds_until_next_run": round(max(0.0, schedule.next_run - now), 1),
+                    "last_error": schedule.last_error,
+                }
+                for schedule in self.schedules
+            ],
+        }
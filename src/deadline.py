@@ -0,0 +1,225 @@
+"""実行の締め切り（時間予算）
+
+--deadline で指定した時間予算を各ステージに伝える。実行中の締め切りはclock.frozenと同様に
+モジュール単位で有効化し、収集・要約・通知の各リクエストはtimeout()で残り時間に応じて
+短くしたタイムアウトを使う。時間内に処理しきれなかった論文はDeferredPapersに保存し、
+次回の実行で優先して処理する
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from src.models import PaperResult
+
+logger = logging.getLogger(__name__)
+
+# 残り時間がこれより短くてもリクエストのタイムアウトはこの値を下回らない（秒）
+MIN_REQUEST_TIMEOUT = 1.0
+
+_DURATION = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m)?(?:(\d+(?:\.\d+)?)s?)?")
+
+_lock = threading.Lock()
+_active: Optional["Deadline"] = None
+
+
+class DeadlineExceeded(TimeoutError):
+    """締め切りを過ぎたため処理を打ち切った"""
+
+
+def parse_duration(value: str) -> float:
+    """
+    時間の文字列を秒数に変換
+    
+    Args:
+        value: "900"（秒）/ "45s" / "25m" / "1h30m" など
+    
+    Returns:
+        秒数
+    
+    Raises:
+        ValueError: 形式が不正な場合、または0以下の場合
+    """
+    match = _DURATION.fullmatch(value.strip().lower())
+    if not value.strip() or match is None:
+        raise ValueError(f"Invalid duration (expected e.g. 900, 45s, 25m, 1h30m): {value}")
+    hours, minutes, seconds = (float(part) if part else 0.0 for part in match.groups())
+    total = hours * 3600 + minutes * 60 + seconds
+    if total <= 0:
+        raise ValueError(f"Duration must be positive: {value}")
+    return total
+
+
+class Deadline:
+    """生成時点から指定秒数後に期限を迎える締め切り"""
+    
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            seconds: 時間予算（秒）
+            clock: 単調増加する現在時刻（秒）を返す関数
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+    
+    def reserve(self, seconds: float) -> "Deadline":
+        """
+        後続のステージのためにseconds秒を残した、このステージ用の締め切り
+        
+        Args:
+            seconds: 残しておく時間（秒）
+        
+        Returns:
+            seconds秒早く期限を迎える締め切り
+        """
+        stage = Deadline(0.0, self.clock)
+        stage.seconds = max(0.0, self.seconds - seconds)
+        stage.expires_at = self.expires_at - seconds
+        return stage
+    
+    def remaining(self) -> float:
+        """残り時間（秒、期限後は0）"""
+        return max(0.0, self.expires_at - self.clock())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def timeout(self, default: float, reserve: float = 0.0) -> float:
+        """
+        1リクエストのタイムアウト
+        
+        Args:
+            default: 締め切りがない場合のタイムアウト（秒）
+            reserve: 後続の処理のために残しておく時間（秒）
+        
+        Returns:
+            defaultと（残り時間 - reserve）の小さい方（MIN_REQUEST_TIMEOUT以上）
+        """
+        return max(MIN_REQUEST_TIMEOUT, min(default, self.remaining() - reserve))
+    
+    def check(self, what: str = "operation") -> None:
+        """
+        期限を過ぎていれば例外を送出
+        
+        Raises:
+            DeadlineExceeded: 期限を過ぎた場合
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.0f}s exceeded before {what}")
+
+
+def current() -> Optional[Deadline]:
+    """active()で有効化中の締め切り（なければNone）"""
+    return _active
+
+
+@contextmanager
+def active(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    ブロック内で締め切りを有効化（Noneの場合は何もしない）
+    
+    Args:
+        deadline: 有効化する締め切り
+    
+    Yields:
+        有効化した締め切り
+    """
+    global _active
+    if deadline is None:
+        yield None
+        return
+    with _lock:
+        previous, _active = _active, deadline
+    try:
+        yield deadline
+    finally:
+        with _lock:
+            _active = previous
+
+
+def timeout(default: float) -> float:
+    """
+    有効な締め切りに応じて短くした1リクエストのタイムアウト
+    
+    Args:
+        default: 通常のタイムアウト（秒）
+    
+    Returns:
+        締め切りがない場合はdefault、ある場合はdefaultと残り時間の小さい方
+    
+    Raises:
+        DeadlineExceeded: 締め切りを過ぎている場合
+    """
+    deadline = _active
+    if deadline is None:
+        return default
+    deadline.check("request")
+    return deadline.timeout(default)
+
+
+def priority_order(papers: List[PaperResult]) -> List[PaperResult]:
+    """
+    締め切りまでに処理しきれない場合に備え、重要な論文から順に並べる
+    
+    ウォッチ中の著者の論文 → 関連度（トリアージのスコア）の高い順 → 公開日の新しい順。
+    関連度のない論文は関連度のある論文の後に並べる
+    
+    Args:
+        papers: 論文のリスト
+    
+    Returns:
+        優先度順に並べた新しいリスト
+    """
+    by_recency = sorted(papers, key=lambda paper: paper.published or "", reverse=True)
+    return sorted(by_recency, key=lambda paper: (
+        not paper.watched_authors,
+        paper.relevance_score is None,
+        -(paper.relevance_score or 0.0),
+    ))
+
+
+class DeferredPapers:
+    """締め切りまでに要約・通知できなかった論文を次回の実行に引き継ぐファイル"""
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 保存先のJSONファイル
+        """
+        self.path = Path(path)
+    
+    def load(self) -> List[PaperResult]:
+        """保存済みの論文（ファイルがない・壊れている場合は空）"""
+        if not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return [PaperResult(**item) for item in data]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable deferred papers file {self.path}: {e}")
+            return []
+    
+    def save(self, papers: List[PaperResult]) -> None:
+        """論文を保存（空の場合はファイルを削除）"""
+        if not papers:
+            self.path.unlink(missing_ok=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump([asdict(paper) for paper in papers], tmp_file, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
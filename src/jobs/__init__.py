@@ -0,0 +1,25 @@
+"""複数ワーカーで要約・通知を分担するジョブキューモジュール
+
+RedisJobQueueはredis-pyに依存するため、``src.jobs.redis_queue`` から直接インポートするか
+``open_queue("redis://...")`` で生成する
+"""
+
+from .base import DEAD, DONE, LEASED, NOTIFY, READY, SUMMARIZE, Job, JobQueue, open_queue
+from .sqlite_queue import SqliteJobQueue
+from .worker import JobWorker, enqueue_papers, job_key
+
+__all__ = [
+    "DEAD",
+    "DONE",
+    "LEASED",
+    "NOTIFY",
+    "READY",
+    "SUMMARIZE",
+    "Job",
+    "JobQueue",
+    "JobWorker",
+    "SqliteJobQueue",
+    "enqueue_papers",
+    "job_key",
+    "open_queue",
+]
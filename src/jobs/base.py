@@ -0,0 +1,95 @@
+"""ジョブキューの共通インターフェース
+
+キューはリース（lease）/ 完了通知（ack）方式で動作する。claimしたジョブは可視性タイムアウトの間
+他のワーカーから見えなくなり、期限までにackされなければ（ワーカーが停止した場合など）再び
+claim可能になる。ジョブはキー（"summarize:<論文ID>" など）で一意になり、完了済みのキーを
+再投入しても無視されるため、同じ論文が複数のプロデューサーから投入されても1回だけ処理される
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Protocol, runtime_checkable
+from urllib.parse import urlsplit
+
+# ジョブの種類
+SUMMARIZE = "summarize"
+NOTIFY = "notify"
+
+# ジョブの状態
+READY = "ready"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    """claimしたジョブ"""
+    
+    id: str
+    kind: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease: str
+
+
+@runtime_checkable
+class JobQueue(Protocol):
+    """ジョブキューのプロトコル
+    
+    SqliteJobQueue（単一ホスト・複数プロセス）/ RedisJobQueue（複数ホスト）が満たすインターフェース
+    """
+    
+    def enqueue(self, kind: str, key: str, payload: Dict[str, Any], priority: int = 0) -> bool:
+        """ジョブを投入（同じキーのジョブが投入済み・完了済みの場合はFalse）"""
+        ...
+    
+    def claim(self, kinds: Iterable[str], worker: str, limit: int = 1) -> List[Job]:
+        """実行可能なジョブを優先度の高い順に最大limit件リース"""
+        ...
+    
+    def extend(self, job: Job) -> bool:
+        """リースを可視性タイムアウト分延長（リースを失っている場合はFalse）"""
+        ...
+    
+    def ack(self, job: Job) -> bool:
+        """ジョブを完了（リースを失っている場合はFalse）"""
+        ...
+    
+    def fail(self, job: Job, error: str) -> bool:
+        """ジョブを失敗として再試行待ちに戻す（試行回数の上限に達した場合はdead）"""
+        ...
+    
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのジョブ数"""
+        ...
+    
+    def close(self) -> None:
+        """接続を閉じる"""
+        ...
+
+
+def open_queue(url: str, **kwargs) -> JobQueue:
+    """
+    URLからジョブキューを生成
+    
+    Args:
+        url: "sqlite:///path/to/jobs.db"（相対パス）/ "sqlite:////abs/path.db" /
+            "redis://host:6379/0"
+        **kwargs: キューに渡す引数（visibility_timeout / max_attempts / retry_delay など）
+    
+    Returns:
+        ジョブキュー
+    
+    Raises:
+        ValueError: 未対応のスキームの場合
+    """
+    scheme = urlsplit(url).scheme
+    if scheme == "sqlite":
+        from .sqlite_queue import SqliteJobQueue
+        return SqliteJobQueue(url[len("sqlite:///"):], **kwargs)
+    if scheme in ("redis", "rediss"):
+        # redis-pyはRedisを使用する場合のみインポート
+        from .redis_queue import RedisJobQueue
+        return RedisJobQueue.from_url(url, **kwargs)
+    raise ValueError(f"Unsupported job queue URL: {url} (expected sqlite:/// or redis://)")
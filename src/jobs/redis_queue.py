@@ -0,0 +1,215 @@
+"""Redisによるジョブキュー
+
+複数ホストのワーカーで1つのキューを共有する。各操作はLuaスクリプトでアトミックに実行する
+
+キー構成（prefix = "paperbot:jobs" など）:
+    {prefix}:seq            ジョブIDの採番
+    {prefix}:keys           ジョブのキー → ジョブID（完了後は "done"。重複投入の判定に使用）
+    {prefix}:job:{id}       ジョブの内容（hash）
+    {prefix}:ready:{kind}   実行可能なジョブ（sorted set、スコアは優先度と投入順）
+    {prefix}:delayed        再試行待ちのジョブ（sorted set、スコアは実行可能になる時刻）
+    {prefix}:leased         リース中のジョブ（sorted set、スコアはリースの期限）
+    {prefix}:dead           試行回数の上限に達したジョブ
+    {prefix}:done           完了したジョブ数
+
+このモジュールはredis-pyに依存するため、JOB_QUEUE_URLにredis://を指定した場合にのみインポートする
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List
+
+from src.lazy_import import LazyImporter
+
+from .base import DEAD, DONE, LEASED, READY, Job
+
+logger = logging.getLogger(__name__)
+
+_lazy = LazyImporter(__name__, {"redis": "redis"})
+__getattr__ = _lazy.module_getattr
+
+# 優先度と投入順を1つのスコアにまとめる（優先度が高いほど、同じ優先度では投入順に小さい値）
+_PRIORITY_SCALE = 2 ** 32
+
+_ENQUEUE = """
+local prefix, kind, key, payload = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local priority, now = tonumber(ARGV[5]), ARGV[6]
+if redis.call('HSETNX', prefix .. ':keys', key, 'pending') == 0 then
+    return 0
+end
+local id = redis.call('INCR', prefix .. ':seq')
+redis.call('HSET', prefix .. ':keys', key, id)
+redis.call('HSET', prefix .. ':job:' .. id, 'kind', kind, 'key', key, 'payload', payload,
+    'priority', priority, 'attempts', 0, 'lease', '', 'updated_at', now)
+redis.call('ZADD', prefix .. ':ready:' .. kind, -priority * %(scale)d + id, id)
+return 1
+""" % {"scale": _PRIORITY_SCALE}
+
+_CLAIM = """
+local prefix, now, timeout = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local limit, max_attempts, worker, token = tonumber(ARGV[4]), tonumber(ARGV[5]), ARGV[6], ARGV[7]
+-- リース期限切れ・再試行待ちを過ぎたジョブを実行可能に戻す
+for _, queue in ipairs({prefix .. ':leased', prefix .. ':delayed'}) do
+    for _, id in ipairs(redis.call('ZRANGEBYSCORE', queue, '-inf', now)) do
+        redis.call('ZREM', queue, id)
+        local job = prefix .. ':job:' .. id
+        local kind, priority = unpack(redis.call('HMGET', job, 'kind', 'priority'))
+        redis.call('HSET', job, 'lease', '')
+        redis.call('ZADD', prefix .. ':ready:' .. kind, -tonumber(priority) * %(scale)d + tonumber(id), id)
+    end
+end
+local claimed = {}
+for index = 8, #ARGV do
+    local ready = prefix .. ':ready:' .. ARGV[index]
+    while #claimed < limit do
+        local top = redis.call('ZRANGE', ready, 0, 0)
+        if #top == 0 then
+            break
+        end
+        local id = top[1]
+        redis.call('ZREM', ready, id)
+        local job = prefix .. ':job:' .. id
+        local attempts = tonumber(redis.call('HGET', job, 'attempts'))
+        if attempts >= max_attempts then
+            redis.call('HSET', job, 'lease', '', 'error', 'lease expired too many times')
+            redis.call('ZADD', prefix .. ':dead', now, id)
+        else
+            local lease = token .. ':' .. id
+            redis.call('HSET', job, 'attempts', attempts + 1, 'lease', lease, 'worker', worker, 'updated_at', now)
+            redis.call('ZADD', prefix .. ':leased', now + timeout, id)
+            local kind, key, payload = unpack(redis.call('HMGET', job, 'kind', 'key', 'payload'))
+            table.insert(claimed, {id, kind, key, payload, attempts + 1, lease})
+        end
+    end
+end
+return claimed
+""" % {"scale": _PRIORITY_SCALE}
+
+# ARGV: prefix, id, lease, now, 操作, 操作ごとの引数
+_SETTLE = """
+local prefix, id, lease, now, action = ARGV[1], ARGV[2], ARGV[3], tonumber(ARGV[4]), ARGV[5]
+local job = prefix .. ':job:' .. id
+if redis.call('HGET', job, 'lease') ~= lease or not redis.call('ZSCORE', prefix .. ':leased', id) then
+    return 0
+end
+if action == 'extend' then
+    redis.call('ZADD', prefix .. ':leased', now + tonumber(ARGV[6]), id)
+    return 1
+end
+redis.call('ZREM', prefix .. ':leased', id)
+if action == 'ack' then
+    redis.call('HSET', prefix .. ':keys', redis.call('HGET', job, 'key'), 'done')
+    redis.call('DEL', job)
+    redis.call('INCR', prefix .. ':done')
+elseif action == 'dead' then
+    redis.call('HSET', job, 'lease', '', 'error', ARGV[6], 'updated_at', now)
+    redis.call('ZADD', prefix .. ':dead', now, id)
+else
+    redis.call('HSET', job, 'lease', '', 'error', ARGV[6], 'updated_at', now)
+    redis.call('ZADD', prefix .. ':delayed', now + tonumber(ARGV[7]), id)
+end
+return 1
+"""
+
+
+class RedisJobQueue:
+    """Redisをジョブキューとして使用するクラス（複数ホストのワーカーで共有可能）
+    
+    リースの期限はワーカーの時計で計算するため、ホスト間の時刻はNTPなどで同期しておくこと
+    """
+    
+    def __init__(
+        self,
+        client,
+        prefix: str = "paperbot:jobs",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            client: redis.Redisクライアント（decode_responses=True）
+            prefix: キーの接頭辞
+            visibility_timeout: リースの有効期間（秒）
+            max_attempts: ジョブをdeadにするまでの最大試行回数
+            retry_delay: 失敗したジョブを再試行するまでの待機時間（秒、試行回数に比例して延長）
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        self.client = client
+        self.prefix = prefix
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+        self._enqueue = client.register_script(_ENQUEUE)
+        self._claim = client.register_script(_CLAIM)
+        self._settle = client.register_script(_SETTLE)
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisJobQueue":
+        """
+        URLからキューを生成
+        
+        Args:
+            url: "redis://host:6379/0"
+            **kwargs: RedisJobQueueに渡す引数
+        
+        Returns:
+            ジョブキュー
+        """
+        return cls(_lazy.redis.Redis.from_url(url, decode_responses=True), **kwargs)
+    
+    def enqueue(self, kind: str, key: str, payload: Dict[str, Any], priority: int = 0) -> bool:
+        """ジョブを投入（同じキーのジョブが投入済み・完了済みの場合はFalse）"""
+        added = self._enqueue(args=[
+            self.prefix, kind, key, json.dumps(payload, ensure_ascii=False), int(priority), self.clock()
+        ])
+        return bool(added)
+    
+    def claim(self, kinds: Iterable[str], worker: str, limit: int = 1) -> List[Job]:
+        """実行可能なジョブを優先度の高い順に最大limit件リース"""
+        rows = self._claim(args=[
+            self.prefix, self.clock(), self.visibility_timeout, limit, self.max_attempts,
+            worker, uuid.uuid4().hex, *kinds
+        ])
+        return [
+            Job(id=str(job_id), kind=kind, key=key, payload=json.loads(payload), attempts=int(attempts), lease=lease)
+            for job_id, kind, key, payload, attempts, lease in rows
+        ]
+    
+    def _settle_job(self, job: Job, action: str, *args) -> bool:
+        return bool(self._settle(args=[self.prefix, job.id, job.lease, self.clock(), action, *args]))
+    
+    def extend(self, job: Job) -> bool:
+        """リースを現在時刻から可視性タイムアウト分延長（リースを失っている場合はFalse）"""
+        return self._settle_job(job, "extend", self.visibility_timeout)
+    
+    def ack(self, job: Job) -> bool:
+        """ジョブを完了（リースを失っている場合はFalse）"""
+        return self._settle_job(job, "ack")
+    
+    def fail(self, job: Job, error: str) -> bool:
+        """ジョブを失敗として再試行待ちに戻す（試行回数の上限に達した場合はdead）"""
+        if job.attempts >= self.max_attempts:
+            return self._settle_job(job, "dead", error)
+        return self._settle_job(job, "retry", error, self.retry_delay * job.attempts)
+    
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのジョブ数（リース期限切れ・待機時間を過ぎた再試行待ちのジョブはreadyに含める）"""
+        now = self.clock()
+        ready = sum(self.client.zcard(key) for key in self.client.scan_iter(f"{self.prefix}:ready:*"))
+        expired = self.client.zcount(f"{self.prefix}:leased", "-inf", now)
+        waiting = self.client.zcard(f"{self.prefix}:delayed")
+        return {
+            READY: ready + expired + waiting,
+            LEASED: self.client.zcard(f"{self.prefix}:leased") - expired,
+            DONE: int(self.client.get(f"{self.prefix}:done") or 0),
+            DEAD: self.client.zcard(f"{self.prefix}:dead"),
+        }
+    
+    def close(self) -> None:
+        """接続を閉じる"""
+        self.client.close()
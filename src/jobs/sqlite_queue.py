@@ -0,0 +1,232 @@
+"""SQLiteによるジョブキュー
+
+1つのデータベースファイルを同じホストの複数プロセスで共有する。claimは
+BEGIN IMMEDIATEのトランザクション内で選択と更新を行うため、同じジョブを
+2つのワーカーが同時にリースすることはない。WALモードで読み書きの競合を抑える
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+from .base import DEAD, DONE, LEASED, READY, Job
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease TEXT,
+    worker TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (kind, state, priority DESC, id);
+"""
+
+
+class SqliteJobQueue:
+    """SQLiteのテーブルをジョブキューとして使用するクラス
+    
+    available_atはREADYのジョブでは実行可能になる時刻（再試行の待機）、
+    LEASEDのジョブではリースの期限を表す。期限を過ぎたLEASEDのジョブはREADYと同様にclaimできる
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            path: データベースファイルのパス（":memory:" はテスト用の単一接続）
+            visibility_timeout: リースの有効期間（秒）
+            max_attempts: ジョブをdeadにするまでの最大試行回数
+            retry_delay: 失敗したジョブを再試行するまでの待機時間（秒、試行回数に比例して延長）
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # 接続はスレッド間で共有し、ロックで直列化する（プロセス間はSQLiteのロックで直列化）
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+    
+    def enqueue(self, kind: str, key: str, payload: Dict[str, Any], priority: int = 0) -> bool:
+        """
+        ジョブを投入
+        
+        Args:
+            kind: ジョブの種類
+            key: ジョブを一意に識別するキー
+            payload: ジョブの内容（JSONに変換できる辞書）
+            priority: 優先度（大きいほど先に実行）
+        
+        Returns:
+            投入した場合True（同じキーのジョブが投入済み・完了済みの場合はFalse）
+        """
+        now = self.clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, kind, payload, priority, state, available_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), priority, READY, now, now)
+            )
+        return cursor.rowcount == 1
+    
+    def claim(self, kinds: Iterable[str], worker: str, limit: int = 1) -> List[Job]:
+        """
+        実行可能なジョブ（READYで待機時間を過ぎたもの・リース期限切れのもの）をリース
+        
+        試行回数が上限に達しているジョブ（ワーカーの停止が繰り返された場合など）はdeadにする
+        
+        Args:
+            kinds: claimするジョブの種類
+            worker: ワーカー名（デバッグ用に記録）
+            limit: 最大件数
+        
+        Returns:
+            リースしたジョブ（優先度の高い順、同じ優先度では投入順）
+        """
+        kinds = list(kinds)
+        now = self.clock()
+        placeholders = ",".join("?" * len(kinds))
+        claimed: List[Job] = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while len(claimed) < limit:
+                    rows = self._conn.execute(
+                        f"SELECT id, kind, key, payload, attempts FROM jobs "
+                        f"WHERE kind IN ({placeholders}) AND state IN (?, ?) AND available_at <= ? "
+                        f"ORDER BY priority DESC, id LIMIT ?",
+                        (*kinds, READY, LEASED, now, limit - len(claimed))
+                    ).fetchall()
+                    if not rows:
+                        break
+                    for job_id, kind, key, payload, attempts in rows:
+                        if attempts >= self.max_attempts:
+                            logger.warning(f"Job {key} exceeded {self.max_attempts} attempts; marking dead")
+                            self._conn.execute(
+                                "UPDATE jobs SET state = ?, lease = NULL, error = COALESCE(error, ?), updated_at = ? "
+                                "WHERE id = ?",
+                                (DEAD, "lease expired too many times", now, job_id)
+                            )
+                            continue
+                        lease = uuid.uuid4().hex
+                        self._conn.execute(
+                            "UPDATE jobs SET state = ?, attempts = attempts + 1, lease = ?, worker = ?, "
+                            "available_at = ?, updated_at = ? WHERE id = ?",
+                            (LEASED, lease, worker, now + self.visibility_timeout, now, job_id)
+                        )
+                        claimed.append(Job(
+                            id=str(job_id),
+                            kind=kind,
+                            key=key,
+                            payload=json.loads(payload),
+                            attempts=attempts + 1,
+                            lease=lease
+                        ))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return claimed
+    
+    def _update_leased(self, job: Job, assignments: str, params: tuple) -> bool:
+        """リースが一致するジョブを更新（リースを失っている場合はFalse）"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND lease = ? AND state = ?",
+                (*params, self.clock(), int(job.id), job.lease, LEASED)
+            )
+        return cursor.rowcount == 1
+    
+    def extend(self, job: Job) -> bool:
+        """
+        リースを現在時刻から可視性タイムアウト分延長
+        
+        Args:
+            job: claimしたジョブ
+        
+        Returns:
+            延長した場合True（リース期限が切れて他のワーカーがclaimした場合はFalse）
+        """
+        return self._update_leased(job, "available_at = ?", (self.clock() + self.visibility_timeout,))
+    
+    def ack(self, job: Job) -> bool:
+        """
+        ジョブを完了（キーは残すため、同じキーの再投入は無視される）
+        
+        Args:
+            job: claimしたジョブ
+        
+        Returns:
+            完了した場合True（リースを失っている場合はFalse）
+        """
+        return self._update_leased(job, "state = ?, lease = NULL, payload = '{}'", (DONE,))
+    
+    def fail(self, job: Job, error: str) -> bool:
+        """
+        ジョブを失敗として再試行待ちに戻す（試行回数の上限に達した場合はdead）
+        
+        Args:
+            job: claimしたジョブ
+            error: エラー内容
+        
+        Returns:
+            更新した場合True（リースを失っている場合はFalse）
+        """
+        if job.attempts >= self.max_attempts:
+            return self._update_leased(job, "state = ?, lease = NULL, error = ?", (DEAD, error))
+        available_at = self.clock() + self.retry_delay * job.attempts
+        return self._update_leased(
+            job, "state = ?, lease = NULL, error = ?, available_at = ?", (READY, error, available_at)
+        )
+    
+    def counts(self) -> Dict[str, int]:
+        """
+        状態ごとのジョブ数
+        
+        Returns:
+            {"ready": ..., "leased": ..., "done": ..., "dead": ...}（リース期限切れのジョブはreadyに含める）
+        """
+        now = self.clock()
+        counts = {READY: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT CASE WHEN state = ? AND available_at <= ? THEN ? ELSE state END, COUNT(*) "
+                "FROM jobs GROUP BY 1",
+                (LEASED, now, READY)
+            ).fetchall()
+        for state, count in rows:
+            counts[state] = counts.get(state, 0) + count
+        return counts
+    
+    def close(self) -> None:
+        """接続を閉じる"""
+        with self._lock:
+            self._conn.close()
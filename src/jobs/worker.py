@@ -0,0 +1,263 @@
+"""ジョブキューのプロデューサーとワーカー
+
+プロデューサー（enqueue_papers）は収集・選別した論文を要約ジョブ（要約しない論文は通知ジョブ）
+として投入し、ワーカー（JobWorker）は任意の数のプロセス・ホストでジョブをclaimして処理する。
+要約ジョブは要約した論文を通知ジョブとして投入してから完了し、通知ジョブは送信後に完了する。
+処理中はリースを定期的に延長し、ワーカーが停止した場合は可視性タイムアウト後に他のワーカーが
+引き継ぐ。ジョブのキーは論文ごとに一意なため、引き継ぎや再投入で同じ論文の通知ジョブが
+重複することはない（送信後・完了前にワーカーが停止した場合のみ再送される）
+
+API使用量の予算（BUDGET_*）はワーカーごとに適用し、1回の実行の上限はワーカーの起動から
+停止までを1回として数える。1日の上限は予算のファイルを通じて他のワーカーと共有する
+"""
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import asdict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..models import PaperResult
+from ..summarizers.base import summarize_all
+from .base import NOTIFY, SUMMARIZE, Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def job_key(kind: str, paper: PaperResult) -> str:
+    """論文のジョブキー（"summarize:<論文ID>" / "notify:<論文ID>"）"""
+    return f"{kind}:{paper.id}"
+
+
+def enqueue_papers(
+    queue: JobQueue,
+    papers: Sequence[PaperResult],
+    targets: Optional[Sequence[PaperResult]] = None
+) -> int:
+    """
+    論文をジョブとして投入
+    
+    Args:
+        queue: ジョブキュー
+        papers: 通知する論文
+        targets: 要約する論文（papersの一部、Noneの場合は全件。それ以外の論文は要約せずに通知）
+    
+    Returns:
+        新たに投入したジョブ数（投入済み・完了済みの論文は数えない）
+    """
+    target_ids = {id(paper) for paper in (papers if targets is None else targets)}
+    added = 0
+    for paper in papers:
+        kind = SUMMARIZE if id(paper) in target_ids else NOTIFY
+        # ウォッチ中の著者の論文を優先
+        priority = 1 if paper.watched_authors else 0
+        added += queue.enqueue(kind, job_key(kind, paper), {"paper": asdict(paper)}, priority=priority)
+    logger.info(f"Enqueued {added} new jobs for {len(papers)} papers")
+    return added
+
+
+class JobWorker:
+    """ジョブをclaimして要約・通知するワーカー"""
+    
+    def __init__(
+        self,
+        bot,
+        queue: JobQueue,
+        name: Optional[str] = None,
+        kinds: Iterable[str] = (NOTIFY, SUMMARIZE),
+        batch_size: int = 1,
+        notify_batch_size: int = 10,
+        poll_interval: float = 2.0,
+        heartbeat_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            bot: 要約器・通知器を持つResearchPaperBot
+            queue: ジョブキュー
+            name: ワーカー名（Noneの場合は "ホスト名:PID"）
+            kinds: 処理するジョブの種類（先に指定した種類を優先）
+            batch_size: 1回にclaimする要約ジョブ数（全文要約ではPDFをまとめて先読みする）
+            notify_batch_size: 1回にclaimする通知ジョブ数（ダイジェスト形式では1メッセージにまとめる）
+            poll_interval: キューが空の場合の待機時間（秒）
+            heartbeat_interval: リースを延長する間隔（秒、Noneの場合は可視性タイムアウトの1/3）
+        """
+        self.bot = bot
+        self.queue = queue
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = list(kinds)
+        self.batch_size = batch_size
+        self.notify_batch_size = notify_batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = getattr(queue, "max_attempts", 5)
+        timeout = getattr(queue, "visibility_timeout", 300.0)
+        self.heartbeat_interval = heartbeat_interval or timeout / 3
+        self.stats = {"summarized": 0, "notified": 0, "failed": 0, "lost": 0, "over_budget": 0}
+        self._stop_event = threading.Event()
+    
+    def stop(self, *_args) -> None:
+        """停止を要求（処理中のジョブは完了してから停止する）"""
+        self._stop_event.set()
+    
+    def run(self, drain: bool = False) -> None:
+        """
+        停止を要求されるまでジョブを処理し続ける
+        
+        Args:
+            drain: Trueの場合、キューに実行可能なジョブがなくなった時点で終了
+        """
+        logger.info(f"Worker {self.name} started (kinds: {', '.join(self.kinds)})")
+        self.bot.budget.start_run()
+        try:
+            while not self._stop_event.is_set():
+                if self.run_once():
+                    continue
+                if drain:
+                    break
+                self._stop_event.wait(self.poll_interval)
+        finally:
+            self.bot.close()
+        logger.info(f"Worker {self.name} stopped: {self.stats}")
+    
+    def run_once(self) -> int:
+        """
+        1バッチ分のジョブをclaimして処理
+        
+        Returns:
+            処理したジョブ数（実行可能なジョブがなかった場合は0）
+        """
+        for kind in self.kinds:
+            limit = self.notify_batch_size if kind == NOTIFY else self.batch_size
+            jobs = self.queue.claim([kind], self.name, limit=limit)
+            if not jobs:
+                continue
+            with _Heartbeat(self.queue, jobs, self.heartbeat_interval):
+                if kind == SUMMARIZE:
+                    self._summarize(jobs)
+                else:
+                    self._notify(jobs)
+            return len(jobs)
+        return 0
+    
+    def _summarize(self, jobs: List[Job]) -> None:
+        """要約ジョブを処理し、要約した論文を通知ジョブとして投入"""
+        papers = [PaperResult(**job.payload["paper"]) for job in jobs]
+        summarizer = self.bot.summarizer
+        budget = self.bot.budget
+        if budget.enabled:
+            jobs, papers = self._within_budget(jobs, papers)
+            if not papers:
+                return
+        prefetch = getattr(summarizer, "prefetch", None)
+        if prefetch is not None and len(papers) > 1:
+            prefetch(papers)
+        # バッチ内の論文は要約器が宣言する並行数・バッチサイズでまとめて要約
+        for job, paper, summarized in zip(jobs, papers, summarize_all(summarizer, papers)):
+            if isinstance(summarized, Exception):
+                logger.error(f"Failed to summarize paper {paper.id} (attempt {job.attempts}): {summarized}")
+                if job.attempts < self.max_attempts:
+                    self._fail(job, str(summarized))
+                    continue
+                # 最後の試行でも失敗した論文は要約なしで通知する（一括実行と同じ扱い）
+                summarized = paper
+                self.stats["failed"] += 1
+            self._enqueue_notify(summarized)
+            self._ack(job, "summarized")
+        self.bot.usage.add_papers("summary", len(papers))
+        if budget.enabled:
+            # 実際の使用量を予算のファイルに記録し、他のワーカーの1日の上限に反映する
+            budget.commit()
+            logger.info(budget.format_status())
+    
+    def _within_budget(self, jobs: List[Job], papers: List[PaperResult]) -> Tuple[List[Job], List[PaperResult]]:
+        """
+        予算内で要約できる論文を選び、予算を超える論文は要約せずに通知ジョブとして投入
+        
+        Args:
+            jobs: claimした要約ジョブ
+            papers: 各ジョブの論文
+        
+        Returns:
+            (要約するジョブ, その論文)
+        """
+        budget = self.bot.budget
+        estimates = []
+        selected_jobs, selected_papers = [], []
+        for job, paper in zip(jobs, papers):
+            # 同時に要約する論文の見積もりも含めて、実際の使用量を踏まえた残りに収まるか確認する
+            estimate = budget.estimate(paper, self.bot.summarizer)
+            if budget.allows(estimate, pending=estimates):
+                estimates.append(estimate)
+                selected_jobs.append(job)
+                selected_papers.append(paper)
+                continue
+            logger.warning(f"Budget limit reached: paper {paper.id} will be notified with its abstract only")
+            paper.summary_deferred = True
+            self._enqueue_notify(paper)
+            self._ack(job, "over_budget")
+        return selected_jobs, selected_papers
+    
+    def _enqueue_notify(self, paper: PaperResult) -> None:
+        # 通知ジョブを投入してから要約ジョブを完了する（この間に停止しても通知ジョブは重複しない）
+        priority = 1 if paper.watched_authors else 0
+        self.queue.enqueue(NOTIFY, job_key(NOTIFY, paper), {"paper": asdict(paper)}, priority=priority)
+    
+    def _notify(self, jobs: List[Job]) -> None:
+        """通知ジョブを処理（ダイジェスト形式ではまとめて1回の送信、それ以外は論文ごと）"""
+        papers = [PaperResult(**job.payload["paper"]) for job in jobs]
+        if self.bot.notify_mode == "digest":
+            batches = [(jobs, papers)]
+        else:
+            batches = [([job], [paper]) for job, paper in zip(jobs, papers)]
+        for batch_jobs, batch_papers in batches:
+            try:
+                results = self.bot.notify_papers(batch_papers)
+            except Exception as e:
+                results, error = [False] * len(batch_papers), str(e)
+            else:
+                error = f"notified {sum(results)}/{len(batch_papers)} papers"
+            for job, delivered in zip(batch_jobs, results):
+                if delivered:
+                    self._ack(job, "notified")
+                else:
+                    self._fail(job, error)
+    
+    def _ack(self, job: Job, stat: str) -> None:
+        if self.queue.ack(job):
+            self.stats[stat] += 1
+        else:
+            # リース期限が切れて他のワーカーが引き継いだ
+            self.stats["lost"] += 1
+            logger.warning(f"Lost lease for job {job.key} before completion")
+    
+    def _fail(self, job: Job, error: str) -> None:
+        self.stats["failed"] += 1
+        if not self.queue.fail(job, error):
+            self.stats["lost"] += 1
+
+
+class _Heartbeat:
+    """処理中のジョブのリースを定期的に延長するバックグラウンドスレッド"""
+    
+    def __init__(self, queue: JobQueue, jobs: List[Job], interval: float):
+        self.queue = queue
+        self.jobs = jobs
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-heartbeat", daemon=True)
+    
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            for job in self.jobs:
+                try:
+                    self.queue.extend(job)
+                except Exception as e:
+                    logger.warning(f"Failed to extend lease for job {job.key}: {e}")
@@ -0,0 +1,67 @@
+"""重い依存パッケージの遅延インポート
+
+openai / arxiv / discord_webhook などはインポートだけで数百ミリ秒かかるため、
+モジュール読み込み時ではなく初回使用時にインポートする
+"""
+
+import importlib
+import sys
+from typing import Any, Dict
+
+
+class LazyImporter:
+    """モジュール属性を初回アクセス時にインポートするヘルパー
+
+    使用例:
+        _lazy = LazyImporter(__name__, {"OpenAI": "openai:OpenAI"})
+        __getattr__ = _lazy.module_getattr
+
+        client = _lazy.OpenAI(api_key=...)
+
+    解決した値は呼び出し元モジュールのグローバルに格納されるため、
+    ``unittest.mock.patch("pkg.module.OpenAI")`` による差し替えもそのまま機能する
+    """
+
+    def __init__(self, module_name: str, targets: Dict[str, str]):
+        """
+        Args:
+            module_name: 呼び出し元モジュール名（``__name__``）
+            targets: 属性名 → ``"module"`` または ``"module:attribute"`` の対応
+        """
+        self._module_name = module_name
+        self._targets = targets
+
+    def resolve(self, name: str) -> Any:
+        """
+        属性を解決（未インポートの場合はインポートしてキャッシュ）
+
+        Args:
+            name: 属性名
+
+        Returns:
+            解決したオブジェクト
+
+        Raises:
+            AttributeError: 遅延インポート対象でない場合
+        """
+        module = sys.modules[self._module_name]
+        if name in module.__dict__:
+            return module.__dict__[name]
+        if name not in self._targets:
+            raise AttributeError(f"module {self._module_name!r} has no attribute {name!r}")
+
+        target, _, attribute = self._targets[name].partition(":")
+        value = importlib.import_module(target)
+        if attribute:
+            value = getattr(value, attribute)
+        setattr(module, name, value)
+        return value
+
+    def module_getattr(self, name: str) -> Any:
+        """モジュールの ``__getattr__`` (PEP 562) として使用する関数"""
+        return self.resolve(name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.resolve(name)
@@ -3,55 +3,117 @@
 論文の収集 → 要約 → Discord通知の統合フロー
 """
 
+import argparse
+import json
 import logging
+import os
 import sys
-from typing import List
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from src.collectors.arxiv_collector import ArxivCollector
-from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from src import deadline as deadlines
+from src.analyzers.watchlist import AuthorWatchlist
+from src.collectors.base import PaperCollector
+from src.collectors.registry import build_collector
+from src.summarizers.base import PaperSummarizer, capabilities_of, summarize_all
+from src.summarizers.budget import BudgetManager
+from src.summarizers.registry import create_summarizer
+from src.summarizers.usage import TierUsage, UsageTracker, parse_prices
+from src.notifiers.digest import build_digest
 from src.notifiers.paper_notifier import PaperNotifier
 from src.models import PaperResult
 from src.config import config
 
 
-# ログ設定
-logging.basicConfig(
-    level=getattr(logging, config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
-
 logger = logging.getLogger(__name__)
 
 
+def setup_logging() -> None:
+    """ログ設定（インポート時ではなく実行時に適用）"""
+    logging.basicConfig(
+        level=getattr(logging, config.LOG_LEVEL),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+
 class ResearchPaperBot:
     """研究論文Botのメインクラス"""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(
+        self,
+        dry_run: bool = False,
+        collector: Optional[PaperCollector] = None,
+        summarizer: Optional[PaperSummarizer] = None,
+        notifier: Optional[PaperNotifier] = None,
+        notify_mode: Optional[str] = None,
+        full_text: Optional[bool] = None,
+        triage: Optional[bool] = None,
+        cluster: Optional[bool] = None,
+        watchlist: Optional[AuthorWatchlist] = None,
+        deadline: Optional[deadlines.Deadline] = None
+    ):
         """
         Args:
             dry_run: Trueの場合、Discord通知を実際に送信しない
+            collector: 使用するコレクター（Noneの場合はENABLED_COLLECTORSの設定から生成）
+            summarizer: 使用する要約器（Noneの場合はSUMMARIZER_BACKENDの設定から生成）
+            notifier: 使用する通知器（Noneの場合は設定から生成）
+            notify_mode: "embed"（論文ごとに送信）または "digest"（まとめて送信）
+                （Noneの場合は設定から取得）
+            full_text: Trueの場合、PDF全文を取得して要約する（Noneの場合は設定から取得）
+            triage: Trueの場合、安価なモデルで関連度を評価してから要約する（Noneの場合は設定から取得）
+            cluster: Trueの場合、論文をトピックごとにクラスタリングする（Noneの場合は設定から取得）
+            watchlist: 著者ウォッチリスト（Noneの場合は設定・保存済みのファイルから読み込み）
+            deadline: 実行の締め切り（Noneの場合は時間制限なし）。締め切りまでに要約・通知
+                できない論文はDEFERRED_FILEに保存し、次回の実行で処理する
         """
         self.dry_run = dry_run
+        self.notify_mode = notify_mode or config.NOTIFY_MODE
+        if self.notify_mode not in ("embed", "digest"):
+            raise ValueError(f"Unknown notify mode: {self.notify_mode}")
         
-        # 設定の検証
-        try:
-            config.validate()
-            logger.info("Configuration validated successfully")
-        except ValueError as e:
-            logger.error(f"Configuration error: {e}")
-            raise
+        # 設定の検証（設定から生成するコンポーネントがある場合のみ）
+        if summarizer is None or (notifier is None and not dry_run):
+            try:
+                config.validate()
+                logger.info("Configuration validated successfully")
+            except ValueError as e:
+                logger.error(f"Configuration error: {e}")
+                raise
         
         # 各モジュールの初期化
-        self.collector = ArxivCollector(
-            search_query=config.ARXIV_SEARCH_QUERY,
-            max_results=config.MAX_PAPERS_PER_DAY
-        )
+        self.collector = collector or build_collector()
+        
+        self.usage = getattr(summarizer, "usage_tracker", None) or UsageTracker(parse_prices(config.MODEL_PRICES))
+        self.summarizer = summarizer or create_summarizer(usage_tracker=self.usage)
+        models = [getattr(self.summarizer, "model", None)]
+        if full_text if full_text is not None else config.FULLTEXT_MODE:
+            # 全文要約はpypdfなどを使用するため、有効な場合のみインポート
+            from src.summarizers.fulltext import FullTextSummarizer
+            
+            self.summarizer = FullTextSummarizer(self.summarizer)
+            logger.info("Full-text mode: summarizing papers from their PDFs")
+        
+        self.triage = None
+        if triage if triage is not None else config.TRIAGE_MODE:
+            from src.summarizers.triage import PaperTriage
+            
+            self.triage = PaperTriage(usage_tracker=self.usage)
+            models.append(self.triage.model)
+            logger.info(f"Triage enabled with model: {self.triage.model}")
+        self.budget = BudgetManager.from_config(self.usage, models=[model for model in models if model])
         
-        self.summarizer = OpenRouterSummarizer()
+        self.cluster = cluster if cluster is not None else config.TOPIC_CLUSTERING
+        self.extractive = None
+        self.deadline = deadline
+        self.deferred = deadlines.DeferredPapers(config.DEFERRED_FILE)
+        self.deferred_papers: List[PaperResult] = []
+        self.watchlist = watchlist if watchlist is not None else self._load_watchlist()
         
         if not self.dry_run:
-            self.notifier = PaperNotifier(webhook_url=config.DISCORD_WEBHOOK_URL)
+            self.notifier = notifier or PaperNotifier(webhook_url=config.DISCORD_WEBHOOK_URL)
         else:
             self.notifier = None
             logger.info("Dry-run mode: Discord notifications will not be sent")
@@ -75,6 +137,137 @@ class ResearchPaperBot:
         
         return papers
     
+    @staticmethod
+    def _load_watchlist() -> Optional[AuthorWatchlist]:
+        """設定から著者ウォッチリストを読み込む（著者が1人もいない場合はNone）"""
+        authors = [author for author in config.WATCHLIST_AUTHORS.split(";") if author.strip()]
+        if not authors and not Path(config.WATCHLIST_FILE).exists():
+            return None
+        watchlist = AuthorWatchlist.load(config.WATCHLIST_FILE, authors or None)
+        if not len(watchlist):
+            return None
+        logger.info(f"Watching {len(watchlist)} authors")
+        return watchlist
+    
+    def match_watchlist(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        ウォッチ中の著者の論文に印を付ける（PaperResult.watched_authors）
+        
+        Args:
+            papers: 論文のリスト
+            
+        Returns:
+            ウォッチ中の著者を含む論文のリスト
+        """
+        if self.watchlist is None or not papers:
+            return []
+        flagged = self.watchlist.annotate(papers)
+        for paper in flagged:
+            logger.info(f"Watched author paper: {paper.title[:50]} ({', '.join(paper.watched_authors)})")
+        if flagged:
+            try:
+                self.watchlist.save()
+            except OSError as e:
+                logger.warning(f"Failed to save author watchlist: {e}")
+        return flagged
+    
+    def triage_papers(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        安価なモデルで関連度を評価し、要約対象の論文を絞り込む
+        
+        Args:
+            papers: 収集した論文のリスト
+            
+        Returns:
+            要約対象の論文のリスト（トリアージが無効・失敗した場合は全件）
+        """
+        if self.triage is None or not papers:
+            return papers
+        logger.info(f"Triaging {len(papers)} papers...")
+        try:
+            return self.triage.triage(papers)
+        except Exception as e:
+            logger.error(f"Triage failed, summarizing all papers: {e}")
+            return papers
+    
+    def cluster_topics(self, papers: List[PaperResult]) -> Tuple[List[PaperResult], List[PaperResult]]:
+        """
+        論文をトピックごとにクラスタリングし、各論文のtopicにラベルを格納
+        
+        Args:
+            papers: 論文のリスト
+            
+        Returns:
+            (クラスタ順に並べた論文のリスト, 要約対象の論文のリスト)。
+            TOPIC_REPRESENTATIVES_ONLY=trueの場合、要約対象は各クラスタの代表論文のみ。
+            クラスタリングが無効・失敗した場合はどちらも元のリスト
+        """
+        if not self.cluster or not papers:
+            return papers, papers
+        try:
+            # numpy / scipyはクラスタリングが有効な場合のみインポート
+            from src.analyzers.clustering import cluster_papers
+            
+            clusters = cluster_papers(papers, n_clusters=config.TOPIC_CLUSTERS)
+        except Exception as e:
+            logger.error(f"Topic clustering failed, keeping original order: {e}")
+            return papers, papers
+        
+        logger.info(f"Clustered {len(papers)} papers into {len(clusters)} topics")
+        for cluster in clusters:
+            logger.info(f"Topic {cluster.label!r}: {len(cluster.papers)} papers")
+        ordered = [paper for cluster in clusters for paper in cluster.papers]
+        if config.TOPIC_REPRESENTATIVES_ONLY:
+            # ウォッチ中の著者の論文は代表論文でなくても要約する
+            targets = [
+                paper for cluster in clusters for paper in cluster.papers
+                if paper is cluster.representative or paper.watched_authors
+            ]
+            return ordered, targets
+        return ordered, ordered
+    
+    def select_papers(self, papers: List[PaperResult]) -> Tuple[List[PaperResult], List[PaperResult]]:
+        """
+        収集した論文をウォッチリスト照合 → トリアージ → クラスタリングし、通知・要約する論文を選ぶ
+        
+        Args:
+            papers: 収集した論文のリスト
+            
+        Returns:
+            (通知する論文のリスト, そのうち要約する論文のリスト)
+        """
+        self.match_watchlist(papers)
+        papers = self.triage_papers(papers)
+        papers, targets = self.cluster_topics(papers)
+        if self.triage is not None:
+            # 関連度が要約のしきい値に届かない論文は要約せず、抽出した要点で通知する
+            targets = [paper for paper in targets if self.triage.needs_summary(paper)]
+        return papers, targets
+    
+    def process_papers(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        収集した論文をウォッチリスト照合 → トリアージ → クラスタリング → 要約し、通知する論文を返す
+        
+        Args:
+            papers: 収集した論文のリスト
+            
+        Returns:
+            通知する論文のリスト
+        """
+        usage_before = self.usage.snapshot()
+        self.budget.start_run()
+        papers, targets = self.select_papers(papers)
+        summarized = dict(zip(map(id, targets), self.summarize_papers(targets)))
+        self.log_usage(usage_before)
+        if self.budget.enabled:
+            self.budget.commit()
+            logger.info(self.budget.format_status())
+        # 締め切りまでに要約できなかった論文は次回の実行に回す
+        deferred = set(map(id, self.deferred_papers))
+        processed = [summarized.get(id(paper), paper) for paper in papers if id(paper) not in deferred]
+        # ウォッチ中の著者の論文を先頭に通知
+        return sorted(processed, key=lambda paper: not paper.watched_authors)
+    
     def summarize_papers(self, papers: List[PaperResult]) -> List[PaperResult]:
         """
         論文を要約
@@ -86,22 +279,161 @@ class ResearchPaperBot:
             要約が追加された論文のリスト
         """
         logger.info(f"Step 2/3: Summarizing {len(papers)} papers...")
-        summarized_papers = []
+        original_order = papers
+        stats = getattr(self.summarizer, "compression_stats", None)
+        stats_before = replace(stats) if stats is not None else None
         
-        for i, paper in enumerate(papers, 1):
-            try:
-                logger.info(f"Summarizing paper {i}/{len(papers)}: {paper.title[:50]}...")
-                summarized_paper = self.summarizer.summarize(paper)
-                summarized_papers.append(summarized_paper)
-            except Exception as e:
-                logger.error(f"Failed to summarize paper {paper.id}: {e}")
-                # 要約失敗した論文もリストに含める（summaryがNone）
-                summarized_papers.append(paper)
+        # 全文要約の場合はPDFの取得・テキスト抽出をまとめて並行実行
+        prefetch = getattr(self.summarizer, "prefetch", None)
+        if prefetch is not None and papers:
+            prefetch(papers)
+        
+        # 締め切りがある場合は通知の時間を残し、重要な論文から要約する
+        stage_deadline = None
+        if self.deadline is not None:
+            stage_deadline = self.deadline.reserve(config.DEADLINE_NOTIFY_RESERVE)
+            papers = deadlines.priority_order(papers)
+        
+        # API使用量の予算がある場合は予算内で要約できる論文数が最大になるように選ぶ
+        over_budget = set()
+        if self.budget.enabled:
+            _, skipped = self.budget.plan([paper for paper in papers if not paper.summary], self.summarizer)
+            over_budget = set(map(id, skipped))
         
-        logger.info(f"Summarized {len(summarized_papers)} papers")
+        # バックエンドが宣言する並行数ずつ要約する（1の場合は1論文ずつ）
+        concurrency = max(capabilities_of(self.summarizer).max_concurrency, 1)
+        results = {}
+        attempted = skipped = 0
+        position = 0
+        with deadlines.active(stage_deadline):
+            while position < len(papers):
+                wave: List[Tuple[int, PaperResult]] = []
+                estimates = []
+                while position < len(papers) and len(wave) < concurrency:
+                    i, paper = position + 1, papers[position]
+                    position += 1
+                    if paper.summary:
+                        # 前回の実行で要約済み・通知待ちの論文
+                        results[id(paper)] = paper
+                        continue
+                    if stage_deadline is not None and stage_deadline.expired:
+                        self.defer_papers([queued for _, queued in wave] + papers[i - 1:], "summarization")
+                        wave, position = [], len(papers)
+                        break
+                    if self.budget.enabled:
+                        # 同時に要約する論文の見積もりも含めて予算内に収まるか確認する
+                        estimate = self.budget.estimate(paper, self.summarizer)
+                        if id(paper) in over_budget or not self.budget.allows(estimate, pending=estimates):
+                            # 予算を超える論文は要約せず、アブストラクトのみ通知する
+                            paper.summary_deferred = True
+                            results[id(paper)] = paper
+                            skipped += 1
+                            continue
+                        estimates.append(estimate)
+                    wave.append((i, paper))
+                if not wave:
+                    continue
+                
+                attempted += len(wave)
+                for i, paper in wave:
+                    logger.info(f"Summarizing paper {i}/{len(papers)}: {paper.title[:50]}...")
+                outcomes = summarize_all(self.summarizer, [paper for _, paper in wave])
+                timed_out = []
+                for (i, paper), outcome in zip(wave, outcomes):
+                    if not isinstance(outcome, Exception):
+                        results[id(paper)] = outcome
+                    elif stage_deadline is not None and stage_deadline.expired:
+                        timed_out.append(paper)
+                    else:
+                        logger.error(f"Failed to summarize paper {paper.id}: {outcome}")
+                        # 要約失敗した論文もリストに含める（summaryがNone）
+                        results[id(paper)] = paper
+                if timed_out:
+                    self.defer_papers(timed_out + papers[position:], "summarization")
+                    break
+        summarized_papers = [results.get(id(paper), paper) for paper in original_order]
+        
+        if skipped:
+            logger.warning(f"Budget limit reached: {skipped} papers will be notified with their abstracts only")
+        logger.info(f"Summarized {len(results) - skipped} papers")
+        self.usage.add_papers("summary", attempted)
+        if stats is not None:
+            run_stats = stats.since(stats_before)
+            logger.info(
+                f"Prompt compression: {run_stats.tokens_saved} tokens saved "
+                f"({run_stats.tokens_before} -> {run_stats.tokens_after}, "
+                f"{run_stats.saved_ratio:.1%}) across {run_stats.papers} abstracts"
+            )
         return summarized_papers
     
-    def notify_papers(self, papers: List[PaperResult]) -> int:
+    def add_key_points(self, papers: List[PaperResult]) -> None:
+        """
+        要約のない論文（要約の失敗・予算超過・関連度がしきい値未満など）に、
+        アブストラクトから抽出した要点を付ける（EXTRACTIVE_FALLBACK=falseの場合は何もしない）
+        
+        Args:
+            papers: 通知する論文のリスト
+        """
+        if not config.EXTRACTIVE_FALLBACK or all(paper.summary or paper.key_points for paper in papers):
+            return
+        try:
+            if self.extractive is None:
+                # numpyを使用するため、要約のない論文がある場合のみインポート
+                from src.summarizers.extractive import ExtractiveSummarizer
+                
+                self.extractive = ExtractiveSummarizer(num_sentences=config.EXTRACTIVE_SENTENCES)
+            count = self.extractive.annotate(papers)
+        except Exception as e:
+            logger.error(f"Key point extraction failed, notifying abstracts: {e}")
+            return
+        logger.info(f"Extracted key points for {count} papers without summaries")
+    
+    def defer_papers(self, papers: List[PaperResult], stage: str) -> None:
+        """
+        締め切りまでに処理できなかった論文を次回の実行に回す
+        
+        Args:
+            papers: 処理できなかった論文のリスト
+            stage: 打ち切ったステージ（ログ用）
+        """
+        if not papers:
+            return
+        logger.warning(
+            f"Deadline reached during {stage}: deferring {len(papers)} papers to the next run "
+            f"({self.deadline.remaining():.0f}s left)"
+        )
+        self.deferred_papers.extend(papers)
+    
+    def with_deferred(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        前回の実行で締め切りまでに処理できなかった論文を先頭に加える
+        
+        Args:
+            papers: 今回収集した論文のリスト
+            
+        Returns:
+            繰り越した論文 + 今回収集した論文（IDの重複は繰り越した方を優先）
+        """
+        deferred = self.deferred.load()
+        if not deferred:
+            return papers
+        logger.info(f"Resuming {len(deferred)} papers deferred from the previous run")
+        deferred_ids = {paper.id for paper in deferred}
+        return deferred + [paper for paper in papers if paper.id not in deferred_ids]
+    
+    def log_usage(self, before: Dict[str, TierUsage]) -> None:
+        """
+        スナップショット以降のティア別API使用量と推定コストをログに出力
+        
+        Args:
+            before: self.usage.snapshot() の結果
+        """
+        usage = self.usage.since(before)
+        summarized = usage["summary"].papers if "summary" in usage else 0
+        for line in self.usage.format_report(usage, summarized):
+            logger.info(line)
+    
+    def notify_papers(self, papers: List[PaperResult]) -> List[bool]:
         """
         論文をDiscordに通知
         
@@ -109,31 +441,64 @@ class ResearchPaperBot:
             papers: 通知する論文のリスト
             
         Returns:
-            成功した通知数
+            論文と同じ順序の通知結果（送信に成功した論文はTrue、失敗・次回に回した論文はFalse）
         """
         logger.info(f"Step 3/3: Notifying {len(papers)} papers to Discord...")
+        self.add_key_points(papers)
         
         if self.dry_run:
             logger.info("Dry-run mode: Skipping actual Discord notification")
+            if self.notify_mode == "digest":
+                messages = build_digest(
+                    papers,
+                    group_by=config.DIGEST_GROUP_BY,
+                    max_messages=config.DIGEST_MAX_MESSAGES
+                )
+                logger.info(f"[DRY-RUN] Would send digest of {len(papers)} papers in {len(messages)} messages")
+                return [True] * len(papers)
             for i, paper in enumerate(papers, 1):
                 logger.info(f"[DRY-RUN] Would notify paper {i}/{len(papers)}: {paper.title}")
-            return len(papers)
+            return [True] * len(papers)
+        
+        if self.deadline is not None and self.deadline.expired:
+            self.defer_papers(papers, "notification")
+            return [False] * len(papers)
+        
+        if self.notify_mode == "digest":
+            if not papers:
+                return []
+            success = self.notifier.send_digest(
+                papers,
+                group_by=config.DIGEST_GROUP_BY,
+                max_messages=config.DIGEST_MAX_MESSAGES
+            )
+            return [bool(success)] * len(papers)
+        
+        if getattr(self.notifier, "concurrent", False) is True:
+            # 複数のWebhookへは論文をまとめて並行に配信（各Webhook内の順序は維持）
+            results = list(self.notifier.send_paper_summaries(papers))
+            logger.info(f"Successfully notified {sum(results)}/{len(papers)} papers")
+            return results
         
-        success_count = 0
+        results = []
         
         for i, paper in enumerate(papers, 1):
+            if self.deadline is not None and self.deadline.expired:
+                self.defer_papers(papers[i - 1:], "notification")
+                results.extend([False] * (len(papers) - len(results)))
+                break
             try:
                 logger.info(f"Notifying paper {i}/{len(papers)}: {paper.title[:50]}...")
                 
-                # Discord通知用のメッセージを作成
-                self.notifier.send_paper_summary(paper)
-                success_count += 1
+                # Discord通知用のメッセージを作成（送信に失敗した場合はFalseが返る）
+                results.append(bool(self.notifier.send_paper_summary(paper)))
                 
             except Exception as e:
                 logger.error(f"Failed to notify paper {paper.id}: {e}")
+                results.append(False)
         
-        logger.info(f"Successfully notified {success_count}/{len(papers)} papers")
-        return success_count
+        logger.info(f"Successfully notified {sum(results)}/{len(papers)} papers")
+        return results
     
     def run(self, days: int = 1) -> bool:
         """
@@ -149,24 +514,30 @@ class ResearchPaperBot:
         logger.info("Research Paper Bot Started")
         logger.info("=" * 60)
         
+        self.deferred_papers = []
         try:
-            # Step 1: 論文収集
-            papers = self.collect_papers(days=days)
-            
-            if not papers:
-                logger.info("No papers to process. Exiting.")
-                return True
-            
-            # Step 2: 論文要約
-            summarized_papers = self.summarize_papers(papers)
+            with deadlines.active(self.deadline):
+                # Step 1: 論文収集（前回の実行から繰り越した論文を先に処理する）
+                papers = self.with_deferred(self.collect_papers(days=days))
+                
+                if not papers:
+                    logger.info("No papers to process. Exiting.")
+                    return True
+                
+                # Step 2: 論文要約（トリアージ・トピッククラスタリングが有効な場合はその結果に従う）
+                summarized_papers = self.process_papers(papers)
+                
+                # Step 3: Discord通知
+                success_count = sum(self.notify_papers(summarized_papers))
             
-            # Step 3: Discord通知
-            success_count = self.notify_papers(summarized_papers)
+            self.deferred.save(self.deferred_papers)
             
             logger.info("=" * 60)
             logger.info(f"Research Paper Bot Completed Successfully")
             logger.info(f"Total papers processed: {len(papers)}")
             logger.info(f"Successfully notified: {success_count}")
+            if self.deferred_papers:
+                logger.info(f"Deferred to the next run: {len(self.deferred_papers)}")
             logger.info("=" * 60)
             
             return True
@@ -174,15 +545,382 @@ class ResearchPaperBot:
         except Exception as e:
             logger.error(f"Fatal error occurred: {e}", exc_info=True)
             return False
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """要約器が保持するプロセスプール・HTTPセッションを解放（再び使用した場合は作り直される）"""
+        close = getattr(self.summarizer, "close", None)
+        if close is not None:
+            close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数のパーサーを作成"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.main",
+        description="最新論文を収集・要約してDiscordに通知する"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Discord通知を実際には送信しない"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="何日前までの論文を収集するか（デフォルト: 7）"
+    )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="論文ごとではなくダイジェスト形式でまとめて通知する（NOTIFY_MODE=digestと同じ）"
+    )
+    parser.add_argument(
+        "--full-text",
+        action="store_true",
+        default=None,
+        help="PDF全文を取得して要約する（FULLTEXT_MODE=trueと同じ）"
+    )
+    parser.add_argument(
+        "--triage",
+        action="store_true",
+        default=None,
+        help="安価なモデルで関連度を評価し、通過した論文のみ要約する（TRIAGE_MODE=trueと同じ）"
+    )
+    parser.add_argument(
+        "--cluster",
+        action="store_true",
+        default=None,
+        help="論文をトピックごとにクラスタリングする（TOPIC_CLUSTERING=trueと同じ）"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="PATH",
+        help="外部とのやり取り（arXiv・completion・Webhook）をカセットファイルに記録しながら実行する"
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="カセットファイルの記録を使い、ネットワークに接続せずに実行する"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="ステージ（収集・要約・通知）ごとにcProfileで計測し、ホットスポット表をPROFILE_DIRに出力する"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="ステージごとにtracemallocでメモリ割り当ての上位とピークをPROFILE_DIRに出力する"
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="収集した論文を論文IDのハッシュでN分割し、i番目（1始まり）だけを要約・通知する。結果はSHARD_OUTPUT_DIRに出力"
+    )
+    parser.add_argument(
+        "--merge-shards",
+        metavar="DIR",
+        help="DIR以下の各シャードの結果（shard-*.json）をまとめてmerged.jsonに出力する"
+    )
+    jobs = parser.add_mutually_exclusive_group()
+    jobs.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="論文を収集・選別してJOB_QUEUE_URLのキューに投入する（要約・通知は --worker が行う）"
+    )
+    jobs.add_argument(
+        "--worker",
+        action="store_true",
+        help="JOB_QUEUE_URLのキューからジョブを取得して要約・通知するワーカーとして起動する"
+    )
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="--worker 指定時、実行可能なジョブがなくなった時点で終了する"
+    )
+    parser.add_argument(
+        "--deadline",
+        metavar="DURATION",
+        help="実行の時間予算（例: 900, 45s, 25m, 1h30m。RUN_DEADLINEより優先）。"
+             "重要な論文から要約し、締め切りまでに処理できない論文は次回の実行に回す"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常駐モードで起動し、クエリごとの間隔で新着論文を処理し続ける"
+    )
+    parser.add_argument(
+        "--health-port",
+        type=int,
+        default=None,
+        help="常駐モードのヘルスチェックポート（デフォルト: DAEMON_HEALTH_PORT）"
+    )
+    return parser
+
+
+def run_daemon(bot: ResearchPaperBot, days: int, health_port: Optional[int] = None, profiler=None) -> None:
+    """
+    常駐モードで実行
+    
+    Args:
+        bot: 起動中保持し続けるResearchPaperBot
+        days: 各ポーリングで何日前までの論文を対象にするか
+        health_port: ヘルスチェックのポート（Noneの場合は設定値を使用）
+        profiler: 収集ステージを計測するStageProfiler（Noneの場合は計測しない）
+    """
+    from src.daemon import PaperDaemon
+    
+    daemon = PaperDaemon.from_config(bot, days=days, health_port=health_port, profiler=profiler)
+    daemon.install_signal_handlers()
+    daemon.run_forever()
+
+
+def prepare_replay(path: str):
+    """
+    再生するカセットを読み込み、未設定のAPIキー・WebhookのURLを記録から補う
+    
+    再生ではAPIキーを送信せず、Discordへの送信も記録から返すため、秘密情報を設定せずに
+    再生できる（設定の検証より前、ResearchPaperBotの生成前に呼ぶ）
+    
+    Args:
+        path: カセットファイルのパス
+    
+    Returns:
+        読み込んだカセット
+    """
+    # カセットはrequestsに依存するため、記録・再生時のみインポート
+    from src.cassette import Cassette
+    
+    cassette = Cassette.load(path)
+    for name, value in cassette.replay_settings().items():
+        if not getattr(config, name):
+            os.environ[name] = value
+            logger.info(f"{name} is not set; using a placeholder from the cassette for replay")
+    return cassette
+
+
+def run_with_cassette(
+    bot: ResearchPaperBot,
+    days: int,
+    record: Optional[str] = None,
+    replay=None
+) -> bool:
+    """
+    外部とのやり取りを記録（record）または記録から再生（replay）しながら1回実行
+    
+    Args:
+        bot: 実行するResearchPaperBot
+        days: 何日前までの論文を収集するか
+        record: 記録先のカセットファイル
+        replay: 再生するカセット（prepare_replayで読み込んだもの）
+    
+    Returns:
+        成功した場合True
+    """
+    if replay is not None:
+        logger.info(f"Replaying {len(replay.interactions)} interactions recorded at {replay.recorded_at}")
+        with replay.replay():
+            return bot.run(days=days)
+    
+    # カセットはrequestsに依存するため、記録・再生時のみインポート
+    from src.cassette import Cassette
+    
+    cassette = Cassette(record)
+    try:
+        with cassette.record():
+            return bot.run(days=days)
+    finally:
+        cassette.save()
+
+
+def open_job_queue():
+    """設定からジョブキューを生成"""
+    # ジョブキュー（SQLite / Redis）は --enqueue / --worker 指定時のみインポート
+    from src.jobs import open_queue
+    
+    return open_queue(
+        config.JOB_QUEUE_URL,
+        visibility_timeout=config.JOB_VISIBILITY_TIMEOUT,
+        max_attempts=config.JOB_MAX_ATTEMPTS,
+        retry_delay=config.JOB_RETRY_DELAY
+    )
+
+
+def run_enqueue(bot: ResearchPaperBot, days: int) -> bool:
+    """
+    論文を収集・選別してジョブキューに投入
+    
+    Args:
+        bot: 収集・選別に使うResearchPaperBot
+        days: 何日前までの論文を収集するか
+    
+    Returns:
+        成功した場合True
+    """
+    from src.jobs import enqueue_papers
+    
+    try:
+        papers = bot.collect_papers(days=days)
+        if not papers:
+            return True
+        papers, targets = bot.select_papers(papers)
+        queue = open_job_queue()
+        try:
+            enqueue_papers(queue, papers, targets)
+            logger.info(f"Job queue: {queue.counts()}")
+        finally:
+            queue.close()
+        return True
+    except Exception as e:
+        logger.error(f"Failed to enqueue papers: {e}", exc_info=True)
+        return False
+
+
+def run_worker(bot: ResearchPaperBot, drain: bool = False) -> None:
+    """
+    ジョブキューのワーカーとして実行（SIGTERM / SIGINTで処理中のジョブを完了してから停止）
+    
+    Args:
+        bot: 要約・通知に使うResearchPaperBot
+        drain: Trueの場合、実行可能なジョブがなくなった時点で終了
+    """
+    import signal
+    
+    from src.jobs import JobWorker
+    
+    queue = open_job_queue()
+    worker = JobWorker(
+        bot,
+        queue,
+        batch_size=config.JOB_BATCH_SIZE,
+        poll_interval=config.JOB_POLL_INTERVAL
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    try:
+        worker.run(drain=drain)
+    finally:
+        queue.close()
 
 
-def main():
+def merge_shards(directory: str) -> bool:
+    """
+    各シャードの結果をまとめてDIR/merged.jsonに出力
+    
+    Args:
+        directory: shard-*.jsonを含むディレクトリ
+    
+    Returns:
+        すべてのシャードが揃って成功していた場合True
+    """
+    from src.sharding import format_merged, load_reports, merge_reports
+    
+    merged = merge_reports(load_reports(directory))
+    for line in format_merged(merged, parse_prices(config.MODEL_PRICES)):
+        logger.info(line)
+    output = Path(directory) / "merged.json"
+    output.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(f"Merged shard results written to {output}")
+    return not merged["missing"] and not merged["failed"]
+
+
+def main(argv: Optional[List[str]] = None):
     """エントリーポイント"""
-    # コマンドライン引数でdry-runモードを設定可能
-    dry_run = "--dry-run" in sys.argv
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.daemon and (args.record or args.replay):
+        parser.error("--record / --replay cannot be combined with --daemon")
+    if (args.enqueue or args.worker) and (args.daemon or args.record or args.replay):
+        parser.error("--enqueue / --worker cannot be combined with --daemon, --record or --replay")
+    if args.drain and not args.worker:
+        parser.error("--drain requires --worker")
+    if args.shard and (args.daemon or args.worker):
+        parser.error("--shard cannot be combined with --daemon or --worker")
+    deadline = None
+    deadline_value = args.deadline or config.RUN_DEADLINE
+    if deadline_value and not (args.daemon or args.enqueue or args.worker or args.merge_shards):
+        try:
+            seconds = deadlines.parse_duration(deadline_value)
+        except ValueError as e:
+            parser.error(str(e))
+        # 時間予算は引数を解析した時点から数える
+        deadline = deadlines.Deadline(seconds)
+    elif args.deadline:
+        parser.error("--deadline cannot be combined with --daemon, --enqueue, --worker or --merge-shards")
+    shard = None
+    if args.shard:
+        from src.sharding import Shard
+        
+        try:
+            shard = Shard.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    setup_logging()
+    
+    if args.merge_shards:
+        sys.exit(0 if merge_shards(args.merge_shards) else 1)
+    
+    replay = prepare_replay(args.replay) if args.replay else None
+    
+    bot = ResearchPaperBot(
+        dry_run=args.dry_run,
+        notify_mode="digest" if args.digest else None,
+        full_text=args.full_text,
+        triage=args.triage,
+        cluster=args.cluster,
+        deadline=deadline
+    )
+    if deadline is not None:
+        logger.info(f"Run deadline: {deadline.seconds:.0f}s")
+    
+    profiler = None
+    if args.profile or args.trace_memory:
+        # 無効な場合はステージをラップしないため、計測のオーバーヘッドはない
+        from src.profiling import StageProfiler
+        
+        profiler = StageProfiler(
+            config.PROFILE_DIR,
+            cpu=args.profile,
+            memory=args.trace_memory,
+            top=config.PROFILE_TOP
+        )
+        profiler.attach(bot)
+        logger.info(f"Profiling pipeline stages into {profiler.output_dir}")
+    
+    shard_run = None
+    if shard is not None:
+        from src.sharding import ShardRun
+        
+        shard_run = ShardRun(shard)
+        shard_run.attach(bot)
+    
+    try:
+        if args.daemon:
+            run_daemon(bot, days=args.days, health_port=args.health_port, profiler=profiler)
+            sys.exit(0)
+        
+        if args.worker:
+            run_worker(bot, drain=args.drain)
+            sys.exit(0)
+        
+        if args.enqueue:
+            success = run_enqueue(bot, days=args.days)
+        elif args.record or args.replay:
+            success = run_with_cassette(bot, days=args.days, record=args.record, replay=replay)
+        else:
+            success = bot.run(days=args.days)
+    finally:
+        if profiler is not None:
+            profiler.close()
     
-    bot = ResearchPaperBot(dry_run=dry_run)
-    success = bot.run(days=7)
+    if shard_run is not None:
+        output = Path(config.SHARD_OUTPUT_DIR) / f"shard-{shard.index}-of-{shard.count}.json"
+        shard_run.report(success).save(str(output))
+        logger.info(f"Shard {shard} results written to {output}")
     
     sys.exit(0 if success else 1)
 
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -18,6 +18,13 @@ class PaperResult:
     source: str
     categories: Optional[str] = None
     summary: Optional[str] = None
+    relevance_score: Optional[float] = None
+    topic: Optional[str] = None
+    watched_authors: Optional[List[str]] = None
+    # API使用量の予算を超えるため要約せず、アブストラクトのみ通知する場合True
+    summary_deferred: bool = False
+    # 要約がない論文のアブストラクトから抽出した要点（通知でアブストラクトの代わりに使用）
+    key_points: Optional[str] = None
     
     def to_dict(self) -> dict:
         """辞書形式に変換"""
@@ -30,5 +37,10 @@ class PaperResult:
             "published": self.published,
             "source": self.source,
             "categories": self.categories,
-            "summary": self.summary
+            "summary": self.summary,
+            "relevance_score": self.relevance_score,
+            "topic": self.topic,
+            "watched_authors": self.watched_authors,
+            "summary_deferred": self.summary_deferred,
+            "key_points": self.key_points
         }
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+非同期Discord Webhook通知モジュール
+
+複数のWebhookへの送信をasyncio（httpx.AsyncClient）で並行に行う。
+Webhookごとに1つのタスクがメッセージを順番に送信するため、各Webhook内の順序は保たれ、
+Webhookをまたいだ送信は互いを待たない。レート制限はWebhookごとに
+X-RateLimit-Remaining / X-RateLimit-Reset-Afterヘッダーと429応答のretry_afterから追跡し、
+グローバルなレート制限（"global": true）は全Webhookの送信を一時停止する
+
+DiscordNotifierと同じ同期API（send_message / send_embed / send_embeds / test_connection）も提供する
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from src import clock, deadline
+from src.lazy_import import LazyImporter
+from src.notifiers.digest import FOOTER_TEXT, DigestMessage
+from src.notifiers.discord_notifier import truncate
+
+
+logger = logging.getLogger(__name__)
+
+# httpxは初回送信時にインポート
+_lazy = LazyImporter(__name__, {"httpx": "httpx"})
+__getattr__ = _lazy.module_getattr
+
+# 再試行するステータスコード（5xx）の待機時間の基準（秒、試行ごとに倍増）
+RETRY_BACKOFF = 0.5
+
+
+@dataclass
+class DeliveryResult:
+    """1つのWebhookへの1メッセージの送信結果"""
+    
+    webhook: str
+    index: int
+    success: bool
+    status: Optional[int] = None
+    attempts: int = 0
+    rate_limited: int = 0
+    latency: float = 0.0
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def redact_webhook(url: str) -> str:
+    """ログ・結果に出力するためWebhookのトークンを伏せる（".../webhooks/<ID>/***"）"""
+    parts = urlsplit(url)
+    path = parts.path.rsplit("/", 1)[0] + "/***" if "/webhooks/" in parts.path else parts.path
+    return f"{parts.scheme}://{parts.netloc}{path}"
+
+
+def build_embed(
+    title: str,
+    description: str,
+    color: str = '03b2f8',
+    fields: Optional[List[Dict]] = None,
+    url: Optional[str] = None,
+    description_limit: int = 2000
+) -> dict:
+    """
+    DiscordNotifier.send_embedと同じ内容の埋め込みをDiscord API形式の辞書で作成
+    
+    Args:
+        title: タイトル
+        description: 説明文
+        color: 埋め込みメッセージの色（16進数カラーコード）
+        fields: フィールドのリスト [{'name': '名前', 'value': '値', 'inline': True/False}]
+        url: タイトルのリンクURL（オプション）
+        description_limit: 説明文の最大文字数
+    
+    Returns:
+        埋め込みの辞書
+    """
+    embed = {
+        "title": truncate(title, 256),
+        "description": truncate(description, description_limit),
+        "color": int(color, 16),
+        "footer": {"text": FOOTER_TEXT},
+        "timestamp": clock.now().astimezone(timezone.utc).isoformat(),
+    }
+    if url:
+        embed["url"] = url
+    if fields:
+        embed["fields"] = [
+            {
+                "name": truncate(field.get('name', ''), 256),
+                "value": truncate(field.get('value', ''), 1024),
+                "inline": field.get('inline', False),
+            }
+            for field in fields
+        ]
+    return embed
+
+
+class _RateLimiter:
+    """Webhookごとのレート制限の状態"""
+    
+    def __init__(self):
+        self.blocked_until = 0.0
+    
+    async def wait(self, *others: "_RateLimiter") -> None:
+        """このWebhook（と他の制限、グローバル制限など）の解除まで待機"""
+        while True:
+            delay = max(limiter.blocked_until for limiter in (self, *others)) - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+    
+    def block(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+    
+    def update(self, headers) -> None:
+        """成功した応答のヘッダーから、残り回数が0ならリセットまで送信を止める"""
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                self.block(float(headers.get("X-RateLimit-Reset-After", "0")))
+            except ValueError:
+                pass
+
+
+class AsyncDiscordNotifier:
+    """複数のDiscord Webhookへ並行にメッセージを送信するクラス"""
+    
+    def __init__(
+        self,
+        webhook_urls: Sequence[str],
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        max_rate_limit_retries: int = 5,
+        transport=None
+    ):
+        """
+        Args:
+            webhook_urls: 送信先のDiscord Webhook URL（各メッセージを全Webhookに送信）
+            timeout: 1リクエストのタイムアウト（秒）
+            max_retries: 通信エラー・5xxの場合の再試行回数
+            max_rate_limit_retries: 429応答の場合の再試行回数（retry_afterだけ待って再送）
+            transport: httpxのトランスポート（テスト用）
+        
+        Raises:
+            ValueError: webhook_urlsが空の場合
+        """
+        self.webhook_urls = [url.strip() for url in webhook_urls if url.strip()]
+        if not self.webhook_urls:
+            raise ValueError("Discord Webhook URLが設定されていません")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.transport = transport
+        self.last_results: List[DeliveryResult] = []
+        logger.info(f"AsyncDiscordNotifier初期化完了: {len(self.webhook_urls)}件のWebhook")
+    
+    async def adeliver(self, messages: Sequence[DigestMessage]) -> List[DeliveryResult]:
+        """
+        全メッセージを全Webhookに送信（Webhook間は並行、各Webhook内は順番に送信）
+        
+        Args:
+            messages: 送信するメッセージ
+        
+        Returns:
+            Webhookごと・メッセージ順の送信結果
+        """
+        global_limiter = _RateLimiter()
+        async with _lazy.httpx.AsyncClient(timeout=deadline.timeout(self.timeout), transport=self.transport) as client:
+            per_webhook = await asyncio.gather(*(
+                self._deliver_webhook(client, url, messages, global_limiter) for url in self.webhook_urls
+            ))
+        results = [result for results in per_webhook for result in results]
+        failed = sum(not result.success for result in results)
+        if failed:
+            logger.error(f"Discord配信失敗: {failed}/{len(results)}件")
+        else:
+            logger.info(f"Discord配信成功: {len(messages)}メッセージ × {len(self.webhook_urls)}件のWebhook")
+        return results
+    
+    def deliver(self, messages: Sequence[DigestMessage]) -> List[DeliveryResult]:
+        """
+        adeliverの同期版（実行中のイベントループの外から呼ぶ）
+        
+        Args:
+            messages: 送信するメッセージ
+        
+        Returns:
+            Webhookごと・メッセージ順の送信結果（last_resultsにも保持）
+        """
+        self.last_results = asyncio.run(self.adeliver(messages))
+        return self.last_results
+    
+    async def _deliver_webhook(
+        self,
+        client,
+        url: str,
+        messages: Sequence[DigestMessage],
+        global_limiter: _RateLimiter
+    ) -> List[DeliveryResult]:
+        """1つのWebhookにメッセージを順番に送信"""
+        limiter = _RateLimiter()
+        results = []
+        for index, message in enumerate(messages):
+            result = DeliveryResult(webhook=redact_webhook(url), index=index, success=False)
+            start = time.perf_counter()
+            while True:
+                await limiter.wait(global_limiter)
+                result.attempts += 1
+                try:
+                    response = await client.post(url, params={"wait": "true"}, **self._request_body(message))
+                except _lazy.httpx.HTTPError as e:
+                    result.status, result.error = None, f"{type(e).__name__}: {e}"
+                    retry_after = None
+                else:
+                    result.status = response.status_code
+                    if response.status_code in (200, 204):
+                        limiter.update(response.headers)
+                        result.success = True
+                        result.error = None
+                        if response.status_code == 200:
+                            try:
+                                result.message_id = response.json().get("id")
+                            except ValueError:
+                                pass
+                        break
+                    result.error = f"ステータスコード {response.status_code}"
+                    if response.status_code == 429:
+                        if result.rate_limited >= self.max_rate_limit_retries:
+                            break
+                        result.rate_limited += 1
+                        retry_after, is_global = self._retry_after(response)
+                        (global_limiter if is_global else limiter).block(retry_after)
+                        continue
+                    if response.status_code < 500:
+                        break
+                    retry_after = None
+                # 通信エラー・5xxは指数バックオフで再試行
+                if result.attempts - result.rate_limited > self.max_retries:
+                    break
+                limiter.block(retry_after or RETRY_BACKOFF * 2 ** (result.attempts - result.rate_limited - 1))
+            result.latency = round(time.perf_counter() - start, 4)
+            if not result.success:
+                logger.error(f"Discord送信失敗 ({result.webhook} #{index}): {result.error}")
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _request_body(message: DigestMessage) -> dict:
+        """メッセージをhttpxのリクエスト引数（JSON、添付ファイルがある場合はmultipart）に変換"""
+        payload: Dict = {"embeds": message.embeds}
+        if message.content:
+            payload["content"] = truncate(message.content, 2000)
+        if not message.files:
+            return {"json": payload}
+        files = {
+            f"files[{index}]": (filename, data)
+            for index, (filename, data) in enumerate(message.files.items())
+        }
+        return {"data": {"payload_json": json.dumps(payload, ensure_ascii=False)}, "files": files}
+    
+    @staticmethod
+    def _retry_after(response) -> tuple:
+        """429応答から (待機秒数, グローバル制限か) を取得"""
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        retry_after = body.get("retry_after") or response.headers.get("Retry-After") or 1.0
+        return float(retry_after), bool(body.get("global")) or response.headers.get("X-RateLimit-Global") == "true"
+    
+    def send_embeds(
+        self,
+        embeds: List[Dict],
+        content: Optional[str] = None,
+        files: Optional[Dict[str, bytes]] = None
+    ) -> bool:
+        """
+        組み立て済みの埋め込みと添付ファイルを1メッセージとして全Webhookに送信
+        
+        Args:
+            embeds: Discord API形式の埋め込み辞書のリスト
+            content: 埋め込みの上に表示するテキスト（オプション）
+            files: ファイル名 → 内容の添付ファイル（オプション）
+        
+        Returns:
+            bool: 全Webhookへの送信に成功した場合True
+        """
+        try:
+            results = self.deliver([DigestMessage(content=content, embeds=list(embeds), files=files or {})])
+        except Exception as e:
+            logger.error(f"Discord埋め込み通知エラー: {e}", exc_info=True)
+            return False
+        return all(result.success for result in results)
+    
+    def send_embed(
+        self,
+        title: str,
+        description: str,
+        color: str = '03b2f8',
+        fields: Optional[List[Dict]] = None,
+        url: Optional[str] = None
+    ) -> bool:
+        """
+        カスタマイズされた埋め込みメッセージを全Webhookに送信（DiscordNotifier.send_embedと同じ引数）
+        
+        Returns:
+            bool: 全Webhookへの送信に成功した場合True
+        """
+        return self.send_embeds([build_embed(title, description, color, fields, url)])
+    
+    def send_message(
+        self,
+        content: str,
+        title: Optional[str] = None,
+        color: str = '03b2f8',
+        url: Optional[str] = None
+    ) -> bool:
+        """
+        テキストメッセージを全Webhookに送信（DiscordNotifier.send_messageと同じ引数）
+        
+        Returns:
+            bool: 全Webhookへの送信に成功した場合True
+        """
+        if title:
+            return self.send_embeds([build_embed(title, content, color, url=url, description_limit=4096)])
+        return self.send_embeds([], content=content)
+    
+    def test_connection(self) -> bool:
+        """
+        全Webhookの接続テスト
+        
+        Returns:
+            bool: 全Webhookへの送信に成功した場合True
+        """
+        embed = build_embed("🔧 接続テスト", "Research Paper BotのDiscord Webhook接続テストです。", '9b59b6')
+        embed["footer"] = {"text": f"{FOOTER_TEXT} - Test"}
+        return self.send_embeds([embed])
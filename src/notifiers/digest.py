@@ -0,0 +1,234 @@
+"""
+論文ダイジェストの組み立て
+
+複数の論文をグループ化し、Discordの埋め込み制限
+（説明文4096文字 / フィールド25個 / 埋め込み合計6000文字 / 1メッセージ10埋め込み）
+に収まるよう、できるだけ少ないWebhookメッセージに詰め込む
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.models import PaperResult
+
+
+# Discordの埋め込み制限
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_TOTAL_LIMIT = 6000
+EMBEDS_PER_MESSAGE = 10
+CONTENT_LIMIT = 2000
+
+FOOTER_TEXT = "Research Paper Bot"
+DEFAULT_GROUP = "その他"
+
+# 1行あたりの長さ（タイトル・要約抜粋）の上限
+LINE_TITLE_LIMIT = 150
+LINE_EXCERPT_LIMIT = 180
+
+
+@dataclass
+class DigestMessage:
+    """1回のWebhook送信に対応するダイジェストメッセージ"""
+    
+    content: Optional[str] = None
+    embeds: List[dict] = field(default_factory=list)
+    files: Dict[str, bytes] = field(default_factory=dict)
+    
+    @property
+    def embed_chars(self) -> int:
+        """埋め込み合計文字数（Discordの6000文字制限の対象）"""
+        return sum(
+            len(embed.get("title", "")) + len(embed.get("description", ""))
+            + len(embed.get("footer", {}).get("text", ""))
+            for embed in self.embeds
+        )
+
+
+def _truncate(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 3] + "..."
+
+
+def group_key(paper: PaperResult, group_by: str) -> str:
+    """
+    論文のグループ名を取得
+    
+    Args:
+        paper: 論文
+        group_by: "category"（主カテゴリ）/ "source" / "topic"（トピッククラスタ）/ "none"
+    
+    Returns:
+        グループ名
+    """
+    if group_by == "category":
+        primary = (paper.categories or "").split(",")[0].strip()
+        return primary or DEFAULT_GROUP
+    if group_by == "source":
+        return paper.source or DEFAULT_GROUP
+    if group_by == "topic":
+        return paper.topic or DEFAULT_GROUP
+    if group_by == "none":
+        return "新着論文"
+    raise ValueError(f"Unknown digest grouping: {group_by}")
+
+
+def group_papers(papers: List[PaperResult], group_by: str = "category") -> "OrderedDict[str, List[PaperResult]]":
+    """
+    論文をグループ化（件数の多いグループ順、グループ内は入力順）
+    
+    Args:
+        papers: 論文のリスト
+        group_by: グループ化の基準
+    
+    Returns:
+        グループ名 → 論文リストの順序付き辞書
+    """
+    groups: Dict[str, List[PaperResult]] = {}
+    for paper in papers:
+        groups.setdefault(group_key(paper, group_by), []).append(paper)
+    return OrderedDict(sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])))
+
+
+def _excerpt(paper: PaperResult) -> str:
+    """要約（なければ抽出した要点、アブストラクト）の冒頭1文を抜粋"""
+    text = " ".join((paper.summary or paper.key_points or paper.abstract or "").split()).lstrip("・")
+    for delimiter in ("。", ". "):
+        head, separator, _ = text.partition(delimiter)
+        if separator:
+            text = head + delimiter.strip()
+            break
+    return _truncate(text, LINE_EXCERPT_LIMIT)
+
+
+def format_digest_line(paper: PaperResult) -> str:
+    """
+    ダイジェストの1論文分の行を作成
+    
+    Args:
+        paper: 論文
+    
+    Returns:
+        Markdown形式の行（タイトルリンク + 要約抜粋、ウォッチ中の著者の論文は⭐付き）
+    """
+    title = _truncate(" ".join(paper.title.split()), LINE_TITLE_LIMIT)
+    title = title.replace("[", "(").replace("]", ")")
+    line = f"• {'⭐ ' if paper.watched_authors else ''}[{title}]({paper.url})"
+    excerpt = _excerpt(paper)
+    if excerpt:
+        line += f"\n　{excerpt}"
+    return line
+
+
+def render_markdown(papers: List[PaperResult], group_by: str, heading: str) -> str:
+    """
+    論文の詳細をMarkdown文書として出力（添付ファイル用）
+    
+    Args:
+        papers: 論文のリスト
+        group_by: グループ化の基準
+        heading: 文書の見出し
+    
+    Returns:
+        Markdown文字列
+    """
+    lines = [f"# {heading}", ""]
+    for group_name, members in group_papers(papers, group_by).items():
+        lines += [f"## {group_name}（{len(members)}件）", ""]
+        for paper in members:
+            lines += [
+                f"### [{' '.join(paper.title.split())}]({paper.url})",
+                "",
+                f"- 著者: {paper.authors}",
+                f"- 公開日: {paper.published}",
+                "",
+                paper.summary or paper.key_points or paper.abstract,
+                "",
+            ]
+    return "\n".join(lines)
+
+
+def build_digest(
+    papers: List[PaperResult],
+    group_by: str = "category",
+    heading: str = "📚 論文ダイジェスト",
+    max_messages: int = 5,
+    color: str = "3498db"
+) -> List[DigestMessage]:
+    """
+    論文リストをダイジェストメッセージに詰め込む
+    
+    各論文は1行（タイトルリンク + 要約抜粋）に整形し、グループごとの埋め込みの
+    説明文に詰めていく。埋め込み・メッセージの上限に達したら次の埋め込み・
+    メッセージに続け、max_messagesを超える分は最後のメッセージに添付する
+    Markdownファイルにまとめる。送信回数は論文数ではなく文字量に比例し、
+    max_messages + 添付1件で頭打ちになる
+    
+    Args:
+        papers: 論文のリスト
+        group_by: グループ化の基準（"category" / "source" / "topic" / "none"）
+        heading: ダイジェストの見出し
+        max_messages: 送信するメッセージ数の上限
+        color: 埋め込みの色（16進数カラーコード）
+    
+    Returns:
+        送信するメッセージのリスト（論文が空の場合は空リスト）
+    """
+    if not papers:
+        return []
+    if max_messages < 1:
+        raise ValueError("max_messages must be at least 1")
+    
+    messages = [DigestMessage(content=_truncate(f"**{heading}** — {len(papers)}件", CONTENT_LIMIT))]
+    message_chars = 0
+    overflow: List[PaperResult] = []
+    
+    for group_name, members in group_papers(papers, group_by).items():
+        embed: Optional[dict] = None
+        continued = False
+        for paper in members:
+            if overflow:
+                overflow.append(paper)
+                continue
+            line = format_digest_line(paper)
+            while True:
+                if embed is None:
+                    suffix = "（続き）" if continued else ""
+                    title = _truncate(f"{group_name}（{len(members)}件）{suffix}", EMBED_TITLE_LIMIT)
+                    cost = len(title) + len(FOOTER_TEXT)
+                    current = messages[-1]
+                    if (len(current.embeds) >= EMBEDS_PER_MESSAGE
+                            or message_chars + cost + len(line) > EMBED_TOTAL_LIMIT):
+                        if len(messages) >= max_messages:
+                            overflow.append(paper)
+                            break
+                        messages.append(DigestMessage())
+                        message_chars = 0
+                    embed = {
+                        "title": title,
+                        "description": "",
+                        "color": int(color, 16),
+                        "footer": {"text": FOOTER_TEXT},
+                    }
+                    messages[-1].embeds.append(embed)
+                    message_chars += cost
+                
+                separator = "\n" if embed["description"] else ""
+                addition = len(separator) + len(line)
+                if (len(embed["description"]) + addition <= EMBED_DESCRIPTION_LIMIT
+                        and message_chars + addition <= EMBED_TOTAL_LIMIT):
+                    embed["description"] += separator + line
+                    message_chars += addition
+                    break
+                embed = None
+                continued = True
+    
+    if overflow:
+        last = messages[-1]
+        note = f"ほか{len(overflow)}件は添付ファイルを参照してください"
+        last.content = _truncate(f"{last.content}\n{note}" if last.content else note, CONTENT_LIMIT)
+        markdown = render_markdown(overflow, group_by, f"{heading}（続き）")
+        last.files["digest.md"] = markdown.encode("utf-8")
+    
+    return messages
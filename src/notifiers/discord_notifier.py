@@ -4,12 +4,37 @@ Discord Webhook通知モジュール
 指定されたメッセージをDiscordに送信する機能を提供
 """
 import logging
-from typing import Optional
-from discord_webhook import DiscordWebhook, DiscordEmbed
+from typing import Dict, List, Optional
+
+from src import clock, deadline
+from src.lazy_import import LazyImporter
 
 
 logger = logging.getLogger(__name__)
 
+# discord_webhook（requests依存）は初回送信時にインポート
+_lazy = LazyImporter(__name__, {
+    "DiscordWebhook": "discord_webhook:DiscordWebhook",
+    "DiscordEmbed": "discord_webhook:DiscordEmbed",
+})
+__getattr__ = _lazy.module_getattr
+
+
+def truncate(text: str, max_length: int) -> str:
+    """
+    テキストを指定の長さで切り詰める
+    
+    Args:
+        text: 元のテキスト
+        max_length: 最大文字数
+    
+    Returns:
+        str: 切り詰められたテキスト
+    """
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 3] + "..."
+
 
 class DiscordNotifier:
     """Discord Webhookを使用してメッセージを通知するクラス"""
@@ -48,11 +73,11 @@ class DiscordNotifier:
             bool: 送信成功の場合True
         """
         try:
-            webhook = DiscordWebhook(url=self.webhook_url, timeout = 10)
+            webhook = _lazy.DiscordWebhook(url=self.webhook_url, timeout = deadline.timeout(10))
             
             if title:
                 # 埋め込み形式で送信
-                embed = DiscordEmbed(
+                embed = _lazy.DiscordEmbed(
                     title=self._truncate(title, 256),
                     description=self._truncate(content, 4096),
                     color=color
@@ -62,7 +87,7 @@ class DiscordNotifier:
                     embed.url = url
                 
                 embed.set_footer(text="Research Paper Bot")
-                embed.set_timestamp()
+                embed.set_timestamp(clock.now().timestamp())
                 
                 webhook.add_embed(embed)
             else:
@@ -87,7 +112,7 @@ class DiscordNotifier:
         title: str,
         description: str,
         color: str = '03b2f8',
-        fields: Optional[list[dict]] = None,
+        fields: Optional[List[Dict]] = None,
         url: Optional[str] = None
     ) -> bool:
         """
@@ -104,9 +129,9 @@ class DiscordNotifier:
             bool: 送信成功の場合True
         """
         try:
-            webhook = DiscordWebhook(url=self.webhook_url, timeout = 10)
+            webhook = _lazy.DiscordWebhook(url=self.webhook_url, timeout = deadline.timeout(10))
             
-            embed = DiscordEmbed(
+            embed = _lazy.DiscordEmbed(
                 title=self._truncate(title, 256),
                 description=self._truncate(description, 2000),
                 color=color
@@ -125,7 +150,7 @@ class DiscordNotifier:
                     )
             
             embed.set_footer(text="Research Paper Bot")
-            embed.set_timestamp()
+            embed.set_timestamp(clock.now().timestamp())
             
             webhook.add_embed(embed)
             response = webhook.execute()
@@ -141,21 +166,50 @@ class DiscordNotifier:
             logger.error(f"Discord埋め込み通知エラー: {e}", exc_info=True)
             return False
     
-    @staticmethod
-    def _truncate(text: str, max_length: int) -> str:
+    def send_embeds(
+        self,
+        embeds: List[Dict],
+        content: Optional[str] = None,
+        files: Optional[Dict[str, bytes]] = None
+    ) -> bool:
         """
-        テキストを指定の長さで切り詰める
+        組み立て済みの埋め込み（最大10件）と添付ファイルを1メッセージで送信
         
         Args:
-            text: 元のテキスト
-            max_length: 最大文字数
+            embeds: Discord API形式の埋め込み辞書のリスト
+            content: 埋め込みの上に表示するテキスト（オプション）
+            files: ファイル名 → 内容の添付ファイル（オプション）
         
         Returns:
-            str: 切り詰められたテキスト
+            bool: 送信成功の場合True
         """
-        if len(text) <= max_length:
-            return text
-        return text[:max_length - 3] + "..."
+        try:
+            webhook = _lazy.DiscordWebhook(url=self.webhook_url, timeout = deadline.timeout(10))
+            
+            if content:
+                webhook.set_content(self._truncate(content, 2000))
+            for embed in embeds:
+                webhook.add_embed(embed)
+            for filename, data in (files or {}).items():
+                webhook.add_file(file=data, filename=filename)
+            
+            response = webhook.execute()
+            
+            if response.status_code in [200, 204]:
+                logger.info(f"埋め込みメッセージ送信成功: {len(embeds)}件")
+                return True
+            else:
+                logger.error(f"埋め込みメッセージ送信失敗: ステータスコード {response.status_code}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Discord埋め込み通知エラー: {e}", exc_info=True)
+            return False
+    
+    @staticmethod
+    def _truncate(text: str, max_length: int) -> str:
+        """テキストを指定の長さで切り詰める（truncate()と同じ）"""
+        return truncate(text, max_length)
     
     def test_connection(self) -> bool:
         """
@@ -165,15 +219,15 @@ class DiscordNotifier:
             bool: 接続成功の場合True
         """
         try:
-            webhook = DiscordWebhook(url=self.webhook_url, timeout = 10)
+            webhook = _lazy.DiscordWebhook(url=self.webhook_url, timeout = deadline.timeout(10))
             
-            embed = DiscordEmbed(
+            embed = _lazy.DiscordEmbed(
                 title="🔧 接続テスト",
                 description="Research Paper BotのDiscord Webhook接続テストです。",
                 color='9b59b6'
             )
             embed.set_footer(text="Research Paper Bot - Test")
-            embed.set_timestamp()
+            embed.set_timestamp(clock.now().timestamp())
             
             webhook.add_embed(embed)
             response = webhook.execute()
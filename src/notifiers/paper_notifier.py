@@ -4,7 +4,11 @@
 論文情報を整形してDiscordに通知する機能を提供
 """
 import logging
+from typing import List
+
 from src.models import PaperResult
+from src.notifiers.async_discord import AsyncDiscordNotifier, build_embed
+from src.notifiers.digest import DigestMessage, build_digest
 from src.notifiers.discord_notifier import DiscordNotifier
 
 
@@ -17,11 +21,94 @@ class PaperNotifier:
     def __init__(self, webhook_url: str):
         """
         Args:
-            webhook_url: Discord Webhook URL
+            webhook_url: Discord Webhook URL（カンマ区切りで複数指定した場合は全Webhookに並行して送信）
         """
-        self.discord_notifier = DiscordNotifier(webhook_url)
+        urls = [url.strip() for url in webhook_url.split(",") if url.strip()]
+        if len(urls) > 1:
+            self.discord_notifier = AsyncDiscordNotifier(urls)
+        else:
+            self.discord_notifier = DiscordNotifier(webhook_url)
         logger.info("PaperNotifier初期化完了")
     
+    @property
+    def concurrent(self) -> bool:
+        """複数のWebhookに並行して送信する場合True（send_paper_summariesでまとめて送信できる）"""
+        return isinstance(self.discord_notifier, AsyncDiscordNotifier)
+    
+    @staticmethod
+    def paper_embed_args(paper: PaperResult) -> dict:
+        """
+        論文の埋め込みメッセージの内容（send_embed / build_embedの引数）
+        
+        Args:
+            paper: 送信する論文情報
+        
+        Returns:
+            title / description / color / fields / url の辞書
+        """
+        # タイトルを整形
+        title = f"{'⭐' if paper.watched_authors else '📄'} {paper.title}"
+        
+        # 説明文を構築（要約がある場合は要約を、ない場合は抽出した要点かアブストラクトを使用）
+        if paper.summary:
+            description = paper.summary
+        elif paper.summary_deferred:
+            description = f"*API使用量の予算の上限に達したため、要約は省略しました*\n\n{paper.key_points or paper.abstract[:1500]}"
+        elif paper.key_points:
+            description = f"*要約の代わりにアブストラクトから要点を抽出しました*\n\n{paper.key_points}"
+        else:
+            description = f"*要約の生成に失敗しました*\n\n{paper.abstract[:1500]}"
+        
+        # フィールドを構築
+        fields = [
+            {
+                'name': '著者',
+                'value': paper.authors[:1024],
+                'inline': False
+            },
+            {
+                'name': '公開日',
+                'value': paper.published,
+                'inline': True
+            },
+            {
+                'name': 'ソース',
+                'value': paper.source,
+                'inline': True
+            }
+        ]
+        
+        # ウォッチ中の著者を含む場合は追加
+        if paper.watched_authors:
+            fields.insert(0, {
+                'name': 'ウォッチ中の著者',
+                'value': ", ".join(paper.watched_authors)[:1024],
+                'inline': False
+            })
+        
+        # カテゴリがある場合は追加
+        if paper.categories:
+            fields.append({
+                'name': 'カテゴリ',
+                'value': paper.categories[:1024],
+                'inline': False
+            })
+        
+        # リンクを追加
+        fields.append({
+            'name': 'リンク',
+            'value': f'[論文を読む]({paper.url})',
+            'inline': False
+        })
+        
+        return {
+            'title': title,
+            'description': description,
+            'color': '3498db',
+            'fields': fields,
+            'url': paper.url
+        }
+    
     def send_paper_summary(self, paper: PaperResult) -> bool:
         """
         論文の要約をDiscordに送信
@@ -33,57 +120,8 @@ class PaperNotifier:
             bool: 送信成功の場合True
         """
         try:
-            # タイトルを整形
-            title = f"📄 {paper.title}"
-            
-            # 説明文を構築（要約がある場合は要約を、ない場合はアブストラクトを使用）
-            if paper.summary:
-                description = paper.summary
-            else:
-                description = f"*要約の生成に失敗しました*\n\n{paper.abstract[:1500]}"
-            
-            # フィールドを構築
-            fields = [
-                {
-                    'name': '著者',
-                    'value': paper.authors[:1024],
-                    'inline': False
-                },
-                {
-                    'name': '公開日',
-                    'value': paper.published,
-                    'inline': True
-                },
-                {
-                    'name': 'ソース',
-                    'value': paper.source,
-                    'inline': True
-                }
-            ]
-            
-            # カテゴリがある場合は追加
-            if paper.categories:
-                fields.append({
-                    'name': 'カテゴリ',
-                    'value': paper.categories[:1024],
-                    'inline': False
-                })
-            
-            # リンクを追加
-            fields.append({
-                'name': 'リンク',
-                'value': f'[論文を読む]({paper.url})',
-                'inline': False
-            })
-            
             # Discord通知を送信
-            success = self.discord_notifier.send_embed(
-                title=title,
-                description=description,
-                color='3498db',
-                fields=fields,
-                url=paper.url
-            )
+            success = self.discord_notifier.send_embed(**self.paper_embed_args(paper))
             
             if success:
                 logger.info(f"論文通知成功: {paper.title[:50]}...")
@@ -95,3 +133,89 @@ class PaperNotifier:
         except Exception as e:
             logger.error(f"論文通知エラー: {e}", exc_info=True)
             return False
+    
+    def send_paper_summaries(self, papers: List[PaperResult]) -> List[bool]:
+        """
+        複数の論文の要約を順番に送信（複数のWebhookの場合は1回の非同期配信で並行して送信）
+        
+        Args:
+            papers: 送信する論文のリスト
+        
+        Returns:
+            論文ごとの送信結果（全Webhookへの送信に成功した場合True）
+        """
+        if not self.concurrent:
+            return [self.send_paper_summary(paper) for paper in papers]
+        if not papers:
+            return []
+        messages = [DigestMessage(embeds=[build_embed(**self.paper_embed_args(paper))]) for paper in papers]
+        try:
+            results = self.discord_notifier.deliver(messages)
+        except Exception as e:
+            logger.error(f"論文通知エラー: {e}", exc_info=True)
+            return [False] * len(papers)
+        success = [True] * len(papers)
+        for result in results:
+            success[result.index] = success[result.index] and result.success
+            logger.debug(
+                f"配信結果 {result.webhook} #{result.index}: status={result.status}, "
+                f"attempts={result.attempts}, latency={result.latency:.3f}s"
+            )
+        latencies = sorted(result.latency for result in results)
+        logger.info(
+            f"論文通知: {sum(success)}/{len(papers)}件成功、"
+            f"レイテンシ中央値 {latencies[len(latencies) // 2]:.3f}s / 最大 {latencies[-1]:.3f}s"
+        )
+        return success
+    
+    def send_digest(
+        self,
+        papers: List[PaperResult],
+        group_by: str = "category",
+        max_messages: int = 5,
+        heading: str = "📚 論文ダイジェスト"
+    ) -> bool:
+        """
+        複数の論文を1つのダイジェストにまとめてDiscordに送信
+        
+        Args:
+            papers: 送信する論文のリスト
+            group_by: グループ化の基準（"category" / "source" / "none"）
+            max_messages: 送信するメッセージ数の上限（超過分はMarkdownファイルを添付）
+            heading: ダイジェストの見出し
+        
+        Returns:
+            bool: 全メッセージの送信に成功した場合True
+        """
+        try:
+            messages = build_digest(
+                papers,
+                group_by=group_by,
+                heading=heading,
+                max_messages=max_messages
+            )
+            logger.info(f"ダイジェスト送信: {len(papers)}件の論文を{len(messages)}メッセージで送信")
+            
+            if self.concurrent:
+                # 全メッセージを1回の非同期配信で各Webhookに順番に送信
+                success = all(result.success for result in self.discord_notifier.deliver(messages))
+            else:
+                success = True
+                for message in messages:
+                    if not self.discord_notifier.send_embeds(
+                        message.embeds,
+                        content=message.content,
+                        files=message.files
+                    ):
+                        success = False
+            
+            if success:
+                logger.info("ダイジェスト通知成功")
+            else:
+                logger.error("ダイジェスト通知で一部のメッセージの送信に失敗しました")
+            
+            return success
+        
+        except Exception as e:
+            logger.error(f"ダイジェスト通知エラー: {e}", exc_info=True)
+            return False
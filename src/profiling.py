@@ -0,0 +1,205 @@
+"""パイプラインのステージごとのCPU・メモリプロファイリング
+
+collect_papers / summarize_papers / notify_papersの各呼び出しをcProfileとtracemallocで計測し、
+呼び出しごとにホットスポット表（.txt）・pstats形式のプロファイル（.prof）・
+メモリ割り当ての増加量上位（-memory.txt）を出力ディレクトリに書き出す。
+各呼び出しの所要時間・ピークメモリはstages.jsonlに1行ずつ追記するため、
+常駐モードで同じステージが繰り返し呼ばれても結果を追跡できる
+
+無効な場合はステージをラップしないため、オーバーヘッドはない
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src import clock
+
+logger = logging.getLogger(__name__)
+
+# ResearchPaperBotの計測対象のステージ
+STAGES = ("collect_papers", "summarize_papers", "notify_papers")
+
+# メモリ割り当ての集計から除外するフレーム（計測自体・インポート機構）
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def format_hotspots(profile: cProfile.Profile, top: int) -> str:
+    """
+    プロファイルからホットスポット表を作成
+    
+    Args:
+        profile: 計測済みのプロファイル
+        top: 表示する関数の数
+    
+    Returns:
+        自己時間（tottime）順と累積時間（cumulative）順の表
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(profile, stream=output).strip_dirs()
+    for sort_key in ("tottime", "cumulative"):
+        output.write(f"=== sorted by {sort_key} ===\n")
+        stats.sort_stats(sort_key).print_stats(top)
+    return output.getvalue()
+
+
+def format_allocations(after: tracemalloc.Snapshot, before: tracemalloc.Snapshot, top: int) -> List[str]:
+    """
+    2つのスナップショット間でメモリ割り当てが増えた行の上位
+    
+    Args:
+        after: ステージ終了時のスナップショット
+        before: ステージ開始時のスナップショット
+        top: 表示する行数
+    
+    Returns:
+        "ファイル:行: size=... (+...), count=... (+...)" 形式の行
+    """
+    differences = after.filter_traces(_MEMORY_FILTERS).compare_to(before.filter_traces(_MEMORY_FILTERS), "lineno")
+    return [str(difference) for difference in differences[:top] if difference.size_diff > 0]
+
+
+class StageProfiler:
+    """ステージごとにCPU・メモリプロファイルを取得して出力ディレクトリに書き出すクラス"""
+    
+    def __init__(self, output_dir: str, cpu: bool = True, memory: bool = False, top: int = 25):
+        """
+        Args:
+            output_dir: 出力先の親ディレクトリ（実行ごとに日時のサブディレクトリを作成）
+            cpu: cProfileでCPU時間を計測するか
+            memory: tracemallocでメモリ割り当てを計測するか
+            top: ホットスポット表・割り当て上位の行数
+        """
+        self.output_dir = Path(output_dir) / clock.now().strftime("%Y%m%d-%H%M%S")
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._profiling = False
+        self._started_tracing = False
+    
+    def attach(self, bot, stages: Iterable[str] = STAGES) -> None:
+        """
+        botのステージのメソッドを計測付きのものに置き換える
+        
+        Args:
+            bot: ResearchPaperBot
+            stages: 計測するメソッド名
+        """
+        for name in stages:
+            setattr(bot, name, self.wrap(name, getattr(bot, name)))
+    
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        """funcの呼び出しをstageとして計測するラッパー"""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        ブロックを1回のステージ呼び出しとして計測し、結果を書き出す
+        
+        cProfileは呼び出し元のスレッドのみを計測する（ステージ内のスレッドプールの処理は
+        累積時間に待ち時間として現れる）。計測中のステージから呼ばれた場合はCPU計測を省略する
+        
+        Args:
+            name: ステージ名
+        """
+        with self._lock:
+            call = self.calls[name] = self.calls.get(name, 0) + 1
+            profile_cpu = self.cpu and not self._profiling
+            if profile_cpu:
+                self._profiling = True
+        prefix = self.output_dir / f"{name}-{call:04d}"
+        
+        profile = cProfile.Profile() if profile_cpu else None
+        before = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        started_at = clock.now()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiling = False
+            memory = None
+            if before is not None:
+                # 結果の書き出しによる割り当てを含めないよう、先にピークとスナップショットを取得
+                peak = tracemalloc.get_traced_memory()[1]
+                memory = (before, tracemalloc.take_snapshot(), peak)
+            record = {
+                "stage": name,
+                "call": call,
+                "started_at": started_at.isoformat(timespec="seconds"),
+                "wall_seconds": round(time.perf_counter() - started, 6),
+                "cpu_seconds": round(time.process_time() - cpu_started, 6),
+            }
+            try:
+                self._write(prefix, record, profile, memory)
+            except OSError as e:
+                logger.warning(f"Failed to write profile for {name}: {e}")
+    
+    def _write(
+        self,
+        prefix: Path,
+        record: dict,
+        profile: Optional[cProfile.Profile],
+        memory: Optional[Tuple[tracemalloc.Snapshot, tracemalloc.Snapshot, int]]
+    ) -> None:
+        """1回分の計測結果を書き出し、stages.jsonlに追記"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        artifacts = []
+        if profile is not None:
+            profile.dump_stats(prefix.with_suffix(".prof"))
+            prefix.with_suffix(".txt").write_text(format_hotspots(profile, self.top), encoding="utf-8")
+            artifacts += [prefix.with_suffix(".prof").name, prefix.with_suffix(".txt").name]
+        if memory is not None:
+            before, after, peak = memory
+            allocations = format_allocations(after, before, self.top)
+            memory_path = prefix.parent / f"{prefix.name}-memory.txt"
+            memory_path.write_text(
+                f"peak: {peak / 1024:.1f} KiB\n" + "\n".join(allocations) + "\n", encoding="utf-8"
+            )
+            record["peak_bytes"] = peak
+            artifacts.append(memory_path.name)
+        record["artifacts"] = artifacts
+        with self._lock, open(self.output_dir / "stages.jsonl", "a", encoding="utf-8") as summary:
+            summary.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+        message = f"Profile [{record['stage']} #{record['call']}] {record['wall_seconds']:.2f}s wall, {record['cpu_seconds']:.2f}s CPU"
+        if "peak_bytes" in record:
+            message += f", peak {record['peak_bytes'] / 1024 / 1024:.1f} MiB"
+        logger.info(f"{message} -> {self.output_dir}")
+    
+    def close(self) -> None:
+        """このプロファイラが開始したtracemallocを停止"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
@@ -0,0 +1,289 @@
+"""並列実行のための論文の決定的なシャーディング
+
+各シャード（"i/N"）は同じ条件で論文を収集し、正規化した論文ID（バージョンを除いたarXiv ID）の
+ハッシュ値でN分割したうちi番目の論文だけを要約・通知する。ハッシュはプロセスやホストに依存しない
+ため、N個のジョブを並列に実行すると互いに重ならない部分集合を処理し、全体で収集した論文を網羅する。
+
+各シャードの結果（処理した論文・通知数・API使用量・所要時間）はJSONに書き出し、
+merge_reportsで1つにまとめる。収集結果のダイジェストを比較し、シャード間で収集した論文が
+食い違っていた場合（実行時刻のずれで新着論文が増えた場合など）は警告する
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.collectors.base import extract_arxiv_id
+from src.models import PaperResult
+from src.summarizers.usage import TierUsage
+
+logger = logging.getLogger(__name__)
+
+
+def shard_key(paper: PaperResult) -> str:
+    """
+    シャードの割り当てに使う正規化した論文ID
+    
+    Args:
+        paper: 論文
+    
+    Returns:
+        "arxiv:2401.00001"（arXiv IDを抽出できない場合は前後の空白を除いて小文字にしたID）
+    """
+    arxiv_id = extract_arxiv_id(paper.id) or extract_arxiv_id(paper.url)
+    if arxiv_id:
+        return f"arxiv:{arxiv_id}"
+    return paper.id.strip().casefold()
+
+
+def shard_index(paper: PaperResult, count: int) -> int:
+    """論文を割り当てるシャード（1始まり）"""
+    digest = hashlib.sha256(shard_key(paper).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def collection_digest(papers: Iterable[PaperResult]) -> str:
+    """収集した論文の集合のダイジェスト（順序に依存しない）"""
+    keys = sorted({shard_key(paper) for paper in papers})
+    return hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Shard:
+    """N分割のうちi番目のシャード（1 <= index <= count）"""
+    
+    index: int
+    count: int
+    
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """
+        "i/N" 形式の文字列を解析
+        
+        Args:
+            value: "2/4" など
+        
+        Returns:
+            シャード
+        
+        Raises:
+            ValueError: 形式が不正、またはiが1〜Nの範囲外の場合
+        """
+        try:
+            index, count = (int(part) for part in value.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard (expected i/N): {value}")
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Shard index must satisfy 1 <= i <= N: {value}")
+        return cls(index, count)
+    
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+    
+    def select(self, papers: Iterable[PaperResult]) -> List[PaperResult]:
+        """このシャードに割り当てられた論文（元の順序を保持）"""
+        return [paper for paper in papers if shard_index(paper, self.count) == self.index]
+
+
+@dataclass
+class ShardReport:
+    """1シャード分の実行結果"""
+    
+    shard: str
+    success: bool
+    collected: int = 0
+    collection_digest: str = ""
+    papers: List[str] = field(default_factory=list)
+    notified: int = 0
+    usage: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    elapsed: float = 0.0
+    
+    @property
+    def summarized(self) -> int:
+        return self.usage.get("summary", {}).get("papers", 0)
+    
+    def save(self, path: str) -> None:
+        """JSONファイルに書き出す"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2), encoding="utf-8")
+    
+    @classmethod
+    def load(cls, path: str) -> "ShardReport":
+        """JSONファイルから読み込む"""
+        return cls(**json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+class ShardRun:
+    """botの収集ステージにシャードの選択を組み込み、実行結果を記録するクラス"""
+    
+    def __init__(self, shard: Shard):
+        """
+        Args:
+            shard: このジョブが処理するシャード
+        """
+        self.shard = shard
+        self.collected = 0
+        self.digest = ""
+        self.papers: List[str] = []
+        self.notified = 0
+        self._bot = None
+        self._usage_before: Dict[str, TierUsage] = {}
+        self._start = time.perf_counter()
+    
+    def attach(self, bot) -> None:
+        """
+        botのcollect_papersを割り当てられた論文だけを返すものに、
+        notify_papersを通知結果を記録するものに置き換える
+        
+        Args:
+            bot: ResearchPaperBot
+        """
+        self._bot = bot
+        self._usage_before = bot.usage.snapshot()
+        self._start = time.perf_counter()
+        collect_papers = bot.collect_papers
+        notify_papers = bot.notify_papers
+        
+        @wraps(collect_papers)
+        def collect_shard(*args, **kwargs):
+            papers = collect_papers(*args, **kwargs)
+            self.collected = len(papers)
+            self.digest = collection_digest(papers)
+            selected = self.shard.select(papers)
+            logger.info(f"Shard {self.shard}: processing {len(selected)} of {len(papers)} collected papers")
+            return selected
+        
+        @wraps(notify_papers)
+        def notify_shard(papers):
+            results = notify_papers(papers)
+            self.papers.extend(paper.id for paper in papers)
+            self.notified += sum(results)
+            return results
+        
+        bot.collect_papers = collect_shard
+        bot.notify_papers = notify_shard
+    
+    def report(self, success: bool) -> ShardReport:
+        """
+        attach以降の実行結果
+        
+        Args:
+            success: bot.runの結果
+        
+        Returns:
+            シャードの実行結果
+        """
+        usage = self._bot.usage.since(self._usage_before) if self._bot is not None else {}
+        return ShardReport(
+            shard=str(self.shard),
+            success=success,
+            collected=self.collected,
+            collection_digest=self.digest,
+            papers=self.papers,
+            notified=self.notified,
+            usage={tier: asdict(tier_usage) for tier, tier_usage in usage.items()},
+            elapsed=round(time.perf_counter() - self._start, 3)
+        )
+
+
+def load_reports(directory: str) -> List[ShardReport]:
+    """ディレクトリ（サブディレクトリを含む）のshard-*.jsonをすべて読み込む"""
+    return [ShardReport.load(str(path)) for path in sorted(Path(directory).rglob("shard-*.json"))]
+
+
+def merge_reports(reports: List[ShardReport]) -> Dict[str, Any]:
+    """
+    シャードごとの結果を1つにまとめる
+    
+    Args:
+        reports: 各シャードの結果
+    
+    Returns:
+        {"shards", "missing", "failed", "collection_consistent", "collected", "papers",
+        "duplicates", "notified", "summarized", "usage", "elapsed", "runner_seconds"} の辞書。
+        elapsedは最も遅いシャードの所要時間（並列実行時のウォールクロック）、
+        runner_secondsは全シャードの所要時間の合計
+    
+    Raises:
+        ValueError: 結果が空、またはシャード数（N）が食い違っている場合
+    """
+    if not reports:
+        raise ValueError("No shard reports to merge")
+    counts = {Shard.parse(report.shard).count for report in reports}
+    if len(counts) != 1:
+        raise ValueError(f"Shard reports have different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    present = {Shard.parse(report.shard).index for report in reports}
+    missing = [f"{index}/{count}" for index in range(1, count + 1) if index not in present]
+    digests = {report.collection_digest for report in reports if report.success}
+    if len(digests) > 1:
+        logger.warning("Shards collected different paper sets; some papers may be skipped or unprocessed")
+    
+    papers: List[str] = []
+    seen = set()
+    duplicates = []
+    for report in sorted(reports, key=lambda report: Shard.parse(report.shard).index):
+        for paper_id in report.papers:
+            if paper_id in seen:
+                duplicates.append(paper_id)
+            seen.add(paper_id)
+            papers.append(paper_id)
+    
+    usage: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        for tier, tier_usage in report.usage.items():
+            total = usage.setdefault(tier, asdict(TierUsage(model=tier_usage.get("model", ""))))
+            for key, value in tier_usage.items():
+                if key != "model":
+                    total[key] += value
+    
+    return {
+        "shards": count,
+        "missing": missing,
+        "failed": sorted(report.shard for report in reports if not report.success),
+        "collection_consistent": len(digests) <= 1,
+        "collected": max(report.collected for report in reports),
+        "papers": papers,
+        "duplicates": duplicates,
+        "notified": sum(report.notified for report in reports),
+        "summarized": sum(report.summarized for report in reports),
+        "usage": usage,
+        "elapsed": max(report.elapsed for report in reports),
+        "runner_seconds": round(sum(report.elapsed for report in reports), 3),
+    }
+
+
+def format_merged(merged: Dict[str, Any], prices: Optional[Dict] = None) -> List[str]:
+    """
+    まとめた結果をログ出力用の行にする
+    
+    Args:
+        merged: merge_reportsの結果
+        prices: モデルごとの単価（推定コストの表示に使用）
+    
+    Returns:
+        レポートの各行
+    """
+    lines = [
+        f"Shards: {merged['shards']} (missing: {', '.join(merged['missing']) or 'none'}, "
+        f"failed: {', '.join(merged['failed']) or 'none'})",
+        f"Collected {merged['collected']} papers, processed {len(merged['papers'])}, "
+        f"summarized {merged['summarized']}, notified {merged['notified']}",
+        f"Wall clock {merged['elapsed']:.1f}s across shards ({merged['runner_seconds']:.1f}s runner time)",
+    ]
+    for tier, tier_usage in merged["usage"].items():
+        usage = TierUsage(**tier_usage)
+        cost = usage.cost(prices or {})
+        lines.append(
+            f"Usage [{tier}] {usage.model}: {usage.calls} calls, "
+            f"{usage.prompt_tokens}+{usage.completion_tokens} tokens"
+            + (f", ${cost:.4f}" if cost is not None else "")
+        )
+    if merged["duplicates"]:
+        lines.append(f"Papers processed by more than one shard: {len(merged['duplicates'])}")
+    return lines
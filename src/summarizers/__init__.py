@@ -1,5 +1,20 @@
 """論文要約機能モジュール"""
 
+from .base import CompletionSummarizer, PaperSummarizer, SummarizerCapabilities, summarize_all
+from .fake import FakeSummarizer
+from .openai_compatible import OpenAICompatibleSummarizer
 from .openrouter_summarizer import OpenRouterSummarizer
+from .registry import available_summarizers, create_summarizer, register_summarizer
 
-__all__ = ["OpenRouterSummarizer"]
+__all__ = [
+    "CompletionSummarizer",
+    "FakeSummarizer",
+    "OpenAICompatibleSummarizer",
+    "OpenRouterSummarizer",
+    "PaperSummarizer",
+    "SummarizerCapabilities",
+    "available_summarizers",
+    "create_summarizer",
+    "register_summarizer",
+    "summarize_all",
+]
@@ -0,0 +1,111 @@
+"""要約器の共通インターフェース
+
+OpenRouter・OpenAI互換のエンドポイント（同一ホストのllama.cpp / vLLMサーバーなど）・
+決定的なフェイクなどのバックエンドが満たすインターフェースと、バックエンドごとに
+宣言する並行数・バッチサイズに従って複数の論文を要約するヘルパー
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Protocol, Union, runtime_checkable
+
+from ..models import PaperResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SummarizerCapabilities:
+    """バックエンドが宣言する処理能力"""
+    
+    # 同時に実行できる要約の数（1の場合は逐次実行）
+    max_concurrency: int = 1
+    # 1回のsummarize_batch()でまとめて要約できる論文数（1の場合はsummarize()を論文ごとに呼ぶ）
+    max_batch_size: int = 1
+
+
+@runtime_checkable
+class PaperSummarizer(Protocol):
+    """要約器のプロトコル
+    
+    OpenRouterSummarizer / OpenAICompatibleSummarizer / FakeSummarizer など、
+    バックエンドごとの要約器が満たすインターフェース。max_batch_sizeが2以上の要約器は
+    summarize_batch(papers) も提供する
+    """
+    
+    capabilities: SummarizerCapabilities
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        """論文を要約してsummaryに格納"""
+        ...
+
+
+@runtime_checkable
+class CompletionSummarizer(PaperSummarizer, Protocol):
+    """任意のプロンプトを送信できる要約器のプロトコル
+    
+    トリアージ・全文要約はこのインターフェースでAPIを呼び出す（リトライ・使用量の記録は要約器が行う）
+    """
+    
+    model: str
+    
+    def complete(self, prompt: str) -> str:
+        """プロンプト（userメッセージ）を送信して応答テキストを取得"""
+        ...
+    
+    def preprocess_abstract(self, abstract: str) -> str:
+        """プロンプトに含めるアブストラクトを前処理"""
+        ...
+
+
+def capabilities_of(summarizer) -> SummarizerCapabilities:
+    """
+    要約器の処理能力を取得
+    
+    Args:
+        summarizer: 要約器
+    
+    Returns:
+        宣言された処理能力（宣言していない要約器は逐次・1件ずつ）
+    """
+    capabilities = getattr(summarizer, "capabilities", None)
+    if isinstance(capabilities, SummarizerCapabilities):
+        return capabilities
+    return SummarizerCapabilities()
+
+
+def summarize_all(summarizer, papers: List[PaperResult]) -> List[Union[PaperResult, Exception]]:
+    """
+    要約器の処理能力に従い、複数の論文をバッチ・並行に要約
+    
+    Args:
+        summarizer: 要約器
+        papers: 要約する論文のリスト
+    
+    Returns:
+        論文と同じ順序の要約結果（失敗した論文は発生した例外）
+    """
+    capabilities = capabilities_of(summarizer)
+    batch_size = max(capabilities.max_batch_size, 1)
+    batches = [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+    
+    def run(batch: List[PaperResult]) -> List[Union[PaperResult, Exception]]:
+        if len(batch) > 1:
+            try:
+                return list(summarizer.summarize_batch(batch))
+            except Exception as e:
+                logger.warning(f"Batch summarization of {len(batch)} papers failed: {e}")
+                return [e] * len(batch)
+        try:
+            return [summarizer.summarize(batch[0])]
+        except Exception as e:
+            return [e]
+    
+    workers = min(max(capabilities.max_concurrency, 1), len(batches))
+    if workers <= 1:
+        results = [run(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as executor:
+            results = list(executor.map(run, batches))
+    return [result for batch_results in results for result in batch_results]
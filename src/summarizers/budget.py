@@ -0,0 +1,289 @@
+"""API使用量（トークン数・推定コスト）の予算管理
+
+1回の実行と1日あたりのトークン数・推定コストに上限を設け、要約の前に論文ごとの
+使用量を見積もって、予算内でできるだけ多くの論文を要約できるように選ぶ。
+実際の使用量はUsageTrackerに集計されたcompletionのusageで追跡し、見積もりより
+多く使った場合は残りの論文の要約を打ち切る。1日あたりの使用量はファイルに記録し、
+同じ日の実行で共有する
+"""
+
+import json
+import logging
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .. import clock
+from ..config import config
+from ..models import PaperResult
+from .preprocess import estimate_tokens
+from .usage import TierUsage, UsageTracker
+
+logger = logging.getLogger(__name__)
+
+# チャット形式のメッセージのオーバーヘッド（トークン）
+MESSAGE_OVERHEAD_TOKENS = 8
+
+
+@dataclass
+class UsageEstimate:
+    """1論文の要約に使う見積もり使用量"""
+    
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+    
+    def cost(self, prices) -> float:
+        """推定コスト（USD、モデルの単価が不明な場合は0）"""
+        return TierUsage(
+            model=self.model,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens
+        ).cost(prices) or 0.0
+
+
+def estimate_prompt(prompt: str) -> int:
+    """プロンプト1回分の入力トークン数の見積もり"""
+    return estimate_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class Spend:
+    """使用したトークン数と推定コスト"""
+    
+    tokens: int = 0
+    cost: float = 0.0
+
+
+class BudgetManager:
+    """実行ごと・1日ごとのトークン数と推定コストの上限を管理するクラス"""
+    
+    def __init__(
+        self,
+        usage_tracker: UsageTracker,
+        run_tokens: int = 0,
+        run_cost: float = 0.0,
+        daily_tokens: int = 0,
+        daily_cost: float = 0.0,
+        ledger_path: Optional[str] = None
+    ):
+        """
+        Args:
+            usage_tracker: 実際の使用量の集計（全ティアの合計を予算に計上）
+            run_tokens: 1回の実行のトークン数の上限（0の場合は無制限）
+            run_cost: 1回の実行の推定コストの上限（USD、0の場合は無制限）
+            daily_tokens: 1日のトークン数の上限（0の場合は無制限）
+            daily_cost: 1日の推定コストの上限（USD、0の場合は無制限）
+            ledger_path: 1日の使用量を記録するJSONファイル（Noneの場合は実行中のみ集計）
+        """
+        self.usage_tracker = usage_tracker
+        self.run_tokens = run_tokens
+        self.run_cost = run_cost
+        self.daily_tokens = daily_tokens
+        self.daily_cost = daily_cost
+        self.ledger_path = Path(ledger_path) if ledger_path else None
+        self._run_start: Dict[str, TierUsage] = usage_tracker.snapshot()
+        self._committed: Dict[str, TierUsage] = self._run_start
+    
+    @classmethod
+    def from_config(cls, usage_tracker: UsageTracker, models: Sequence[str] = ()) -> "BudgetManager":
+        """
+        設定（BUDGET_*）から生成
+        
+        Args:
+            usage_tracker: 実際の使用量の集計
+            models: 使用するモデル（コストの上限がある場合、MODEL_PRICESに単価がないモデルを警告する）
+        
+        Returns:
+            BudgetManagerインスタンス
+        """
+        if config.BUDGET_RUN_COST > 0 or config.BUDGET_DAILY_COST > 0:
+            unpriced = [model for model in dict.fromkeys(models) if model not in usage_tracker.prices]
+            if unpriced:
+                logger.warning(
+                    f"No MODEL_PRICES entry for {', '.join(unpriced)}: their usage is costed at 0, "
+                    f"so BUDGET_RUN_COST / BUDGET_DAILY_COST are not enforced for them"
+                )
+        return cls(
+            usage_tracker,
+            run_tokens=config.BUDGET_RUN_TOKENS,
+            run_cost=config.BUDGET_RUN_COST,
+            daily_tokens=config.BUDGET_DAILY_TOKENS,
+            daily_cost=config.BUDGET_DAILY_COST,
+            ledger_path=config.BUDGET_FILE
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        return any(limit > 0 for limit in (self.run_tokens, self.run_cost, self.daily_tokens, self.daily_cost))
+    
+    def start_run(self) -> None:
+        """実行ごとの上限の集計を始める"""
+        self._run_start = self.usage_tracker.snapshot()
+    
+    def _spend(self, before: Dict[str, TierUsage]) -> Spend:
+        usage = self.usage_tracker.since(before)
+        return Spend(
+            tokens=sum(tier_usage.total_tokens for tier_usage in usage.values()),
+            cost=sum(tier_usage.cost(self.usage_tracker.prices) or 0.0 for tier_usage in usage.values())
+        )
+    
+    def run_spend(self) -> Spend:
+        """この実行で使用した量"""
+        return self._spend(self._run_start)
+    
+    def daily_spend(self) -> Spend:
+        """今日使用した量（記録済みの量 + 未記録のこの実行の量）"""
+        recorded = self._load_ledger()
+        pending = self._spend(self._committed)
+        return Spend(tokens=recorded.tokens + pending.tokens, cost=recorded.cost + pending.cost)
+    
+    def remaining(self) -> Spend:
+        """
+        実行ごと・1日ごとの上限までの残り（上限がない項目はinf）
+        
+        Returns:
+            残りのトークン数と推定コスト
+        """
+        tokens, cost = math.inf, math.inf
+        run = self.run_spend()
+        if self.run_tokens > 0:
+            tokens = min(tokens, self.run_tokens - run.tokens)
+        if self.run_cost > 0:
+            cost = min(cost, self.run_cost - run.cost)
+        if self.daily_tokens > 0 or self.daily_cost > 0:
+            daily = self.daily_spend()
+            if self.daily_tokens > 0:
+                tokens = min(tokens, self.daily_tokens - daily.tokens)
+            if self.daily_cost > 0:
+                cost = min(cost, self.daily_cost - daily.cost)
+        return Spend(tokens=tokens, cost=cost)
+    
+    def estimate(self, paper: PaperResult, summarizer) -> UsageEstimate:
+        """
+        論文の要約に使う使用量を見積もる
+        
+        Args:
+            paper: 要約する論文
+            summarizer: 要約器（estimate_usageを持たない場合はアブストラクトから見積もる）
+        
+        Returns:
+            見積もり使用量
+        """
+        estimate_usage = getattr(summarizer, "estimate_usage", None)
+        if callable(estimate_usage):
+            return estimate_usage(paper)
+        return UsageEstimate(
+            model=str(getattr(summarizer, "model", "")),
+            prompt_tokens=estimate_prompt(f"{paper.title}\n{paper.abstract}"),
+            completion_tokens=int(getattr(summarizer, "max_tokens", 500))
+        )
+    
+    def allows(self, estimate: UsageEstimate, pending: Sequence[UsageEstimate] = ()) -> bool:
+        """
+        実際の使用量を踏まえ、見積もり分を使っても上限内に収まるか
+        
+        Args:
+            estimate: 要約する論文の見積もり使用量
+            pending: 同時に要約する（まだ使用量に計上されていない）論文の見積もり使用量
+        
+        Returns:
+            上限内に収まる場合はTrue
+        """
+        remaining = self.remaining()
+        estimates = [*pending, estimate]
+        prices = self.usage_tracker.prices
+        return (
+            sum(item.total_tokens for item in estimates) <= remaining.tokens
+            and sum(item.cost(prices) for item in estimates) <= remaining.cost
+        )
+    
+    def plan(self, papers: List[PaperResult], summarizer) -> Tuple[List[PaperResult], List[PaperResult]]:
+        """
+        予算内で要約する論文を選ぶ
+        
+        ウォッチ中の著者の論文を優先し、残りは見積もり使用量の少ない順に詰めて
+        要約できる論文数を最大にする
+        
+        Args:
+            papers: 要約候補の論文（優先度順）
+            summarizer: 要約器
+        
+        Returns:
+            (要約する論文, 予算超過で要約しない論文)。どちらも元の順序を保持
+        """
+        remaining = self.remaining()
+        estimates = {id(paper): self.estimate(paper, summarizer) for paper in papers}
+        candidates = sorted(
+            papers,
+            key=lambda paper: (not paper.watched_authors, estimates[id(paper)].total_tokens)
+        )
+        tokens, cost = 0, 0.0
+        selected = set()
+        for paper in candidates:
+            estimate = estimates[id(paper)]
+            estimate_cost = estimate.cost(self.usage_tracker.prices)
+            if tokens + estimate.total_tokens <= remaining.tokens and cost + estimate_cost <= remaining.cost:
+                tokens += estimate.total_tokens
+                cost += estimate_cost
+                selected.add(id(paper))
+        skipped = [paper for paper in papers if id(paper) not in selected]
+        logger.info(
+            f"Budget plan: {len(selected)}/{len(papers)} papers within budget "
+            f"(estimated {tokens} tokens, ${cost:.4f}; remaining {remaining.tokens} tokens, "
+            f"${remaining.cost:.4f})"
+        )
+        return [paper for paper in papers if id(paper) in selected], skipped
+    
+    def commit(self) -> None:
+        """前回の記録以降の使用量を1日の使用量のファイルに加算"""
+        pending = self._spend(self._committed)
+        self._committed = self.usage_tracker.snapshot()
+        if self.ledger_path is None or (pending.tokens == 0 and pending.cost == 0):
+            return
+        recorded = self._load_ledger()
+        self._write_ledger(Spend(tokens=recorded.tokens + pending.tokens, cost=recorded.cost + pending.cost))
+    
+    def format_status(self) -> str:
+        """ログ出力用の使用状況"""
+        run = self.run_spend()
+        daily = self.daily_spend()
+        return (
+            f"Budget: run {run.tokens} tokens / ${run.cost:.4f}, today {daily.tokens} tokens / ${daily.cost:.4f} "
+            f"(limits: run {self.run_tokens or '-'} tokens / ${self.run_cost or '-'}, "
+            f"daily {self.daily_tokens or '-'} tokens / ${self.daily_cost or '-'})"
+        )
+    
+    @staticmethod
+    def _today() -> str:
+        return clock.now().date().isoformat()
+    
+    def _load_ledger(self) -> Spend:
+        if self.ledger_path is None or not self.ledger_path.exists():
+            return Spend()
+        try:
+            data = json.loads(self.ledger_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable budget ledger {self.ledger_path}: {e}")
+            return Spend()
+        if data.get("date") != self._today():
+            return Spend()
+        return Spend(tokens=int(data.get("tokens", 0)), cost=float(data.get("cost", 0.0)))
+    
+    def _write_ledger(self, spend: Spend) -> None:
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.ledger_path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump({"date": self._today(), "tokens": spend.tokens, "cost": round(spend.cost, 6)}, tmp_file)
+            os.replace(tmp_path, self.ledger_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
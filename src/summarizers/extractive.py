@@ -0,0 +1,218 @@
+"""アブストラクトからの抽出要約（CPUのみ、APIを使用しない）
+
+アブストラクトを文に分割し、文ごとのTF-IDFベクトル（NumPy）からTextRank
+（文の類似度グラフ上のPageRank）と、文書全体の重心への類似度を計算して、
+スコアの高い文を元の順序で要点として抜き出す。1論文あたり数ミリ秒で終わるため、
+APIが使えない場合・予算の上限に達した場合・関連度が要約のしきい値に届かない場合の
+要約の代わりに使用する
+
+このモジュールはnumpyに依存するため、抽出要約が必要になった時点でインポートする
+（計算はnumpyのみで行うが、トピッククラスタリングと共通のトークン化を使うためscipyも読み込まれる）
+"""
+
+import logging
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from ..analyzers.clustering import tokenize
+from ..models import PaperResult
+from .base import SummarizerCapabilities
+from .budget import UsageEstimate
+from .preprocess import AbstractPreprocessor
+
+logger = logging.getLogger(__name__)
+
+# 文の区切り（終端記号の後に大文字・数字・括弧で始まる文が続く位置。"e.g. the" などは区切らない）
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+
+# 要点の行頭記号
+BULLET = "・"
+
+
+def split_sentences(text: str, min_chars: int = 20) -> List[str]:
+    """
+    テキストを文に分割
+    
+    Args:
+        text: テキスト
+        min_chars: これより短い断片は直前の文に連結する
+    
+    Returns:
+        文のリスト
+    """
+    sentences: List[str] = []
+    for sentence in _SENTENCE_BOUNDARY.split(" ".join(text.split())):
+        if sentences and len(sentence) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {sentence}"
+        elif sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def sentence_vectors(sentences: List[str]) -> np.ndarray:
+    """
+    文ごとのTF-IDFベクトル（対数TF、平滑化IDF、行ごとにL2正規化）
+    
+    Args:
+        sentences: 文のリスト
+    
+    Returns:
+        文数 × 語彙数の行列
+    """
+    vocabulary = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    for row, sentence in enumerate(sentences):
+        for token in tokenize(sentence):
+            rows.append(row)
+            columns.append(vocabulary.setdefault(token, len(vocabulary)))
+    counts = np.zeros((len(sentences), len(vocabulary)))
+    np.add.at(counts, (rows, columns), 1.0)
+    
+    matrix = np.log1p(counts)
+    df = np.count_nonzero(counts, axis=0)
+    matrix *= np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = 1.0
+    return matrix / norms[:, None]
+
+
+def textrank(similarity: np.ndarray, damping: float = 0.85, iterations: int = 50, tol: float = 1e-6) -> np.ndarray:
+    """
+    類似度行列のグラフ上のPageRank
+    
+    Args:
+        similarity: 文 × 文の類似度行列（非負）
+        damping: ダンピング係数
+        iterations: 反復回数の上限
+        tol: 収束判定のしきい値（L1ノルム）
+    
+    Returns:
+        文ごとのスコア（合計1）
+    """
+    n = similarity.shape[0]
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0.0)
+    totals = weights.sum(axis=1, keepdims=True)
+    # 他の文と語を共有しない文からは全文に均等に遷移する
+    transition = np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), 1.0 / n)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1.0 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            return updated
+        scores = updated
+    return scores
+
+
+class ExtractiveSummarizer:
+    """TextRankと重心への類似度で重要な文を抜き出す要約器"""
+    
+    capabilities = SummarizerCapabilities(max_concurrency=1)
+    
+    def __init__(
+        self,
+        num_sentences: int = 3,
+        centroid_weight: float = 0.5,
+        max_chars: int = 1500,
+        usage_tracker=None
+    ):
+        """
+        Args:
+            num_sentences: 抜き出す文の数
+            centroid_weight: 重心への類似度の重み（残りはTextRankのスコア）
+            max_chars: 要点全体の最大文字数
+            usage_tracker: 使用しない（他のバックエンドとの互換のため保持）
+        """
+        self.num_sentences = num_sentences
+        self.centroid_weight = centroid_weight
+        self.max_chars = max_chars
+        self.usage_tracker = usage_tracker
+        self.model = "extractive"
+        self.preprocessor = AbstractPreprocessor(max_tokens=0)
+    
+    def extract(self, text: str) -> List[str]:
+        """
+        テキストから重要な文を抜き出す
+        
+        Args:
+            text: アブストラクトなどのテキスト
+        
+        Returns:
+            重要な文のリスト（元の順序）
+        """
+        sentences = split_sentences(self.preprocessor.clean(text))
+        if len(sentences) <= self.num_sentences:
+            return sentences
+        matrix = sentence_vectors(sentences)
+        rank = textrank(np.clip(matrix @ matrix.T, 0.0, None))
+        centroid = matrix.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        centrality = matrix @ (centroid / norm) if norm > 0 else np.zeros(len(sentences))
+        scores = (1.0 - self.centroid_weight) * rank / rank.max() + self.centroid_weight * centrality
+        # 同点の場合は前の文を優先
+        top = np.argsort(-scores, kind="stable")[:self.num_sentences]
+        return [sentences[index] for index in sorted(top)]
+    
+    def key_points(self, paper: PaperResult) -> Optional[str]:
+        """
+        論文のアブストラクトから要点を作成
+        
+        Args:
+            paper: 論文
+        
+        Returns:
+            行頭記号付きの要点（アブストラクトがない場合はNone）
+        """
+        sentences = self.extract(paper.abstract or "")
+        if not sentences:
+            return None
+        text = "\n".join(f"{BULLET}{sentence}" for sentence in sentences)
+        return text if len(text) <= self.max_chars else text[:self.max_chars - 1] + "…"
+    
+    def annotate(self, papers: List[PaperResult]) -> int:
+        """
+        要約のない論文のkey_pointsに要点を格納
+        
+        Args:
+            papers: 論文のリスト
+        
+        Returns:
+            要点を格納した論文数
+        """
+        count = 0
+        for paper in papers:
+            if paper.summary or paper.key_points:
+                continue
+            try:
+                paper.key_points = self.key_points(paper)
+            except Exception as e:
+                logger.warning(f"Failed to extract key points from {paper.id}: {e}")
+                continue
+            count += paper.key_points is not None
+        return count
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        """
+        論文の要点を要約として格納（要約のバックエンドとして使用する場合）
+        
+        Args:
+            paper: 要約する論文
+        
+        Returns:
+            要約が追加されたPaperResultオブジェクト
+        
+        Raises:
+            ValueError: アブストラクトから文を抽出できない場合
+        """
+        key_points = self.key_points(paper)
+        if key_points is None:
+            raise ValueError(f"No sentences to extract from {paper.id}")
+        paper.summary = key_points
+        return paper
+    
+    def estimate_usage(self, paper: PaperResult) -> UsageEstimate:
+        """APIを使用しないため使用量は0"""
+        return UsageEstimate(self.model, 0, 0)
@@ -0,0 +1,95 @@
+"""APIを呼び出さない決定的なフェイクの要約器
+
+タイトルとアブストラクトの先頭の文から要約を組み立てるため、同じ論文には常に同じ要約を返す。
+APIキーやネットワークなしでパイプライン全体（トリアージ以外）を動かす場合や、
+ベンチマークで要約以外のステージを計測する場合に使用する
+"""
+
+import logging
+import re
+import threading
+from typing import List, Optional
+
+from ..models import PaperResult
+from .base import SummarizerCapabilities
+from .budget import UsageEstimate, estimate_prompt
+from .preprocess import CompressionStats, estimate_tokens
+from .usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+# 文の区切り（". " / "。"）
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+class FakeSummarizer:
+    """アブストラクトから決定的に要約を作る要約器"""
+    
+    capabilities = SummarizerCapabilities(max_concurrency=8, max_batch_size=16)
+    
+    def __init__(
+        self,
+        usage_tracker: Optional[UsageTracker] = None,
+        tier: str = "summary",
+        model: str = "fake",
+        max_sentences: int = 2
+    ):
+        """
+        Args:
+            usage_tracker: 使用量（推定トークン数）の集計先（Noneの場合は集計しない）
+            tier: 使用量を集計するティア名
+            model: 使用量の集計に使うモデル名
+            max_sentences: 要約に含めるアブストラクトの文の数
+        """
+        self.usage_tracker = usage_tracker
+        self.tier = tier
+        self.model = model
+        self.max_sentences = max_sentences
+        self.max_tokens = 0
+        self.compression_stats = CompressionStats()
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        """
+        論文を要約してPaperResultに格納
+        
+        Args:
+            paper: 要約する論文
+        
+        Returns:
+            要約が追加されたPaperResultオブジェクト
+        """
+        return self.summarize_batch([paper])[0]
+    
+    def summarize_batch(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        複数の論文をまとめて要約
+        
+        Args:
+            papers: 要約する論文のリスト
+        
+        Returns:
+            要約が追加された論文のリスト
+        """
+        with self._lock:
+            self.calls += 1
+        for paper in papers:
+            paper.summary = self._summary(paper)
+            if self.usage_tracker is not None:
+                estimate = self.estimate_usage(paper)
+                self.usage_tracker.record(
+                    self.tier, self.model, estimate.prompt_tokens, estimate_tokens(paper.summary), 0.0
+                )
+        return papers
+    
+    def estimate_usage(self, paper: PaperResult) -> UsageEstimate:
+        """要約の使用量の見積もり（課金はないが、トークン数の予算の計算に使用）"""
+        prompt_tokens = estimate_prompt(f"{paper.title}\n{paper.abstract}")
+        return UsageEstimate(self.model, prompt_tokens, estimate_tokens(self._summary(paper)))
+    
+    def _summary(self, paper: PaperResult) -> str:
+        title = " ".join(paper.title.split())
+        sentences = _SENTENCE_END.split(" ".join(paper.abstract.split()))
+        lead = " ".join(sentences[:self.max_sentences]).strip()
+        return f"{title}: {lead}" if lead else title
@@ -0,0 +1,608 @@
+"""論文全文を使用した要約（PDFの並行取得・テキスト抽出・map-reduce要約）
+
+1. PDFを並行してダウンロードし、内容のハッシュをキーにローカルへキャッシュ
+2. プロセスプールでページごとにテキストを抽出（抽出結果もキャッシュ）
+3. テキストを行単位で読み進めてセクション・チャンクに分割し、チャンクごとの要点を並列に生成（map）
+4. 要点とアブストラクトから最終的な日本語要約を生成（reduce）
+
+PDFはストリーミングでディスクに書き込み、テキストはページ単位でファイルに書き出し、
+チャンクは選択したものだけを保持するため、50ページ規模の論文でもメモリ使用量は一定に収まる。
+PDFを取得できない論文や処理に失敗した論文はアブストラクトのみで要約する
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+
+from .. import deadline
+from ..collectors.base import extract_arxiv_id
+from ..config import config
+from ..lazy_import import LazyImporter
+from ..models import PaperResult
+from .base import CompletionSummarizer, SummarizerCapabilities, capabilities_of
+from .budget import MESSAGE_OVERHEAD_TOKENS
+from .preprocess import estimate_tokens
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# requestsは初回ダウンロード時にインポート
+_lazy = LazyImporter(__name__, {"requests": "requests", "HTTPAdapter": "requests.adapters:HTTPAdapter"})
+__getattr__ = _lazy.module_getattr
+
+DEFAULT_PDF_URL_FORMAT = "https://arxiv.org/pdf/{id}"
+
+# ダウンロード時の読み込み単位
+_CHUNK_BYTES = 64 * 1024
+
+# セクション見出し（"3 Method" / "3.1 Training" / "IV. RESULTS" / "Abstract" など）
+_HEADING = re.compile(
+    r"^(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?"
+    r"(Abstract|Introduction|Background|Related Work|Preliminaries|Method(?:s|ology)?|Approach|"
+    r"Model|Experiments?|Experimental (?:Setup|Results)|Evaluation|Results?|Analysis|Discussion|"
+    r"Limitations|Conclusions?|Future Work|References|Bibliography|Acknowledg(?:e)?ments?|Appendix)\b"
+    r"(?:\s+[A-Za-z][\w-]*){0,5}\s*$",
+    re.IGNORECASE
+)
+_SECTION_NUMBER = re.compile(r"^(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+")
+_NUMBERED_HEADING = re.compile(r"^\d+(?:\.\d+)*\.?\s+[A-Z][\w-]*(?:\s+[\w-]+){0,7}$")
+_HYPHENATED = re.compile(r"[A-Za-z]-$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# ここ以降は要約に不要なセクション
+_TRAILING_SECTIONS = ("references", "bibliography", "acknowledgment", "acknowledgement", "appendix")
+
+
+@dataclass
+class Chunk:
+    """要約の単位となる本文の断片"""
+    
+    section: str
+    text: str
+    tokens: int
+
+
+def extract_pdf_text(pdf_path: str, text_path: str, max_pages: int = 50, max_chars: int = 200_000) -> int:
+    """
+    PDFからテキストを抽出してファイルに書き出す（プロセスプールのワーカーで実行）
+    
+    ページ単位で抽出して書き出すため、抽出済みのテキストをメモリに保持しない
+    
+    Args:
+        pdf_path: PDFファイルのパス
+        text_path: 抽出したテキストの書き出し先
+        max_pages: 抽出する最大ページ数
+        max_chars: 書き出す最大文字数
+    
+    Returns:
+        抽出したページ数
+    """
+    from pypdf import PdfReader
+    
+    reader = PdfReader(pdf_path)
+    written = 0
+    pages = 0
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(text_path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as output:
+            for page in reader.pages[:max_pages]:
+                text = (page.extract_text() or "")[:max_chars - written]
+                output.write(text)
+                output.write("\n")
+                written += len(text)
+                pages += 1
+                if written >= max_chars:
+                    break
+        os.replace(tmp_path, text_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return pages
+
+
+def _is_heading(line: str) -> bool:
+    return len(line) <= 80 and bool(_HEADING.match(line) or _NUMBERED_HEADING.match(line))
+
+
+def iter_chunks(lines: Iterable[str], max_tokens: int = 1500) -> Iterator[Chunk]:
+    """
+    抽出したテキストを行単位で読み進め、セクションごとにトークン上限以下のチャンクを生成
+    
+    行末のハイフネーションを結合し、文の途中では分割しない。References以降は除外する。
+    1行ずつ処理するため、保持するのは生成中の1チャンク分のテキストのみ
+    
+    Args:
+        lines: PDFから抽出したテキストの行（ファイルオブジェクトなど）
+        max_tokens: 1チャンクあたりの推定トークン数の上限
+    
+    Yields:
+        チャンク
+    """
+    section = "Front Matter"
+    sentences: List[str] = []
+    tokens = 0
+    carry = ""
+    
+    def add(sentence: str) -> Iterator[Chunk]:
+        nonlocal sentences, tokens
+        sentence_tokens = estimate_tokens(sentence)
+        if sentences and tokens + sentence_tokens > max_tokens:
+            yield Chunk(section, " ".join(sentences), tokens)
+            sentences, tokens = [], 0
+        sentences.append(sentence)
+        tokens += sentence_tokens
+    
+    def flush() -> Iterator[Chunk]:
+        nonlocal sentences, tokens, carry
+        if carry:
+            yield from add(carry)
+            carry = ""
+        if sentences:
+            yield Chunk(section, " ".join(sentences), tokens)
+            sentences, tokens = [], 0
+    
+    for raw_line in lines:
+        line = " ".join(raw_line.split())
+        if not line:
+            continue
+        if _is_heading(line):
+            yield from flush()
+            if _SECTION_NUMBER.sub("", line).lower().startswith(_TRAILING_SECTIONS):
+                return
+            section = line
+            continue
+        
+        if _HYPHENATED.search(carry):
+            carry = carry[:-1] + line
+        else:
+            carry = f"{carry} {line}" if carry else line
+        *complete, carry = _SENTENCE_END.split(carry)
+        # 文末記号のない長い行（表など）は上限の長さで区切る
+        if len(carry) > max_tokens * 4:
+            complete.append(carry)
+            carry = ""
+        for sentence in complete:
+            yield from add(sentence)
+    yield from flush()
+
+
+def select_chunks(chunks: Iterable[Chunk], total: int, max_chunks: int) -> List[Chunk]:
+    """
+    チャンク数を上限まで間引く（論文全体から均等に選ぶ）
+    
+    Args:
+        chunks: チャンク（ジェネレーターでも可）
+        total: チャンクの総数
+        max_chunks: 上限
+    
+    Returns:
+        選択したチャンク（元の順序を維持）
+    """
+    if total <= max_chunks:
+        return list(chunks)
+    if max_chunks <= 1:
+        wanted = set(range(max_chunks))
+    else:
+        step = (total - 1) / (max_chunks - 1)
+        wanted = {round(index * step) for index in range(max_chunks)}
+    return [chunk for index, chunk in enumerate(chunks) if index in wanted]
+
+
+class PdfCache:
+    """内容のSHA-256をキーにPDFと抽出テキストを保存するディスクキャッシュ
+    
+    objects/ab/<sha256>.pdf にPDF、同じ場所の <sha256>.txt に抽出テキストを保存し、
+    urls/<sha256(URL)> にURL → 内容ハッシュの対応を保存する。
+    同じ内容のPDFは取得元URLが異なっても1つだけ保存される
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: キャッシュディレクトリ（初回書き込み時に作成）
+        """
+        self.directory = Path(directory)
+    
+    def pdf_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / f"{digest}.pdf"
+    
+    def text_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / f"{digest}.txt"
+    
+    def _index_path(self, url: str) -> Path:
+        return self.directory / "urls" / hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        URLに対応するキャッシュ済みPDFの内容ハッシュを取得
+        
+        Args:
+            url: PDFのURL
+        
+        Returns:
+            内容ハッシュ（未取得・PDFが削除済みの場合はNone）
+        """
+        try:
+            digest = self._index_path(url).read_text(encoding="ascii").strip()
+        except OSError:
+            return None
+        return digest if self.pdf_path(digest).exists() else None
+    
+    def temp_file(self):
+        """ダウンロード用の一時ファイルを作成（(fd, path)を返す）"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".pdf")
+    
+    def store(self, url: str, tmp_path: str, digest: str) -> str:
+        """
+        ダウンロード済みの一時ファイルをキャッシュに移動し、URLとの対応を記録
+        
+        Args:
+            url: PDFのURL
+            tmp_path: temp_file()で作成した一時ファイルのパス
+            digest: 内容のSHA-256
+        
+        Returns:
+            内容ハッシュ
+        """
+        target = self.pdf_path(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            Path(tmp_path).unlink(missing_ok=True)
+        else:
+            os.replace(tmp_path, target)
+        
+        index_path = self._index_path(url)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, index_tmp = tempfile.mkstemp(dir=index_path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="ascii") as index_file:
+            index_file.write(digest)
+        os.replace(index_tmp, index_path)
+        return digest
+
+
+class PdfFetcher:
+    """PDFを並行してダウンロードし、PdfCacheに保存するクラス"""
+    
+    def __init__(self, cache: PdfCache, max_workers: int = 4, timeout: float = 60.0, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            cache: 保存先のキャッシュ
+            max_workers: 並行ダウンロード数
+            timeout: 1リクエストあたりのタイムアウト（秒）
+            max_bytes: 1ファイルあたりの最大サイズ（超えた場合はエラー）
+        """
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "downloads": 0, "bytes": 0}
+        self._session = None
+        self._lock = threading.Lock()
+    
+    def get_session(self) -> "requests.Session":
+        """
+        HTTPセッションを取得（初回のみ生成し、以降は接続を再利用）
+        
+        Returns:
+            requestsのセッション
+        """
+        with self._lock:
+            if self._session is None:
+                session = _lazy.requests.Session()
+                adapter = _lazy.HTTPAdapter(pool_maxsize=self.max_workers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = "research-paper-bot"
+                self._session = session
+            return self._session
+    
+    def close(self) -> None:
+        """HTTPセッションを閉じる"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def fetch(self, url: str) -> str:
+        """
+        PDFを取得（キャッシュ済みの場合はダウンロードしない）
+        
+        Args:
+            url: PDFのURL
+        
+        Returns:
+            内容ハッシュ
+        
+        Raises:
+            requests.HTTPError: ダウンロードに失敗した場合
+            ValueError: サイズが上限を超えた場合
+        """
+        digest = self.cache.lookup(url)
+        if digest is not None:
+            self._record("hits")
+            return digest
+        
+        fd, tmp_path = self.cache.temp_file()
+        try:
+            hasher = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as tmp_file, \
+                    self.get_session().get(url, stream=True, timeout=deadline.timeout(self.timeout)) as response:
+                response.raise_for_status()
+                for block in response.iter_content(_CHUNK_BYTES):
+                    size += len(block)
+                    if size > self.max_bytes:
+                        raise ValueError(f"PDF exceeds {self.max_bytes} bytes: {url}")
+                    hasher.update(block)
+                    tmp_file.write(block)
+            digest = self.cache.store(url, tmp_path, hasher.hexdigest())
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._record("downloads", size)
+        logger.debug(f"Downloaded PDF ({size} bytes): {url}")
+        return digest
+    
+    def fetch_all(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        複数のPDFを並行して取得
+        
+        Args:
+            urls: PDFのURL
+        
+        Returns:
+            URL → 内容ハッシュ（取得に失敗した場合はNone）
+        """
+        urls = list(dict.fromkeys(urls))
+        results: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-fetch") as executor:
+            futures = {url: executor.submit(self.fetch, url) for url in urls}
+            for url, future in futures.items():
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to download PDF {url}: {e}")
+                    results[url] = None
+        return results
+    
+    def _record(self, outcome: str, size: int = 0) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["bytes"] += size
+
+
+class FullTextSummarizer:
+    """PDF全文をmap-reduceで要約するクラス
+    
+    OpenRouterSummarizerなどをラップし、同じsummarize()インターフェースを提供する。
+    API呼び出し（リトライを含む）はラップした要約器のcomplete()を使用する。
+    論文の並行数はラップした要約器の宣言に従い、summarize_batch()は提供しない。
+    プロセスプールとHTTPセッションは使い終えたらclose()で解放する
+    """
+    
+    def __init__(
+        self,
+        summarizer: CompletionSummarizer,
+        cache_dir: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        chunk_tokens: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+        workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        pdf_url_format: str = DEFAULT_PDF_URL_FORMAT,
+        max_chars: int = 200_000
+    ):
+        """
+        Args:
+            summarizer: API呼び出しとフォールバックに使用する要約器
+            cache_dir: PDFキャッシュのディレクトリ（Noneの場合は設定から取得）
+            max_pages: 抽出する最大ページ数（Noneの場合は設定から取得）
+            chunk_tokens: 1チャンクあたりの推定トークン数の上限（Noneの場合は設定から取得）
+            max_chunks: 1論文あたりのチャンク数の上限（Noneの場合は設定から取得）
+            workers: ダウンロード・チャンク要約の並列数（Noneの場合は設定から取得）
+            process_workers: テキスト抽出のプロセス数（Noneの場合はworkersと同じ、
+                0の場合はプロセスプールを使用せず呼び出し元のスレッドで抽出）
+            pdf_url_format: arXiv IDからPDFのURLを組み立てるフォーマット
+            max_chars: 1論文あたりの抽出する最大文字数
+        """
+        self.summarizer = summarizer
+        self.capabilities = SummarizerCapabilities(max_concurrency=capabilities_of(summarizer).max_concurrency)
+        self.max_pages = max_pages or config.FULLTEXT_MAX_PAGES
+        self.chunk_tokens = chunk_tokens or config.FULLTEXT_CHUNK_TOKENS
+        self.max_chunks = max_chunks or config.FULLTEXT_MAX_CHUNKS
+        self.workers = workers or config.FULLTEXT_WORKERS
+        self.process_workers = self.workers if process_workers is None else process_workers
+        self.pdf_url_format = pdf_url_format
+        self.max_chars = max_chars
+        self.cache = PdfCache(cache_dir or config.FULLTEXT_CACHE_DIR)
+        self.fetcher = PdfFetcher(self.cache, max_workers=self.workers)
+        self.stats = {"full_text": 0, "fallbacks": 0, "chunks": 0}
+        self._lock = threading.Lock()
+        self._process_pool: Optional[Executor] = None
+        self._extract_locks: Dict[str, threading.Lock] = {}
+    
+    @property
+    def compression_stats(self):
+        """ラップした要約器のアブストラクト圧縮の集計"""
+        return getattr(self.summarizer, "compression_stats", None)
+    
+    def pdf_url(self, paper: PaperResult) -> Optional[str]:
+        """
+        論文のPDFのURLを取得
+        
+        Args:
+            paper: 論文
+        
+        Returns:
+            PDFのURL（arXivの論文でない場合はNone）
+        """
+        arxiv_id = extract_arxiv_id(paper.id) or extract_arxiv_id(paper.url)
+        if arxiv_id is None:
+            return None
+        return self.pdf_url_format.format(id=arxiv_id)
+    
+    def prefetch(self, papers: Iterable[PaperResult]) -> None:
+        """
+        複数の論文のPDFを並行して取得し、テキストを抽出しておく
+        
+        Args:
+            papers: 要約予定の論文
+        """
+        urls = [url for url in map(self.pdf_url, papers) if url]
+        if not urls:
+            return
+        digests = [digest for digest in self.fetcher.fetch_all(urls).values() if digest]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-extract") as executor:
+            for digest, future in [(d, executor.submit(self._extract, d)) for d in digests]:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from PDF {digest[:12]}: {e}")
+    
+    def estimate_usage(self, paper: PaperResult):
+        """
+        要約のAPI呼び出し前に使用量を見積もる
+        
+        PDFがある論文は最大チャンク数分のmap（チャンク + 出力上限）と、
+        そのメモをまとめるreduceの呼び出しを上限として見積もる
+        
+        Args:
+            paper: 要約する論文
+        
+        Returns:
+            見積もり使用量（UsageEstimate）
+        """
+        estimate = self.summarizer.estimate_usage(paper)
+        if self.pdf_url(paper) is None:
+            return estimate
+        completion = estimate.completion_tokens
+        estimate.prompt_tokens += self.max_chunks * (self.chunk_tokens + completion + MESSAGE_OVERHEAD_TOKENS)
+        estimate.completion_tokens = (self.max_chunks + 1) * completion
+        return estimate
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        """
+        論文全文から要約を生成してPaperResultに格納
+        
+        Args:
+            paper: 要約する論文のPaperResultオブジェクト
+        
+        Returns:
+            要約が追加されたPaperResultオブジェクト
+        
+        Raises:
+            Exception: アブストラクトのみの要約にも失敗した場合
+        """
+        try:
+            chunks = self._load_chunks(paper)
+        except Exception as e:
+            logger.warning(f"Full text unavailable for {paper.id}, using abstract: {e}")
+            chunks = []
+        
+        if not chunks:
+            self._record("fallbacks")
+            return self.summarizer.summarize(paper)
+        
+        logger.info(f"Summarizing full text of {paper.id} in {len(chunks)} chunks")
+        try:
+            notes = self._map(paper, chunks)
+            paper.summary = self.summarizer.complete(self._create_reduce_prompt(paper, chunks, notes))
+        except Exception as e:
+            logger.warning(f"Full-text summarization failed for {paper.id}, using abstract: {e}")
+            self._record("fallbacks")
+            return self.summarizer.summarize(paper)
+        self._record("full_text")
+        return paper
+    
+    def close(self) -> None:
+        """プロセスプールとHTTPセッションを閉じる（再び使用した場合は作り直される）"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        self.fetcher.close()
+    
+    def _load_chunks(self, paper: PaperResult) -> List[Chunk]:
+        url = self.pdf_url(paper)
+        if url is None:
+            return []
+        text_path = self._extract(self.fetcher.fetch(url))
+        # 1回目で総数を数え、2回目で選択したチャンクのみ保持する
+        with text_path.open(encoding="utf-8") as lines:
+            total = sum(1 for _ in iter_chunks(lines, self.chunk_tokens))
+        with text_path.open(encoding="utf-8") as lines:
+            return select_chunks(iter_chunks(lines, self.chunk_tokens), total, self.max_chunks)
+    
+    def _extract(self, digest: str) -> Path:
+        """PDFのテキストを抽出（抽出済みの場合はキャッシュを返す）"""
+        text_path = self.cache.text_path(digest)
+        with self._lock:
+            lock = self._extract_locks.setdefault(digest, threading.Lock())
+        with lock:
+            if text_path.exists():
+                return text_path
+            args = (str(self.cache.pdf_path(digest)), str(text_path), self.max_pages, self.max_chars)
+            if self.process_workers == 0:
+                extract_pdf_text(*args)
+            else:
+                self._get_process_pool().submit(extract_pdf_text, *args).result()
+        return text_path
+    
+    def _get_process_pool(self) -> Executor:
+        with self._lock:
+            if self._process_pool is None:
+                # fork後のスレッド・ロックの状態を引き継がないようspawnで起動
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+    
+    def _map(self, paper: PaperResult, chunks: List[Chunk]) -> List[str]:
+        """チャンクごとの要点を並列に生成"""
+        title = " ".join(paper.title.split())
+        prompts = [self._create_map_prompt(title, chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fulltext-map") as executor:
+            notes = list(executor.map(self.summarizer.complete, prompts))
+        self._record("chunks", len(chunks))
+        return notes
+    
+    def _record(self, outcome: str, count: int = 1) -> None:
+        with self._lock:
+            self.stats[outcome] += count
+    
+    def _create_map_prompt(self, title: str, chunk: Chunk) -> str:
+        """チャンク要約（map）用のプロンプトを作成"""
+        return f"""以下は技術論文「{title}」の「{chunk.section}」セクションの一部です。
+手法・実験設定・数値結果など、重要な内容を日本語の箇条書き（3項目以内）で抜き出してください。
+
+本文:
+{chunk.text}
+
+要点:"""
+    
+    def _create_reduce_prompt(self, paper: PaperResult, chunks: List[Chunk], notes: List[str]) -> str:
+        """最終要約（reduce）用のプロンプトを作成"""
+        sections = "\n\n".join(
+            f"[{chunk.section}]\n{note.strip()}" for chunk, note in zip(chunks, notes)
+        )
+        return f"""以下の技術論文のアブストラクトと、本文の各セクションの要点を読み、日本語で簡潔に要約してください。
+要約は3-5文程度で、論文の主な貢献・手法・結果（可能であれば具体的な数値）を含めてください。
+
+タイトル: {" ".join(paper.title.split())}
+
+アブストラクト:
+{self.summarizer.preprocess_abstract(paper.abstract)}
+
+本文の要点:
+{sections}
+
+要約:"""
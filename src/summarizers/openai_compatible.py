@@ -0,0 +1,101 @@
+"""OpenAI互換APIのエンドポイントを使用した論文要約機能
+
+同一ホストで動かすllama.cpp（llama-server）やvLLMなど、/v1/chat/completions を
+提供するサーバーで要約する。WANのレイテンシとトークン単位の課金がないため、
+大量の論文をさかのぼって要約する場合に向く
+"""
+
+import logging
+import threading
+from typing import List, Optional, Union
+
+from ..config import config
+from ..models import PaperResult
+from .base import SummarizerCapabilities
+from .budget import UsageEstimate
+from .openrouter_summarizer import OpenRouterSummarizer
+
+logger = logging.getLogger(__name__)
+
+# APIキーを検証しないサーバー向けのプレースホルダー（OpenAI SDKは空のキーを受け付けない）
+NO_API_KEY = "EMPTY"
+# モデル名を解決するまでのプレースホルダー（使用量の見積もりなどに使われる）
+UNRESOLVED_MODEL = "default"
+
+
+class OpenAICompatibleSummarizer(OpenRouterSummarizer):
+    """OpenAI互換APIのエンドポイントを使用して論文を要約するクラス
+    
+    プロンプトの組み立て・リトライ・使用量の記録はOpenRouterSummarizerと共通。
+    cache_control（Anthropic形式のプロンプトキャッシュ指定）はllama.cpp / vLLMが解釈しないため送らない
+    """
+    
+    # ローカルのCPUモデルは同時に1リクエストずつ処理する想定
+    # （llama-serverの --parallel やvLLMのバッチ処理に合わせてSUMMARIZER_CONCURRENCYで変更）
+    default_capabilities = SummarizerCapabilities(max_concurrency=1)
+    extra_headers = {}
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            base_url: APIのベースURL（Noneの場合はSUMMARIZER_BASE_URL、例: "http://localhost:8080/v1"）
+            api_key: APIキー（Noneの場合はSUMMARIZER_API_KEY、未設定の場合はプレースホルダー）
+            model: モデル名（Noneの場合はSUMMARIZER_MODEL、未設定の場合は初回のリクエスト前に
+                サーバーの GET /models が返す最初のモデル）
+            **kwargs: OpenRouterSummarizerの引数（max_retries / max_tokens / usage_tracker など、
+                prompt_cacheはPROMPT_CACHEの設定に関わらず常に無効）
+        """
+        model = model or config.SUMMARIZER_MODEL
+        kwargs["prompt_cache"] = False
+        super().__init__(
+            api_key=api_key or config.SUMMARIZER_API_KEY or NO_API_KEY,
+            model=model or UNRESOLVED_MODEL,
+            base_url=base_url or config.SUMMARIZER_BASE_URL,
+            **kwargs
+        )
+        self._model_resolved = bool(model)
+        self._model_lock = threading.Lock()
+    
+    def resolve_model(self) -> str:
+        """
+        サーバーが提供するモデル名を GET /models から取得
+        
+        Returns:
+            最初のモデルのID
+        
+        Raises:
+            ValueError: サーバーがモデルを返さない場合
+        """
+        try:
+            models = [model.id for model in self._get_client().models.list(timeout=10)]
+        except Exception as e:
+            raise ValueError(
+                f"Could not list models at {self.base_url}/models ({e}); set SUMMARIZER_MODEL"
+            ) from e
+        if not models:
+            raise ValueError(f"No models are served at {self.base_url}; set SUMMARIZER_MODEL")
+        logger.info(f"Resolved model from {self.base_url}/models: {models[0]}")
+        return models[0]
+    
+    def estimate_usage(self, paper: PaperResult) -> UsageEstimate:
+        # 見積もりをプレースホルダーのモデル名で記録しないよう、先にモデル名を解決する
+        self._ensure_model()
+        return super().estimate_usage(paper)
+    
+    def _call_api(self, prompt: Union[str, List[dict]]):
+        self._ensure_model()
+        return super()._call_api(prompt)
+    
+    def _ensure_model(self) -> None:
+        # 並行に要約する場合も問い合わせは1回にする
+        if not self._model_resolved:
+            with self._model_lock:
+                if not self._model_resolved:
+                    self.model = self.resolve_model()
+                    self._model_resolved = True
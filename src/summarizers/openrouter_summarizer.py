@@ -1,25 +1,100 @@
 """OpenRouter APIを使用した論文要約機能"""
 
+import json
 import logging
+import threading
 import time
-from typing import Optional
+from dataclasses import replace
+from typing import List, Optional, Sequence, Tuple, Union
 
 from ..models import PaperResult
-from ..config import config
-from openai import OpenAI
+from ..config import config, parse_bool
+from .. import deadline
+from ..lazy_import import LazyImporter
+from .base import SummarizerCapabilities
+from .budget import UsageEstimate, estimate_prompt
+from .preprocess import AbstractPreprocessor, CompressionStats, estimate_tokens
+from .usage import UsageTracker
 
 logger = logging.getLogger(__name__)
 
+# OpenAI SDK（pydantic / httpx依存）は初回API呼び出し時にインポート
+_lazy = LazyImporter(__name__, {"OpenAI": "openai:OpenAI"})
+__getattr__ = _lazy.module_getattr
+
+# 要約の固定の指示（論文ごとの内容はuserメッセージで送り、この部分をプロバイダー側でキャッシュさせる）
+SUMMARY_SYSTEM_PROMPT = """あなたは技術論文を日本語で紹介するアシスタントです。
+ユーザーが送る技術論文のタイトルとアブストラクトを読み、日本語で簡潔に要約してください。
+要約は3-5文程度で、論文の主な貢献・手法・結果を含めてください。
+要約の本文のみを出力してください。"""
+
+# cache_controlを付ける固定部分の最小トークン数（Anthropicはこれより短いプレフィックスをキャッシュしない）
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# few-shotの例（(userメッセージ, assistantメッセージ) の組）
+Examples = Sequence[Tuple[str, str]]
+
+
+def format_paper(title: str, abstract: str) -> str:
+    """要約する論文1本分のuserメッセージ"""
+    return f"""タイトル: {title}
+
+アブストラクト:
+{abstract}
+
+日本語の要約:"""
+
+
+def load_examples(path: str) -> List[Tuple[str, str]]:
+    """
+    few-shotの例をJSONファイルから読み込む
+    
+    Args:
+        path: [{"title": ..., "abstract": ..., "summary": ...}, ...] 形式のJSONファイル
+    
+    Returns:
+        (userメッセージ, assistantメッセージ) のリスト
+    
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    try:
+        return [
+            (format_paper(" ".join(item["title"].split()), item["abstract"]), item["summary"])
+            for item in items
+        ]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid few-shot examples file (expected title/abstract/summary): {path}") from e
+
 
 class OpenRouterSummarizer:
     """OpenRouter APIを使用して論文を要約するクラス"""
     
+    # 同時に要約する論文数の既定値（リモートのAPIはWANのレイテンシが大半のため並行に送る）
+    default_capabilities = SummarizerCapabilities(max_concurrency=4)
+    # 全リクエストに付けるヘッダー（OpenRouterのアプリ識別用）
+    extra_headers = {
+        "HTTP-Referer": "https://github.com/research-paper-bot",
+        "X-Title": "Research Paper Summarizer Bot"
+    }
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         max_retries: int = 3,
-        retry_delay: int = 2
+        retry_delay: int = 2,
+        base_url: Optional[str] = None,
+        preprocessor: Optional[AbstractPreprocessor] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        usage_tracker: Optional[UsageTracker] = None,
+        tier: str = "summary",
+        examples: Optional[Examples] = None,
+        prompt_cache: Optional[bool] = None,
+        max_concurrency: Optional[int] = None
     ):
         """
         Args:
@@ -27,17 +102,62 @@ class OpenRouterSummarizer:
             model: 使用するモデル名（Noneの場合は設定から取得）
             max_retries: 最大リトライ回数
             retry_delay: リトライ間隔（秒）
+            base_url: APIのベースURL（Noneの場合は設定から取得。ベンチマーク用のスタブサーバー等に差し替え可能）
+            preprocessor: アブストラクトの前処理器（Noneの場合は設定から生成、
+                PROMPT_COMPRESSION=falseの場合は前処理しない）
+            max_tokens: 1回の応答の最大トークン数
+            temperature: 生成時のtemperature
+            usage_tracker: API使用量の集計先（Noneの場合は集計しない）
+            tier: 使用量を集計するティア名
+            examples: 要約のfew-shotの例（Noneの場合はSUMMARY_EXAMPLES_FILEから読み込み）
+            prompt_cache: システムプロンプトなどの固定部分にcache_controlを付けるか
+                （Noneの場合はPROMPT_CACHEの設定に従い、autoではAnthropicのモデルのみ）
+            max_concurrency: 同時に要約する論文数（Noneの場合はSUMMARIZER_CONCURRENCY、
+                0の場合はバックエンドの既定値）
         """
         self.api_key = api_key or config.OPENROUTER_API_KEY
         self.model = model or config.OPENROUTER_MODEL
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = (base_url or config.OPENROUTER_BASE_URL).rstrip("/")
+        self.api_url = f"{self.base_url}/chat/completions"
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.usage_tracker = usage_tracker
+        self.tier = tier
+        self._client = None
+        
+        if preprocessor is None and config.PROMPT_COMPRESSION:
+            preprocessor = AbstractPreprocessor(max_tokens=config.PROMPT_MAX_ABSTRACT_TOKENS)
+        self.preprocessor = preprocessor
+        self.compression_stats = CompressionStats()
+        self._stats_lock = threading.Lock()
         
         if not self.api_key:
             raise ValueError("OpenRouter API key is required")
         
-        logger.info(f"OpenRouterSummarizer initialized with model: {self.model}")
+        self.system_prompt = SUMMARY_SYSTEM_PROMPT
+        if examples is None and config.SUMMARY_EXAMPLES_FILE:
+            examples = load_examples(config.SUMMARY_EXAMPLES_FILE)
+        self.examples = list(examples or [])
+        if prompt_cache is None:
+            setting = config.PROMPT_CACHE.strip().lower()
+            prompt_cache = self.model.startswith("anthropic/") if setting == "auto" else parse_bool(setting)
+        self.prompt_cache = prompt_cache
+        prefix_tokens = self._prefix_tokens(self.system_prompt, self.examples)
+        if prompt_cache and prefix_tokens < PROMPT_CACHE_MIN_TOKENS:
+            logger.warning(
+                f"Prompt prefix is about {prefix_tokens} tokens, below the {PROMPT_CACHE_MIN_TOKENS}-token "
+                "minimum for prompt caching; cache_control will not be sent (add few-shot examples with "
+                "SUMMARY_EXAMPLES_FILE to enable caching)"
+            )
+        if max_concurrency is None:
+            max_concurrency = config.SUMMARIZER_CONCURRENCY
+        self.capabilities = self.default_capabilities
+        if max_concurrency > 0:
+            self.capabilities = replace(self.capabilities, max_concurrency=max_concurrency)
+        
+        logger.info(f"{type(self).__name__} initialized with model: {self.model} ({self.base_url})")
     
     def summarize(self, paper: PaperResult) -> PaperResult:
         """
@@ -55,7 +175,10 @@ class OpenRouterSummarizer:
         logger.info(f"Summarizing paper: {paper.title}")
         
         try:
-            summary = self._generate_summary(paper.title, paper.abstract)
+            summary = self._generate_summary(
+                " ".join(paper.title.split()),
+                self.preprocess_abstract(paper.abstract)
+            )
             paper.summary = summary
             logger.info(f"Successfully summarized paper: {paper.id}")
             return paper
@@ -63,6 +186,45 @@ class OpenRouterSummarizer:
             logger.error(f"Failed to summarize paper {paper.id}: {str(e)}")
             raise
     
+    def estimate_usage(self, paper: PaperResult) -> UsageEstimate:
+        """
+        要約のAPI呼び出し前に使用量を見積もる（出力は上限のmax_tokensで見積もる）
+        
+        Args:
+            paper: 要約する論文
+            
+        Returns:
+            見積もり使用量
+        """
+        abstract = paper.abstract
+        if self.preprocessor is not None:
+            abstract = self.preprocessor.process(abstract).text
+        messages = self._build_messages(
+            self._create_prompt(" ".join(paper.title.split()), abstract), self.system_prompt, self.examples
+        )
+        prompt_tokens = sum(estimate_prompt(self._message_text(message)) for message in messages)
+        return UsageEstimate(self.model, prompt_tokens, self.max_tokens)
+    
+    def preprocess_abstract(self, abstract: str) -> str:
+        """
+        アブストラクトを前処理して入力トークンを削減（削減量はcompression_statsに集計）
+        
+        Args:
+            abstract: 元のアブストラクト
+            
+        Returns:
+            前処理後のアブストラクト
+        """
+        if self.preprocessor is None:
+            return abstract
+        result = self.preprocessor.process(abstract)
+        with self._stats_lock:
+            self.compression_stats.add(result)
+        logger.debug(
+            f"Abstract compressed: {result.tokens_before} -> {result.tokens_after} tokens"
+        )
+        return result.text
+    
     def _generate_summary(self, title: str, abstract: str) -> str:
         """
         OpenRouter APIを使用して要約を生成
@@ -74,15 +236,35 @@ class OpenRouterSummarizer:
         Returns:
             日本語の要約文
         """
-        prompt = self._create_prompt(title, abstract)
+        return self.complete(self._create_prompt(title, abstract), system=self.system_prompt, examples=self.examples)
+    
+    def complete(self, prompt: str, system: Optional[str] = None, examples: Examples = ()) -> str:
+        """
+        プロンプトを送信し、リトライ付きで応答テキストを取得
         
+        Args:
+            prompt: 送信するプロンプト（userメッセージ）
+            system: システムプロンプト（オプション）
+            examples: systemの後に置くfew-shotの例
+            
+        Returns:
+            応答テキスト
+        """
+        messages = self._build_messages(prompt, system, examples)
         for attempt in range(self.max_retries):
             try:
-                response = self._call_api(prompt)
+                started = time.monotonic()
+                response = self._call_api(messages)
                 summary = self._extract_summary(response)
+                self._record_usage(response, time.monotonic() - started)
                 return summary
             except Exception as e:
-                if attempt < self.max_retries - 1:
+                # 締め切りを過ぎた・再試行の待機中に締め切りを迎える場合は再試行しない
+                active = deadline.current()
+                out_of_time = isinstance(e, deadline.DeadlineExceeded) or (
+                    active is not None and active.remaining() <= self.retry_delay * (attempt + 1)
+                )
+                if attempt < self.max_retries - 1 and not out_of_time:
                     logger.warning(
                         f"API call failed (attempt {attempt + 1}/{self.max_retries}): {str(e)}"
                     )
@@ -91,52 +273,112 @@ class OpenRouterSummarizer:
                     logger.error(f"All retry attempts failed: {str(e)}")
                     raise
     
+    def _record_usage(self, response, latency: float) -> None:
+        """
+        API呼び出しのトークン数とレイテンシをusage_trackerに記録
+        
+        Args:
+            response: OpenAI completion object
+            latency: 呼び出しにかかった時間（秒）
+        """
+        if self.usage_tracker is None:
+            return
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0)
+        completion_tokens = getattr(usage, "completion_tokens", 0)
+        # プロバイダー側のキャッシュから読み込まれた入力トークン数
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0)
+        self.usage_tracker.record(
+            self.tier,
+            self.model,
+            prompt_tokens if isinstance(prompt_tokens, int) else 0,
+            completion_tokens if isinstance(completion_tokens, int) else 0,
+            latency,
+            cached_tokens=cached_tokens if isinstance(cached_tokens, int) else 0
+        )
+    
     def _create_prompt(self, title: str, abstract: str) -> str:
-        """要約用のプロンプトを作成"""
-        return f"""以下の技術論文のタイトルとアブストラクトを読み、日本語で簡潔に要約してください。
-要約は3-5文程度で、論文の主な貢献・手法・結果を含めてください。
-
-タイトル: {title}
-
-アブストラクト:
-{abstract}
-
-要約:"""
+        """要約用のプロンプト（論文ごとのuserメッセージ、固定の指示はsystem_prompt）を作成"""
+        return format_paper(title, abstract)
     
-    def _call_api(self, prompt: str):
+    def _build_messages(self, prompt: str, system: Optional[str] = None, examples: Examples = ()) -> List[dict]:
         """
-        OpenRouter APIを呼び出し
+        送信するメッセージを組み立てる
+        
+        固定部分（system + few-shotの例）を先頭に置き、プロンプトキャッシュが有効で固定部分が
+        PROMPT_CACHE_MIN_TOKENS以上の場合は、固定部分の最後のメッセージにcache_controlを付けて、
+        論文をまたいでプレフィックスを再利用させる
         
         Args:
-            prompt: 送信するプロンプト
+            prompt: 論文ごとのuserメッセージ
+            system: システムプロンプト（オプション）
+            examples: few-shotの例
+            
+        Returns:
+            chat completionのmessages
+        """
+        messages = [{"role": "system", "content": system}] if system else []
+        for user, assistant in examples:
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        if messages and self.prompt_cache and self._prefix_tokens(system, examples) >= PROMPT_CACHE_MIN_TOKENS:
+            last = messages[-1]
+            last["content"] = [{"type": "text", "text": last["content"], "cache_control": {"type": "ephemeral"}}]
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    @staticmethod
+    def _prefix_tokens(system: Optional[str], examples: Examples) -> int:
+        """固定部分（system + few-shotの例）の推定トークン数"""
+        return estimate_tokens("\n".join([system or "", *(text for example in examples for text in example)]))
+    
+    @staticmethod
+    def _message_text(message: dict) -> str:
+        """メッセージの本文（cache_control付きのパート形式を含む）"""
+        content = message["content"]
+        if isinstance(content, str):
+            return content
+        return "".join(part.get("text", "") for part in content)
+    
+    def _get_client(self):
+        """
+        OpenAIクライアントを取得（初回のみ生成し、以降は接続プールごと再利用）
+        
+        Returns:
+            OpenAI client
+        """
+        if self._client is None:
+            self._client = _lazy.OpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=60
+            )
+        return self._client
+    
+    def _call_api(self, prompt: Union[str, List[dict]]):
+        """
+        OpenAI互換のchat completions APIを呼び出し
+        
+        Args:
+            prompt: 送信するメッセージのリスト（文字列の場合は1つのuserメッセージとして送信）
             
         Returns:
             OpenAI completion object
         """
 
-        client = OpenAI(
-            api_key=self.api_key,
-            base_url="https://openrouter.ai/api/v1",
-            timeout=60
-        )
+        client = self._get_client()
+        if isinstance(prompt, str):
+            prompt = [{"role": "user", "content": prompt}]
 
         completion = client.chat.completions.create(
-            extra_headers= {
-                "HTTP-Referer": "https://github.com/research-paper-bot",
-                "X-Title": "Research Paper Summarizer Bot"
-            },
+            extra_headers=self.extra_headers,
             extra_body={},
             model= self.model,
-            messages=
-            [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=500,
+            messages=prompt,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
             stream=False,
+            timeout=deadline.timeout(60),
         )
         
         return completion
@@ -0,0 +1,284 @@
+"""
+要約前のアブストラクト前処理
+
+LaTeX記法・URL・定型文（コード公開・採択情報・著作権表記など）を取り除き、
+空白を正規化したうえで、ローカルのトークン数推定に基づき上限まで切り詰める。
+プロンプトの入力トークンを減らし、要約のレイテンシとコストを下げる。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+
+# トークン数推定用のパターン（英字列 / 数字列 / その他の非空白1文字）
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# 中身を残すLaTeXコマンド（\textbf{X} → X）
+_KEEP_CONTENT_COMMANDS = re.compile(
+    r"\\(?:text(?:bf|it|tt|sc|rm|sf|normal)?|emph|math(?:rm|bf|it|cal|bb|sf|tt|frak)|"
+    r"operatorname|underline|boldsymbol|bm|mbox|hbox)\s*\{([^{}]*)\}"
+)
+# 中身ごと削除するLaTeXコマンド（\cite{...} など）
+_DROP_COMMANDS = re.compile(r"\\(?:cite[tp]?|ref|eqref|label|footnote|url|href)\s*\{[^{}]*\}(?:\{[^{}]*\})?")
+_GREEK = {
+    "alpha": "α", "beta": "β", "gamma": "γ", "delta": "δ", "epsilon": "ε", "varepsilon": "ε",
+    "zeta": "ζ", "eta": "η", "theta": "θ", "kappa": "κ", "lambda": "λ", "mu": "μ",
+    "nu": "ν", "xi": "ξ", "pi": "π", "rho": "ρ", "sigma": "σ", "tau": "τ", "phi": "φ",
+    "varphi": "φ", "chi": "χ", "psi": "ψ", "omega": "ω", "Gamma": "Γ", "Delta": "Δ",
+    "Theta": "Θ", "Lambda": "Λ", "Sigma": "Σ", "Phi": "Φ", "Psi": "Ψ", "Omega": "Ω",
+}
+_SYMBOLS = {
+    "times": "×", "cdot": "·", "leq": "≤", "le": "≤", "geq": "≥", "ge": "≥", "neq": "≠",
+    "approx": "≈", "sim": "~", "infty": "∞", "pm": "±", "to": "→", "rightarrow": "→",
+    "in": "∈", "sum": "Σ", "prod": "Π", "ell": "ℓ", "partial": "∂", "nabla": "∇",
+}
+# 括弧の大きさの指定（\left( → "("）と空白の指定（\, \quad → " "）
+_SIZING = re.compile(r"\\(?:left|right|middle|[Bb]igg?[lrm]?)(?![A-Za-z])")
+_SPACING = re.compile(r"\\(?:[,;:! ]|q?quad(?![A-Za-z]))")
+_COMMAND = re.compile(r"\\([A-Za-z]+)(\s*)")
+_ESCAPED = re.compile(r"\\([%&$#_{}])")
+_MATH = re.compile(r"\$\$?([^$]+)\$\$?")
+
+_URL = re.compile(r"(?:https?://|www\.)\S+|\b(?:github|gitlab|huggingface)\.(?:com|co|io)/\S+", re.IGNORECASE)
+
+# 要約に寄与しない定型文（この表現を含む文を丸ごと削除）
+# 本文の内容と区別できるよう、公開先・会議名・arXivのComments欄の書式などに限定して照合する
+_BOILERPLATE = re.compile(
+    r"""
+    (?:https?://|www\.)\S+ | \b(?:github|gitlab|huggingface)\.(?:com|co|io)/   # URLを含む文（公開先の案内）
+    | \b(?:code|data(?:set)?s?|models?|implementation|weights|checkpoints|demo|project\ page)
+      \b[^.]{0,60}\b(?:is|are|will\ be|has\ been|have\ been)\s+(?:made\s+)?
+      (?:publicly\s+|freely\s+|openly\s+)?(?:available|released|open[-\ ]sourced)
+      (?:\s+(?:at|on|from|via|upon\ request)\b|\s*[.!]?\s*$)   # 「available at」または文末
+    | \b(?:accepted|to\ appear)\s+(?:at|in|to|for|by)\s+(?:the\s+)?
+      (?:(?-i:[A-Z][A-Za-z]*[A-Z])|\d{4}|proceedings|conference|workshop|journal)   # 会議名・年・会議録
+    | \bthis\s+(?:paper|work|manuscript)\s+is\s+(?:currently\s+)?under\ review\b
+    | \bthis\s+is\s+(?:an?\s+|the\s+)?(?:extended|preprint|camera[-\ ]ready)\s+version\b
+    | ©|\(c\)\s*\d{4}|\bcopyright\s+(?:\(c\)\s*)?\d{4}|\ball\ rights\ reserved\b
+    | ^\s*comments?\s*:                                          # arXivのComments欄
+    | ^\s*\d+\s+pages?\s*(?:[,;]|$)                              # 「12 pages, 5 figures」
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    ローカルでトークン数を推定（BPE系トークナイザの近似）
+    
+    英字列は4文字ごと、数字列は3文字ごとに1トークン、記号・CJK文字は1文字1トークンとして数える
+    
+    Args:
+        text: 対象テキスト
+    
+    Returns:
+        推定トークン数
+    """
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        if piece[0].isascii() and piece[0].isalpha():
+            tokens += (len(piece) + 3) // 4
+        elif piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def _replace_command(match: re.Match) -> str:
+    name, space = match.group(1), match.group(2)
+    if name in _SYMBOLS:
+        return f" {_SYMBOLS[name]} "
+    if name in _GREEK:
+        return _GREEK[name] + space
+    # 未知のコマンド（\sqrt{n} など）は名前を残し、続く引数と区切る
+    return f"{name}{space or ' '}"
+
+
+def simplify_latex(text: str) -> str:
+    """
+    LaTeX記法を平文に簡略化
+    
+    Args:
+        text: 元のテキスト
+    
+    Returns:
+        簡略化したテキスト
+    """
+    text = _DROP_COMMANDS.sub("", text)
+    # ネストした \textbf{\emph{x}} に対応するため、変化がなくなるまで繰り返す
+    previous = None
+    while previous != text:
+        previous = text
+        text = _KEEP_CONTENT_COMMANDS.sub(r"\1", text)
+    text = _MATH.sub(lambda m: m.group(1), text)
+    # "~"（改行しない空白）はコマンド展開（\sim → "~"）より先に空白へ置換する
+    text = text.replace("~", " ")
+    text = _ESCAPED.sub(r"\1", text)
+    text = _SIZING.sub("", text)
+    text = _SPACING.sub(" ", text)
+    text = _COMMAND.sub(_replace_command, text)
+    text = text.replace("{", "").replace("}", "")
+    text = text.replace("``", '"').replace("''", '"')
+    return text
+
+
+def remove_boilerplate(text: str) -> str:
+    """
+    定型文（コード公開・採択情報・著作権表記・ページ数など）を含む文を削除
+    
+    Args:
+        text: 元のテキスト
+    
+    Returns:
+        定型文を除いたテキスト
+    """
+    sentences = _SENTENCE_SPLIT.split(text)
+    kept = [sentence for sentence in sentences if not _BOILERPLATE.search(sentence)]
+    # 全ての文が該当した場合は元のテキストを残す（要約対象が空になるのを避ける）
+    return " ".join(kept) if kept else text
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    推定トークン数が上限に収まるよう文単位で切り詰める
+    
+    Args:
+        text: 元のテキスト
+        max_tokens: 推定トークン数の上限（0以下の場合は切り詰めない）
+    
+    Returns:
+        切り詰めたテキスト
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+    
+    kept: List[str] = []
+    used = 0
+    for sentence in _SENTENCE_SPLIT.split(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            if not kept:
+                # 1文目だけで上限を超える場合は単語単位で切る
+                words = []
+                for word in sentence.split():
+                    cost = estimate_tokens(word)
+                    if used + cost > max_tokens:
+                        break
+                    words.append(word)
+                    used += cost
+                kept.append(" ".join(words))
+            break
+        kept.append(sentence)
+        used += cost
+    return " ".join(kept).rstrip() + " …"
+
+
+@dataclass
+class PreprocessResult:
+    """前処理の結果"""
+    
+    text: str
+    tokens_before: int
+    tokens_after: int
+    
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+@dataclass
+class CompressionStats:
+    """前処理による入力トークン削減量の集計"""
+    
+    papers: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+    
+    @property
+    def saved_ratio(self) -> float:
+        return self.tokens_saved / self.tokens_before if self.tokens_before else 0.0
+    
+    def add(self, result: PreprocessResult) -> None:
+        """1件分の結果を加算"""
+        self.papers += 1
+        self.tokens_before += result.tokens_before
+        self.tokens_after += result.tokens_after
+    
+    def since(self, earlier: "CompressionStats") -> "CompressionStats":
+        """earlier以降の差分（1回の実行分の集計に使用）"""
+        return CompressionStats(
+            papers=self.papers - earlier.papers,
+            tokens_before=self.tokens_before - earlier.tokens_before,
+            tokens_after=self.tokens_after - earlier.tokens_after
+        )
+
+
+class AbstractPreprocessor:
+    """要約前にアブストラクトを圧縮する前処理器"""
+    
+    def __init__(
+        self,
+        max_tokens: int = 512,
+        strip_latex: bool = True,
+        strip_urls: bool = True,
+        strip_boilerplate: bool = True
+    ):
+        """
+        Args:
+            max_tokens: 推定トークン数の上限（0以下の場合は切り詰めない）
+            strip_latex: LaTeX記法を簡略化するか
+            strip_urls: URLを削除するか
+            strip_boilerplate: 定型文を削除するか
+        """
+        self.max_tokens = max_tokens
+        self.strip_latex = strip_latex
+        self.strip_urls = strip_urls
+        self.strip_boilerplate = strip_boilerplate
+    
+    def clean(self, text: str) -> str:
+        """
+        切り詰めを除く前処理（LaTeX・URL・定型文の除去と空白の正規化）
+        
+        Args:
+            text: 元のテキスト
+        
+        Returns:
+            前処理したテキスト
+        """
+        if self.strip_latex:
+            text = simplify_latex(text)
+        text = " ".join(text.split())
+        # 定型文はURLを手がかりに判定するため、URLの削除より先に行う
+        if self.strip_boilerplate:
+            text = remove_boilerplate(text)
+        if self.strip_urls:
+            text = _URL.sub("", text)
+        # 削除で生じた「 .」「( )」などの残骸を整える
+        text = re.sub(r"\(\s*\)|\[\s*\]", "", text)
+        text = re.sub(r"\s+([.,;:])", r"\1", text)
+        return " ".join(text.split())
+    
+    def process(self, text: str) -> PreprocessResult:
+        """
+        前処理と切り詰めを行い、推定トークン数の変化とともに返す
+        
+        Args:
+            text: 元のテキスト
+        
+        Returns:
+            前処理の結果
+        """
+        cleaned = truncate_to_tokens(self.clean(text), self.max_tokens)
+        return PreprocessResult(
+            text=cleaned,
+            tokens_before=estimate_tokens(text),
+            tokens_after=estimate_tokens(cleaned)
+        )
@@ -0,0 +1,88 @@
+"""要約器のバックエンドのレジストリ
+
+SUMMARIZER_BACKENDに指定したバックエンドの要約器を生成する。バックエンドの実装
+（OpenAI SDKなど）は生成時に初めてインポートする
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+from ..config import config
+from .base import PaperSummarizer
+from .usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+SummarizerFactory = Callable[[Optional[UsageTracker]], PaperSummarizer]
+
+# バックエンド名 → 要約器の生成関数
+_REGISTRY: Dict[str, SummarizerFactory] = {}
+
+
+def register_summarizer(name: str, factory: SummarizerFactory) -> None:
+    """
+    要約器のバックエンドを登録
+    
+    Args:
+        name: バックエンド名（SUMMARIZER_BACKENDで指定する名前）
+        factory: 使用量の集計先を受け取り、設定から要約器を生成する関数
+    """
+    _REGISTRY[name] = factory
+
+
+def available_summarizers() -> List[str]:
+    """登録済みのバックエンド名の一覧"""
+    return list(_REGISTRY)
+
+
+def create_summarizer(
+    name: Optional[str] = None,
+    usage_tracker: Optional[UsageTracker] = None
+) -> PaperSummarizer:
+    """
+    登録済みのバックエンドの要約器を生成
+    
+    Args:
+        name: バックエンド名（Noneの場合はSUMMARIZER_BACKENDの設定）
+        usage_tracker: API使用量の集計先
+    
+    Returns:
+        要約器
+    
+    Raises:
+        ValueError: 未登録のバックエンド名の場合
+    """
+    name = (name or config.SUMMARIZER_BACKEND).strip()
+    if name not in _REGISTRY:
+        raise ValueError(
+            f"Unknown summarizer backend: {name} (available: {', '.join(available_summarizers())})"
+        )
+    summarizer = _REGISTRY[name](usage_tracker)
+    logger.info(f"Summarizer backend: {name} ({summarizer.capabilities})")
+    return summarizer
+
+
+def _create_openrouter_summarizer(usage_tracker: Optional[UsageTracker]) -> PaperSummarizer:
+    from .openrouter_summarizer import OpenRouterSummarizer
+    return OpenRouterSummarizer(usage_tracker=usage_tracker)
+
+
+def _create_openai_compatible_summarizer(usage_tracker: Optional[UsageTracker]) -> PaperSummarizer:
+    from .openai_compatible import OpenAICompatibleSummarizer
+    return OpenAICompatibleSummarizer(usage_tracker=usage_tracker)
+
+
+def _create_extractive_summarizer(usage_tracker: Optional[UsageTracker]) -> PaperSummarizer:
+    from .extractive import ExtractiveSummarizer
+    return ExtractiveSummarizer(num_sentences=config.EXTRACTIVE_SENTENCES, usage_tracker=usage_tracker)
+
+
+def _create_fake_summarizer(usage_tracker: Optional[UsageTracker]) -> PaperSummarizer:
+    from .fake import FakeSummarizer
+    return FakeSummarizer(usage_tracker=usage_tracker)
+
+
+register_summarizer("openrouter", _create_openrouter_summarizer)
+register_summarizer("openai_compatible", _create_openai_compatible_summarizer)
+register_summarizer("extractive", _create_extractive_summarizer)
+register_summarizer("fake", _create_fake_summarizer)
@@ -0,0 +1,173 @@
+"""安価なモデルによる論文のトリアージ（関連度スクリーニング）
+
+複数の論文のタイトルとアブストラクトを1回のプロンプトにまとめて安価なモデルに送り、
+関心分野との関連度を0〜10で評価させる。しきい値以上の論文だけを高価なモデルで要約する
+"""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ..config import config
+from ..models import PaperResult
+from .base import CompletionSummarizer
+from .openrouter_summarizer import OpenRouterSummarizer
+from .preprocess import AbstractPreprocessor
+from .usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+# 応答の「番号: スコア」行（"[3]: 7" / "3: 7.5" / "3：7" などを許容）
+_SCORE_LINE = re.compile(r"^\s*\[?(\d+)\]?\s*[:：]\s*(\d+(?:\.\d+)?)", re.MULTILINE)
+
+
+def parse_scores(text: str, count: int) -> Dict[int, float]:
+    """
+    トリアージの応答からスコアを抽出
+    
+    Args:
+        text: モデルの応答
+        count: バッチ内の論文数
+    
+    Returns:
+        論文の番号（0始まり）→ 関連度（0.0〜1.0）。応答に含まれない論文は含まない
+    """
+    scores = {}
+    for match in _SCORE_LINE.finditer(text):
+        index = int(match.group(1)) - 1
+        if 0 <= index < count:
+            scores[index] = min(max(float(match.group(2)), 0.0), 10.0) / 10
+    return scores
+
+
+class PaperTriage:
+    """安価なモデルで論文の関連度を評価し、要約対象を絞り込むクラス"""
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        threshold: Optional[float] = None,
+        extractive_threshold: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        interests: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_workers: int = 4,
+        abstract_tokens: int = 150,
+        usage_tracker: Optional[UsageTracker] = None
+    ):
+        """
+        Args:
+            api_key: OpenRouter APIキー（Noneの場合は設定から取得）
+            model: トリアージに使用するモデル（Noneの場合は設定から取得）
+            threshold: 要約対象とする関連度の下限（0.0〜1.0、Noneの場合は設定から取得）
+            extractive_threshold: 要約せず抽出した要点で通知する関連度の下限（thresholdより小さい
+                場合のみ有効、Noneの場合は設定から取得）
+            batch_size: 1回のプロンプトで評価する論文数（Noneの場合は設定から取得）
+            interests: 関心分野の説明（Noneの場合は設定から取得、未設定の場合は検索クエリ）
+            base_url: APIのベースURL（Noneの場合は設定から取得）
+            max_workers: 並行して送信するバッチ数
+            abstract_tokens: 1論文あたりのアブストラクトの推定トークン数の上限
+            usage_tracker: API使用量の集計先
+        """
+        self.threshold = config.TRIAGE_THRESHOLD if threshold is None else threshold
+        self.extractive_threshold = (
+            config.TRIAGE_EXTRACTIVE_THRESHOLD if extractive_threshold is None else extractive_threshold
+        )
+        self.batch_size = batch_size or config.TRIAGE_BATCH_SIZE
+        self.interests = interests or config.TRIAGE_INTERESTS or config.ARXIV_SEARCH_QUERY
+        self.max_workers = max_workers
+        self.usage_tracker = usage_tracker
+        # API呼び出し（リトライ・使用量の記録を含む）はOpenRouterSummarizerを再利用
+        self.client: CompletionSummarizer = OpenRouterSummarizer(
+            api_key=api_key,
+            model=model or config.TRIAGE_MODEL,
+            base_url=base_url,
+            preprocessor=AbstractPreprocessor(max_tokens=abstract_tokens),
+            max_tokens=8 * self.batch_size + 32,
+            temperature=0.0,
+            usage_tracker=usage_tracker,
+            tier="triage"
+        )
+    
+    @property
+    def model(self) -> str:
+        return self.client.model
+    
+    def triage(self, papers: List[PaperResult]) -> List[PaperResult]:
+        """
+        論文の関連度を評価し、しきい値以上の論文を返す
+        
+        各論文のrelevance_scoreに評価結果を格納する。評価に失敗したバッチや
+        応答にスコアが含まれない論文、ウォッチ中の著者の論文は通過させる。
+        extractive_thresholdがしきい値より小さい場合は、その間の関連度の論文も
+        通知対象として通過させる（needs_summaryがFalseになり、抽出した要点で通知する）
+        
+        Args:
+            papers: 評価する論文
+        
+        Returns:
+            通知対象とする論文（元の順序を維持）
+        """
+        if not papers:
+            return []
+        batches = [papers[start:start + self.batch_size] for start in range(0, len(papers), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="triage") as executor:
+            for batch, error in zip(batches, executor.map(self._score_batch, batches)):
+                if error is not None:
+                    logger.warning(f"Triage failed for {len(batch)} papers, passing them through: {error}")
+        if self.usage_tracker is not None:
+            self.usage_tracker.add_papers("triage", len(papers))
+        
+        passed = [
+            paper for paper in papers
+            if self.needs_summary(paper) or paper.relevance_score >= self.extractive_threshold
+        ]
+        summarized = sum(map(self.needs_summary, passed))
+        logger.info(
+            f"Triage ({self.model}): {summarized}/{len(papers)} papers passed "
+            f"(threshold {self.threshold:.2f})"
+            + (f", {len(passed) - summarized} more with key points only" if len(passed) > summarized else "")
+        )
+        return passed
+    
+    def needs_summary(self, paper: PaperResult) -> bool:
+        """
+        関連度が要約のしきい値以上か（未評価・ウォッチ中の著者の論文はスコアに関わらずTrue）
+        
+        Args:
+            paper: 論文
+        
+        Returns:
+            LLMで要約する場合True
+        """
+        return paper.relevance_score is None or paper.relevance_score >= self.threshold or bool(paper.watched_authors)
+    
+    def _score_batch(self, batch: List[PaperResult]) -> Optional[Exception]:
+        """1バッチを評価してrelevance_scoreに格納（失敗した場合は例外を返す）"""
+        try:
+            scores = parse_scores(self.client.complete(self._create_prompt(batch)), len(batch))
+        except Exception as e:
+            return e
+        for index, paper in enumerate(batch):
+            paper.relevance_score = scores.get(index)
+        if len(scores) < len(batch):
+            logger.warning(f"Triage response missing scores for {len(batch) - len(scores)} papers")
+        return None
+    
+    def _create_prompt(self, batch: List[PaperResult]) -> str:
+        """トリアージ用のプロンプトを作成"""
+        entries = "\n\n".join(
+            f"[{number}] タイトル: {' '.join(paper.title.split())}\n"
+            f"アブストラクト: {self.client.preprocess_abstract(paper.abstract)}"
+            for number, paper in enumerate(batch, 1)
+        )
+        return f"""以下の{len(batch)}本の論文について、次の関心分野を持つ研究者が読む価値があるかを0〜10の整数で評価してください。
+関心分野: {self.interests}
+
+各論文につき「番号: スコア」の形式で1行ずつ出力し、それ以外は出力しないでください。
+
+{entries}
+
+評価:"""
@@ -0,0 +1,206 @@
+"""API呼び出しのティア別使用量（トークン数・レイテンシ・推定コスト）の集計
+
+トリアージ（安価なモデル）と要約（高価なモデル）のように、用途（ティア）ごとに
+呼び出し回数・トークン数・レイテンシを集計し、モデルの単価から推定コストを算出する
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# モデル名 → (入力, 出力[, キャッシュ済み入力]) の100万トークンあたりの単価（USD）
+Prices = Dict[str, Tuple[float, ...]]
+
+
+def parse_prices(value: str) -> Prices:
+    """
+    単価の設定文字列を解析
+    
+    Args:
+        value: "モデル=入力単価/出力単価[/キャッシュ済み入力単価]" のカンマ区切り
+            （例: "openai/gpt-4o-mini=0.15/0.6,anthropic/claude-3.5-sonnet=3/15/0.3"）
+    
+    Returns:
+        モデル名 → (入力, 出力[, キャッシュ済み入力]) の100万トークンあたりの単価
+    
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    prices: Prices = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        try:
+            model, pair = item.rsplit("=", 1)
+            values = tuple(float(price) for price in pair.split("/"))
+            if len(values) not in (2, 3):
+                raise ValueError(item)
+            prices[model.strip()] = values
+        except ValueError:
+            raise ValueError(f"Invalid price entry (expected model=input/output[/cached]): {item}")
+    return prices
+
+
+@dataclass
+class TierUsage:
+    """1ティア分の使用量"""
+    
+    model: str = ""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    papers: int = 0
+    cached_prompt_tokens: int = 0
+    
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+    
+    @property
+    def average_latency(self) -> float:
+        """1呼び出しあたりの平均レイテンシ（秒）"""
+        return self.latency / self.calls if self.calls else 0.0
+    
+    @property
+    def cache_hit_ratio(self) -> float:
+        """入力トークンのうちプロバイダー側のキャッシュから読み込まれた割合"""
+        return self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+    
+    def cost(self, prices: Prices) -> Optional[float]:
+        """
+        推定コスト（USD）
+        
+        キャッシュ済み入力の単価がある場合、キャッシュから読み込まれた入力トークンはその単価で計算する
+        
+        Args:
+            prices: モデルごとの単価
+        
+        Returns:
+            推定コスト（モデルの単価が不明な場合はNone）
+        """
+        if self.model not in prices:
+            return None
+        prompt_price, completion_price, *cached = prices[self.model]
+        cached_price = cached[0] if cached else prompt_price
+        uncached_tokens = self.prompt_tokens - self.cached_prompt_tokens
+        return (
+            uncached_tokens * prompt_price
+            + self.cached_prompt_tokens * cached_price
+            + self.completion_tokens * completion_price
+        ) / 1_000_000
+    
+    def since(self, before: Optional["TierUsage"]) -> "TierUsage":
+        """スナップショットbefore以降の差分"""
+        if before is None:
+            return replace(self)
+        return TierUsage(
+            model=self.model,
+            calls=self.calls - before.calls,
+            prompt_tokens=self.prompt_tokens - before.prompt_tokens,
+            completion_tokens=self.completion_tokens - before.completion_tokens,
+            latency=self.latency - before.latency,
+            papers=self.papers - before.papers,
+            cached_prompt_tokens=self.cached_prompt_tokens - before.cached_prompt_tokens
+        )
+
+
+class UsageTracker:
+    """ティアごとのAPI使用量を集計するクラス（スレッドセーフ）"""
+    
+    def __init__(self, prices: Optional[Prices] = None):
+        """
+        Args:
+            prices: モデルごとの100万トークンあたりの単価（推定コストの算出に使用）
+        """
+        self.prices = prices or {}
+        self._tiers: Dict[str, TierUsage] = {}
+        self._lock = threading.Lock()
+    
+    def record(
+        self,
+        tier: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency: float,
+        cached_tokens: int = 0
+    ) -> None:
+        """
+        1回のAPI呼び出しを記録
+        
+        Args:
+            tier: ティア名（"triage" / "summary" など）
+            model: 使用したモデル
+            prompt_tokens: 入力トークン数（キャッシュから読み込まれた分を含む）
+            completion_tokens: 出力トークン数
+            latency: レイテンシ（秒）
+            cached_tokens: 入力トークンのうちプロバイダー側のキャッシュから読み込まれた数
+        """
+        with self._lock:
+            usage = self._tiers.setdefault(tier, TierUsage())
+            usage.model = model
+            usage.calls += 1
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.latency += latency
+            usage.cached_prompt_tokens += cached_tokens
+    
+    def add_papers(self, tier: str, count: int) -> None:
+        """ティアで処理した論文数を記録"""
+        with self._lock:
+            self._tiers.setdefault(tier, TierUsage()).papers += count
+    
+    def snapshot(self) -> Dict[str, TierUsage]:
+        """現在の集計のコピー"""
+        with self._lock:
+            return {tier: replace(usage) for tier, usage in self._tiers.items()}
+    
+    def since(self, before: Dict[str, TierUsage]) -> Dict[str, TierUsage]:
+        """スナップショットbefore以降の差分"""
+        return {tier: usage.since(before.get(tier)) for tier, usage in self.snapshot().items()}
+    
+    def total_cost(self, usage: Dict[str, TierUsage]) -> Optional[float]:
+        """
+        全ティアの推定コストの合計（USD）
+        
+        Args:
+            usage: snapshot() / since() の結果
+        
+        Returns:
+            推定コスト（単価が不明なモデルを含む場合はNone）
+        """
+        costs = [tier_usage.cost(self.prices) for tier_usage in usage.values() if tier_usage.calls]
+        if any(cost is None for cost in costs):
+            return None
+        return sum(costs)
+    
+    def format_report(self, usage: Dict[str, TierUsage], summarized: int) -> List[str]:
+        """
+        ログ出力用のレポートを作成
+        
+        Args:
+            usage: snapshot() / since() の結果
+            summarized: 要約した論文数（1ドルあたりのスループットの算出に使用）
+        
+        Returns:
+            レポートの各行
+        """
+        lines = []
+        for tier, tier_usage in usage.items():
+            if not tier_usage.calls:
+                continue
+            cost = tier_usage.cost(self.prices)
+            lines.append(
+                f"Usage [{tier}] {tier_usage.model}: {tier_usage.papers} papers, {tier_usage.calls} calls, "
+                f"{tier_usage.prompt_tokens}+{tier_usage.completion_tokens} tokens "
+                f"(cached {tier_usage.cached_prompt_tokens}/{tier_usage.prompt_tokens} prompt tokens, "
+                f"{tier_usage.cache_hit_ratio:.0%}), "
+                f"avg {tier_usage.average_latency:.2f}s"
+                + (f", ${cost:.4f}" if cost is not None else "")
+            )
+        total = self.total_cost(usage)
+        if lines and total:
+            lines.append(f"Throughput: {summarized} papers summarized for ${total:.4f} ({summarized / total:.1f} papers/$)")
+        return lines
@@ -0,0 +1,29 @@
+"""
+テスト共通のヘルパー（論文などのテストデータの生成）
+"""
+from src.models import PaperResult
+
+
+def make_paper(index: int = 1, version: int = 1, **fields) -> PaperResult:
+    """
+    テスト用の論文を生成
+    
+    Args:
+        index: 論文の番号（arXiv ID "2601.<index>" とタイトル "Paper <index>" に使う）
+        version: arXiv IDのバージョン
+        **fields: 上書きするPaperResultのフィールド（idのみ指定した場合はurlも同じ値にする）
+    
+    Returns:
+        論文
+    """
+    paper_id = fields.pop("id", f"http://arxiv.org/abs/2601.{index:05d}v{version}")
+    values = {
+        "title": f"Paper {index}",
+        "authors": "John Doe",
+        "abstract": "We propose a method.",
+        "url": paper_id,
+        "published": "2026-01-01T00:00:00",
+        "source": "arXiv",
+    }
+    values.update(fields)
+    return PaperResult(id=paper_id, **values)
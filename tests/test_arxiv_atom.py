@@ -0,0 +1,127 @@
+"""
+arXiv APIレスポンスのストリーミングパースのテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.ArxivApiStub）を使用（外部サービスへの接続なし）
+"""
+import xml.etree.ElementTree as ET
+
+import pytest
+import requests
+
+from benchmarks.atom_parse import compare, parse_streaming, parse_with_arxiv, write_pages
+from benchmarks.stubs import ArxivApiStub, generate_papers, render_atom_feed
+from src.collectors.arxiv_atom import FeedHeader, StreamingArxivClient, parse_feed
+from src.collectors.arxiv_collector import ArxivCollector
+from src.collectors.http_cache import HttpCache
+
+
+def _client(stub, page_size=10, **kwargs) -> StreamingArxivClient:
+    client = StreamingArxivClient(page_size=page_size, delay_seconds=0, num_retries=0, **kwargs)
+    client.query_url_format = stub.query_url_format
+    return client
+
+
+class TestParseFeed:
+    """フィードのパースのテスト"""
+    
+    def test_same_results_as_arxiv_package(self):
+        feed = render_atom_feed(generate_papers(30), total_results=30)
+        streaming = [paper.to_dict() for paper in parse_streaming(feed)]
+        assert len(streaming) == 30
+        assert streaming == [paper.to_dict() for paper in parse_with_arxiv(feed)]
+    
+    def test_small_chunks_and_header(self):
+        feed = render_atom_feed(generate_papers(5), total_results=120, start=40)
+        header = FeedHeader()
+        chunks = [feed[offset:offset + 7] for offset in range(0, len(feed), 7)]
+        papers = list(parse_feed(chunks, header))
+        
+        assert [paper.id for paper in papers] == [f"http://arxiv.org/abs/2601.{i:05d}v1" for i in range(5)]
+        assert header == FeedHeader(total_results=120, start_index=40, items_per_page=5)
+    
+    def test_invalid_entries(self):
+        feed = (
+            b'<feed xmlns="http://www.w3.org/2005/Atom">'
+            b"<entry><title>No id</title></entry>"
+            b"<entry><id>http://arxiv.org/abs/2601.00001v1</id>"
+            b"<published>2026-01-01T00:00:00Z</published>"
+            b"<title>Valid\n  Title</title></entry>"
+            b"</feed>"
+        )
+        papers = list(parse_feed([feed]))
+        assert [paper.title for paper in papers] == ["Valid Title"]
+        
+        with pytest.raises(ET.ParseError):
+            list(parse_feed([b"<feed><entry>"]))
+
+
+class TestStreamingArxivClient:
+    """ストリーミングのarXivクライアントのテスト"""
+    
+    def test_pages_until_max_results(self):
+        with ArxivApiStub(25) as stub:
+            papers = list(_client(stub).results("cat:cs.AI", max_results=12))
+            assert stub.request_count == 2
+            everything = list(_client(stub).results("cat:cs.AI"))
+        
+        assert len(papers) == 12
+        assert len(everything) == 25
+        assert len({paper.id for paper in everything}) == 25
+    
+    def test_retry_skips_already_returned_papers(self):
+        class FlakyClient(StreamingArxivClient):
+            failures = 1
+            
+            def _fetch(self, url, header):
+                for index, paper in enumerate(super()._fetch(url, header)):
+                    if index == 3 and self.failures:
+                        self.failures -= 1
+                        raise requests.ConnectionError("connection reset")
+                    yield paper
+        
+        with ArxivApiStub(10) as stub:
+            client = FlakyClient(page_size=10, delay_seconds=0, num_retries=1)
+            client.query_url_format = stub.query_url_format
+            papers = list(client.results("cat:cs.AI", max_results=10))
+            assert stub.request_count == 2
+        
+        assert [paper.id for paper in papers] == [f"http://arxiv.org/abs/2601.{i:05d}v1" for i in range(10)]
+    
+    def test_cache(self, tmp_path):
+        cache = HttpCache(str(tmp_path), ttl=600)
+        with ArxivApiStub(25) as stub:
+            first = list(_client(stub, cache=cache).results("cat:cs.AI", max_results=25))
+            requests_after_first = stub.request_count
+            second = list(_client(stub, cache=cache).results("cat:cs.AI", max_results=25))
+            assert stub.request_count == requests_after_first
+        
+        assert [paper.id for paper in second] == [paper.id for paper in first]
+        assert cache.stats["hits"] == requests_after_first
+
+
+class TestArxivCollectorStreaming:
+    """ArxivCollectorのストリーミングの経路のテスト"""
+    
+    def test_setting_selects_streaming_client(self, monkeypatch):
+        monkeypatch.setenv("ARXIV_STREAMING_PARSER", "true")
+        assert isinstance(ArxivCollector("cat:cs.AI", cache_dir="").get_client(), StreamingArxivClient)
+        monkeypatch.setenv("ARXIV_STREAMING_PARSER", "false")
+        assert not isinstance(ArxivCollector("cat:cs.AI", cache_dir="").get_client(), StreamingArxivClient)
+    
+    def test_collect_recent_papers(self):
+        with ArxivApiStub(25) as stub:
+            collector = ArxivCollector("cat:cs.AI", max_results=20, client=_client(stub))
+            papers = collector.collect_recent_papers(days=1)
+        
+        assert len(papers) == 20
+        assert all(paper.source == "arXiv" and paper.abstract for paper in papers)
+
+
+class TestAtomParseBenchmark:
+    """パースのベンチマークのテスト"""
+    
+    def test_compare_in_process(self, tmp_path):
+        report = compare(write_pages(str(tmp_path), entries=20, pages=2), runs=1, in_process=True)
+        
+        assert report["results"]["arxiv"]["entries"] == report["results"]["streaming"]["entries"] == 40
+        assert report["speedup"] > 0
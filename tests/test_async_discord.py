@@ -0,0 +1,201 @@
+"""
+非同期Discord Webhook通知（複数Webhookへの並行配信）のテスト
+"""
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from benchmarks.stubs import DiscordWebhookStub
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.notifiers import async_discord
+from src.notifiers.async_discord import AsyncDiscordNotifier, redact_webhook
+from src.notifiers.digest import DigestMessage
+from src.notifiers.paper_notifier import PaperNotifier
+from tests.helpers import make_paper
+
+
+WEBHOOKS = [f"https://discord.com/api/webhooks/{i}/token{i}" for i in range(3)]
+
+
+def _messages(count: int):
+    return [DigestMessage(content=f"message {i}") for i in range(count)]
+
+
+def _paper(index: int) -> PaperResult:
+    return make_paper(index, summary=f"summary {index}")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """応答を順番に返し、受信したリクエストを記録するトランスポート"""
+    
+    def __init__(self, responses=None, delay: float = 0.0):
+        """
+        Args:
+            responses: Webhookのパス → 返す応答のリスト（尽きた後は200）
+            delay: 応答までの遅延（秒）
+        """
+        self.responses = {path: list(items) for path, items in (responses or {}).items()}
+        self.delay = delay
+        self.requests = []
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        self.requests.append((request.url.path, time.monotonic(), request))
+        await asyncio.sleep(self.delay)
+        pending = self.responses.get(request.url.path)
+        if pending:
+            return pending.pop(0)
+        return httpx.Response(200, json={"id": str(len(self.requests))})
+    
+    def contents(self, path: str):
+        return [json.loads(request.content)["content"] for p, _, request in self.requests if p == path]
+
+
+class TestAsyncDiscordNotifier:
+    """AsyncDiscordNotifierのテスト"""
+    
+    def test_requires_webhook(self):
+        with pytest.raises(ValueError):
+            AsyncDiscordNotifier([" ", ""])
+    
+    def test_delivers_concurrently_and_keeps_order_per_webhook(self):
+        transport = RecordingTransport(delay=0.05)
+        notifier = AsyncDiscordNotifier(WEBHOOKS, transport=transport)
+        
+        start = time.perf_counter()
+        results = notifier.deliver(_messages(4))
+        elapsed = time.perf_counter() - start
+        
+        assert len(results) == 12 and all(result.success for result in results)
+        for url in WEBHOOKS:
+            assert transport.contents(httpx.URL(url).path) == [f"message {i}" for i in range(4)]
+        # 直列なら12 × 0.05秒、Webhook間が並行なら4 × 0.05秒
+        assert elapsed < 0.4
+        assert all(result.latency >= 0.05 for result in results)
+        assert results[0].message_id is not None
+        assert notifier.last_results == results
+    
+    def test_retries_after_rate_limit(self):
+        path = httpx.URL(WEBHOOKS[0]).path
+        transport = RecordingTransport({path: [
+            httpx.Response(429, json={"message": "rate limited", "retry_after": 0.1, "global": False})
+        ]})
+        notifier = AsyncDiscordNotifier(WEBHOOKS[:2], transport=transport)
+        
+        first, other = notifier.deliver(_messages(1))
+        
+        assert first.success and first.attempts == 2 and first.rate_limited == 1
+        assert first.latency >= 0.1
+        # 他のWebhookは待たされない
+        assert other.success and other.attempts == 1 and other.latency < 0.1
+    
+    def test_global_rate_limit_pauses_all_webhooks(self):
+        path = httpx.URL(WEBHOOKS[0]).path
+        transport = RecordingTransport({path: [
+            httpx.Response(429, json={"message": "rate limited", "retry_after": 0.2, "global": True})
+        ]})
+        notifier = AsyncDiscordNotifier(WEBHOOKS[:2], transport=transport)
+        
+        start = time.monotonic()
+        results = notifier.deliver(_messages(2))
+        
+        assert all(result.success for result in results)
+        other_times = [at for p, at, _ in transport.requests if p == httpx.URL(WEBHOOKS[1]).path]
+        assert other_times[1] - start >= 0.2
+    
+    def test_respects_remaining_header(self):
+        with DiscordWebhookStub(rate_limit=2, window_seconds=0.3) as stub:
+            notifier = AsyncDiscordNotifier([stub.webhook_url("a"), stub.webhook_url("b")])
+            start = time.perf_counter()
+            results = notifier.deliver(_messages(5))
+            elapsed = time.perf_counter() - start
+            stats = dict(stub.stats)
+        
+        assert all(result.success for result in results)
+        assert stats["messages"] == 10
+        assert stats["rate_limited"] == 0
+        assert elapsed >= 0.6
+    
+    def test_server_errors_are_retried_then_reported(self, monkeypatch):
+        monkeypatch.setattr(async_discord, "RETRY_BACKOFF", 0.01)
+        paths = [httpx.URL(url).path for url in WEBHOOKS]
+        transport = RecordingTransport({
+            paths[0]: [httpx.Response(502), httpx.Response(200, json={"id": "1"})],
+            paths[1]: [httpx.Response(500)] * 3,
+            paths[2]: [httpx.Response(404)],
+        })
+        notifier = AsyncDiscordNotifier(WEBHOOKS, max_retries=1, transport=transport)
+        
+        recovered, failed, not_found = notifier.deliver(_messages(1))
+        
+        assert recovered.success and recovered.attempts == 2
+        assert not failed.success and failed.attempts == 2 and failed.status == 500
+        assert not not_found.success and not_found.attempts == 1 and not_found.status == 404
+        assert "token" not in failed.webhook
+    
+    def test_files_are_sent_as_multipart(self):
+        transport = RecordingTransport()
+        notifier = AsyncDiscordNotifier(WEBHOOKS[:1], transport=transport)
+        
+        assert notifier.send_embeds([{"title": "t"}], content="hello", files={"digest.md": b"# digest"})
+        
+        request = transport.requests[0][2]
+        assert request.headers["Content-Type"].startswith("multipart/form-data")
+        assert b'name="payload_json"' in request.content and b"# digest" in request.content
+        assert request.url.params["wait"] == "true"
+    
+    def test_sync_api_matches_discord_notifier(self):
+        transport = RecordingTransport()
+        notifier = AsyncDiscordNotifier(WEBHOOKS[:2], transport=transport)
+        
+        assert notifier.send_embed("title", "description", fields=[{"name": "n", "value": "v"}], url="https://x")
+        assert notifier.send_message("plain")
+        assert notifier.test_connection()
+        
+        embed = json.loads(transport.requests[0][2].content)["embeds"][0]
+        assert embed["title"] == "title" and embed["url"] == "https://x"
+        assert embed["color"] == 0x03b2f8 and embed["fields"][0]["name"] == "n"
+        assert len(transport.requests) == 6
+    
+    def test_redact_webhook(self):
+        assert redact_webhook(WEBHOOKS[1]) == "https://discord.com/api/webhooks/1/***"
+
+
+class TestPaperNotifierMultipleWebhooks:
+    """カンマ区切りの複数Webhookでの論文通知のテスト"""
+    
+    def test_single_webhook_keeps_sync_notifier(self):
+        notifier = PaperNotifier(WEBHOOKS[0])
+        assert not notifier.concurrent
+    
+    def test_bot_notifies_all_webhooks(self):
+        with DiscordWebhookStub(rate_limit=50, keep_payloads=True) as stub:
+            notifier = PaperNotifier(f"{stub.webhook_url('a')},{stub.webhook_url('b')}")
+            assert notifier.concurrent
+            bot = ResearchPaperBot(
+                dry_run=False,
+                collector=Mock(),
+                summarizer=Mock(usage_tracker=None, compression_stats=None),
+                notifier=notifier,
+                full_text=False,
+                triage=False,
+                cluster=False,
+                watchlist=None
+            )
+            assert bot.notify_papers([_paper(i) for i in range(3)]) == [True, True, True]
+            payloads = [json.loads(payload) for payload in stub.payloads]
+        
+        titles = [payload["embeds"][0]["title"] for payload in payloads]
+        assert sorted(titles) == sorted(["📄 Paper 0", "📄 Paper 1", "📄 Paper 2"] * 2)
+    
+    def test_partial_failure_is_reported_per_paper(self):
+        path = httpx.URL(WEBHOOKS[1]).path
+        notifier = PaperNotifier(",".join(WEBHOOKS[:2]))
+        notifier.discord_notifier.transport = RecordingTransport({path: [httpx.Response(200), httpx.Response(400)]})
+        
+        assert notifier.send_paper_summaries([_paper(0), _paper(1)]) == [True, False]
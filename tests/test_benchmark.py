@@ -0,0 +1,92 @@
+"""
+オフラインベンチマーク（スタブサーバー）のテスト
+
+ローカルスタブのみを使用（外部サービスへの接続なし）
+"""
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.run_benchmark import latency_summary, percentile, run_scale
+from benchmarks.stubs import (
+    ArxivApiStub,
+    ChatCompletionStub,
+    CompletionProfile,
+    DiscordWebhookStub,
+)
+
+
+def _post(url: str, payload: dict):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    return urllib.request.urlopen(request, timeout=5)
+
+
+class TestPercentile:
+    """パーセンタイル計算のテスト"""
+
+    def test_percentile_interpolates(self):
+        samples = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(samples, 0) == 1.0
+        assert percentile(samples, 100) == 4.0
+        assert percentile(samples, 50) == pytest.approx(2.5)
+
+    def test_latency_summary_empty(self):
+        summary = latency_summary([])
+        assert summary["count"] == 0
+        assert summary["p99_ms"] == 0.0
+
+
+class TestStubs:
+    """スタブサーバーのテスト"""
+
+    def test_arxiv_stub_pages(self):
+        with ArxivApiStub(25) as stub:
+            with urllib.request.urlopen(f"{stub.url}/api/query?start=20&max_results=10") as response:
+                body = response.read().decode("utf-8")
+        assert body.count("<entry>") == 5
+        assert "<opensearch:totalResults>25</opensearch:totalResults>" in body
+
+    def test_completion_stub_rate_limit_profile(self):
+        profile = CompletionProfile(latency_ms=0, rate_limit_rate=1.0, retry_after_seconds=1.5)
+        with ChatCompletionStub(profile) as stub:
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                _post(f"{stub.base_url}/chat/completions", {"messages": []})
+        assert excinfo.value.code == 429
+        assert excinfo.value.headers["Retry-After"] == "1.5"
+        assert stub.stats["rate_limited"] == 1
+
+    def test_discord_stub_enforces_rate_limit(self):
+        with DiscordWebhookStub(rate_limit=2, window_seconds=60) as stub:
+            url = stub.webhook_url()
+            assert _post(url, {"content": "1"}).status == 200
+            assert _post(url, {"content": "2"}).status == 200
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                _post(url, {"content": "3"})
+        assert excinfo.value.code == 429
+        assert json.loads(excinfo.value.read())["retry_after"] > 0
+        assert stub.stats == {"messages": 2, "rate_limited": 1}
+
+
+def test_run_scale_end_to_end():
+    """スタブに対してパイプライン全体を実行し、計測結果が得られることをテスト"""
+    result = run_scale(
+        5,
+        profile=CompletionProfile(latency_ms=0),
+        discord_rate_limit=100
+    )
+
+    assert result["success"] is True
+    assert result["scale"] == 5
+    assert result["latency"]["summarize"]["count"] == 5
+    assert result["notifications"] == {"succeeded": 5, "failed": 0}
+    assert result["stubs"]["completions"]["completions"] == 5
+    assert result["stubs"]["discord"]["messages"] == 5
+    assert result["peak_rss_kb"] > 0
+    json.dumps(result)
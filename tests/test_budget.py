@@ -0,0 +1,227 @@
+"""
+API使用量の予算管理（BudgetManager）のテスト
+"""
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src import clock
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.notifiers.paper_notifier import PaperNotifier
+from src.summarizers.budget import BudgetManager, UsageEstimate
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from src.summarizers.preprocess import estimate_tokens
+from src.summarizers.usage import UsageTracker
+from tests.helpers import make_paper
+
+
+MODEL = "test/model"
+# 100万トークンあたり入力10ドル・出力30ドル
+PRICES = {MODEL: (10.0, 30.0)}
+
+
+def _paper(index: int, words: int = 50, watched=None) -> PaperResult:
+    return make_paper(index, abstract=" ".join(["method"] * words), watched_authors=watched)
+
+
+class FakeSummarizer:
+    """見積もりどおりの使用量を記録する要約器"""
+    
+    def __init__(self, tracker: UsageTracker, actual_factor: float = 1.0):
+        self.usage_tracker = tracker
+        self.compression_stats = None
+        self.model = MODEL
+        self.actual_factor = actual_factor
+        self.summarized = []
+    
+    def estimate_usage(self, paper: PaperResult) -> UsageEstimate:
+        return UsageEstimate(MODEL, len(paper.abstract.split()), 100)
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        estimate = self.estimate_usage(paper)
+        self.usage_tracker.record(
+            "summary", MODEL, int(estimate.prompt_tokens * self.actual_factor), estimate.completion_tokens, 0.1
+        )
+        self.summarized.append(paper.title)
+        paper.summary = f"summary of {paper.title}"
+        return paper
+
+
+def _bot(summarizer, papers) -> ResearchPaperBot:
+    collector = Mock()
+    collector.collect_recent_papers.return_value = papers
+    return ResearchPaperBot(
+        dry_run=True,
+        collector=collector,
+        summarizer=summarizer,
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=None
+    )
+
+
+@pytest.fixture
+def budget_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("BUDGET_FILE", str(tmp_path / "budget.json"))
+    monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+    return tmp_path / "budget.json"
+
+
+class TestEstimate:
+    """要約前の使用量の見積もりのテスト"""
+    
+    def test_openrouter_estimate_uses_preprocessed_prompt(self):
+        summarizer = OpenRouterSummarizer(api_key="test_key", model=MODEL, max_tokens=300)
+        short = summarizer.estimate_usage(_paper(1, words=20))
+        long = summarizer.estimate_usage(_paper(2, words=200))
+        
+        assert short.model == MODEL and short.completion_tokens == 300
+        assert long.prompt_tokens - short.prompt_tokens == estimate_tokens(" ".join(["method"] * 180))
+        # 見積もりは圧縮の集計に含めない
+        assert summarizer.compression_stats.papers == 0
+    
+    def test_estimate_cost(self):
+        estimate = UsageEstimate(MODEL, 1000, 1000)
+        assert estimate.cost(PRICES) == pytest.approx(0.04)
+        assert UsageEstimate("unknown", 1000, 1000).cost(PRICES) == 0.0
+
+
+class TestBudgetManager:
+    """BudgetManagerのテスト"""
+    
+    def test_disabled_without_limits(self):
+        assert not BudgetManager(UsageTracker()).enabled
+        assert BudgetManager(UsageTracker(), daily_cost=1.0).enabled
+    
+    def test_plan_maximizes_coverage(self):
+        tracker = UsageTracker(PRICES)
+        budget = BudgetManager(tracker, run_tokens=500)
+        summarizer = FakeSummarizer(tracker)
+        papers = [_paper(1, words=300), _paper(2, words=50), _paper(3, words=80), _paper(4, words=200)]
+        
+        selected, skipped = budget.plan(papers, summarizer)
+        
+        # 見積もりの少ない順に詰め（150 + 180 = 330）、元の順序で返す
+        assert [paper.title for paper in selected] == ["Paper 2", "Paper 3"]
+        assert [paper.title for paper in skipped] == ["Paper 1", "Paper 4"]
+    
+    def test_plan_prefers_watched_papers(self):
+        tracker = UsageTracker(PRICES)
+        budget = BudgetManager(tracker, run_tokens=600)
+        papers = [_paper(1, words=50), _paper(2, words=300, watched=["John Doe"])]
+        
+        selected, _ = budget.plan(papers, FakeSummarizer(tracker))
+        assert [paper.title for paper in selected] == ["Paper 1", "Paper 2"]
+        
+        budget.run_tokens = 450
+        selected, _ = budget.plan(papers, FakeSummarizer(tracker))
+        assert [paper.title for paper in selected] == ["Paper 2"]
+    
+    def test_cost_limit(self):
+        tracker = UsageTracker(PRICES)
+        # 1論文（入力100 + 出力100トークン）= $0.004
+        budget = BudgetManager(tracker, run_cost=0.01)
+        papers = [_paper(i, words=100) for i in range(5)]
+        
+        selected, skipped = budget.plan(papers, FakeSummarizer(tracker))
+        assert len(selected) == 2 and len(skipped) == 3
+    
+    def test_warns_about_unpriced_models_with_cost_limit(self, monkeypatch, caplog):
+        monkeypatch.setenv("BUDGET_DAILY_COST", "1.0")
+        BudgetManager.from_config(UsageTracker(PRICES), models=[MODEL, "cheap/model"])
+        assert "No MODEL_PRICES entry for cheap/model" in caplog.text
+        
+        caplog.clear()
+        monkeypatch.setenv("BUDGET_DAILY_COST", "0")
+        monkeypatch.setenv("BUDGET_RUN_TOKENS", "1000")
+        BudgetManager.from_config(UsageTracker(PRICES), models=["cheap/model"])
+        assert "MODEL_PRICES" not in caplog.text
+    
+    def test_actual_usage_reduces_remaining(self):
+        tracker = UsageTracker(PRICES)
+        budget = BudgetManager(tracker, run_tokens=1000)
+        estimate = UsageEstimate(MODEL, 300, 100)
+        assert budget.allows(estimate)
+        
+        tracker.record("triage", MODEL, 500, 50, 0.1)
+        assert budget.remaining().tokens == 450
+        assert budget.allows(estimate)
+        tracker.record("summary", MODEL, 100, 0, 0.1)
+        assert not budget.allows(estimate)
+        
+        budget.start_run()
+        assert budget.allows(estimate)
+    
+    def test_daily_ledger(self, tmp_path):
+        ledger = str(tmp_path / "budget.json")
+        tracker = UsageTracker(PRICES)
+        with clock.frozen(datetime(2026, 3, 1, 9, 0)):
+            budget = BudgetManager(tracker, daily_tokens=1000, ledger_path=ledger)
+            tracker.record("summary", MODEL, 400, 200, 0.1)
+            assert budget.daily_spend().tokens == 600
+            budget.commit()
+            budget.commit()
+            
+            # 同じ日の別の実行は記録済みの使用量を引き継ぐ
+            other = BudgetManager(UsageTracker(PRICES), daily_tokens=1000, ledger_path=ledger)
+            assert other.daily_spend().tokens == 600
+            assert other.remaining().tokens == 400
+            assert other.daily_spend().cost == pytest.approx(0.01)
+        
+        with clock.frozen(datetime(2026, 3, 2, 9, 0)):
+            assert BudgetManager(UsageTracker(PRICES), daily_tokens=1000, ledger_path=ledger).remaining().tokens == 1000
+
+
+class TestBudgetRun:
+    """予算付きの実行のテスト"""
+    
+    def test_over_budget_papers_are_notified_with_abstract(self, budget_env, monkeypatch):
+        monkeypatch.setenv("BUDGET_RUN_TOKENS", "500")
+        summarizer = FakeSummarizer(UsageTracker(PRICES))
+        papers = [_paper(1, words=400), _paper(2, words=50), _paper(3, words=100), _paper(4, words=150)]
+        bot = _bot(summarizer, papers)
+        notify = Mock(wraps=bot.notify_papers)
+        bot.notify_papers = notify
+        
+        assert bot.run(days=1)
+        
+        assert sorted(summarizer.summarized) == ["Paper 2", "Paper 3"]
+        notified = {paper.title: paper for paper in notify.call_args.args[0]}
+        assert len(notified) == 4
+        assert notified["Paper 1"].summary is None and notified["Paper 1"].summary_deferred
+        assert notified["Paper 2"].summary and not notified["Paper 2"].summary_deferred
+        
+        description = PaperNotifier.paper_embed_args(notified["Paper 1"])["description"]
+        assert "予算" in description and notified["Paper 1"].abstract[:100] in description
+    
+    def test_stops_when_actual_usage_exceeds_estimates(self, budget_env, monkeypatch):
+        monkeypatch.setenv("BUDGET_RUN_TOKENS", "800")
+        # 実際の入力トークンは見積もりの3倍
+        summarizer = FakeSummarizer(UsageTracker(PRICES), actual_factor=3.0)
+        papers = [_paper(i, words=100) for i in range(4)]
+        bot = _bot(summarizer, papers)
+        
+        assert bot.run(days=1)
+        
+        # 見積もりでは4件とも収まるが、2件目の後で残りが足りなくなる
+        assert len(summarizer.summarized) == 2
+        assert sum(paper.summary_deferred for paper in papers) == 2
+    
+    def test_daily_budget_is_shared_across_runs(self, budget_env, monkeypatch):
+        monkeypatch.setenv("BUDGET_DAILY_TOKENS", "700")
+        first = FakeSummarizer(UsageTracker(PRICES))
+        assert _bot(first, [_paper(1, words=100), _paper(2, words=100)]).run(days=1)
+        assert len(first.summarized) == 2
+        
+        second = FakeSummarizer(UsageTracker(PRICES))
+        assert _bot(second, [_paper(3, words=100), _paper(4, words=100)]).run(days=1)
+        assert len(second.summarized) == 1
+    
+    def test_no_budget_summarizes_everything(self, budget_env):
+        summarizer = FakeSummarizer(UsageTracker(PRICES))
+        assert _bot(summarizer, [_paper(i, words=1000) for i in range(3)]).run(days=1)
+        assert len(summarizer.summarized) == 3
+        assert not budget_env.exists()
@@ -0,0 +1,202 @@
+"""
+パイプライン実行の記録・再生（カセット）のテスト
+
+ローカルのスタブサーバー（benchmarks.stubs）を使用（外部サービスへの接続なし）
+"""
+import time
+from datetime import datetime
+
+import arxiv
+import pytest
+import requests
+
+from benchmarks.stubs import ArxivApiStub, ChatCompletionStub, CompletionProfile, DiscordWebhookStub
+from src import clock
+from src.analyzers.watchlist import AuthorWatchlist
+from src.cassette import Cassette, CassetteMiss
+from src.collectors.arxiv_collector import ArxivCollector
+from src.config import config
+from src.main import ResearchPaperBot, build_parser, prepare_replay, run_with_cassette
+from src.notifiers.paper_notifier import PaperNotifier
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+
+
+def _bot(arxiv_url_format: str, completion_url: str, webhook_url: str) -> ResearchPaperBot:
+    client = arxiv.Client(page_size=10, delay_seconds=0, num_retries=0)
+    client.query_url_format = arxiv_url_format
+    return ResearchPaperBot(
+        collector=ArxivCollector("cat:cs.AI", max_results=4, client=client, cache_dir=""),
+        summarizer=OpenRouterSummarizer(
+            api_key="test-key", model="stub-model", retry_delay=0, base_url=completion_url
+        ),
+        notifier=PaperNotifier(webhook_url=webhook_url),
+        notify_mode="embed",
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=AuthorWatchlist()
+    )
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """スタブに対して1回実行して記録したカセットと、実行時の宛先・Webhookのペイロード"""
+    path = tmp_path / "run.cassette"
+    with ArxivApiStub(4) as arxiv_stub, \
+            ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub, \
+            DiscordWebhookStub(rate_limit=100, keep_payloads=True) as discord_stub:
+        urls = (arxiv_stub.query_url_format, completion_stub.base_url, discord_stub.webhook_url())
+        cassette = Cassette(str(path))
+        with cassette.record():
+            assert _bot(*urls).run(days=7)
+        cassette.save()
+    return path, urls, discord_stub.payloads
+
+
+class TestRecordReplay:
+    """記録と再生のテスト"""
+    
+    def test_replay_runs_offline_and_deterministically(self, recorded):
+        path, urls, payloads = recorded
+        cassette = Cassette.load(str(path))
+        kinds = [interaction.kind for interaction in cassette.interactions]
+        assert kinds.count("completion") == 4
+        webhook_bodies = [
+            interaction.request["body"].encode("utf-8") for interaction in cassette.interactions
+            if interaction.request.get("method") == "POST"
+        ]
+        assert webhook_bodies == payloads
+        
+        # スタブは停止済みのため、記録から返せないリクエストは失敗する
+        started = time.perf_counter()
+        with cassette.replay():
+            assert _bot(*urls).run(days=7)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 1.0
+        assert cassette.unused == 0
+        # 記録時と同じリクエスト（Webhookのペイロードを含む）が送信された
+        assert cassette.stats["fallbacks"] == 0
+        assert cassette.stats["replayed"] == len(cassette.interactions)
+    
+    def test_changed_prompt_replays_by_endpoint(self, recorded, monkeypatch):
+        path, urls, _ = recorded
+        cassette = Cassette.load(str(path))
+        monkeypatch.setattr(OpenRouterSummarizer, "_create_prompt", lambda self, title, abstract: f"新しいプロンプト: {title}")
+        
+        with cassette.replay():
+            bot = _bot(*urls)
+            papers = bot.process_papers(bot.collect_papers(days=7))
+        
+        assert all(paper.summary for paper in papers)
+        assert cassette.stats["fallbacks"] == 4
+    
+    def test_multiple_webhooks_are_recorded_and_replayed(self, tmp_path):
+        path = tmp_path / "webhooks.cassette"
+        with ArxivApiStub(4) as arxiv_stub, \
+                ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub, \
+                DiscordWebhookStub(rate_limit=100) as discord_stub:
+            webhooks = f"{discord_stub.webhook_url('a')},{discord_stub.webhook_url('b')}"
+            urls = (arxiv_stub.query_url_format, completion_stub.base_url, webhooks)
+            cassette = Cassette(str(path))
+            with cassette.record():
+                assert _bot(*urls).run(days=7)
+            cassette.save()
+            sent = discord_stub.stats["messages"]
+        
+        cassette = Cassette.load(str(path))
+        webhook_posts = [
+            interaction for interaction in cassette.interactions
+            if interaction.request.get("method") == "POST" and "/api/webhooks/" in interaction.request["url"]
+        ]
+        assert sent == len(webhook_posts) == 8
+        
+        # スタブは停止済みのため、Discordへの送信も記録から返す必要がある
+        with cassette.replay():
+            assert _bot(*urls).run(days=7)
+        assert cassette.unused == 0
+        assert cassette.stats["fallbacks"] == 0
+    
+    def test_replay_without_secrets(self, recorded, monkeypatch):
+        path, urls, _ = recorded
+        monkeypatch.setenv("OPENROUTER_API_KEY", "")
+        monkeypatch.setenv("DISCORD_WEBHOOK_URL", "")
+        monkeypatch.setenv("SUMMARIZER_BACKEND", "openrouter")
+        monkeypatch.setenv("TRIAGE_MODE", "false")
+        cassette = prepare_replay(str(path))
+        client = arxiv.Client(page_size=10, delay_seconds=0, num_retries=0)
+        client.query_url_format = urls[0]
+        # 要約器・通知器は設定から生成する（APIキー・WebhookのURLは記録から補う）
+        bot = ResearchPaperBot(
+            collector=ArxivCollector("cat:cs.AI", max_results=4, client=client, cache_dir=""),
+            notify_mode="embed",
+            full_text=False,
+            triage=False,
+            cluster=False,
+            watchlist=AuthorWatchlist()
+        )
+        
+        assert config.DISCORD_WEBHOOK_URL == urls[2]
+        assert run_with_cassette(bot, days=7, replay=cassette)
+        assert cassette.unused == 0
+    
+    def test_patches_are_restored(self, tmp_path):
+        send, call_api = requests.Session.send, OpenRouterSummarizer._call_api
+        with Cassette(str(tmp_path / "empty.cassette")).record():
+            assert requests.Session.send is not send
+            assert OpenRouterSummarizer._call_api is not call_api
+        assert requests.Session.send is send
+        assert OpenRouterSummarizer._call_api is call_api
+
+
+class TestCassette:
+    """カセット単体のテスト"""
+    
+    def test_miss_raises(self, tmp_path):
+        cassette = Cassette(str(tmp_path / "empty.cassette"), recorded_at=datetime(2026, 1, 1))
+        with cassette.replay():
+            with pytest.raises(CassetteMiss):
+                requests.get("http://127.0.0.1:9/never")
+    
+    def test_streamed_body_is_readable_after_recording(self, tmp_path):
+        path = tmp_path / "stream.cassette"
+        with ArxivApiStub(3) as stub:
+            url = f"{stub.url}/api/query?max_results=3"
+            cassette = Cassette(str(path))
+            with cassette.record():
+                response = requests.get(url, stream=True)
+                recorded_body = response.raw.read()
+            cassette.save()
+        
+        with Cassette.load(str(path)).replay():
+            response = requests.get(url, stream=True)
+            assert response.raw.read() == recorded_body
+        assert recorded_body.count(b"<entry>") == 3
+    
+    def test_recorded_error_is_replayed(self, tmp_path):
+        path = tmp_path / "error.cassette"
+        cassette = Cassette(str(path))
+        with cassette.record():
+            with pytest.raises(requests.ConnectionError):
+                requests.get("http://127.0.0.1:9/unreachable", timeout=1)
+        cassette.save()
+        
+        with Cassette.load(str(path)).replay():
+            with pytest.raises(requests.ConnectionError, match="Recorded error"):
+                requests.get("http://127.0.0.1:9/unreachable", timeout=1)
+    
+    def test_replay_freezes_clock(self, tmp_path):
+        recorded_at = datetime(2026, 1, 15, 9, 30)
+        with Cassette(str(tmp_path / "empty.cassette"), recorded_at=recorded_at).replay():
+            assert clock.now() == recorded_at
+        assert clock.now() != recorded_at
+
+
+class TestCli:
+    """コマンドライン引数のテスト"""
+    
+    def test_record_and_replay_are_exclusive(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["--record", "a", "--replay", "b"])
+        args = build_parser().parse_args(["--replay", "run.cassette"])
+        assert args.replay == "run.cassette" and args.record is None
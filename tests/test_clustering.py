@@ -0,0 +1,146 @@
+"""
+トピッククラスタリングのテスト
+
+合成した論文（トピックごとに固有の語彙を持つアブストラクト）を使用
+"""
+import random
+import time
+from collections import Counter
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from src.analyzers.clustering import build_tfidf, cluster_papers, tokenize
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.notifiers.digest import group_papers
+
+TOPICS = {
+    "vision": "image segmentation detection pixel convolutional camera object scene depth video visual".split(),
+    "language": "language token translation text sentence corpus dialogue question prompt lexical parsing".split(),
+    "robotics": "robot manipulation grasping locomotion control trajectory actuator navigation gripper torque".split(),
+    "graphs": "graph node edge message molecule link community spectral vertex subgraph neighbor topology".split(),
+    "speech": "speech audio acoustic speaker waveform phoneme spectrogram voice prosody utterance microphone".split(),
+}
+COMMON = [f"common{i}" for i in range(300)]
+
+
+def _papers(count: int, seed: int = 0):
+    """トピックを順番に割り当てた論文と、論文ID → 正解トピックの対応を生成"""
+    rng = random.Random(seed)
+    names = list(TOPICS)
+    papers, truth = [], {}
+    for index in range(count):
+        topic = names[index % len(names)]
+        words = [rng.choice(TOPICS[topic]) if rng.random() < 0.35 else rng.choice(COMMON) for _ in range(120)]
+        paper = PaperResult(
+            id=str(index),
+            title=" ".join(rng.sample(TOPICS[topic], 3)).title(),
+            authors="John Doe",
+            abstract=" ".join(words) + ".",
+            url=f"http://arxiv.org/abs/2601.{index:05d}v1",
+            published="2026-01-01T00:00:00",
+            source="arXiv"
+        )
+        papers.append(paper)
+        truth[paper.id] = topic
+    return papers, truth
+
+
+class TestTfidf:
+    """TF-IDFのテスト"""
+    
+    def test_tokenize_drops_stopwords(self):
+        assert tokenize("We propose a Novel graph-based method for GNNs in 2024") == ["graph-based", "gnns"]
+    
+    def test_rows_are_normalized(self):
+        matrix, terms = build_tfidf(["graph neural graph", "graph speech", "speech audio"], min_df=1, max_df=1.0)
+        
+        assert matrix.shape == (3, len(terms))
+        assert set(terms) == {"graph", "neural", "speech", "audio"}
+        np.testing.assert_allclose(np.sqrt(matrix.multiply(matrix).sum(axis=1)).ravel(), 1.0, rtol=1e-5)
+    
+    def test_document_frequency_filter(self):
+        _, terms = build_tfidf(["graph rare", "graph speech", "graph speech", "audio"], min_df=2, max_df=0.6)
+        assert list(terms) == ["speech"]
+
+
+class TestClusterPapers:
+    """クラスタリングのテスト"""
+    
+    def test_recovers_topics(self):
+        papers, truth = _papers(200)
+        clusters = cluster_papers(papers, n_clusters=5)
+        
+        assert len(clusters) == 5
+        assert sum(len(cluster.papers) for cluster in clusters) == 200
+        for cluster in clusters:
+            topic, count = Counter(truth[p.id] for p in cluster.papers).most_common(1)[0]
+            assert count / len(cluster.papers) > 0.9
+            assert set(cluster.terms) <= set(TOPICS[topic])
+            assert cluster.representative is cluster.papers[0]
+            assert all(p.topic == cluster.label for p in cluster.papers)
+    
+    def test_automatic_cluster_count(self):
+        papers, _ = _papers(50)
+        clusters = cluster_papers(papers)
+        assert 2 <= len(clusters) <= 5
+    
+    def test_small_inputs(self):
+        assert cluster_papers([]) == []
+        papers, _ = _papers(1)
+        clusters = cluster_papers(papers)
+        
+        assert len(clusters) == 1
+        assert clusters[0].representative is papers[0]
+        assert papers[0].topic == clusters[0].label
+    
+    def test_clusters_5000_abstracts_quickly(self):
+        papers, _ = _papers(5000)
+        started = time.perf_counter()
+        clusters = cluster_papers(papers)
+        elapsed = time.perf_counter() - started
+        
+        assert sum(len(cluster.papers) for cluster in clusters) == 5000
+        assert elapsed < 5
+    
+    def test_digest_groups_by_topic(self):
+        papers, _ = _papers(20)
+        clusters = cluster_papers(papers, n_clusters=5)
+        groups = group_papers(papers, "topic")
+        
+        assert set(groups) == {cluster.label for cluster in clusters}
+
+
+class TestBotClustering:
+    """ResearchPaperBotのクラスタリング統合のテスト"""
+    
+    def _bot(self):
+        summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda paper: paper))
+        return ResearchPaperBot(dry_run=True, collector=Mock(), summarizer=summarizer, triage=False, cluster=True)
+    
+    def test_representatives_only(self):
+        papers, _ = _papers(40)
+        bot = self._bot()
+        with patch('src.main.config') as mock_config:
+            mock_config.TOPIC_CLUSTERS = 5
+            mock_config.TOPIC_REPRESENTATIVES_ONLY = True
+            processed = bot.process_papers(papers)
+        
+        assert len(processed) == 40
+        assert bot.summarizer.summarize.call_count == 5
+        # クラスタごとにまとめて並び、先頭が代表論文
+        topics = [paper.topic for paper in processed]
+        assert len({topic for topic in topics}) == 5
+        assert sorted(topics, key=topics.index) == topics
+    
+    def test_all_papers_summarized_by_default(self):
+        papers, _ = _papers(10)
+        bot = self._bot()
+        with patch('src.main.config') as mock_config:
+            mock_config.TOPIC_CLUSTERS = 0
+            mock_config.TOPIC_REPRESENTATIVES_ONLY = False
+            processed = bot.process_papers(papers)
+        
+        assert bot.summarizer.summarize.call_count == 10
+        assert {p.id for p in processed} == {p.id for p in papers}
@@ -0,0 +1,179 @@
+"""
+コレクターのレジストリと複数ソースの並行収集のテスト
+
+モックのコレクターを使用（外部サービスへの接続なし）
+"""
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.collectors.arxiv_collector import ArxivCollector
+from src.collectors.base import PaperCollector, dedup_keys, extract_arxiv_id
+from src.collectors.registry import (
+    MultiSourceCollector,
+    available_collectors,
+    build_collector,
+    create_collector,
+    merge_papers,
+)
+from src.collectors.scholar_collector import SemanticScholarCollector
+from src.models import PaperResult
+from tests.helpers import make_paper
+
+
+def _paper(paper_id: str, title: str, published: str, source: str = "arXiv") -> PaperResult:
+    return make_paper(id=paper_id, title=title, abstract="Abstract", published=published, source=source)
+
+
+class FakeCollector:
+    """指定した遅延の後に論文を返す（または例外を送出する）コレクター"""
+    
+    def __init__(self, papers=None, delay: float = 0.0, error: Exception = None):
+        self.papers = papers or []
+        self.delay = delay
+        self.error = error
+        self.released = threading.Event()
+    
+    def collect_recent_papers(self, days: int = 1):
+        self.released.wait(self.delay)
+        if self.error:
+            raise self.error
+        return self.papers
+
+
+class TestBase:
+    """共通インターフェースのテスト"""
+    
+    def test_collectors_satisfy_protocol(self):
+        assert isinstance(ArxivCollector("cat:cs.AI"), PaperCollector)
+        assert isinstance(SemanticScholarCollector("ml", api_key=""), PaperCollector)
+        assert isinstance(MultiSourceCollector({"fake": FakeCollector()}), PaperCollector)
+    
+    def test_extract_arxiv_id(self):
+        assert extract_arxiv_id("http://arxiv.org/abs/2401.00001v3") == "2401.00001"
+        assert extract_arxiv_id("https://www.semanticscholar.org/paper/abc") is None
+    
+    def test_dedup_keys_normalize_title(self):
+        paper = _paper("http://arxiv.org/abs/2401.00001v1", "Attention Is  All You Need!", "")
+        assert dedup_keys(paper) == ["arxiv:2401.00001", "title:attention is all you need"]
+
+
+class TestRegistry:
+    """レジストリのテスト"""
+    
+    def test_builtin_collectors_are_registered(self):
+        assert {"arxiv", "semantic_scholar"} <= set(available_collectors())
+    
+    def test_unknown_collector(self):
+        with pytest.raises(ValueError, match="Unknown collector: nope"):
+            create_collector("nope")
+    
+    def test_build_single_collector(self):
+        with patch('src.collectors.registry.config') as mock_config:
+            mock_config.ENABLED_COLLECTORS = "arxiv"
+            mock_config.ARXIV_SEARCH_QUERY = "cat:cs.AI"
+            mock_config.MAX_PAPERS_PER_DAY = 3
+            collector = build_collector()
+        
+        assert isinstance(collector, ArxivCollector)
+        assert collector.max_results == 3
+    
+    def test_build_multiple_collectors(self):
+        with patch('src.collectors.registry.config') as mock_config:
+            mock_config.ENABLED_COLLECTORS = "arxiv, semantic_scholar"
+            mock_config.COLLECTOR_TIMEOUT = 15.0
+            collector = build_collector()
+        
+        assert isinstance(collector, MultiSourceCollector)
+        assert list(collector.collectors) == ["arxiv", "semantic_scholar"]
+        assert collector.timeout == 15.0
+
+
+class TestMergePapers:
+    """マージのテスト"""
+    
+    def test_merge_sorts_and_deduplicates(self):
+        arxiv = [
+            _paper("http://arxiv.org/abs/2401.00002v1", "Second", "2024-01-02T00:00:00"),
+            _paper("http://arxiv.org/abs/2401.00001v1", "First", "2024-01-01T00:00:00"),
+        ]
+        scholar = [
+            _paper("s2-a", "second", "2024-01-02T00:00:00", source="Semantic Scholar"),
+            _paper("s2-b", "Third", "2024-01-03T00:00:00", source="Semantic Scholar"),
+        ]
+        merged = merge_papers([arxiv, scholar])
+        
+        assert [p.title for p in merged] == ["Third", "Second", "First"]
+        assert merged[1].source == "arXiv"
+    
+    def test_merge_sorts_mixed_date_formats(self):
+        """ソースごとに形式の異なる公開日を日時として比較すること"""
+        papers = [
+            _paper("iso", "ISO", "2024-01-02T09:00:00"),
+            _paper("offset", "Offset", "2024-01-03T06:00:00+09:00"),
+            _paper("date", "Date only", "2024-01-03", source="Semantic Scholar"),
+            _paper("year", "Year only", "2023", source="Semantic Scholar"),
+            _paper("rss", "RSS", "Wed, 03 Jan 2024 12:00:00 +0000"),
+            _paper("empty", "Empty", ""),
+        ]
+        merged = merge_papers([papers])
+        
+        assert [p.id for p in merged] == ["rss", "date", "offset", "iso", "year", "empty"]
+    
+    def test_merge_max_results(self):
+        papers = [_paper(str(i), f"Paper {i}", f"2024-01-0{i}T00:00:00") for i in range(1, 5)]
+        assert [p.id for p in merge_papers([papers], max_results=2)] == ["4", "3"]
+
+
+class TestMultiSourceCollector:
+    """並行収集のテスト"""
+    
+    def test_sources_run_concurrently(self):
+        """所要時間がソースの遅延の合計ではなく最大値になること"""
+        collectors = {
+            f"source{i}": FakeCollector([_paper(str(i), f"Paper {i}", "2024-01-01")], delay=0.3)
+            for i in range(3)
+        }
+        started = time.monotonic()
+        papers = MultiSourceCollector(collectors, timeout=5).collect_recent_papers(days=1)
+        elapsed = time.monotonic() - started
+        
+        assert len(papers) == 3
+        assert elapsed < 0.8
+    
+    def test_slow_source_times_out(self):
+        slow = FakeCollector([_paper("slow", "Slow", "2024-01-01")], delay=10)
+        fast = FakeCollector([_paper("fast", "Fast", "2024-01-01")])
+        collector = MultiSourceCollector({"slow": slow, "fast": fast}, timeout=5, timeouts={"slow": 0.2})
+        
+        started = time.monotonic()
+        papers = collector.collect_recent_papers(days=1)
+        elapsed = time.monotonic() - started
+        slow.released.set()
+        
+        assert [p.id for p in papers] == ["fast"]
+        assert elapsed < 2
+        assert collector.last_report["slow"]["error"] == "timeout"
+        assert collector.last_report["fast"]["papers"] == 1
+    
+    def test_failing_source_is_skipped(self):
+        collectors = {
+            "broken": FakeCollector(error=Exception("boom")),
+            "ok": FakeCollector([_paper("ok", "Ok", "2024-01-01")]),
+        }
+        collector = MultiSourceCollector(collectors)
+        
+        assert [p.id for p in collector.collect_recent_papers()] == ["ok"]
+        assert collector.last_report["broken"]["error"] == "boom"
+    
+    def test_all_sources_failing_raises(self):
+        collector = MultiSourceCollector({"broken": FakeCollector(error=Exception("boom"))})
+        with pytest.raises(RuntimeError, match="All collectors failed"):
+            collector.collect_recent_papers()
+    
+    def test_days_is_passed_to_sources(self):
+        source = Mock(collect_recent_papers=Mock(return_value=[]))
+        MultiSourceCollector({"mock": source}).collect_recent_papers(days=7)
+        source.collect_recent_papers.assert_called_once_with(days=7)
@@ -0,0 +1,246 @@
+"""
+常駐モード（PaperDaemon）のテスト
+
+モックのコレクター・Botを使用（外部サービスへの接続なし）
+"""
+import json
+import threading
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+
+from src.daemon import PaperDaemon, QuerySchedule, SeenPapers, parse_query_schedules
+from tests.helpers import make_paper
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_bot():
+    bot = Mock()
+    bot.process_papers.side_effect = lambda papers: papers
+    bot.notify_papers.side_effect = lambda papers: [True] * len(papers)
+    bot.deferred_papers = []
+    return bot
+
+
+def _daemon(mock_bot, collectors, schedules, clock=None, **kwargs):
+    return PaperDaemon(
+        mock_bot,
+        schedules,
+        collector_factory=lambda query: collectors[query],
+        clock=clock or FakeClock(),
+        **kwargs
+    )
+
+
+class TestParseQuerySchedules:
+    """スケジュール指定のパーステスト"""
+
+    def test_parse_multiple_queries(self):
+        schedules = parse_query_schedules("cat:cs.AI@900; cat:cs.LG", "unused", 60)
+        assert [(s.query, s.interval) for s in schedules] == [("cat:cs.AI", 900.0), ("cat:cs.LG", 60.0)]
+
+    def test_parse_empty_uses_default_query(self):
+        schedules = parse_query_schedules("", "cat:cs.AI OR cat:cs.LG", 300)
+        assert [(s.query, s.interval) for s in schedules] == [("cat:cs.AI OR cat:cs.LG", 300.0)]
+
+    def test_parse_invalid_interval(self):
+        with pytest.raises(ValueError, match="Poll interval must be positive"):
+            parse_query_schedules("cat:cs.AI@0", "unused", 60)
+
+
+class TestSeenPapers:
+    """処理済みID集合のテスト"""
+
+    def test_add_reports_new_ids(self):
+        seen = SeenPapers(max_size=10)
+        assert seen.add("a") is True
+        assert seen.add("a") is False
+        assert "a" in seen
+
+    def test_size_is_bounded(self):
+        seen = SeenPapers(max_size=3)
+        for paper_id in "abcde":
+            seen.add(paper_id)
+        assert len(seen) == 3
+        assert "a" not in seen
+        assert "e" in seen
+
+    def test_persisted_across_restarts(self, tmp_path):
+        path = str(tmp_path / "seen.json")
+        seen = SeenPapers(max_size=3, path=path)
+        for paper_id in ["a", "b", "c", "d"]:
+            seen.add(paper_id)
+        seen.save()
+
+        restored = SeenPapers(max_size=2, path=path)
+        assert "d" in restored and "c" in restored and "b" not in restored
+        assert list(tmp_path.iterdir()) == [tmp_path / "seen.json"]
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        path = tmp_path / "seen.json"
+        path.write_text("{broken", encoding="utf-8")
+        assert len(SeenPapers(path=str(path))) == 0
+
+
+class TestPaperDaemon:
+    """PaperDaemonのテスト"""
+
+    def test_run_query_processes_only_new_papers(self, mock_bot):
+        collector = Mock()
+        collector.collect_recent_papers.side_effect = [
+            [make_paper(id="1"), make_paper(id="2")],
+            [make_paper(id="2"), make_paper(id="3")],
+        ]
+        schedule = QuerySchedule("cat:cs.AI", interval=60)
+        daemon = _daemon(mock_bot, {"cat:cs.AI": collector}, [schedule])
+
+        assert daemon.run_query(schedule) == 2
+        assert daemon.run_query(schedule) == 1
+        assert [p.id for p in mock_bot.process_papers.call_args.args[0]] == ["3"]
+        assert daemon.papers_processed == 3
+
+    def test_failed_notification_is_retried(self, mock_bot):
+        collector = Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1"), make_paper(id="2")]))
+        mock_bot.notify_papers.side_effect = [[True, False], [True]]
+        schedule = QuerySchedule("q", interval=60)
+        daemon = _daemon(mock_bot, {"q": collector}, [schedule])
+
+        assert daemon.run_query(schedule) == 1
+        assert "1/2" in daemon.health()["queries"][0]["last_error"]
+        assert "1" in daemon.seen and "2" not in daemon.seen
+        # 通知済みの論文は再送せず、失敗した論文のみ再度処理する
+        assert daemon.run_query(schedule) == 1
+        assert [p.id for p in mock_bot.process_papers.call_args.args[0]] == ["2"]
+        assert daemon.health()["queries"][0]["last_error"] is None
+
+    def test_failed_send_with_single_webhook_is_retried(self, tmp_path, monkeypatch):
+        from src.main import ResearchPaperBot
+
+        monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+        notifier = Mock(concurrent=False)
+        notifier.send_paper_summary.side_effect = [True, False, True]
+        bot = ResearchPaperBot(
+            collector=Mock(),
+            summarizer=Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda p: p)),
+            notifier=notifier,
+            full_text=False,
+            triage=False,
+            cluster=False,
+            watchlist=None
+        )
+        collector = Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1"), make_paper(id="2")]))
+        schedule = QuerySchedule("q", interval=60)
+        daemon = _daemon(bot, {"q": collector}, [schedule])
+
+        assert daemon.run_query(schedule) == 1
+        assert "1" in daemon.seen and "2" not in daemon.seen
+        assert daemon.run_query(schedule) == 1
+        sent = [call.args[0].id for call in notifier.send_paper_summary.call_args_list]
+        assert sent == ["1", "2", "2"]
+
+    def test_seen_papers_survive_restart(self, mock_bot, tmp_path):
+        collector = Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1")]))
+        seen_path = str(tmp_path / "seen.json")
+        schedule = QuerySchedule("q", interval=60)
+        assert _daemon(mock_bot, {"q": collector}, [schedule], seen_path=seen_path).run_query(schedule) == 1
+
+        restarted = _daemon(mock_bot, {"q": collector}, [schedule], seen_path=seen_path)
+        assert restarted.run_query(schedule) == 0
+        mock_bot.notify_papers.assert_called_once()
+
+    def test_run_query_profiles_collection(self, mock_bot, tmp_path):
+        from src.profiling import StageProfiler
+
+        collector = Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1")]))
+        schedule = QuerySchedule("cat:cs.AI", interval=60)
+        profiler = StageProfiler(str(tmp_path), cpu=True)
+        daemon = _daemon(mock_bot, {"cat:cs.AI": collector}, [schedule], profiler=profiler)
+
+        daemon.run_query(schedule)
+        daemon.run_query(schedule)
+
+        assert profiler.calls == {"collect_papers": 2}
+        assert (profiler.output_dir / "collect_papers-0002.txt").exists()
+
+    def test_papers_are_deduplicated_across_queries(self, mock_bot):
+        collectors = {
+            "q1": Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1")])),
+            "q2": Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1")])),
+        }
+        schedules = [QuerySchedule("q1", 60), QuerySchedule("q2", 60)]
+        daemon = _daemon(mock_bot, collectors, schedules)
+
+        assert daemon.run_pending() == 1
+        mock_bot.notify_papers.assert_called_once()
+
+    def test_each_query_runs_on_its_own_interval(self, mock_bot):
+        clock = FakeClock()
+        collectors = {
+            "fast": Mock(collect_recent_papers=Mock(return_value=[])),
+            "slow": Mock(collect_recent_papers=Mock(return_value=[])),
+        }
+        schedules = [QuerySchedule("fast", 60), QuerySchedule("slow", 600)]
+        daemon = _daemon(mock_bot, collectors, schedules, clock=clock)
+
+        daemon.run_pending()
+        assert daemon.seconds_until_next_run() == 60
+        for _ in range(3):
+            clock.now += 60
+            daemon.run_pending()
+
+        assert collectors["fast"].collect_recent_papers.call_count == 4
+        assert collectors["slow"].collect_recent_papers.call_count == 1
+
+    def test_collector_failure_is_recorded_and_retried(self, mock_bot):
+        collector = Mock()
+        collector.collect_recent_papers.side_effect = [Exception("arXiv down"), [make_paper(id="1")]]
+        schedule = QuerySchedule("q", 60)
+        daemon = _daemon(mock_bot, {"q": collector}, [schedule])
+
+        assert daemon.run_query(schedule) == 0
+        assert daemon.health()["queries"][0]["last_error"] == "arXiv down"
+        assert daemon.run_query(schedule) == 1
+        assert daemon.health()["queries"][0]["last_error"] is None
+
+    def test_run_forever_stops_gracefully(self, mock_bot):
+        collector = Mock(collect_recent_papers=Mock(return_value=[]))
+        daemon = PaperDaemon(
+            mock_bot,
+            [QuerySchedule("q", 3600)],
+            collector_factory=lambda query: collector
+        )
+        thread = threading.Thread(target=daemon.run_forever)
+        thread.start()
+        daemon.stop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert daemon.health()["status"] == "stopping"
+
+    def test_health_endpoint(self, mock_bot):
+        collector = Mock(collect_recent_papers=Mock(return_value=[make_paper(id="1")]))
+        daemon = _daemon(mock_bot, {"q": collector}, [QuerySchedule("q", 60)], health_port=0)
+        daemon._health.host = "127.0.0.1"
+        daemon.run_pending()
+        daemon._health.start()
+        try:
+            host, port = daemon._health.address
+            with urllib.request.urlopen(f"http://{host}:{port}/health", timeout=5) as response:
+                status = json.loads(response.read())
+        finally:
+            daemon._health.stop()
+
+        assert status["status"] == "ok"
+        assert status["papers_processed"] == 1
+        assert status["queries"][0]["query"] == "q"
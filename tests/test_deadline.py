@@ -0,0 +1,279 @@
+"""
+実行の締め切り（--deadline）と優先度順の要約・次回への繰り越しのテスト
+"""
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src import deadline as deadlines
+from src.deadline import Deadline, DeadlineExceeded, DeferredPapers, parse_duration, priority_order
+from src.main import ResearchPaperBot, main
+from src.models import PaperResult
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from tests.helpers import make_paper
+
+
+class FakeClock:
+    """手動で進める単調時計"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _paper(index: int, score=None, published="2026-01-01T00:00:00", watched=None) -> PaperResult:
+    return make_paper(index, published=published, relevance_score=score, watched_authors=watched or [])
+
+
+def _bot(papers, summarize, deadline=None, dry_run=True, notifier=None) -> ResearchPaperBot:
+    collector = Mock()
+    collector.collect_recent_papers.return_value = papers
+    summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=summarize))
+    return ResearchPaperBot(
+        dry_run=dry_run,
+        collector=collector,
+        summarizer=summarizer,
+        notifier=notifier,
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=None,
+        deadline=deadline
+    )
+
+
+@pytest.fixture
+def deferred_file(tmp_path, monkeypatch):
+    path = tmp_path / "deferred.json"
+    monkeypatch.setenv("DEFERRED_FILE", str(path))
+    monkeypatch.setenv("DEADLINE_NOTIFY_RESERVE", "60")
+    return path
+
+
+class TestDeadline:
+    """Deadlineとparse_durationのテスト"""
+    
+    @pytest.mark.parametrize("value, seconds", [
+        ("900", 900), ("45s", 45), ("25m", 1500), ("1h30m", 5400), ("1h", 3600), ("1.5m", 90), (" 2M ", 120)
+    ])
+    def test_parse_duration(self, value, seconds):
+        assert parse_duration(value) == seconds
+    
+    @pytest.mark.parametrize("value", ["", "0", "abc", "10x", "m", "-5"])
+    def test_parse_duration_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_duration(value)
+    
+    def test_request_timeout_shrinks_as_deadline_approaches(self):
+        clock = FakeClock()
+        deadline = Deadline(100, clock=clock)
+        assert deadline.timeout(60) == 60
+        
+        clock.advance(70)
+        assert deadline.remaining() == 30
+        assert deadline.timeout(60) == 30
+        assert deadline.timeout(60, reserve=20) == 10
+        
+        clock.advance(29.9)
+        assert deadline.timeout(60) == deadlines.MIN_REQUEST_TIMEOUT
+        clock.advance(1)
+        assert deadline.expired
+        with pytest.raises(DeadlineExceeded):
+            deadline.check()
+    
+    def test_reserve(self):
+        clock = FakeClock()
+        stage = Deadline(100, clock=clock).reserve(60)
+        assert stage.remaining() == 40
+        clock.advance(40)
+        assert stage.expired
+    
+    def test_module_timeout_uses_active_deadline(self):
+        clock = FakeClock()
+        deadline = Deadline(20, clock=clock)
+        assert deadlines.timeout(60) == 60
+        with deadlines.active(deadline):
+            assert deadlines.current() is deadline
+            assert deadlines.timeout(60) == 20
+            clock.advance(20)
+            with pytest.raises(DeadlineExceeded):
+                deadlines.timeout(60)
+        assert deadlines.current() is None
+        assert deadlines.timeout(60) == 60
+    
+    def test_priority_order(self):
+        papers = [
+            _paper(1, score=0.5, published="2026-01-03T00:00:00"),
+            _paper(2, score=None, published="2026-01-05T00:00:00"),
+            _paper(3, score=0.9, published="2026-01-01T00:00:00"),
+            _paper(4, score=0.5, published="2026-01-04T00:00:00"),
+            _paper(5, score=None, published="2026-01-02T00:00:00", watched=["John Doe"]),
+        ]
+        assert [paper.title for paper in priority_order(papers)] == [
+            "Paper 5", "Paper 3", "Paper 4", "Paper 1", "Paper 2"
+        ]
+    
+    def test_deferred_papers_file(self, tmp_path):
+        deferred = DeferredPapers(str(tmp_path / "deferred.json"))
+        assert deferred.load() == []
+        
+        papers = [_paper(1, score=0.7), _paper(2)]
+        papers[1].summary = "要約"
+        deferred.save(papers)
+        assert deferred.load() == papers
+        
+        deferred.save([])
+        assert not deferred.path.exists()
+        
+        deferred.path.write_text("{broken", encoding="utf-8")
+        assert deferred.load() == []
+
+
+class TestDeadlineRun:
+    """締め切り付きの実行のテスト"""
+    
+    def test_summarizes_by_priority_and_defers_the_rest(self, deferred_file):
+        clock = FakeClock()
+        summarized = []
+        
+        def slow_summarize(paper):
+            clock.advance(15)
+            summarized.append(paper.title)
+            paper.summary = f"summary of {paper.title}"
+            return paper
+        
+        papers = [_paper(i, score=i / 10) for i in range(1, 6)]
+        bot = _bot(papers, slow_summarize, deadline=Deadline(100, clock=clock))
+        notify = Mock(wraps=bot.notify_papers)
+        bot.notify_papers = notify
+        
+        assert bot.run(days=1)
+        
+        # 通知のために60秒を残し、関連度の高い順に40秒分だけ要約する
+        assert summarized == ["Paper 5", "Paper 4", "Paper 3"]
+        notified = notify.call_args.args[0]
+        assert sorted(paper.title for paper in notified) == ["Paper 3", "Paper 4", "Paper 5"]
+        saved = json.loads(deferred_file.read_text(encoding="utf-8"))
+        assert [item["title"] for item in saved] == ["Paper 2", "Paper 1"]
+        
+        # 次回の実行では繰り越した論文を今回の新着より先に処理する
+        summarized.clear()
+        next_bot = _bot([_paper(9, score=0.95)], slow_summarize)
+        assert next_bot.run(days=1)
+        assert summarized[:2] == ["Paper 2", "Paper 1"] and "Paper 9" in summarized
+        assert not deferred_file.exists()
+    
+    def test_request_cut_off_by_deadline_is_deferred(self, deferred_file):
+        clock = FakeClock()
+        
+        def timed_out(paper):
+            clock.advance(50)
+            raise TimeoutError("request timed out")
+        
+        bot = _bot([_paper(1, score=0.9), _paper(2, score=0.1)], timed_out, deadline=Deadline(100, clock=clock))
+        notify = Mock(return_value=[])
+        bot.notify_papers = notify
+        
+        assert bot.run(days=1)
+        
+        # 要約なしで通知せず、次回に回す
+        assert notify.call_args.args[0] == []
+        assert [paper.title for paper in DeferredPapers(str(deferred_file)).load()] == ["Paper 1", "Paper 2"]
+    
+    def test_unsent_notifications_keep_their_summaries(self, deferred_file):
+        clock = FakeClock()
+        notifier = Mock()
+        notifier.send_paper_summary.side_effect = lambda paper: clock.advance(40)
+        
+        def summarize(paper):
+            paper.summary = f"summary of {paper.title}"
+            return paper
+        
+        papers = [_paper(i, score=i / 10) for i in range(1, 5)]
+        bot = _bot(papers, summarize, deadline=Deadline(100, clock=clock), dry_run=False, notifier=notifier)
+        bot.notify_mode = "embed"
+        
+        assert bot.run(days=1)
+        
+        assert notifier.send_paper_summary.call_count == 3
+        deferred = DeferredPapers(str(deferred_file)).load()
+        assert len(deferred) == 1 and deferred[0].summary == f"summary of {deferred[0].title}"
+        
+        # 要約済みの論文は次回の実行で再び要約しない
+        next_summarize = Mock(side_effect=summarize)
+        next_bot = _bot([], next_summarize)
+        next_bot.notify_papers = Mock(return_value=[True])
+        assert next_bot.run(days=1)
+        next_summarize.assert_not_called()
+        assert next_bot.notify_papers.call_args.args[0] == deferred
+    
+    def test_no_deadline_keeps_previous_behaviour(self, deferred_file):
+        papers = [_paper(i) for i in range(3)]
+        bot = _bot(papers, lambda paper: paper)
+        assert bot.run(days=1)
+        assert bot.deferred_papers == [] and not deferred_file.exists()
+        assert bot.summarizer.summarize.call_count == 3
+
+
+class TestRequestTimeouts:
+    """各リクエストへの残り時間の伝播のテスト"""
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_completion_timeout_follows_deadline(self, mock_openai):
+        clock = FakeClock()
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = TimeoutError("timed out")
+        mock_openai.return_value = mock_client
+        summarizer = OpenRouterSummarizer(api_key="test_key", max_retries=3, retry_delay=10)
+        
+        with deadlines.active(Deadline(8, clock=clock)):
+            with pytest.raises(TimeoutError):
+                summarizer.complete("prompt")
+        
+        # 残り8秒では再試行の待機（10秒）中に締め切りを迎えるため、再試行しない
+        assert mock_client.chat.completions.create.call_count == 1
+        assert mock_client.chat.completions.create.call_args.kwargs["timeout"] == 8
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_expired_deadline_skips_request(self, mock_openai):
+        clock = FakeClock()
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        summarizer = OpenRouterSummarizer(api_key="test_key")
+        
+        deadline = Deadline(1, clock=clock)
+        clock.advance(2)
+        with deadlines.active(deadline):
+            with pytest.raises(DeadlineExceeded):
+                summarizer.complete("prompt")
+        mock_client.chat.completions.create.assert_not_called()
+
+
+class TestCli:
+    """コマンドラインのテスト"""
+    
+    @pytest.mark.parametrize("argv", [
+        ["--deadline", "soon"],
+        ["--deadline", "0"],
+        ["--deadline", "10m", "--daemon"],
+        ["--deadline", "10m", "--worker"],
+    ])
+    def test_invalid_deadline(self, argv):
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
+    
+    def test_deadline_is_passed_to_bot(self, monkeypatch):
+        monkeypatch.setenv("RUN_DEADLINE", "1h")
+        with patch("src.main.ResearchPaperBot") as bot_class:
+            bot_class.return_value.run.return_value = True
+            with pytest.raises(SystemExit) as excinfo:
+                main(["--dry-run", "--deadline", "25m"])
+        assert excinfo.value.code == 0
+        assert bot_class.call_args.kwargs["deadline"].seconds == 1500
@@ -0,0 +1,120 @@
+"""
+ダイジェスト通知のテスト
+
+メッセージの組み立て（Discordの制限内への詰め込み）とPaperNotifier.send_digestを確認
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from src.models import PaperResult
+from src.notifiers.digest import (
+    EMBED_DESCRIPTION_LIMIT,
+    EMBED_TOTAL_LIMIT,
+    EMBEDS_PER_MESSAGE,
+    build_digest,
+    format_digest_line,
+    group_papers,
+)
+from src.notifiers.paper_notifier import PaperNotifier
+
+
+def _papers(count: int, categories=("cs.AI", "cs.LG", "cs.CL")) -> list:
+    return [
+        PaperResult(
+            id=f"2401.{i:05d}",
+            title=f"Paper {i} on Efficient Transformers for Long Documents",
+            authors="John Doe, Jane Smith",
+            abstract="We propose a method. It works well.",
+            url=f"https://arxiv.org/abs/2401.{i:05d}",
+            published="2024-01-01T00:00:00",
+            source="arXiv",
+            categories=f"{categories[i % len(categories)]}, cs.IR",
+            summary="この論文は長文書向けの効率的なTransformerを提案している。" * 3
+        )
+        for i in range(count)
+    ]
+
+
+class TestGrouping:
+    """グループ化のテスト"""
+
+    def test_group_by_primary_category(self):
+        groups = group_papers(_papers(5), "category")
+        assert list(groups) == ["cs.AI", "cs.LG", "cs.CL"]
+        assert [len(members) for members in groups.values()] == [2, 2, 1]
+
+    def test_unknown_grouping(self):
+        with pytest.raises(ValueError, match="Unknown digest grouping"):
+            group_papers(_papers(1), "author")
+
+
+class TestBuildDigest:
+    """ダイジェスト組み立てのテスト"""
+
+    def test_format_line_uses_first_sentence(self):
+        line = format_digest_line(_papers(1)[0])
+        assert line.startswith("• [Paper 0")
+        assert "(https://arxiv.org/abs/2401.00000)" in line
+        assert line.count("提案している。") == 1
+
+    def test_empty_papers(self):
+        assert build_digest([]) == []
+
+    def test_small_digest_fits_one_message(self):
+        messages = build_digest(_papers(10))
+        assert len(messages) == 1
+        assert len(messages[0].embeds) == 3
+        assert "10件" in messages[0].content
+
+    def test_messages_respect_discord_limits(self):
+        messages = build_digest(_papers(300), max_messages=100)
+
+        lines = sum(embed["description"].count("• [") for m in messages for embed in m.embeds)
+        assert lines == 300
+        for message in messages:
+            assert len(message.embeds) <= EMBEDS_PER_MESSAGE
+            assert message.embed_chars <= EMBED_TOTAL_LIMIT
+            for embed in message.embeds:
+                assert 0 < len(embed["description"]) <= EMBED_DESCRIPTION_LIMIT
+
+    def test_message_count_grows_sublinearly(self):
+        """1論文1メッセージではなく、文字量に応じたメッセージ数になること"""
+        messages = build_digest(_papers(300), max_messages=100)
+        assert len(messages) < 300 / 10
+
+    def test_overflow_goes_to_markdown_attachment(self):
+        messages = build_digest(_papers(500), max_messages=2)
+
+        assert len(messages) == 2
+        assert messages[0].files == {}
+        attachment = messages[-1].files["digest.md"].decode("utf-8")
+        sent = sum(embed["description"].count("• [") for m in messages for embed in m.embeds)
+        assert attachment.count("### [") == 500 - sent
+        assert f"ほか{500 - sent}件" in messages[-1].content
+
+
+class TestSendDigest:
+    """PaperNotifier.send_digestのテスト"""
+
+    @patch('src.notifiers.paper_notifier.DiscordNotifier')
+    def test_send_digest_sends_each_message(self, mock_notifier_class):
+        mock_notifier = Mock()
+        mock_notifier.send_embeds.return_value = True
+        mock_notifier_class.return_value = mock_notifier
+
+        notifier = PaperNotifier("https://discord.com/api/webhooks/123/abc")
+        result = notifier.send_digest(_papers(300), max_messages=3)
+
+        assert result is True
+        assert mock_notifier.send_embeds.call_count == 3
+        last_call = mock_notifier.send_embeds.call_args
+        assert "digest.md" in last_call.kwargs["files"]
+
+    @patch('src.notifiers.paper_notifier.DiscordNotifier')
+    def test_send_digest_reports_failure(self, mock_notifier_class):
+        mock_notifier = Mock()
+        mock_notifier.send_embeds.return_value = False
+        mock_notifier_class.return_value = mock_notifier
+
+        notifier = PaperNotifier("https://discord.com/api/webhooks/123/abc")
+        assert notifier.send_digest(_papers(3)) is False
@@ -316,3 +316,41 @@ class TestDiscordNotifierTestConnection:
         result = notifier.test_connection()
         
         assert result is False
+
+
+class TestDiscordNotifierSendEmbeds:
+    """組み立て済み埋め込みの送信テスト"""
+    
+    @patch('src.notifiers.discord_notifier.DiscordWebhook')
+    def test_send_embeds_with_file(self, mock_webhook_class):
+        """複数の埋め込みと添付ファイルを1メッセージで送信"""
+        mock_webhook = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_webhook.execute.return_value = mock_response
+        mock_webhook_class.return_value = mock_webhook
+        
+        notifier = DiscordNotifier("https://discord.com/api/webhooks/123/abc")
+        result = notifier.send_embeds(
+            [{'title': 'A', 'description': 'a'}, {'title': 'B', 'description': 'b'}],
+            content="ダイジェスト",
+            files={'digest.md': b'# digest'}
+        )
+        
+        assert result is True
+        assert mock_webhook.add_embed.call_count == 2
+        mock_webhook.set_content.assert_called_once_with("ダイジェスト")
+        mock_webhook.add_file.assert_called_once_with(file=b'# digest', filename='digest.md')
+        mock_webhook.execute.assert_called_once()
+    
+    @patch('src.notifiers.discord_notifier.DiscordWebhook')
+    def test_send_embeds_http_error(self, mock_webhook_class):
+        """HTTPエラー時はFalseを返す"""
+        mock_webhook = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_webhook.execute.return_value = mock_response
+        mock_webhook_class.return_value = mock_webhook
+        
+        notifier = DiscordNotifier("https://discord.com/api/webhooks/123/abc")
+        assert notifier.send_embeds([{'title': 'A', 'description': 'a'}]) is False
@@ -0,0 +1,135 @@
+"""
+抽出要約（ExtractiveSummarizer）のテスト
+"""
+import time
+from unittest.mock import Mock
+
+import numpy as np
+
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.notifiers.digest import format_digest_line
+from src.notifiers.paper_notifier import PaperNotifier
+from src.summarizers import create_summarizer
+from src.summarizers.extractive import ExtractiveSummarizer, split_sentences, textrank
+from tests.helpers import make_paper
+
+
+ABSTRACT = (
+    "Large language models have shown remarkable capabilities in reasoning. "
+    "However, they often fail on long-horizon planning tasks, e.g. multi-step tool use. "
+    "We propose PlanFormer, a transformer that learns to decompose planning tasks into subgoals. "
+    "PlanFormer combines a subgoal generator with a learned value function over subgoals. "
+    "On three planning benchmarks, PlanFormer improves planning success rate by 23% over strong baselines. "
+    "Code is available at https://github.com/example/planformer. "
+    "We thank the anonymous reviewers for helpful comments."
+)
+
+
+def _paper(abstract: str = ABSTRACT, **kwargs) -> PaperResult:
+    return make_paper(title="PlanFormer: Learning to Plan with Subgoals", abstract=abstract, **kwargs)
+
+
+class TestSentences:
+    """文分割とスコアリングのテスト"""
+    
+    def test_split_sentences(self):
+        sentences = split_sentences(ABSTRACT)
+        assert len(sentences) == 7
+        # 略語（e.g.）の後では区切らない
+        assert sentences[1].endswith("multi-step tool use.")
+    
+    def test_short_fragments_are_merged(self):
+        assert split_sentences("This is the first sentence of it. Yes. Another full sentence here.") == [
+            "This is the first sentence of it. Yes.",
+            "Another full sentence here."
+        ]
+    
+    def test_textrank_prefers_connected_sentences(self):
+        similarity = np.array([
+            [1.0, 0.8, 0.7, 0.0],
+            [0.8, 1.0, 0.6, 0.0],
+            [0.7, 0.6, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+        scores = textrank(similarity)
+        assert abs(scores.sum() - 1.0) < 1e-6
+        assert scores[0] > scores[2] > scores[3]
+
+
+class TestExtractiveSummarizer:
+    """ExtractiveSummarizerのテスト"""
+    
+    def test_extracts_key_sentences_in_order(self):
+        sentences = ExtractiveSummarizer().extract(ABSTRACT)
+        
+        assert len(sentences) == 3
+        assert sentences == sorted(sentences, key=ABSTRACT.index)
+        assert any("PlanFormer" in sentence for sentence in sentences)
+        assert not any("reviewers" in sentence for sentence in sentences)
+    
+    def test_short_abstract_is_kept(self):
+        assert ExtractiveSummarizer().extract("Only one sentence here.") == ["Only one sentence here."]
+        assert ExtractiveSummarizer().key_points(_paper(abstract="")) is None
+    
+    def test_fast_enough_per_paper(self):
+        summarizer = ExtractiveSummarizer()
+        started = time.perf_counter()
+        for _ in range(50):
+            summarizer.key_points(_paper())
+        assert (time.perf_counter() - started) / 50 < 0.05
+    
+    def test_annotate_skips_summarized_papers(self):
+        summarized = _paper(summary="要約です。")
+        missing = _paper()
+        assert ExtractiveSummarizer().annotate([summarized, missing]) == 1
+        assert summarized.key_points is None
+        assert missing.key_points.startswith("・") and missing.key_points.count("\n") == 2
+    
+    def test_as_backend(self):
+        summarizer = create_summarizer("extractive")
+        paper = summarizer.summarize(_paper())
+        assert paper.summary.startswith("・")
+        assert summarizer.estimate_usage(paper).total_tokens == 0
+
+
+class TestFallback:
+    """要約のない論文の通知のテスト"""
+    
+    def test_embed_uses_key_points(self):
+        paper = _paper(key_points="・Point one.\n・Point two.")
+        description = PaperNotifier.paper_embed_args(paper)["description"]
+        assert "要点" in description and "・Point one." in description
+        assert ABSTRACT[:50] not in description
+        
+        paper.summary_deferred = True
+        assert "予算" in PaperNotifier.paper_embed_args(paper)["description"]
+        # ダイジェストでは要点の1文目を抜粋
+        assert format_digest_line(paper).endswith("　Point one.")
+    
+    def test_failed_summaries_are_notified_with_key_points(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+        papers = [_paper(), _paper()]
+        summarizer = Mock(usage_tracker=None, compression_stats=None)
+        summarizer.summarize.side_effect = RuntimeError("API is down")
+        notifier = Mock()
+        bot = ResearchPaperBot(
+            collector=Mock(collect_recent_papers=Mock(return_value=papers)),
+            summarizer=summarizer,
+            notifier=notifier,
+            full_text=False,
+            triage=False,
+            cluster=False,
+            watchlist=None
+        )
+        
+        assert bot.run(days=1)
+        sent = [call.args[0] for call in notifier.send_paper_summary.call_args_list]
+        assert len(sent) == 2 and all(paper.key_points for paper in sent)
+    
+    def test_fallback_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTIVE_FALLBACK", "false")
+        bot = ResearchPaperBot(dry_run=True, collector=Mock(), summarizer=Mock(usage_tracker=None), triage=False)
+        paper = _paper()
+        bot.add_key_points([paper])
+        assert paper.key_points is None
@@ -0,0 +1,217 @@
+"""
+全文要約（PDF取得・テキスト抽出・map-reduce要約）のテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.PdfStub / ChatCompletionStub）を使用（外部サービスへの接続なし）
+"""
+import tracemalloc
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.stubs import ChatCompletionStub, CompletionProfile, PdfStub
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.summarizers.base import SummarizerCapabilities
+from src.summarizers.fulltext import (
+    Chunk,
+    FullTextSummarizer,
+    PdfCache,
+    PdfFetcher,
+    iter_chunks,
+    select_chunks,
+)
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from tests.helpers import make_paper
+
+
+def _paper(paper_id: str = "http://arxiv.org/abs/2601.00001v1") -> PaperResult:
+    return make_paper(id=paper_id, title="Test  Paper", abstract="We propose a method. It works well.")
+
+
+def _summarizer(pdf_stub, completion_stub, tmp_path, **kwargs) -> FullTextSummarizer:
+    base = OpenRouterSummarizer(api_key="test-key", model="stub-model", base_url=completion_stub.base_url)
+    kwargs.setdefault("process_workers", 0)
+    return FullTextSummarizer(
+        base,
+        cache_dir=str(tmp_path / "pdf"),
+        max_pages=50,
+        chunk_tokens=400,
+        max_chunks=6,
+        workers=4,
+        pdf_url_format=pdf_stub.pdf_url_format,
+        **kwargs
+    )
+
+
+class TestIterChunks:
+    """チャンク分割のテスト"""
+    
+    def test_sections_and_references(self):
+        lines = [
+            "Title\n", "Authors\n", "1 Introduction\n", "We study trans-\n", "formers. They\n",
+            "work.\n", "2 Method\n", "Our method is simple.\n", "References\n", "[1] Someone. 2020.\n",
+        ]
+        chunks = list(iter_chunks(lines))
+        
+        assert [c.section for c in chunks] == ["Front Matter", "1 Introduction", "2 Method"]
+        assert chunks[1].text == "We study transformers. They work."
+        assert all("Someone" not in c.text for c in chunks)
+    
+    def test_respects_token_limit(self):
+        lines = ["1 Introduction"] + ["This is a sentence of eight tokens."] * 40
+        chunks = list(iter_chunks(lines, max_tokens=50))
+        
+        assert len(chunks) > 1
+        assert all(chunk.tokens <= 50 for chunk in chunks)
+        assert all(chunk.text.endswith(".") for chunk in chunks)
+    
+    def test_select_chunks_samples_evenly(self):
+        chunks = [Chunk(str(i), "text", 1) for i in range(10)]
+        assert [c.section for c in select_chunks(iter(chunks), 10, 4)] == ["0", "3", "6", "9"]
+        assert select_chunks(chunks[:3], 3, 4) == chunks[:3]
+
+
+class TestPdfFetcher:
+    """PDF取得とキャッシュのテスト"""
+    
+    def test_second_fetch_is_served_from_cache(self, tmp_path):
+        with PdfStub(page_count=2) as stub:
+            fetcher = PdfFetcher(PdfCache(str(tmp_path)))
+            url = stub.pdf_url_format.format(id="2601.00001")
+            first = fetcher.fetch(url)
+            second = fetcher.fetch(url)
+        
+        assert first == second
+        assert stub.stats["downloads"] == 1
+        assert fetcher.stats["hits"] == 1
+        assert PdfCache(str(tmp_path)).pdf_path(first).read_bytes().startswith(b"%PDF")
+    
+    def test_fetch_all_runs_concurrently(self, tmp_path):
+        with PdfStub(page_count=1, latency_ms=200, missing=["2601.99999"]) as stub:
+            fetcher = PdfFetcher(PdfCache(str(tmp_path)), max_workers=4)
+            urls = [stub.pdf_url_format.format(id=f"2601.0000{i}") for i in range(4)]
+            urls.append(stub.pdf_url_format.format(id="2601.99999"))
+            results = fetcher.fetch_all(urls)
+        
+        assert stub.stats["downloads"] == 4
+        assert results[urls[-1]] is None
+        assert all(results[url] for url in urls[:4])
+    
+    def test_oversized_pdf_is_rejected(self, tmp_path):
+        with PdfStub(page_count=2) as stub:
+            fetcher = PdfFetcher(PdfCache(str(tmp_path)), max_bytes=100)
+            with pytest.raises(ValueError, match="exceeds"):
+                fetcher.fetch(stub.pdf_url_format.format(id="2601.00001"))
+        assert not list(tmp_path.rglob("*.pdf"))
+
+
+class TestFullTextSummarizer:
+    """map-reduce要約のテスト"""
+    
+    def test_map_reduce(self, tmp_path):
+        with PdfStub(page_count=6) as pdf_stub, \
+                ChatCompletionStub(CompletionProfile(latency_ms=0), keep_prompts=True) as completion_stub:
+            summarizer = _summarizer(pdf_stub, completion_stub, tmp_path)
+            paper = summarizer.summarize(_paper())
+        
+        chunks = summarizer.stats["chunks"]
+        assert paper.summary
+        assert 1 < chunks <= 6
+        # チャンクごとのmap + 最終要約のreduce
+        assert completion_stub.stats["completions"] == chunks + 1
+        reduce_prompt = completion_stub.prompts[-1]
+        assert "本文の要点" in reduce_prompt
+        assert "We propose a method." in reduce_prompt
+        assert "References" not in "".join(completion_stub.prompts)
+        assert summarizer.stats["full_text"] == 1
+    
+    def test_process_pool_extraction(self, tmp_path):
+        with PdfStub(page_count=2) as pdf_stub, ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub:
+            summarizer = _summarizer(pdf_stub, completion_stub, tmp_path, process_workers=1)
+            try:
+                summarizer.prefetch([_paper()])
+            finally:
+                summarizer.close()
+        
+        assert len(list((tmp_path / "pdf").rglob("*.txt"))) == 1
+    
+    def test_prefetch_reuses_cache(self, tmp_path):
+        with PdfStub(page_count=2) as pdf_stub, ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub:
+            summarizer = _summarizer(pdf_stub, completion_stub, tmp_path)
+            papers = [_paper(f"http://arxiv.org/abs/2601.0000{i}v1") for i in range(3)]
+            summarizer.prefetch(papers)
+            for paper in papers:
+                summarizer.summarize(paper)
+        
+        assert pdf_stub.stats["downloads"] == 3
+        assert summarizer.fetcher.stats["hits"] == 3
+    
+    def test_capabilities_follow_wrapped_summarizer(self, tmp_path):
+        base = OpenRouterSummarizer(api_key="test-key", model="stub-model", max_concurrency=3)
+        summarizer = FullTextSummarizer(base, cache_dir=str(tmp_path), workers=1, process_workers=0)
+        assert summarizer.capabilities == SummarizerCapabilities(max_concurrency=3, max_batch_size=1)
+    
+    def test_bot_closes_summarizer_after_run(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FULLTEXT_CACHE_DIR", str(tmp_path))
+        bot = ResearchPaperBot(
+            dry_run=True,
+            collector=Mock(collect_recent_papers=Mock(return_value=[])),
+            summarizer=Mock(usage_tracker=None),
+            full_text=True,
+            triage=False,
+            cluster=False,
+            watchlist=None
+        )
+        assert isinstance(bot.summarizer, FullTextSummarizer)
+        bot.summarizer.fetcher.get_session()
+        
+        assert bot.run(days=1)
+        assert bot.summarizer.fetcher._session is None
+    
+    def test_falls_back_to_abstract_without_pdf(self, tmp_path):
+        base = Mock(summarize=Mock(side_effect=lambda paper: paper))
+        summarizer = FullTextSummarizer(base, cache_dir=str(tmp_path), workers=1, process_workers=0)
+        paper = _paper("https://www.semanticscholar.org/paper/abc")
+        
+        assert summarizer.summarize(paper) is paper
+        base.summarize.assert_called_once_with(paper)
+        base.complete.assert_not_called()
+        assert summarizer.stats["fallbacks"] == 1
+    
+    def test_falls_back_when_download_fails(self, tmp_path):
+        with PdfStub(missing=["2601.99999"]) as pdf_stub, \
+                ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub:
+            summarizer = _summarizer(pdf_stub, completion_stub, tmp_path)
+            paper = summarizer.summarize(_paper("http://arxiv.org/abs/2601.99999v1"))
+        
+        assert paper.summary
+        assert completion_stub.stats["completions"] == 1
+        assert summarizer.stats["fallbacks"] == 1
+    
+    def test_memory_is_bounded_for_long_papers(self, tmp_path):
+        """50ページの論文でもピークメモリがPDFサイズに比例して増えないこと
+        
+        テキスト抽出はプロセスプールで実行するため、計測対象はダウンロードとチャンク分割・要約
+        """
+        def peak_for(page_count: int) -> int:
+            with PdfStub(page_count=page_count) as pdf_stub, \
+                    ChatCompletionStub(CompletionProfile(latency_ms=0)) as completion_stub:
+                summarizer = _summarizer(pdf_stub, completion_stub, tmp_path / str(page_count), process_workers=1)
+                summarizer.summarizer._get_client()
+                # スタブ側のPDF生成は計測から除外
+                pdf_stub.pdf_for("2601.00001")
+                tracemalloc.start()
+                try:
+                    summarizer.summarize(_paper())
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                    summarizer.close()
+            assert summarizer.stats["chunks"] == 6
+            return peak
+        
+        # 初回のみ発生するモジュールのインポートなどを計測から除外
+        peak_for(5)
+        small = peak_for(5)
+        large = peak_for(50)
+        assert large < small * 2
@@ -0,0 +1,145 @@
+"""
+arXiv APIレスポンスキャッシュのテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.ArxivApiStub）を使用（外部サービスへの接続なし）
+"""
+import os
+import time
+
+import arxiv
+
+from benchmarks.stubs import ArxivApiStub
+from src.collectors.arxiv_collector import ArxivCollector
+from src.collectors.http_cache import CachedArxivClient, HttpCache, normalize_url
+
+
+def _collector(stub, cache, delay_seconds=0.0, page_size=10, max_results=25):
+    client = CachedArxivClient(cache, page_size=page_size, delay_seconds=delay_seconds, num_retries=0)
+    client.query_url_format = stub.query_url_format
+    return ArxivCollector("cat:cs.AI", max_results=max_results, client=client)
+
+
+class TestNormalizeUrl:
+    """URL正規化のテスト"""
+    
+    def test_query_order_and_case(self):
+        a = normalize_url("HTTP://Export.arXiv.org/api/query?start=0&search_query=cat:cs.AI")
+        b = normalize_url("http://export.arxiv.org/api/query?search_query=cat%3Acs.AI&start=0")
+        assert a == b
+
+
+class TestHttpCache:
+    """HttpCacheのテスト"""
+    
+    def test_put_and_get(self, tmp_path):
+        cache = HttpCache(str(tmp_path / "cache"))
+        cache.put("http://example.com/a?x=1", {"ETag": '"v1"', "Set-Cookie": "secret"}, b"body")
+        
+        entry = cache.get("http://example.com/a?x=1")
+        assert entry.body == b"body"
+        assert entry.headers == {"ETag": '"v1"'}
+        assert cache.get("http://example.com/b") is None
+    
+    def test_clear(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.put("http://example.com/a", {}, b"body")
+        cache.clear()
+        assert cache.get("http://example.com/a") is None
+    
+    def test_default_max_age_is_at_least_ttl(self, tmp_path):
+        assert HttpCache(str(tmp_path), ttl=600).max_age == 24 * 60 * 60
+        assert HttpCache(str(tmp_path), ttl=7 * 24 * 60 * 60).max_age == 7 * 24 * 60 * 60
+    
+    def test_put_prunes_stale_entries(self, tmp_path):
+        """保持期間を過ぎたエントリと書き込み途中の残骸が書き込み時に削除されること"""
+        cache = HttpCache(str(tmp_path), ttl=0, max_age=60)
+        cache.put("http://example.com/old", {}, b"old")
+        cache.put("http://example.com/fresh", {}, b"fresh")
+        orphan = tmp_path / ("0" * 64 + ".body")
+        orphan.write_bytes(b"orphan")
+        stale = time.time() - 120
+        for path in [*cache._paths("http://example.com/old"), orphan]:
+            os.utime(path, (stale, stale))
+        
+        cache.put("http://example.com/new", {}, b"new")
+        
+        assert cache.get("http://example.com/old") is None
+        assert cache.get("http://example.com/fresh").body == b"fresh"
+        assert cache.get("http://example.com/new").body == b"new"
+        assert sorted(path.suffix for path in tmp_path.iterdir()) == [".body", ".body", ".json", ".json"]
+    
+    def test_revalidated_entry_is_kept(self, tmp_path):
+        """再検証でメタデータが更新されたエントリはボディが古くても削除されないこと"""
+        cache = HttpCache(str(tmp_path), ttl=0, max_age=60)
+        entry = cache.put("http://example.com/a", {}, b"body")
+        stale = time.time() - 120
+        for path in cache._paths("http://example.com/a"):
+            os.utime(path, (stale, stale))
+        cache.touch(entry)
+        
+        assert cache.prune() == 0
+        assert cache.get("http://example.com/a").body == b"body"
+
+
+class TestCachedArxivClient:
+    """キャッシュ付きarXivクライアントのテスト"""
+    
+    def test_second_collection_is_served_from_cache(self, tmp_path):
+        cache = HttpCache(str(tmp_path), ttl=600)
+        with ArxivApiStub(25) as stub:
+            first = _collector(stub, cache).collect_recent_papers(days=1)
+            requests_after_first = stub.request_count
+            second = _collector(stub, cache).collect_recent_papers(days=1)
+        
+        assert [p.id for p in second] == [p.id for p in first]
+        assert len(first) == 25
+        assert stub.request_count == requests_after_first
+        assert cache.stats["hits"] == requests_after_first
+    
+    def test_cache_hits_skip_politeness_delay(self, tmp_path):
+        """キャッシュヒット時はリクエスト間隔の待機が発生しないこと"""
+        cache = HttpCache(str(tmp_path), ttl=600)
+        with ArxivApiStub(30) as stub:
+            _collector(stub, cache, delay_seconds=0.5, max_results=30).collect_recent_papers(days=1)
+            started = time.monotonic()
+            papers = _collector(stub, cache, delay_seconds=0.5, max_results=30).collect_recent_papers(days=1)
+            elapsed = time.monotonic() - started
+        
+        assert len(papers) == 30
+        assert elapsed < 0.3
+    
+    def test_expired_entry_is_revalidated(self, tmp_path):
+        cache = HttpCache(str(tmp_path), ttl=0)
+        with ArxivApiStub(5) as stub:
+            first = _collector(stub, cache).collect_recent_papers(days=1)
+            second = _collector(stub, cache).collect_recent_papers(days=1)
+        
+        assert [p.id for p in second] == [p.id for p in first]
+        assert stub.stats["feeds"] == 1
+        assert stub.stats["not_modified"] == 1
+        assert cache.stats["revalidated"] == 1
+    
+    def test_arxiv_client_tracks_last_request_time(self):
+        """CachedArxivClientが置き換えるarxiv.Clientの内部属性が存在すること
+        
+        arxivの更新で属性名が変わるとキャッシュヒット時にも待機が発生するため、ここで検知する
+        """
+        with ArxivApiStub(5) as stub:
+            client = arxiv.Client(page_size=10, delay_seconds=0.0, num_retries=0)
+            client.query_url_format = stub.query_url_format
+            assert client._last_request_dt is None
+            list(client.results(arxiv.Search(query="cat:cs.AI", max_results=5)))
+        
+        assert client._last_request_dt is not None
+        assert hasattr(client, "_session")
+    
+    def test_collector_uses_cache_dir(self, tmp_path):
+        collector = ArxivCollector("cat:cs.AI", cache_dir=str(tmp_path), cache_ttl=60)
+        client = collector.get_client()
+        
+        assert isinstance(client, CachedArxivClient)
+        assert client.cache.ttl == 60
+    
+    def test_cache_can_be_disabled(self):
+        client = ArxivCollector("cat:cs.AI", cache_dir="").get_client()
+        assert not isinstance(client, CachedArxivClient)
@@ -0,0 +1,367 @@
+"""
+ジョブキュー（リース / ack）とワーカーのテスト
+"""
+import multiprocessing
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.jobs import (
+    DEAD,
+    DONE,
+    LEASED,
+    NOTIFY,
+    READY,
+    SUMMARIZE,
+    JobQueue,
+    JobWorker,
+    SqliteJobQueue,
+    enqueue_papers,
+    open_queue,
+)
+from src.main import ResearchPaperBot, build_parser, main
+from src.models import PaperResult
+from src.summarizers.budget import UsageEstimate
+from tests.helpers import make_paper
+
+
+class FakeClock:
+    """テスト用に手動で進める時計"""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _paper(index: int, watched: bool = False) -> PaperResult:
+    return make_paper(index, watched_authors=["John Doe"] if watched else None)
+
+
+def _summarize(paper: PaperResult) -> PaperResult:
+    paper.summary = f"summary of {paper.title}"
+    return paper
+
+
+def _bot(summarize=_summarize, notify_mode: str = "embed") -> ResearchPaperBot:
+    summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=summarize))
+    return ResearchPaperBot(
+        dry_run=True,
+        notify_mode=notify_mode,
+        collector=Mock(),
+        summarizer=summarizer,
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=None
+    )
+
+
+def _drain_keys(path: str, delay: float, results) -> None:
+    """子プロセス: キューが空になるまでclaim → ackし、完了したキーを返す"""
+    queue = SqliteJobQueue(path)
+    keys = []
+    while True:
+        jobs = queue.claim([SUMMARIZE], worker=multiprocessing.current_process().name)
+        if not jobs:
+            break
+        time.sleep(delay)
+        for job in jobs:
+            if queue.ack(job):
+                keys.append(job.key)
+    queue.close()
+    results.put(keys)
+
+
+def _claim_and_hang(path: str, claimed) -> None:
+    """子プロセス: ジョブをclaimしたまま応答しなくなる（ワーカーの停止を再現）"""
+    queue = SqliteJobQueue(path, visibility_timeout=0.5)
+    jobs = queue.claim([SUMMARIZE], worker="doomed")
+    claimed.put(jobs[0].key)
+    time.sleep(60)
+
+
+class TestSqliteJobQueue:
+    """SqliteJobQueueのテスト"""
+    
+    def test_implements_protocol(self, tmp_path):
+        queue = open_queue(f"sqlite:///{tmp_path}/jobs.db")
+        assert isinstance(queue, SqliteJobQueue)
+        assert isinstance(queue, JobQueue)
+        queue.close()
+    
+    def test_unsupported_url(self):
+        with pytest.raises(ValueError):
+            open_queue("memcached://localhost")
+    
+    def test_enqueue_is_idempotent_per_key(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        assert queue.enqueue(SUMMARIZE, "summarize:a", {"n": 1})
+        assert not queue.enqueue(SUMMARIZE, "summarize:a", {"n": 2})
+        job, = queue.claim([SUMMARIZE], "w1")
+        assert job.payload == {"n": 1}
+        assert queue.ack(job)
+        # 完了済みのキーも再投入されない
+        assert not queue.enqueue(SUMMARIZE, "summarize:a", {"n": 3})
+        assert queue.claim([SUMMARIZE], "w1") == []
+        assert queue.counts() == {READY: 0, LEASED: 0, DONE: 1, DEAD: 0}
+    
+    def test_claim_order_and_kinds(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        queue.enqueue(SUMMARIZE, "s1", {})
+        queue.enqueue(NOTIFY, "n1", {})
+        queue.enqueue(SUMMARIZE, "s2", {}, priority=1)
+        queue.enqueue(SUMMARIZE, "s3", {})
+        
+        jobs = queue.claim([SUMMARIZE], "w1", limit=10)
+        assert [job.key for job in jobs] == ["s2", "s1", "s3"]
+        assert all(job.attempts == 1 for job in jobs)
+        assert [job.key for job in queue.claim([NOTIFY], "w1", limit=10)] == ["n1"]
+    
+    def test_leased_job_is_invisible_until_timeout(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), visibility_timeout=10, clock=clock)
+        queue.enqueue(SUMMARIZE, "s1", {})
+        first, = queue.claim([SUMMARIZE], "w1")
+        assert queue.claim([SUMMARIZE], "w2") == []
+        assert queue.counts()[LEASED] == 1
+        
+        clock.now += 11
+        assert queue.counts()[READY] == 1
+        second, = queue.claim([SUMMARIZE], "w2")
+        assert second.key == "s1" and second.attempts == 2
+        # 期限切れのリースでは完了・延長できない
+        assert not queue.ack(first)
+        assert not queue.extend(first)
+        assert queue.ack(second)
+    
+    def test_extend_keeps_lease(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), visibility_timeout=10, clock=clock)
+        queue.enqueue(SUMMARIZE, "s1", {})
+        job, = queue.claim([SUMMARIZE], "w1")
+        clock.now += 8
+        assert queue.extend(job)
+        clock.now += 8
+        assert queue.claim([SUMMARIZE], "w2") == []
+        assert queue.ack(job)
+    
+    def test_fail_retries_with_backoff_then_dead(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, retry_delay=5, clock=clock)
+        queue.enqueue(SUMMARIZE, "s1", {})
+        job, = queue.claim([SUMMARIZE], "w1")
+        assert queue.fail(job, "boom")
+        assert queue.claim([SUMMARIZE], "w1") == []
+        
+        clock.now += 5
+        job, = queue.claim([SUMMARIZE], "w1")
+        assert job.attempts == 2
+        assert queue.fail(job, "boom")
+        clock.now += 100
+        assert queue.claim([SUMMARIZE], "w1") == []
+        assert queue.counts()[DEAD] == 1
+    
+    def test_repeatedly_expired_job_becomes_dead(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), visibility_timeout=1, max_attempts=2, clock=clock)
+        queue.enqueue(SUMMARIZE, "s1", {})
+        for _ in range(2):
+            assert queue.claim([SUMMARIZE], "w1")
+            clock.now += 2
+        assert queue.claim([SUMMARIZE], "w1") == []
+        assert queue.counts()[DEAD] == 1
+    
+    def test_processes_never_claim_the_same_job(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        queue = SqliteJobQueue(path)
+        keys = [f"summarize:{i}" for i in range(60)]
+        for key in keys:
+            queue.enqueue(SUMMARIZE, key, {})
+        
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [context.Process(target=_drain_keys, args=(path, 0.002, results)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        done = [key for _ in processes for key in results.get(timeout=60)]
+        for process in processes:
+            process.join(timeout=10)
+        
+        assert sorted(done) == sorted(keys)
+        assert queue.counts() == {READY: 0, LEASED: 0, DONE: 60, DEAD: 0}
+    
+    def test_job_of_killed_process_is_reclaimed(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        queue = SqliteJobQueue(path, visibility_timeout=0.5)
+        queue.enqueue(SUMMARIZE, "summarize:a", {})
+        
+        context = multiprocessing.get_context("spawn")
+        claimed = context.Queue()
+        process = context.Process(target=_claim_and_hang, args=(path, claimed))
+        process.start()
+        assert claimed.get(timeout=60) == "summarize:a"
+        process.kill()
+        process.join(timeout=10)
+        
+        assert queue.claim([SUMMARIZE], "survivor") == []
+        time.sleep(0.6)
+        job, = queue.claim([SUMMARIZE], "survivor")
+        assert job.key == "summarize:a" and job.attempts == 2
+        assert queue.ack(job)
+
+
+class TestJobWorker:
+    """JobWorkerのテスト"""
+    
+    def test_enqueue_and_drain(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        papers = [_paper(i, watched=(i == 2)) for i in range(3)]
+        # Paper 1は要約せずに通知
+        targets = [papers[0], papers[2]]
+        assert enqueue_papers(queue, papers, targets) == 3
+        assert enqueue_papers(queue, papers, targets) == 0
+        
+        bot = _bot()
+        bot.notify_papers = Mock(side_effect=lambda batch: [True] * len(batch))
+        worker = JobWorker(bot, queue, name="w1", poll_interval=0.01)
+        worker.run(drain=True)
+        
+        notified = [call.args[0][0] for call in bot.notify_papers.call_args_list]
+        assert sorted(paper.title for paper in notified) == ["Paper 0", "Paper 1", "Paper 2"]
+        summaries = {paper.title: paper.summary for paper in notified}
+        assert summaries == {"Paper 0": "summary of Paper 0", "Paper 1": None, "Paper 2": "summary of Paper 2"}
+        assert worker.stats == {"summarized": 2, "notified": 3, "failed": 0, "lost": 0, "over_budget": 0}
+        assert queue.counts() == {READY: 0, LEASED: 0, DONE: 5, DEAD: 0}
+        # 終了時に要約器のリソースを解放する
+        bot.summarizer.close.assert_called_once()
+    
+    def test_watched_papers_are_processed_first(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        enqueue_papers(queue, [_paper(0), _paper(1, watched=True)])
+        job, = queue.claim([SUMMARIZE], "w1")
+        assert job.payload["paper"]["title"] == "Paper 1"
+    
+    def test_digest_mode_notifies_batch_at_once(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        papers = [_paper(i) for i in range(4)]
+        enqueue_papers(queue, papers, targets=[])
+        bot = _bot(notify_mode="digest")
+        bot.notify_papers = Mock(side_effect=lambda batch: [True] * len(batch))
+        
+        JobWorker(bot, queue, name="w1", notify_batch_size=10).run(drain=True)
+        
+        bot.notify_papers.assert_called_once()
+        assert len(bot.notify_papers.call_args.args[0]) == 4
+    
+    def test_failed_notification_is_retried(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), retry_delay=5, clock=clock)
+        enqueue_papers(queue, [_paper(0)], targets=[])
+        bot = _bot()
+        bot.notify_papers = Mock(side_effect=[[False], [True]])
+        worker = JobWorker(bot, queue, name="w1")
+        
+        assert worker.run_once() == 1
+        assert worker.run_once() == 0
+        clock.now += 5
+        assert worker.run_once() == 1
+        assert worker.stats["failed"] == 1 and worker.stats["notified"] == 1
+        assert queue.counts()[DONE] == 1
+    
+    def test_summary_failure_on_last_attempt_notifies_without_summary(self, tmp_path):
+        clock = FakeClock()
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, retry_delay=0, clock=clock)
+        enqueue_papers(queue, [_paper(0)])
+        bot = _bot(summarize=Mock(side_effect=RuntimeError("API error")))
+        bot.notify_papers = Mock(side_effect=lambda batch: [True] * len(batch))
+        
+        JobWorker(bot, queue, name="w1").run(drain=True)
+        
+        assert bot.summarizer.summarize.call_count == 2
+        paper, = bot.notify_papers.call_args.args[0]
+        assert paper.summary is None
+        assert queue.counts() == {READY: 0, LEASED: 0, DONE: 2, DEAD: 0}
+    
+    def test_heartbeat_extends_long_running_job(self, tmp_path):
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"), visibility_timeout=0.3)
+        enqueue_papers(queue, [_paper(0)])
+        
+        def slow_summarize(paper):
+            time.sleep(0.8)
+            # 処理中のジョブは他のワーカーから見えない
+            assert queue.claim([SUMMARIZE], "w2") == []
+            return _summarize(paper)
+        
+        worker = JobWorker(_bot(summarize=slow_summarize), queue, name="w1", heartbeat_interval=0.05)
+        worker.run_once()
+        assert worker.stats["summarized"] == 1 and worker.stats["lost"] == 0
+    
+    def test_budget_limit_notifies_abstract_only(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BUDGET_RUN_TOKENS", "500")
+        monkeypatch.setenv("BUDGET_FILE", str(tmp_path / "budget.json"))
+        queue = SqliteJobQueue(str(tmp_path / "jobs.db"))
+        enqueue_papers(queue, [_paper(i) for i in range(4)])
+        
+        def summarize(paper):
+            # 見積もりどおりの使用量を記録する
+            bot.usage.record("summary", "test/model", 100, 100, 0.1)
+            return _summarize(paper)
+        
+        bot = _bot(summarize=summarize)
+        bot.summarizer.estimate_usage = lambda paper: UsageEstimate("test/model", 100, 100)
+        bot.notify_papers = Mock(side_effect=lambda batch: [True] * len(batch))
+        worker = JobWorker(bot, queue, name="w1", batch_size=1)
+        worker.run(drain=True)
+        
+        # 2件要約した時点で残りが見積もりに足りなくなる
+        assert bot.summarizer.summarize.call_count == 2
+        assert worker.stats["summarized"] == 2 and worker.stats["over_budget"] == 2
+        notified = [call.args[0][0] for call in bot.notify_papers.call_args_list]
+        assert sorted((paper.summary is None, paper.summary_deferred) for paper in notified) == [
+            (False, False), (False, False), (True, True), (True, True)
+        ]
+        assert bot.budget.daily_spend().tokens == 400
+        assert queue.counts()[DONE] == 8
+    
+    def test_throughput_scales_with_workers(self, tmp_path):
+        def slow_summarize(paper):
+            time.sleep(0.05)
+            return _summarize(paper)
+        
+        def elapsed(workers: int) -> float:
+            queue = SqliteJobQueue(str(tmp_path / f"jobs-{workers}.db"))
+            enqueue_papers(queue, [_paper(i) for i in range(16)])
+            bots = [_bot(summarize=slow_summarize) for _ in range(workers)]
+            threads = [
+                threading.Thread(target=JobWorker(bot, queue, name=f"w{i}", kinds=[SUMMARIZE]).run, kwargs={"drain": True})
+                for i, bot in enumerate(bots)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert sum(bot.summarizer.summarize.call_count for bot in bots) == 16
+            return time.perf_counter() - start
+        
+        assert elapsed(4) < elapsed(1) / 2
+
+
+class TestCli:
+    """コマンドライン引数のテスト"""
+    
+    def test_job_flags(self):
+        args = build_parser().parse_args(["--worker", "--drain"])
+        assert args.worker and args.drain and not args.enqueue
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["--worker", "--enqueue"])
+    
+    @pytest.mark.parametrize("argv", [["--drain"], ["--worker", "--daemon"], ["--enqueue", "--replay", "x.json.gz"]])
+    def test_invalid_combinations(self, argv):
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
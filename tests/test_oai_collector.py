@@ -0,0 +1,130 @@
+"""
+arXiv OAI-PMH collectorのテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.OaiPmhStub）を使用（外部サービスへの接続なし）
+"""
+import json
+import tracemalloc
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from benchmarks.stubs import OaiPmhStub
+from src import clock
+from src.collectors.oai_collector import OaiPmhCollector, OaiPmhError
+
+
+def _collector(stub, **kwargs) -> OaiPmhCollector:
+    kwargs.setdefault("sets", ["cs"])
+    return OaiPmhCollector(base_url=stub.base_url, **kwargs)
+
+
+def _since() -> date:
+    return date.today() - timedelta(days=1)
+
+
+class TestOaiPmhCollector:
+    """OaiPmhCollectorのテスト"""
+    
+    @pytest.mark.parametrize("prefix", ["arXiv", "arXivRaw"])
+    def test_parse_records(self, prefix):
+        with OaiPmhStub(3) as stub:
+            papers = list(_collector(stub, metadata_prefix=prefix).iter_papers(_since()))
+        
+        assert len(papers) == 3
+        paper = papers[0]
+        assert paper.id == "http://arxiv.org/abs/2601.00000"
+        assert paper.source == "arXiv"
+        assert paper.title and paper.abstract
+        assert paper.authors.count(",") >= 1
+        assert paper.categories
+        assert paper.published[:10] >= _since().isoformat()
+        assert stub.requests[0]["metadataPrefix"] == prefix
+        assert stub.requests[0]["set"] == "cs"
+    
+    def test_follows_resumption_tokens(self):
+        with OaiPmhStub(25, page_size=10) as stub:
+            collector = _collector(stub)
+            papers = list(collector.iter_papers(_since()))
+        
+        assert len(papers) == 25
+        assert len({p.id for p in papers}) == 25
+        assert stub.stats["pages"] == 3
+        assert "resumptionToken" in stub.requests[1]
+        assert collector.stats == {"pages": 3, "records": 25}
+    
+    def test_cross_listed_papers_are_deduplicated(self):
+        with OaiPmhStub(5) as stub:
+            papers = list(_collector(stub, sets=["cs", "stat"]).iter_papers(_since()))
+        assert len(papers) == 5
+    
+    def test_retries_on_flow_control(self):
+        with OaiPmhStub(2, retry_after_first=2) as stub:
+            papers = list(_collector(stub).iter_papers(_since()))
+        
+        assert len(papers) == 2
+        assert stub.stats["retry_after"] == 2
+    
+    def test_no_records_match(self):
+        with OaiPmhStub(0) as stub:
+            assert list(_collector(stub).iter_papers(_since())) == []
+    
+    def test_resumes_from_checkpoint(self, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        with OaiPmhStub(30, page_size=10) as stub:
+            harvest = _collector(stub, checkpoint_path=str(checkpoint)).iter_papers(_since())
+            first_run = [next(harvest) for _ in range(15)]
+            harvest.close()
+            saved = json.loads(checkpoint.read_text())
+            
+            second_run = list(_collector(stub, checkpoint_path=str(checkpoint)).iter_papers(_since()))
+        
+        assert saved["records"] == 10
+        # 中断したページから再開するため、2ページ目以降のみ取得する
+        assert [p.id for p in second_run] == [f"http://arxiv.org/abs/2601.{i:05d}" for i in range(10, 30)]
+        assert first_run[0].id.endswith("2601.00000")
+        assert stub.stats["pages"] == 4
+        assert not checkpoint.exists()
+    
+    def test_collect_recent_papers_returns_newest(self):
+        with OaiPmhStub(50, page_size=20) as stub:
+            papers = _collector(stub, max_results=5).collect_recent_papers(days=1)
+        
+        assert [p.id for p in papers] == [f"http://arxiv.org/abs/2601.{i:05d}" for i in range(5)]
+    
+    def test_collect_recent_papers_includes_cutoff_day(self):
+        """日付のみの投稿日は、基準日時より前の時刻でも基準日の論文として残す"""
+        with OaiPmhStub(5) as stub:
+            collector = _collector(stub, max_results=5)
+            with clock.frozen(datetime.combine(date.today() + timedelta(days=1), time(23, 59))):
+                papers = collector.collect_recent_papers(days=1)
+        
+        assert len(papers) == 5
+    
+    def test_error_response_raises(self):
+        with OaiPmhStub(5) as stub:
+            collector = _collector(stub)
+            stub.handle = lambda *args: (200, {}, (
+                b'<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+                b'<error code="badArgument">bad</error></OAI-PMH>'
+            ))
+            with pytest.raises(OaiPmhError, match="badArgument"):
+                list(collector.iter_papers(_since()))
+    
+    def test_memory_is_flat(self):
+        """ハーベスト件数を10倍にしてもピークメモリがほぼ変わらないこと"""
+        def peak_for(count: int) -> int:
+            with OaiPmhStub(count, page_size=150) as stub:
+                collector = _collector(stub, max_results=5)
+                tracemalloc.start()
+                try:
+                    papers = collector.collect_recent_papers(days=1)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+            assert len(papers) == 5
+            return peak
+        
+        small = peak_for(300)
+        large = peak_for(3000)
+        assert large < small * 2
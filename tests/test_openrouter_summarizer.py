@@ -1,9 +1,15 @@
 """OpenRouter Summarizer のテスト"""
 
+import json
+import logging
+
 import pytest
 from unittest.mock import Mock, patch
-from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from benchmarks.stubs import ChatCompletionStub, CompletionProfile
+from src.summarizers.openrouter_summarizer import SUMMARY_SYSTEM_PROMPT, OpenRouterSummarizer, load_examples
 from src.models import PaperResult
+from src.summarizers.preprocess import AbstractPreprocessor
+from src.summarizers.usage import TierUsage, UsageTracker
 
 
 @pytest.fixture
@@ -137,3 +143,138 @@ class TestOpenRouterSummarizer:
         
         with pytest.raises(ValueError, match="Empty summary returned from API"):
             summarizer._extract_summary(empty_response)
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_summarize_sends_compressed_abstract(self, mock_openai, sample_paper, mock_api_response):
+        """前処理後のアブストラクトがプロンプトに使われ、削減量が集計されることをテスト"""
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = mock_api_response
+        mock_openai.return_value = mock_client
+        sample_paper.abstract = (
+            "We study $\\mathcal{O}(n \\log n)$ attention~\\cite{vaswani2017}. "
+            "Code is available at https://github.com/example/repo. "
+            "Accepted at NeurIPS 2024."
+        )
+        
+        summarizer = OpenRouterSummarizer(api_key="test_key", preprocessor=AbstractPreprocessor())
+        summarizer.summarize(sample_paper)
+        
+        prompt = mock_client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert "We study O(n log n) attention." in prompt
+        assert "github.com" not in prompt
+        assert "NeurIPS" not in prompt
+        assert summarizer.compression_stats.papers == 1
+        assert summarizer.compression_stats.tokens_saved > 0
+    
+    def test_preprocessing_can_be_disabled(self, sample_paper):
+        """PROMPT_COMPRESSION=falseの場合はアブストラクトをそのまま使うことをテスト"""
+        with patch('src.summarizers.openrouter_summarizer.config') as mock_config:
+            mock_config.OPENROUTER_API_KEY = "test_key"
+            mock_config.PROMPT_COMPRESSION = False
+            mock_config.SUMMARY_EXAMPLES_FILE = ""
+            mock_config.PROMPT_CACHE = "auto"
+            mock_config.SUMMARIZER_CONCURRENCY = 0
+            summarizer = OpenRouterSummarizer()
+        
+        assert summarizer.preprocessor is None
+        assert summarizer.preprocess_abstract(sample_paper.abstract) == sample_paper.abstract
+
+
+class TestPromptCaching:
+    """システムプロンプトの分離とプロンプトキャッシュのテスト"""
+    
+    @staticmethod
+    def _summarize(summarizer, mock_openai, mock_api_response, papers):
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = mock_api_response
+        mock_openai.return_value = mock_client
+        for paper in papers:
+            summarizer.summarize(paper)
+        return [call.kwargs["messages"] for call in mock_client.chat.completions.create.call_args_list]
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_static_instructions_are_sent_as_shared_prefix(self, mock_openai, sample_paper, mock_api_response):
+        """固定の指示はsystemに、論文ごとの内容はuserに分けて送ることをテスト"""
+        other = PaperResult(**{**sample_paper.to_dict(), "id": "2401.00002", "title": "Another Paper"})
+        summarizer = OpenRouterSummarizer(api_key="test_key", model="openai/gpt-4o-mini")
+        
+        first, second = self._summarize(summarizer, mock_openai, mock_api_response, [sample_paper, other])
+        
+        assert first[0] == second[0] == {"role": "system", "content": SUMMARY_SYSTEM_PROMPT}
+        assert [message["role"] for message in first] == ["system", "user"]
+        assert "Test Paper on Machine Learning" in first[1]["content"]
+        assert "Another Paper" in second[1]["content"]
+        assert "要約は3-5文程度" not in first[1]["content"]
+        # OpenAIのモデルは自動キャッシュのためcache_controlを付けない
+        assert not summarizer.prompt_cache
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_cache_control_for_anthropic_with_examples(self, mock_openai, sample_paper, mock_api_response):
+        """Anthropicのモデルでは固定部分（system + few-shot）の最後にcache_controlを付けることをテスト"""
+        example = "タイトル: Example\n\nアブストラクト:\n" + "We propose a method. " * 250
+        summarizer = OpenRouterSummarizer(
+            api_key="test_key",
+            model="anthropic/claude-3.5-sonnet",
+            examples=[(example, "例の要約です。")]
+        )
+        
+        messages, = self._summarize(summarizer, mock_openai, mock_api_response, [sample_paper])
+        
+        assert [message["role"] for message in messages] == ["system", "user", "assistant", "user"]
+        assert messages[0]["content"] == SUMMARY_SYSTEM_PROMPT
+        assert messages[2]["content"] == [
+            {"type": "text", "text": "例の要約です。", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert isinstance(messages[3]["content"], str)
+    
+    @patch('src.summarizers.openrouter_summarizer.OpenAI')
+    def test_short_prefix_is_not_marked_for_caching(self, mock_openai, sample_paper, mock_api_response, caplog):
+        """固定部分がキャッシュの最小トークン数に満たない場合はcache_controlを付けず警告することをテスト"""
+        with caplog.at_level(logging.WARNING):
+            summarizer = OpenRouterSummarizer(
+                api_key="test_key",
+                model="anthropic/claude-3.5-sonnet",
+                examples=[("タイトル: Example", "例の要約です。")]
+            )
+        
+        messages, = self._summarize(summarizer, mock_openai, mock_api_response, [sample_paper])
+        
+        assert all(isinstance(message["content"], str) for message in messages)
+        assert "SUMMARY_EXAMPLES_FILE" in caplog.text
+    
+    def test_prompt_cache_setting(self, monkeypatch):
+        """PROMPT_CACHEの設定でcache_controlを強制・無効化できることをテスト"""
+        monkeypatch.setenv("PROMPT_CACHE", "true")
+        assert OpenRouterSummarizer(api_key="test_key", model="openai/gpt-4o-mini").prompt_cache
+        monkeypatch.setenv("PROMPT_CACHE", "false")
+        assert not OpenRouterSummarizer(api_key="test_key", model="anthropic/claude-3.5-sonnet").prompt_cache
+    
+    def test_load_examples(self, tmp_path):
+        """few-shotの例をJSONファイルから読み込むことをテスト"""
+        path = tmp_path / "examples.json"
+        path.write_text(json.dumps([{"title": "T", "abstract": "A", "summary": "S"}]), encoding="utf-8")
+        (user, assistant), = load_examples(str(path))
+        assert "タイトル: T" in user and "A" in user and assistant == "S"
+        
+        path.write_text(json.dumps([{"title": "T"}]), encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_examples(str(path))
+    
+    def test_cached_tokens_are_reported(self, sample_paper):
+        """usageのキャッシュ済み入力トークン数が集計されることをテスト"""
+        tracker = UsageTracker({"test/model": (1.0, 2.0, 0.1)})
+        with ChatCompletionStub(CompletionProfile(latency_ms=0)) as stub:
+            summarizer = OpenRouterSummarizer(
+                api_key="test_key", model="test/model", base_url=stub.base_url, usage_tracker=tracker
+            )
+            for _ in range(3):
+                summarizer.summarize(sample_paper)
+            cached = stub.stats["cached_tokens"]
+        
+        usage = tracker.snapshot()["summary"]
+        # 2回目以降はシステムプロンプトがキャッシュから読み込まれる
+        assert cached > 0 and usage.cached_prompt_tokens == cached
+        assert 0 < usage.cache_hit_ratio < 1
+        uncached = TierUsage(model="test/model", prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+        assert usage.cost(tracker.prices) < uncached.cost(tracker.prices)
+        assert "cached" in tracker.format_report({"summary": usage}, summarized=3)[0]
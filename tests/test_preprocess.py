@@ -0,0 +1,140 @@
+"""
+アブストラクト前処理のテスト
+"""
+import pytest
+
+from src.summarizers.preprocess import (
+    AbstractPreprocessor,
+    CompressionStats,
+    estimate_tokens,
+    remove_boilerplate,
+    simplify_latex,
+    truncate_to_tokens,
+)
+
+
+class TestEstimateTokens:
+    """トークン数推定のテスト"""
+    
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+    
+    def test_words_numbers_and_symbols(self):
+        # "transformer"(11文字→3) + "2024"(4桁→2) + "("(1) + ")"(1)
+        assert estimate_tokens("transformer (2024)") == 7
+    
+    def test_cjk_counts_per_character(self):
+        assert estimate_tokens("日本語") == 3
+
+
+class TestSimplifyLatex:
+    """LaTeX簡略化のテスト"""
+    
+    def test_math_and_commands(self):
+        text = simplify_latex("an $\\mathcal{O}(n^2)$ method with $\\alpha \\leq 0.5$")
+        assert text.split() == ["an", "O(n^2)", "method", "with", "α", "≤", "0.5"]
+    
+    def test_nested_formatting(self):
+        assert simplify_latex("\\textbf{\\emph{bold}} text") == "bold text"
+    
+    def test_citations_are_dropped(self):
+        assert simplify_latex("prior work~\\cite{a,b} shows") == "prior work  shows"
+    
+    def test_escaped_characters(self):
+        assert simplify_latex("improves by 20\\% \\& more") == "improves by 20% & more"
+    
+    def test_unknown_commands_are_separated_from_arguments(self):
+        assert simplify_latex("$\\sqrt{n}$ regret") == "sqrt n regret"
+    
+    def test_sizing_and_spacing_commands_are_dropped(self):
+        assert simplify_latex("\\left( x \\right)").split() == ["(", "x", ")"]
+        assert simplify_latex("10\\,ms \\quad \\bigl[ a \\bigr]").split() == ["10", "ms", "[", "a", "]"]
+
+
+class TestRemoveBoilerplate:
+    """定型文除去のテスト"""
+    
+    def test_removes_code_release_and_venue(self):
+        text = (
+            "We propose a method. It works well. "
+            "Our code is publicly available. Accepted at ICML 2024. To appear in NeurIPS."
+        )
+        assert remove_boilerplate(text) == "We propose a method. It works well."
+    
+    def test_removes_release_location_and_comments(self):
+        text = (
+            "We propose a method. Code: github.com/org/repo. "
+            "Data are available upon request. Comments: 12 pages, 5 figures. 9 pages; appendix."
+        )
+        assert remove_boilerplate(text) == "We propose a method."
+    
+    @pytest.mark.parametrize("sentence", [
+        "Our model is available in three sizes and outperforms GPT-4.",
+        "We study models published in the last decade.",
+        "We evaluate on 12 tables from WikiTQ.",
+        "The agent navigates 3 pages of a website.",
+        "We detect copyright infringement in generated images.",
+        "Users accepted to the study were paid.",
+    ])
+    def test_keeps_content_sentences(self, sentence):
+        text = f"We propose a method. {sentence}"
+        assert remove_boilerplate(text) == text
+    
+    def test_keeps_text_when_everything_matches(self):
+        text = "Code will be released."
+        assert remove_boilerplate(text) == text
+
+
+class TestTruncateToTokens:
+    """切り詰めのテスト"""
+    
+    def test_short_text_is_unchanged(self):
+        assert truncate_to_tokens("Short text.", 100) == "Short text."
+    
+    def test_zero_means_unlimited(self):
+        text = "word " * 1000
+        assert truncate_to_tokens(text, 0) == text
+    
+    def test_truncates_at_sentence_boundary(self):
+        text = "First sentence here. Second sentence here. Third sentence here."
+        truncated = truncate_to_tokens(text, 8)
+        assert truncated == "First sentence here. …"
+        assert estimate_tokens(truncated) <= 9
+    
+    def test_long_first_sentence_is_cut_by_words(self):
+        truncated = truncate_to_tokens("word " * 100, 10)
+        assert truncated.startswith("word word")
+        assert estimate_tokens(truncated) <= 11
+
+
+class TestAbstractPreprocessor:
+    """AbstractPreprocessorのテスト"""
+    
+    def test_process_reduces_tokens(self):
+        abstract = (
+            "We present \\textbf{FastAttn}, an $\\mathcal{O}(n)$ attention~\\cite{x}.\n"
+            "  It is   2x faster. Code: https://github.com/example/fastattn. "
+            "Code is available at https://example.com. 12 pages, 5 figures."
+        )
+        result = AbstractPreprocessor().process(abstract)
+        
+        assert result.text == "We present FastAttn, an O(n) attention. It is 2x faster."
+        assert result.tokens_after < result.tokens_before
+        assert result.tokens_saved == result.tokens_before - result.tokens_after
+    
+    def test_options_can_be_disabled(self):
+        preprocessor = AbstractPreprocessor(strip_latex=False, strip_urls=False, strip_boilerplate=False)
+        text = "See $x$ at https://example.com. Accepted at ICML."
+        assert preprocessor.clean(text) == text
+    
+    def test_compression_stats(self):
+        preprocessor = AbstractPreprocessor()
+        stats = CompressionStats()
+        stats.add(preprocessor.process("Simple abstract."))
+        snapshot = CompressionStats(**vars(stats))
+        stats.add(preprocessor.process("Code is available at https://example.com. Real content."))
+        
+        run = stats.since(snapshot)
+        assert run.papers == 1
+        assert run.tokens_saved > 0
+        assert 0 < run.saved_ratio < 1
@@ -0,0 +1,109 @@
+"""
+ステージごとのCPU・メモリプロファイリングのテスト
+"""
+import json
+import pstats
+import tracemalloc
+from unittest.mock import Mock
+
+import pytest
+
+from src.main import ResearchPaperBot, build_parser
+from src.profiling import StageProfiler
+from tests.helpers import make_paper
+
+
+def _bot() -> ResearchPaperBot:
+    collector = Mock()
+    collector.collect_recent_papers.return_value = [make_paper(i) for i in range(3)]
+    summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda p: p))
+    return ResearchPaperBot(
+        dry_run=True,
+        collector=collector,
+        summarizer=summarizer,
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=None
+    )
+
+
+def _records(profiler: StageProfiler):
+    lines = (profiler.output_dir / "stages.jsonl").read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+class TestStageProfiler:
+    """StageProfilerのテスト"""
+    
+    def test_attach_profiles_each_stage(self, tmp_path):
+        bot = _bot()
+        profiler = StageProfiler(str(tmp_path), cpu=True, memory=True, top=10)
+        profiler.attach(bot)
+        try:
+            assert bot.run(days=1)
+        finally:
+            profiler.close()
+        
+        records = _records(profiler)
+        assert [record["stage"] for record in records] == ["collect_papers", "summarize_papers", "notify_papers"]
+        for record in records:
+            assert record["wall_seconds"] >= 0
+            assert record["peak_bytes"] > 0
+            for artifact in record["artifacts"]:
+                assert (profiler.output_dir / artifact).exists()
+        hotspots = (profiler.output_dir / "summarize_papers-0001.txt").read_text(encoding="utf-8")
+        assert "sorted by tottime" in hotspots and "summarize_papers" in hotspots
+        stats = pstats.Stats(str(profiler.output_dir / "collect_papers-0001.prof"))
+        assert stats.total_calls > 0
+        assert not tracemalloc.is_tracing()
+    
+    def test_repeated_calls_get_separate_artifacts(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), cpu=True)
+        for _ in range(2):
+            with profiler.stage("notify_papers"):
+                sum(range(1000))
+        
+        assert [record["call"] for record in _records(profiler)] == [1, 2]
+        assert (profiler.output_dir / "notify_papers-0002.prof").exists()
+    
+    def test_memory_report_lists_allocating_line(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), cpu=False, memory=True, top=5)
+        try:
+            with profiler.stage("summarize_papers"):
+                retained = [bytearray(1024) for _ in range(2000)]
+        finally:
+            profiler.close()
+        
+        report = (profiler.output_dir / "summarize_papers-0001-memory.txt").read_text(encoding="utf-8")
+        assert report.startswith("peak: ")
+        assert "test_profiling.py" in report.splitlines()[1]
+        assert _records(profiler)[0]["peak_bytes"] >= 2000 * 1024
+        assert retained
+    
+    def test_nested_stage_skips_cpu_profile(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), cpu=True)
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                pass
+        
+        artifacts = {record["stage"]: record["artifacts"] for record in _records(profiler)}
+        assert artifacts["inner"] == []
+        assert artifacts["outer"] == ["outer-0001.prof", "outer-0001.txt"]
+    
+    def test_exception_is_propagated_and_recorded(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), cpu=True)
+        with pytest.raises(RuntimeError):
+            with profiler.stage("collect_papers"):
+                raise RuntimeError("boom")
+        assert _records(profiler)[0]["stage"] == "collect_papers"
+
+
+class TestCli:
+    """コマンドライン引数のテスト"""
+    
+    def test_profile_flags(self):
+        args = build_parser().parse_args(["--profile", "--trace-memory"])
+        assert args.profile and args.trace_memory
+        args = build_parser().parse_args([])
+        assert not args.profile and not args.trace_memory
@@ -0,0 +1,140 @@
+"""
+arXiv新着フィード（RSS）コレクターのテスト
+"""
+import io
+from datetime import datetime
+
+import pytest
+
+from benchmarks.stubs import ArxivRssStub
+from src import clock
+from src.collectors import ArxivRssCollector, create_collector
+from src.collectors.rss_collector import categories_from_query, parse_feed
+
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss xmlns:arxiv="http://arxiv.org/schemas/atom" xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0">
+<channel>
+<title>cs.AI updates on arXiv.org</title>
+<pubDate>Mon, 19 Oct 2026 00:00:00 -0400</pubDate>
+<item>
+<title>Planning with
+  Language Models</title>
+<link>https://arxiv.org/abs/2610.01234</link>
+<description>arXiv:2610.01234v1 Announce Type: new
+Abstract: We study planning. Results are promising.</description>
+<guid isPermaLink="false">oai:arXiv.org:2610.01234v1</guid>
+<category>cs.AI</category>
+<category>cs.LG</category>
+<pubDate>Mon, 19 Oct 2026 00:00:00 -0400</pubDate>
+<arxiv:announce_type>new</arxiv:announce_type>
+<dc:creator>Alice Smith, Bob Jones</dc:creator>
+</item>
+<item>
+<title>Revised Paper</title>
+<link>https://arxiv.org/abs/2501.00001</link>
+<description>arXiv:2501.00001v3 Announce Type: replace
+Abstract: An old paper.</description>
+<category>cs.AI</category>
+<pubDate>Mon, 19 Oct 2026 00:00:00 -0400</pubDate>
+<arxiv:announce_type>replace</arxiv:announce_type>
+<dc:creator>Carol White</dc:creator>
+</item>
+</channel>
+</rss>
+"""
+
+
+class TestParseFeed:
+    """フィードのパースのテスト"""
+    
+    def test_parse_item(self):
+        papers = list(parse_feed(io.BytesIO(FEED)))
+        
+        assert len(papers) == 2
+        paper = papers[0]
+        assert paper.id == paper.url == "http://arxiv.org/abs/2610.01234"
+        assert paper.title == "Planning with Language Models"
+        assert paper.authors == "Alice Smith, Bob Jones"
+        assert paper.abstract == "We study planning. Results are promising."
+        assert paper.categories == "cs.AI, cs.LG"
+        # アナウンス日時はUTCに変換する
+        assert paper.published == "2026-10-19T04:00:00"
+        assert paper.source == "arXiv"
+    
+    def test_filter_announce_types(self):
+        papers = list(parse_feed(io.BytesIO(FEED), announce_types=("new", "cross")))
+        assert [paper.title for paper in papers] == ["Planning with Language Models"]
+    
+    def test_categories_from_query(self):
+        query = "cat:cs.AI OR cat:cs.LG OR (cat:cs.AI AND ti:agents) OR cat:math"
+        assert categories_from_query(query) == ["cs.AI", "cs.LG", "math"]
+    
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="category"):
+            ArxivRssCollector(categories=[])
+        with pytest.raises(ValueError, match="Unknown announce types"):
+            ArxivRssCollector(categories=["cs.AI"], announce_types=["updated"])
+
+
+class TestArxivRssCollector:
+    """スタブサーバーを使った収集のテスト"""
+    
+    CATEGORIES = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.IR", "stat.ML"]
+    
+    def test_one_request_per_category(self):
+        with ArxivRssStub(paper_count=50, latency_ms=100) as stub:
+            collector = ArxivRssCollector(self.CATEGORIES, feed_url_format=stub.feed_url_format)
+            started = datetime.now()
+            papers = collector.collect_recent_papers(days=1)
+            elapsed = (datetime.now() - started).total_seconds()
+            requests = sorted(stub.requests)
+        
+        assert requests == sorted(self.CATEGORIES)
+        # フィードは並行に取得する（逐次なら6 × 100ms以上）
+        assert elapsed < 0.5
+        # クロスリストされた論文も1件にまとまる
+        assert len(papers) == 50
+        assert len({paper.id for paper in papers}) == 50
+        assert collector.stats["feeds"] == 6
+        assert collector.stats["duplicates"] == collector.stats["items"] - 50
+    
+    def test_excludes_replacements_by_default(self):
+        with ArxivRssStub(paper_count=20, replacements=5) as stub:
+            default = ArxivRssCollector(self.CATEGORIES, feed_url_format=stub.feed_url_format)
+            everything = ArxivRssCollector(
+                self.CATEGORIES,
+                announce_types=("new", "cross", "replace", "replace-cross"),
+                feed_url_format=stub.feed_url_format
+            )
+            assert len(default.collect_recent_papers()) == 15
+            assert len(everything.collect_recent_papers()) == 20
+    
+    def test_max_results_and_cutoff(self):
+        with ArxivRssStub(paper_count=20) as stub:
+            collector = ArxivRssCollector(self.CATEGORIES, max_results=5, feed_url_format=stub.feed_url_format)
+            assert len(collector.collect_papers()) == 5
+            
+            with clock.frozen(datetime(2100, 1, 1)):
+                assert collector.collect_recent_papers(days=1) == []
+    
+    def test_failed_category_is_skipped(self):
+        with ArxivRssStub(paper_count=20) as stub:
+            collector = ArxivRssCollector(["cs.AI", "unknown"], feed_url_format=stub.feed_url_format)
+            papers = collector.collect_recent_papers()
+            assert papers and all("cs.AI" in paper.categories for paper in papers)
+            
+            failing = ArxivRssCollector(["unknown"], feed_url_format=stub.feed_url_format)
+            with pytest.raises(Exception):
+                failing.collect_recent_papers()
+    
+    def test_create_from_registry(self, monkeypatch):
+        monkeypatch.setenv("ARXIV_SEARCH_QUERY", "cat:cs.CL OR cat:cs.IR")
+        monkeypatch.setenv("RSS_CATEGORIES", "")
+        monkeypatch.setenv("RSS_ANNOUNCE_TYPES", "new")
+        collector = create_collector("arxiv_rss")
+        assert collector.categories == ["cs.CL", "cs.IR"]
+        assert collector.announce_types == ("new",)
+        
+        monkeypatch.setenv("RSS_CATEGORIES", "stat.ML")
+        assert create_collector("arxiv_rss").categories == ["stat.ML"]
@@ -0,0 +1,136 @@
+"""
+Semantic Scholar collectorのテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.SemanticScholarStub）を使用（外部サービスへの接続なし）
+"""
+import pytest
+
+from benchmarks.stubs import SemanticScholarStub
+from src.collectors.scholar_collector import RateLimiter, SemanticScholarCollector, to_scholar_id
+from src.models import PaperResult
+
+
+def _collector(stub, **kwargs) -> SemanticScholarCollector:
+    kwargs.setdefault("api_key", "")
+    return SemanticScholarCollector(
+        "transformer",
+        api_url=stub.api_url,
+        min_interval=0,
+        retry_delay=0,
+        **kwargs
+    )
+
+
+def _arxiv_paper(arxiv_id: str, **kwargs) -> PaperResult:
+    fields = dict(
+        id=f"http://arxiv.org/abs/{arxiv_id}v1",
+        title="Paper",
+        authors="",
+        abstract="",
+        url=f"http://arxiv.org/abs/{arxiv_id}v1",
+        published="",
+        source="arXiv"
+    )
+    fields.update(kwargs)
+    return PaperResult(**fields)
+
+
+class TestRateLimiter:
+    """RateLimiterのテスト"""
+    
+    def test_waits_for_min_interval(self):
+        now = [100.0]
+        sleeps = []
+        
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+        
+        limiter = RateLimiter(1.0, clock=lambda: now[0], sleep=sleep)
+        limiter.wait()
+        limiter.wait()
+        now[0] += 5
+        limiter.wait()
+        
+        assert sleeps == [1.0]
+
+
+class TestToScholarId:
+    """検索用ID変換のテスト"""
+    
+    def test_arxiv_new_style(self):
+        assert to_scholar_id(_arxiv_paper("2401.00001")) == "ARXIV:2401.00001"
+    
+    def test_arxiv_old_style(self):
+        assert to_scholar_id(_arxiv_paper("cs.AI/0101001")) == "ARXIV:cs.AI/0101001"
+    
+    def test_scholar_paper(self):
+        paper = _arxiv_paper("x", id="abc123", source="Semantic Scholar")
+        assert to_scholar_id(paper) == "abc123"
+
+
+class TestSemanticScholarCollector:
+    """SemanticScholarCollectorのテスト"""
+    
+    def test_collect_recent_papers(self):
+        with SemanticScholarStub(paper_count=20) as stub:
+            papers = _collector(stub, max_results=5).collect_recent_papers(days=1)
+        
+        assert len(papers) == 5
+        paper = papers[0]
+        assert paper.source == "Semantic Scholar"
+        assert paper.title and paper.abstract and paper.authors
+        assert paper.categories == "Computer Science"
+        assert paper.url.startswith("https://www.semanticscholar.org/paper/")
+        assert stub.stats["search"] == 1
+    
+    def test_search_follows_continuation_token(self):
+        with SemanticScholarStub(paper_count=25, page_size=10) as stub:
+            papers = _collector(stub, max_results=100).collect_recent_papers(days=1)
+        
+        assert len(papers) == 25
+        assert stub.stats["search"] == 3
+    
+    def test_fetch_papers_uses_batches(self):
+        """1000件超のメタデータ取得がbatchエンドポイント数回で済むこと"""
+        with SemanticScholarStub(paper_count=1200) as stub:
+            ids = [f"ARXIV:{paper['externalIds']['ArXiv']}" for paper in stub.papers]
+            results = _collector(stub).fetch_papers(ids + ["ARXIV:9999.99999"])
+        
+        assert len(results) == 1200
+        assert stub.stats["batch"] == 3
+        assert stub.request_count == 3
+    
+    def test_enrich_papers_fills_missing_fields(self):
+        with SemanticScholarStub(paper_count=3) as stub:
+            arxiv_id = stub.papers[0]["externalIds"]["ArXiv"]
+            papers = [
+                _arxiv_paper(arxiv_id),
+                _arxiv_paper("2401.99999", abstract="Kept as is"),
+            ]
+            _collector(stub).enrich_papers(papers)
+        
+        assert papers[0].abstract == stub.papers[0]["abstract"]
+        assert papers[0].authors
+        assert papers[0].categories == "Computer Science"
+        assert papers[1].abstract == "Kept as is"
+        assert stub.stats["batch"] == 1
+    
+    def test_api_key_is_sent(self):
+        with SemanticScholarStub(paper_count=1) as stub:
+            _collector(stub, api_key="secret").collect_recent_papers(days=1)
+        
+        assert stub.api_keys == ["secret"]
+    
+    def test_retries_on_rate_limit(self):
+        with SemanticScholarStub(paper_count=2, rate_limit_first=2) as stub:
+            papers = _collector(stub).collect_recent_papers(days=1)
+        
+        assert len(papers) == 2
+        assert stub.stats["rate_limited"] == 2
+        assert stub.request_count == 3
+    
+    def test_raises_after_retries_exhausted(self):
+        with SemanticScholarStub(paper_count=2, rate_limit_first=10) as stub:
+            with pytest.raises(Exception, match="429"):
+                _collector(stub, max_retries=1).collect_recent_papers(days=1)
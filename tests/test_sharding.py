@@ -0,0 +1,145 @@
+"""
+シャード実行（--shard i/N）と結果のマージのテスト
+"""
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.main import ResearchPaperBot, main
+from src.models import PaperResult
+from src.sharding import Shard, ShardReport, ShardRun, load_reports, merge_reports, shard_index, shard_key
+from tests.helpers import make_paper
+
+
+def _bot(papers, summarize=lambda p: p) -> ResearchPaperBot:
+    collector = Mock()
+    collector.collect_recent_papers.return_value = papers
+    summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=summarize))
+    return ResearchPaperBot(
+        dry_run=True,
+        collector=collector,
+        summarizer=summarizer,
+        full_text=False,
+        triage=False,
+        cluster=False,
+        watchlist=None
+    )
+
+
+def _run_shard(shard: Shard, papers, summarize=lambda p: p) -> ShardReport:
+    bot = _bot(papers, summarize)
+    run = ShardRun(shard)
+    run.attach(bot)
+    return run.report(bot.run(days=1))
+
+
+class TestShard:
+    """Shardのテスト"""
+    
+    def test_parse(self):
+        assert Shard.parse("2/4") == Shard(2, 4)
+        assert str(Shard(2, 4)) == "2/4"
+    
+    @pytest.mark.parametrize("value", ["0/4", "5/4", "1/0", "1", "a/b", "1/2/3"])
+    def test_parse_invalid(self, value):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+    
+    def test_shards_are_disjoint_and_cover_all_papers(self):
+        papers = [make_paper(i) for i in range(200)]
+        selected = [Shard(index, 4).select(papers) for index in range(1, 5)]
+        ids = [paper.id for papers in selected for paper in papers]
+        assert sorted(ids) == sorted(paper.id for paper in papers)
+        # 偏りなく分割される
+        assert all(30 <= len(papers) <= 70 for papers in selected)
+    
+    def test_assignment_ignores_version_and_is_stable(self):
+        assert shard_key(make_paper(7, version=3)) == "arxiv:2601.00007"
+        assert shard_index(make_paper(7, version=1), 8) == shard_index(make_paper(7, version=3), 8)
+        # ハッシュはプロセスに依存しない（PYTHONHASHSEEDの影響を受けない）
+        assert [shard_index(make_paper(i), 4) for i in range(6)] == [3, 4, 2, 4, 3, 3]
+        assert shard_key(PaperResult(
+            id=" DOI:10.1/ABC ", title="", authors="", abstract="", url="", published="", source="x"
+        )) == "doi:10.1/abc"
+
+
+class TestShardRun:
+    """ShardRunとmerge_reportsのテスト"""
+    
+    def test_shards_process_disjoint_slices(self):
+        papers = [make_paper(i) for i in range(30)]
+        reports = [_run_shard(Shard(index, 3), papers) for index in range(1, 4)]
+        
+        assert all(report.success and report.collected == 30 for report in reports)
+        merged = merge_reports(reports)
+        assert sorted(merged["papers"]) == sorted(paper.id for paper in papers)
+        assert merged["duplicates"] == [] and merged["missing"] == [] and merged["failed"] == []
+        assert merged["collection_consistent"]
+        assert merged["notified"] == 30 and merged["summarized"] == 30
+        assert merged["usage"]["summary"]["papers"] == 30
+    
+    def test_wall_clock_scales_down_with_shards(self):
+        papers = [make_paper(i) for i in range(24)]
+        
+        def slow_summarize(paper):
+            time.sleep(0.02)
+            return paper
+        
+        single = _run_shard(Shard(1, 1), papers, slow_summarize)
+        merged = merge_reports([_run_shard(Shard(index, 4), papers, slow_summarize) for index in range(1, 5)])
+        assert merged["elapsed"] < single.elapsed / 2
+    
+    def test_merge_reports_missing_failed_and_inconsistent(self, caplog):
+        reports = [
+            ShardReport(shard="1/3", success=True, collected=10, collection_digest="a", papers=["x"], notified=1),
+            ShardReport(shard="3/3", success=False, collected=12, collection_digest="b"),
+        ]
+        merged = merge_reports(reports)
+        assert merged["missing"] == ["2/3"]
+        assert merged["failed"] == ["3/3"]
+        assert merged["collection_consistent"]
+        
+        reports[1].success = True
+        assert not merge_reports(reports)["collection_consistent"]
+        assert "different paper sets" in caplog.text
+    
+    def test_merge_reports_rejects_mixed_counts(self):
+        with pytest.raises(ValueError):
+            merge_reports([ShardReport(shard="1/2", success=True), ShardReport(shard="1/3", success=True)])
+        with pytest.raises(ValueError):
+            merge_reports([])
+    
+    def test_save_and_load(self, tmp_path):
+        report = ShardReport(shard="2/4", success=True, papers=["a"], usage={"summary": {"papers": 1}})
+        report.save(str(tmp_path / "shard-2" / "shard-2-of-4.json"))
+        loaded, = load_reports(str(tmp_path))
+        assert loaded == report and loaded.summarized == 1
+
+
+class TestCli:
+    """コマンドラインのテスト"""
+    
+    @pytest.mark.parametrize("argv", [["--shard", "5/4"], ["--shard", "1/2", "--daemon"], ["--shard", "1/2", "--worker"]])
+    def test_invalid_shard(self, argv):
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
+    
+    def test_merge_shards(self, tmp_path):
+        for index in (1, 2):
+            ShardReport(shard=f"{index}/2", success=True, papers=[f"p{index}"], notified=1).save(
+                str(tmp_path / f"shard-{index}-of-2.json")
+            )
+        with pytest.raises(SystemExit) as excinfo:
+            main(["--merge-shards", str(tmp_path)])
+        assert excinfo.value.code == 0
+        merged = json.loads((tmp_path / "merged.json").read_text(encoding="utf-8"))
+        assert merged["papers"] == ["p1", "p2"] and merged["notified"] == 2
+    
+    def test_merge_shards_fails_when_shard_missing(self, tmp_path):
+        ShardReport(shard="1/2", success=True).save(str(tmp_path / "shard-1-of-2.json"))
+        with pytest.raises(SystemExit) as excinfo:
+            main(["--merge-shards", str(tmp_path)])
+        assert excinfo.value.code == 1
@@ -0,0 +1,53 @@
+"""
+CLI起動時間のテスト
+
+``python -X importtime`` で計測し、重い依存パッケージが起動時に
+読み込まれないこと・起動時間が予算内に収まることを確認する
+"""
+import subprocess
+import sys
+
+from benchmarks.startup import measure_import, parse_importtime
+
+
+# src.mainのインポートに許容する累積時間（ミリ秒）
+# 遅延インポート導入前は約1秒（openai SDKの読み込みが大半）
+STARTUP_BUDGET_MS = 250
+
+
+def test_parse_importtime():
+    """-X importtime 出力の解析テスト"""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      2000 |       5000 | src.main\n"
+    )
+    assert parse_importtime(stderr) == {"_io": 120, "src.main": 5000}
+
+
+def test_main_import_does_not_load_heavy_dependencies():
+    """src.mainのインポートでopenai / arxiv / discord_webhookが読み込まれないこと"""
+    profile = measure_import("src.main", runs=1)
+    assert profile.heavy_modules() == []
+    assert not profile.loaded("dotenv")
+
+
+def test_main_import_within_budget():
+    """src.mainのインポートが起動時間の予算内に収まること"""
+    profile = measure_import("src.main")
+    assert profile.cumulative_ms < STARTUP_BUDGET_MS, (
+        f"src.main import took {profile.cumulative_ms:.1f}ms "
+        f"(budget {STARTUP_BUDGET_MS}ms)"
+    )
+
+
+def test_help_exits_without_configuration():
+    """--helpは設定や外部依存なしで終了すること"""
+    completed = subprocess.run(
+        [sys.executable, "-m", "src.main", "--help"],
+        capture_output=True,
+        text=True,
+        timeout=30
+    )
+    assert completed.returncode == 0
+    assert "--dry-run" in completed.stdout
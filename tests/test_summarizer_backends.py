@@ -0,0 +1,233 @@
+"""
+要約器のバックエンド（インターフェース・レジストリ・OpenAI互換・フェイク）のテスト
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.stubs import ChatCompletionStub, CompletionProfile
+from src.config import config
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.summarizers import (
+    FakeSummarizer,
+    OpenAICompatibleSummarizer,
+    OpenRouterSummarizer,
+    PaperSummarizer,
+    SummarizerCapabilities,
+    available_summarizers,
+    create_summarizer,
+    summarize_all,
+)
+from src.summarizers.usage import UsageTracker
+from tests.helpers import make_paper
+
+
+def _paper(index: int) -> PaperResult:
+    return make_paper(index, abstract=f"We propose method {index}. It works well. Experiments confirm it.")
+
+
+class SlowSummarizer:
+    """同時に実行された要約の最大数を記録する要約器"""
+    
+    def __init__(self, max_concurrency: int, fail_titles=(), delay: float = 0.05):
+        self.capabilities = SummarizerCapabilities(max_concurrency=max_concurrency)
+        self.fail_titles = set(fail_titles)
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def summarize(self, paper: PaperResult) -> PaperResult:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+            if paper.title in self.fail_titles:
+                raise RuntimeError("backend error")
+            paper.summary = f"summary of {paper.title}"
+            return paper
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class TestRegistry:
+    """バックエンドのレジストリのテスト"""
+    
+    def test_available_backends(self):
+        assert {"openrouter", "openai_compatible", "fake"} <= set(available_summarizers())
+    
+    def test_create_from_setting(self, monkeypatch):
+        monkeypatch.setenv("SUMMARIZER_BACKEND", "fake")
+        tracker = UsageTracker()
+        summarizer = create_summarizer(usage_tracker=tracker)
+        assert isinstance(summarizer, FakeSummarizer)
+        assert summarizer.usage_tracker is tracker
+        assert isinstance(summarizer, PaperSummarizer)
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown summarizer backend"):
+            create_summarizer("nonexistent")
+    
+    def test_openrouter_base_url_from_setting(self, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_BASE_URL", "https://proxy.example.com/api/v1/")
+        summarizer = OpenRouterSummarizer(api_key="test_key")
+        assert summarizer.base_url == "https://proxy.example.com/api/v1"
+        assert summarizer.capabilities.max_concurrency == 4
+    
+    def test_local_backend_does_not_require_openrouter_key(self, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "")
+        monkeypatch.setenv("DISCORD_WEBHOOK_URL", "https://discord.example.com/webhook")
+        monkeypatch.setenv("SUMMARIZER_BACKEND", "openai_compatible")
+        assert config.validate()
+        monkeypatch.setenv("SUMMARIZER_BACKEND", "openrouter")
+        with pytest.raises(ValueError, match="OPENROUTER_API_KEY"):
+            config.validate()
+
+
+class TestOpenAICompatibleSummarizer:
+    """OpenAI互換APIのエンドポイントを使用する要約器のテスト"""
+    
+    def test_defaults_from_settings(self, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "")
+        monkeypatch.setenv("SUMMARIZER_BASE_URL", "http://127.0.0.1:8000/v1")
+        monkeypatch.setenv("SUMMARIZER_MODEL", "qwen2.5-7b-instruct")
+        summarizer = OpenAICompatibleSummarizer()
+        
+        assert summarizer.base_url == "http://127.0.0.1:8000/v1"
+        assert summarizer.model == "qwen2.5-7b-instruct"
+        assert summarizer.api_key == "EMPTY"
+        assert summarizer.extra_headers == {}
+        assert summarizer.capabilities.max_concurrency == 1
+        assert not summarizer.prompt_cache
+        
+        monkeypatch.setenv("PROMPT_CACHE", "true")
+        assert not OpenAICompatibleSummarizer().prompt_cache
+    
+    def test_concurrency_setting(self, monkeypatch):
+        monkeypatch.setenv("SUMMARIZER_CONCURRENCY", "3")
+        assert OpenAICompatibleSummarizer().capabilities.max_concurrency == 3
+        assert OpenAICompatibleSummarizer(max_concurrency=2).capabilities.max_concurrency == 2
+    
+    def test_summarize_with_local_server(self, monkeypatch):
+        monkeypatch.setenv("SUMMARIZER_MODEL", "")
+        tracker = UsageTracker()
+        with ChatCompletionStub(CompletionProfile(latency_ms=0)) as stub:
+            summarizer = OpenAICompatibleSummarizer(base_url=stub.base_url, usage_tracker=tracker)
+            # 見積もりの時点でモデル名を解決する
+            assert summarizer.estimate_usage(_paper(1)).model == "stub-model"
+            summarizer.summarize(_paper(1))
+            paper = summarizer.summarize(_paper(2))
+            models = dict(stub.models)
+            model_requests = stub.request_count - stub.stats["completions"]
+        
+        assert paper.summary
+        # モデル名は初回のリクエスト前に1回だけサーバーから取得する
+        assert models == {"stub-model": 2}
+        assert model_requests == 1
+        assert tracker.snapshot()["summary"].model == "stub-model"
+        assert tracker.snapshot()["summary"].calls == 2
+    
+    def test_unresolvable_model_fails_with_hint(self, monkeypatch):
+        monkeypatch.setenv("SUMMARIZER_MODEL", "")
+        with ChatCompletionStub(CompletionProfile(latency_ms=0)) as stub:
+            stub.served_models = ()
+            summarizer = OpenAICompatibleSummarizer(base_url=stub.base_url, max_retries=1)
+            with pytest.raises(ValueError, match="SUMMARIZER_MODEL"):
+                summarizer.summarize(_paper(1))
+            assert stub.stats["completions"] == 0
+
+
+class TestFakeSummarizer:
+    """決定的なフェイクの要約器のテスト"""
+    
+    def test_deterministic_summary(self):
+        first = FakeSummarizer().summarize(_paper(1))
+        second = FakeSummarizer().summarize(_paper(1))
+        assert first.summary == second.summary == "Paper 1: We propose method 1. It works well."
+    
+    def test_batch_records_usage(self):
+        tracker = UsageTracker()
+        summarizer = FakeSummarizer(usage_tracker=tracker)
+        papers = summarizer.summarize_batch([_paper(i) for i in range(3)])
+        
+        assert all(paper.summary for paper in papers)
+        assert summarizer.calls == 1
+        usage = tracker.snapshot()["summary"]
+        assert usage.calls == 3 and usage.prompt_tokens > 0
+
+
+class TestSummarizeAll:
+    """処理能力に従った複数論文の要約のテスト"""
+    
+    def test_runs_up_to_declared_concurrency(self):
+        summarizer = SlowSummarizer(max_concurrency=3)
+        results = summarize_all(summarizer, [_paper(i) for i in range(6)])
+        
+        assert [paper.title for paper in results] == [f"Paper {i}" for i in range(6)]
+        assert summarizer.peak == 3
+    
+    def test_sequential_without_capabilities(self):
+        summarizer = Mock()
+        summarizer.summarize.side_effect = lambda paper: paper
+        papers = [_paper(i) for i in range(3)]
+        assert summarize_all(summarizer, papers) == papers
+        summarizer.summarize_batch.assert_not_called()
+    
+    def test_batches_and_failures(self):
+        summarizer = FakeSummarizer()
+        summarizer.capabilities = SummarizerCapabilities(max_concurrency=1, max_batch_size=4)
+        results = summarize_all(summarizer, [_paper(i) for i in range(10)])
+        assert len(results) == 10 and summarizer.calls == 3
+        
+        failing = SlowSummarizer(max_concurrency=2, fail_titles={"Paper 1"}, delay=0)
+        results = summarize_all(failing, [_paper(i) for i in range(3)])
+        assert isinstance(results[1], RuntimeError)
+        assert results[0].summary and results[2].summary
+
+
+class TestConcurrentRun:
+    """並行に要約する実行のテスト"""
+    
+    @staticmethod
+    def _bot(summarizer, papers) -> ResearchPaperBot:
+        collector = Mock()
+        collector.collect_recent_papers.return_value = papers
+        return ResearchPaperBot(
+            dry_run=True,
+            collector=collector,
+            summarizer=summarizer,
+            full_text=False,
+            triage=False,
+            cluster=False,
+            watchlist=None
+        )
+    
+    def test_summarizes_concurrently_in_order(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+        summarizer = SlowSummarizer(max_concurrency=4, fail_titles={"Paper 2"})
+        papers = [_paper(i) for i in range(8)]
+        
+        results = self._bot(summarizer, papers).summarize_papers(papers)
+        
+        assert summarizer.peak == 4
+        assert [paper.title for paper in results] == [paper.title for paper in papers]
+        assert results[2].summary is None
+        assert sum(paper.summary is not None for paper in results) == 7
+    
+    def test_budget_counts_concurrent_papers(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+        monkeypatch.setenv("BUDGET_FILE", str(tmp_path / "budget.json"))
+        summarizer = FakeSummarizer(usage_tracker=UsageTracker())
+        papers = [_paper(i) for i in range(6)]
+        estimate = summarizer.estimate_usage(papers[0]).total_tokens
+        monkeypatch.setenv("BUDGET_RUN_TOKENS", str(estimate * 3 + 1))
+        
+        results = self._bot(summarizer, papers).summarize_papers(papers)
+        
+        assert sum(paper.summary is not None for paper in results) == 3
+        assert sum(paper.summary_deferred for paper in results) == 3
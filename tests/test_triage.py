@@ -0,0 +1,203 @@
+"""
+トリアージ（安価なモデルによる関連度評価）とAPI使用量集計のテスト
+
+ローカルのスタブサーバー（benchmarks.stubs.ChatCompletionStub）を使用（外部サービスへの接続なし）
+"""
+import re
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.stubs import ChatCompletionStub, CompletionProfile
+from src.main import ResearchPaperBot
+from src.models import PaperResult
+from src.summarizers.base import CompletionSummarizer
+from src.summarizers.openrouter_summarizer import OpenRouterSummarizer
+from src.summarizers.triage import PaperTriage, parse_scores
+from src.summarizers.usage import UsageTracker, parse_prices
+from tests.helpers import make_paper
+
+
+def _paper(number: int) -> PaperResult:
+    return make_paper(
+        number,
+        title=f"Paper {number} on {'graphs' if number % 2 else 'language models'}",
+        abstract="We study a problem. Our method improves accuracy."
+    )
+
+
+def _responder(model: str, prompt: str) -> str:
+    """トリアージには言語モデルの論文を9点、それ以外を2点と答え、要約には固定文を返す"""
+    if model != "cheap-model":
+        return "要約です。"
+    entries = re.findall(r"^\[(\d+)\] タイトル: (.*)$", prompt, re.MULTILINE)
+    return "\n".join(f"{number}: {9 if 'language' in title else 2}" for number, title in entries)
+
+
+def _triage(stub, tracker=None, **kwargs) -> PaperTriage:
+    kwargs.setdefault("threshold", 0.5)
+    kwargs.setdefault("batch_size", 10)
+    return PaperTriage(
+        api_key="test-key",
+        model="cheap-model",
+        interests="language models",
+        base_url=stub.base_url,
+        usage_tracker=tracker,
+        **kwargs
+    )
+
+
+class TestParseScores:
+    """スコア抽出のテスト"""
+    
+    def test_parse_formats(self):
+        text = "1: 7\n[2]: 10\n3：0\n4: 12\n9: 5\nnote: ignored"
+        assert parse_scores(text, 4) == {0: 0.7, 1: 1.0, 2: 0.0, 3: 1.0}
+    
+    def test_parse_prices(self):
+        assert parse_prices("a/b=0.15/0.6, c=3/15") == {"a/b": (0.15, 0.6), "c": (3.0, 15.0)}
+        with pytest.raises(ValueError, match="Invalid price entry"):
+            parse_prices("a/b=0.15")
+    
+    def test_parse_prices_with_cached_input(self):
+        assert parse_prices("a=3/15/0.3") == {"a": (3.0, 15.0, 0.3)}
+        with pytest.raises(ValueError, match="Invalid price entry"):
+            parse_prices("a=1/2/3/4")
+
+
+class TestPaperTriage:
+    """PaperTriageのテスト"""
+    
+    def test_batches_and_filters(self):
+        papers = [_paper(i) for i in range(25)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            passed = _triage(stub).triage(papers)
+        
+        # 25件を10件ずつのバッチで評価
+        assert stub.stats["completions"] == 3
+        assert [p.id for p in passed] == [p.id for p in papers if "language" in p.title]
+        assert papers[1].relevance_score == 0.2
+        assert passed[0].relevance_score == 0.9
+    
+    def test_client_uses_public_completion_interface(self):
+        with ChatCompletionStub(CompletionProfile(latency_ms=0)) as stub:
+            assert isinstance(_triage(stub).client, CompletionSummarizer)
+    
+    def test_missing_scores_pass_through(self):
+        papers = [_paper(i) for i in range(3)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=lambda model, prompt: "1: 1") as stub:
+            passed = _triage(stub).triage(papers)
+        
+        assert [p.id for p in passed] == [papers[1].id, papers[2].id]
+        assert papers[0].relevance_score == 0.1
+        assert papers[1].relevance_score is None
+    
+    def test_watched_authors_skip_threshold(self):
+        papers = [_paper(1), _paper(3)]
+        papers[1].watched_authors = ["John Doe"]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            passed = _triage(stub).triage(papers)
+        
+        assert passed == [papers[1]]
+        assert papers[1].relevance_score == 0.2
+    
+    def test_failed_batch_passes_through(self):
+        papers = [_paper(i) for i in range(3)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0, error_rate=1.0)) as stub:
+            triage = _triage(stub)
+            triage.client.max_retries = 1
+            passed = triage.triage(papers)
+        
+        assert passed == papers
+    
+    def test_usage_is_tracked_per_tier(self):
+        tracker = UsageTracker({"cheap-model": (0.1, 0.4), "big-model": (3.0, 15.0)})
+        papers = [_paper(i) for i in range(20)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            passed = _triage(stub, tracker).triage(papers)
+            summarizer = OpenRouterSummarizer(
+                api_key="test-key", model="big-model", base_url=stub.base_url, usage_tracker=tracker
+            )
+            for paper in passed:
+                summarizer.summarize(paper)
+            tracker.add_papers("summary", len(passed))
+        
+        usage = tracker.snapshot()
+        assert usage["triage"].calls == 2
+        assert usage["triage"].papers == 20
+        assert usage["summary"].calls == 10
+        assert usage["summary"].model == "big-model"
+        assert usage["summary"].prompt_tokens > 0
+        assert stub.models == {"cheap-model": 2, "big-model": 10}
+        
+        total = tracker.total_cost(usage)
+        assert total == pytest.approx(usage["triage"].cost(tracker.prices) + usage["summary"].cost(tracker.prices))
+        report = tracker.format_report(usage, summarized=10)
+        assert report[0].startswith("Usage [triage] cheap-model: 20 papers, 2 calls")
+        assert report[-1].startswith("Throughput: 10 papers summarized")
+    
+    def test_usage_since_snapshot(self):
+        tracker = UsageTracker()
+        tracker.record("summary", "m", 10, 5, 0.5)
+        before = tracker.snapshot()
+        tracker.record("summary", "m", 20, 10, 1.5)
+        
+        delta = tracker.since(before)["summary"]
+        assert (delta.calls, delta.prompt_tokens, delta.latency) == (1, 20, 1.5)
+        assert tracker.total_cost(tracker.snapshot()) is None
+
+
+class TestExtractiveTier:
+    """関連度が要約のしきい値未満の論文を抽出要約で通知する段階のテスト"""
+    
+    def test_papers_between_thresholds_pass_without_summary(self):
+        papers = [_paper(i) for i in range(4)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            triage = _triage(stub, extractive_threshold=0.2)
+            passed = triage.triage(papers)
+        
+        assert passed == papers
+        assert [triage.needs_summary(paper) for paper in passed] == [True, False, True, False]
+    
+    def test_disabled_by_default(self):
+        papers = [_paper(i) for i in range(4)]
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            passed = _triage(stub).triage(papers)
+        assert passed == [papers[0], papers[2]]
+    
+    def test_bot_notifies_key_points_instead_of_summary(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DEFERRED_FILE", str(tmp_path / "deferred.json"))
+        papers = [_paper(i) for i in range(4)]
+        collector = Mock(collect_recent_papers=Mock(return_value=papers))
+        summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda paper: paper))
+        bot = ResearchPaperBot(dry_run=True, collector=collector, summarizer=summarizer, triage=False)
+        with ChatCompletionStub(CompletionProfile(latency_ms=0), responder=_responder) as stub:
+            bot.triage = _triage(stub, extractive_threshold=0.2)
+            notify = Mock(wraps=bot.notify_papers)
+            bot.notify_papers = notify
+            assert bot.run(days=1)
+        
+        assert [call.args[0] for call in summarizer.summarize.call_args_list] == [papers[0], papers[2]]
+        assert len(notify.call_args.args[0]) == 4
+        assert papers[1].key_points and papers[1].summary is None
+
+
+class TestBotTriage:
+    """ResearchPaperBotのトリアージ統合のテスト"""
+    
+    def test_run_summarizes_only_passed_papers(self):
+        papers = [_paper(i) for i in range(4)]
+        collector = Mock(collect_recent_papers=Mock(return_value=papers))
+        summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda paper: paper))
+        bot = ResearchPaperBot(dry_run=True, collector=collector, summarizer=summarizer, triage=False)
+        bot.triage = Mock(triage=Mock(return_value=papers[:1]))
+        
+        assert bot.run(days=1)
+        summarizer.summarize.assert_called_once_with(papers[0])
+    
+    def test_triage_error_keeps_all_papers(self):
+        papers = [_paper(i) for i in range(2)]
+        bot = ResearchPaperBot(dry_run=True, collector=Mock(), summarizer=Mock(usage_tracker=None), triage=False)
+        bot.triage = Mock(triage=Mock(side_effect=Exception("boom")))
+        
+        assert bot.triage_papers(papers) == papers
@@ -0,0 +1,125 @@
+"""
+著者ウォッチリストのテスト
+"""
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.analyzers.watchlist import AuthorWatchlist, normalize_name, split_authors
+from src.main import ResearchPaperBot
+from src.notifiers.digest import format_digest_line
+from tests.helpers import make_paper
+
+
+class TestNormalization:
+    """著者名の正規化のテスト"""
+    
+    def test_normalize_name(self):
+        assert normalize_name("Jürgen  SCHMIDHUBER") == ["jurgen", "schmidhuber"]
+        assert normalize_name("J.-P. Dupont") == ["j", "p", "dupont"]
+        assert normalize_name("Zoë O'Neil") == ["zoe", "o", "neil"]
+    
+    def test_split_authors(self):
+        assert split_authors("A. One, B. Two and C. Three, et al.") == ["A. One", "B. Two", "C. Three"]
+        assert split_authors("") == []
+
+
+class TestAuthorWatchlist:
+    """照合のテスト"""
+    
+    @pytest.mark.parametrize("author, expected", [
+        ("Geoffrey Hinton", ["Geoffrey Hinton"]),
+        ("geoffrey e. hinton", ["Geoffrey Hinton"]),
+        ("G. Hinton", ["Geoffrey Hinton"]),
+        ("Jurgen Schmidhuber", ["Jürgen Schmidhuber"]),
+        ("Yoshua Bengio", ["Y. Bengio"]),
+        ("Samy Bengio", []),
+        ("Geoffrey Hinton-Smith", []),
+        ("Hinton", []),
+    ])
+    def test_match_author(self, author, expected):
+        watchlist = AuthorWatchlist(["Geoffrey Hinton", "Jürgen Schmidhuber", "Y. Bengio"])
+        assert watchlist.match_author(author) == expected
+    
+    def test_match_paper(self):
+        watchlist = AuthorWatchlist(["Geoffrey Hinton", "Yann LeCun"])
+        paper = make_paper(id="1", authors="Alice Smith, Yann LeCun, G. E. Hinton")
+        assert watchlist.match(paper) == ["Yann LeCun", "Geoffrey Hinton"]
+    
+    def test_add_and_remove(self):
+        watchlist = AuthorWatchlist(["Yann LeCun"])
+        assert not watchlist.add("Yann  LeCun")
+        assert not watchlist.add("LeCun")
+        assert watchlist.remove("Yann LeCun")
+        assert watchlist.match_author("Yann LeCun") == []
+        assert len(watchlist) == 0
+    
+    def test_lookup_does_not_scale_with_watchlist_size(self):
+        """照合時間がウォッチ中の著者数にほぼ依存しないこと"""
+        papers = [make_paper(id=str(i), authors=", ".join(f"Author{i}x{j} Person{j}" for j in range(10))) for i in range(2000)]
+        
+        def elapsed_for(size: int) -> float:
+            watchlist = AuthorWatchlist(f"Watched{i} Researcher{i}" for i in range(size))
+            started = time.perf_counter()
+            watchlist.annotate(papers)
+            return time.perf_counter() - started
+        
+        small = elapsed_for(10)
+        large = elapsed_for(10000)
+        assert large < small * 3 + 0.05
+    
+    def test_annotate_and_persist(self, tmp_path):
+        path = tmp_path / "watchlist.json"
+        watchlist = AuthorWatchlist.load(str(path), ["Yann LeCun"])
+        papers = [make_paper(id="1", authors="Yann LeCun"), make_paper(id="2", authors="Someone Else")]
+        
+        assert watchlist.annotate(papers) == [papers[0]]
+        assert papers[0].watched_authors == ["Yann LeCun"]
+        assert papers[1].watched_authors is None
+        watchlist.save()
+        
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["matches"]["Yann LeCun"]["count"] == 1
+        assert "yann lecun" in data["index"]["exact"]
+        
+        reloaded = AuthorWatchlist.load(str(path))
+        assert reloaded.authors == ["Yann LeCun"]
+        assert reloaded.match_author("Y. LeCun") == ["Yann LeCun"]
+        assert reloaded.matches["Yann LeCun"]["last_paper"] == "1"
+    
+    def test_configured_authors_replace_saved_list(self, tmp_path):
+        path = tmp_path / "watchlist.json"
+        AuthorWatchlist.load(str(path), ["Yann LeCun"]).save()
+        
+        watchlist = AuthorWatchlist.load(str(path), ["Geoffrey Hinton"])
+        assert watchlist.authors == ["Geoffrey Hinton"]
+        assert watchlist.match_author("Yann LeCun") == []
+
+
+class TestBotWatchlist:
+    """ResearchPaperBotのウォッチリスト統合のテスト"""
+    
+    def test_watched_papers_skip_triage_and_come_first(self):
+        papers = [make_paper(id="1", authors="Alice Smith"), make_paper(id="2", authors="Bob Jones, Yann LeCun")]
+        summarizer = Mock(usage_tracker=None, compression_stats=None, summarize=Mock(side_effect=lambda paper: paper))
+        bot = ResearchPaperBot(
+            dry_run=True,
+            collector=Mock(),
+            summarizer=summarizer,
+            triage=False,
+            cluster=False,
+            watchlist=AuthorWatchlist(["Yann LeCun"])
+        )
+        bot.triage = Mock(triage=Mock(side_effect=lambda papers: [p for p in papers if p.watched_authors]))
+        
+        processed = bot.process_papers(papers)
+        
+        assert [p.id for p in processed] == ["2"]
+        assert processed[0].watched_authors == ["Yann LeCun"]
+    
+    def test_digest_line_is_flagged(self):
+        paper = make_paper(id="1", authors="Yann LeCun")
+        paper.watched_authors = ["Yann LeCun"]
+        assert format_digest_line(paper).startswith("• ⭐ [Paper 1]")